@@ -0,0 +1,73 @@
+"""
+Benchmark del tiempo de arranque en frío del grafo de análisis.
+
+Mide, en intérpretes nuevos (sin módulos en memoria), cuánto cuesta:
+    - import: importar ``application.workflow.graph`` con Django configurado,
+      lo que paga todo proceso que carga las vistas (incluido ``manage.py migrate``).
+    - import + warm_up: además crear los adaptadores y compilar el grafo, que es
+      lo que antes ocurría siempre al importar el módulo.
+    - django.setup: línea base de Django sin el grafo.
+
+Usage:
+    python benchmark_startup.py            # 5 repeticiones por escenario
+    python benchmark_startup.py --runs 10
+
+Note:
+    ``warm_up`` crea el adaptador LLM configurado: requiere la API key del
+    proveedor (un valor cualquiera alcanza, no se hacen llamadas de red).
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+
+SCENARIOS = {
+    "django.setup": "",
+    "import": "import application.workflow.graph",
+    "import + warm_up": "import application.workflow.graph as g; g.warm_up()",
+}
+
+TEMPLATE = """
+import time
+start = time.perf_counter()
+import django
+django.setup()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def measure(statement: str, runs: int) -> list:
+    """Segundos de cada ejecución del escenario en un intérprete nuevo."""
+    env = {
+        **os.environ,
+        "PYTHONPATH": SRC,
+        "DJANGO_SETTINGS_MODULE": "config.settings",
+        "GOOGLE_API_KEY": os.environ.get("GOOGLE_API_KEY", "benchmark"),
+    }
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", TEMPLATE.format(statement=statement)],
+            env=env, capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Repeticiones por escenario")
+    args = parser.parse_args()
+
+    print(f"{'Escenario':<20}{'mediana':>10}{'mínimo':>10}")
+    for name, statement in SCENARIOS.items():
+        timings = measure(statement, args.runs)
+        print(f"{name:<20}{statistics.median(timings):>9.3f}s{min(timings):>9.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,8 @@ Usage:
     python generate_graph.py
 
 Note:
-    Requiere que las variables de entorno del LLM estén configuradas en .env,
-    ya que al importar el grafo se inicializan los adaptadores.
+    No requiere API keys: compilar el grafo no crea los adaptadores LLM ni de
+    YouTube (se inicializan recién al ejecutar un análisis).
 """
 import os
 import sys
@@ -20,7 +20,7 @@ load_dotenv()
 # Añadimos 'src' al path para que Python encuentre tus módulos
 sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
 
-from application.workflow.graph import app
+from application.workflow.graph import get_graph
 
 
 
@@ -39,6 +39,8 @@ def generate():
     os.makedirs("docs", exist_ok=True)
 
     try:
+        app = get_graph()
+
         # 1. Obtener el código Mermaid (Ideal para el README.md)
         mermaid_code = app.get_graph().draw_mermaid()
         
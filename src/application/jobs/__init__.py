@@ -0,0 +1,9 @@
+"""
+Ejecución en segundo plano de trabajos de análisis.
+
+Provee un pool acotado de workers asyncio dentro del proceso, de modo que la
+API pueda aceptar muchas más solicitudes que slots concurrentes de LLM.
+"""
+from .worker_pool import JobWorkerPool, JobQueueFullError
+
+__all__ = ["JobWorkerPool", "JobQueueFullError"]
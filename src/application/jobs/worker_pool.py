@@ -0,0 +1,123 @@
+"""
+Pool acotado de workers asyncio para trabajos en segundo plano.
+
+La cola y los workers se crean de forma perezosa sobre el event loop en el que
+se encola el primer trabajo, y se recrean si el loop cambia (p. ej. entre
+tests). Ese loop tiene que vivir tanto como el proceso: el de un servidor ASGI
+(uvicorn). Bajo WSGI (``manage.py runserver``) cada vista async corre en un
+loop efímero que se cierra con la respuesta y los workers mueren con él; los
+pendientes se trasladan al loop siguiente, pero los trabajos en curso quedan
+interrumpidos hasta la recuperación al arranque (``RecoverAnalysisJobsUseCase``).
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFullError(Exception):
+    """Se lanza cuando la cola de trabajos alcanzó su capacidad máxima."""
+    pass
+
+
+class JobWorkerPool:
+    """
+    Cola FIFO consumida por un número fijo de workers.
+
+    Attributes:
+        workers: Cantidad de trabajos ejecutados en paralelo.
+        max_queue_size: Trabajos pendientes admitidos antes de rechazar.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str], Awaitable[None]],
+        workers: int,
+        max_queue_size: int
+    ):
+        """
+        Inicializa el pool (sin arrancar workers todavía).
+
+        Args:
+            handler: Corrutina que procesa un trabajo a partir de su ID.
+            workers: Cantidad de workers concurrentes.
+            max_queue_size: Capacidad de la cola de pendientes.
+        """
+        self._handler = handler
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def submit(self, job_id: str) -> None:
+        """
+        Encola un trabajo sin esperar a que se procese.
+
+        Args:
+            job_id: Identificador del trabajo a procesar.
+
+        Raises:
+            JobQueueFullError: Si la cola está llena.
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            raise JobQueueFullError(
+                f"La cola de trabajos está llena ({self.max_queue_size} pendientes)."
+            )
+
+    def has_capacity(self) -> bool:
+        """Indica si la cola admite un trabajo más."""
+        return self._queue is None or not self._queue.full()
+
+    def pending(self) -> int:
+        """Cantidad de trabajos en espera de un worker."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def join(self) -> None:
+        """Espera a que se procesen todos los trabajos encolados."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    def _ensure_started(self) -> None:
+        """Crea la cola y los workers sobre el loop actual si hace falta."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        pending = self._drain()
+        if self._loop is not None and self._loop.is_closed():
+            logger.warning(
+                "El loop de los workers se cerró (¿servidor WSGI?): se reinician "
+                "los workers y se trasladan %d trabajos pendientes",
+                len(pending)
+            )
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        for job_id in pending:
+            self._queue.put_nowait(job_id)
+        self._tasks = [
+            loop.create_task(self._worker(), name=f"analysis-job-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    def _drain(self) -> List[str]:
+        """Retira los trabajos que quedaron sin procesar en la cola anterior."""
+        pending = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        return pending
+
+    async def _worker(self) -> None:
+        """Consume trabajos de la cola indefinidamente."""
+        queue = self._queue
+        while True:
+            job_id = await queue.get()
+            try:
+                await self._handler(job_id)
+            except Exception:
+                logger.exception("Error no controlado procesando el trabajo %s", job_id)
+            finally:
+                queue.task_done()
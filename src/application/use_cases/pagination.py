@@ -0,0 +1,54 @@
+"""
+Paginación por keyset (cursor) sobre (created_at, id) descendente.
+
+A diferencia de OFFSET, cuyo costo crece con la página pedida porque la
+base de datos recorre y descarta todas las filas anteriores, el cursor
+codifica la posición de la última fila devuelta y la página siguiente es un
+rango sobre el índice: el costo es el mismo en la primera página que en la
+millonésima. El ``id`` desempata análisis con el mismo ``created_at``.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+from django.db.models import Q, QuerySet
+
+
+class InvalidCursorError(ValueError):
+    """El cursor recibido no fue emitido por esta API o está corrupto."""
+
+
+def encode_cursor(created_at: datetime, pk: int) -> str:
+    """Cursor opaco (base64 URL-safe) que apunta a continuación de la fila dada."""
+    raw = json.dumps([created_at.isoformat(), pk]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decodifica un cursor emitido por ``encode_cursor``.
+
+    Raises:
+        InvalidCursorError: Si el cursor no es válido.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, pk = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Cursor inválido: {cursor!r}") from e
+
+
+def after_cursor(queryset: QuerySet, cursor: str) -> QuerySet:
+    """
+    Filtra las filas posteriores al cursor en el orden ``-created_at, -id``.
+
+    ``created_at <= c`` es el rango que recorre el índice; la disyunción
+    solo descarta las filas ya devueltas con el mismo ``created_at``.
+    """
+    created_at, pk = decode_cursor(cursor)
+    return queryset.filter(
+        Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk),
+        created_at__lte=created_at
+    )
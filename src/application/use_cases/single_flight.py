@@ -0,0 +1,53 @@
+"""
+Coalescencia de ejecuciones concurrentes (patrón single-flight).
+
+Cuando llegan varias solicitudes simultáneas para la misma clave, solo la
+primera dispara el trabajo real; el resto espera esa misma ejecución y
+recibe su resultado (o su excepción).
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Registro en proceso de ejecuciones en vuelo indexadas por clave.
+
+    El trabajo se ejecuta como una tarea independiente de quien la originó,
+    de modo que la cancelación de un cliente (p. ej. desconexión HTTP) no
+    aborta el análisis que otros solicitantes están esperando.
+    """
+
+    def __init__(self):
+        """Inicializa el registro vacío de tareas en vuelo."""
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Ejecuta ``fn`` una sola vez por clave mientras esté en vuelo.
+
+        Args:
+            key: Identificador del trabajo (p. ej. el video a analizar).
+            fn: Función asíncrona sin argumentos que realiza el trabajo.
+
+        Returns:
+            El resultado de la ejecución compartida.
+        """
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: str) -> bool:
+        """Indica si hay una ejecución en curso para la clave."""
+        return key in self._inflight
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        """Elimina la tarea del registro al finalizar (si sigue siendo la vigente)."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Marca la excepción como consumida aunque todos los solicitantes se hayan cancelado
+        if not task.cancelled():
+            task.exception()
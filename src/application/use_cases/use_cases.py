@@ -2,48 +2,896 @@
 Capa de Aplicación: Orquestación de casos de uso.
 Aquí reside la lógica que conecta los adaptadores de entrada con el dominio y el workflow.
 """
-from asgiref.sync import sync_to_async
-from application.workflow.graph import app
-from infrastructure.persistence.models import VideoRecord
+import asyncio
+import logging
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+
+from application.workflow.graph import get_graph
+from domain.video_url import extract_video_id, canonical_video_url, InvalidVideoURLError
+from application.use_cases.single_flight import SingleFlight
+from application.use_cases.pagination import after_cursor, encode_cursor
+from application.jobs import JobWorkerPool, JobQueueFullError
+from infrastructure.adapters.llm.response_cache import bypass_response_cache
+from infrastructure.persistence.fingerprint_index import find_near_duplicate
+from infrastructure.persistence.locks import advisory_lock
+from infrastructure.persistence.models import VideoRecord, VideoTranscript, AnalysisJob, SentimentRollup
+from infrastructure.persistence.search import search_videos
+from infrastructure.persistence.video_records import upsert_video_record
+
+logger = logging.getLogger(__name__)
+
+# Callback invocado con (nombre_de_nodo, actualización_de_estado) al completar cada nodo
+ProgressCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+# Ejecuciones del grafo en vuelo, compartidas por todas las solicitudes del proceso
+_in_flight_analyses = SingleFlight()
 
 class AnalyzeVideoUseCase:
     """
     Caso de Uso: Analizar y persistir información de un video.
     Encapsula el disparo del grafo y asegura la consistencia de los datos.
+
+    Actúa como cache read-through: si ya existe un análisis vigente para el
+    video (identificado por su ID canónico, sin importar la variante de URL)
+    se devuelve sin volver a ejecutar el grafo (YouTube + LLM).
+    Las solicitudes concurrentes para el mismo video comparten una única
+    ejecución en vuelo (single-flight).
+
+    Si la transcripción extraída es casi idéntica (similitud MinHash >=
+    ANALYSIS_NEAR_DUPLICATE_THRESHOLD) a la de otro análisis vigente, se
+    reutiliza ese análisis sin llamar al LLM (re-subidas, espejos, recortes).
     """
-    
+
     @staticmethod
-    async def execute(video_url: str) -> VideoRecord:
+    async def execute(
+        video_url: str,
+        force_refresh: bool = False,
+        on_progress: Optional[ProgressCallback] = None,
+        latency_tier: Optional[str] = None
+    ) -> VideoRecord:
         """
         Ejecuta el flujo de agentes y persiste el resultado.
-        
+
         Args:
             video_url (str): URL validada del video.
-            
+            force_refresh (bool): Ignora el análisis almacenado y re-ejecuta el grafo.
+            on_progress (ProgressCallback): Notificado al completar cada nodo del grafo.
+                Solo lo recibe la solicitud que efectivamente ejecuta el grafo.
+            latency_tier (str): Nivel de latencia para el ruteo de modelos
+                ("fast", "standard", "quality"; None = LLM_DEFAULT_LATENCY_TIER).
+
+        Returns:
+            VideoRecord: Instancia del modelo guardada en DB.
+
+        Raises:
+            InvalidVideoURLError: Si la URL no contiene un ID de video de YouTube.
+        """
+        video_id = extract_video_id(video_url)
+
+        # 1. Lectura desde el cache (análisis previo todavía fresco)
+        if not force_refresh:
+            cached = await AnalyzeVideoUseCase._get_fresh_record(video_id)
+            if cached is not None:
+                return cached
+
+        # 2. Coalescer solicitudes concurrentes en una sola ejecución del grafo
+        return await _in_flight_analyses.do(
+            video_id,
+            lambda: AnalyzeVideoUseCase._analyze(video_id, force_refresh, on_progress, latency_tier)
+        )
+
+    @staticmethod
+    async def _analyze(
+        video_id: str,
+        force_refresh: bool,
+        on_progress: Optional[ProgressCallback] = None,
+        latency_tier: Optional[str] = None
+    ) -> VideoRecord:
+        """
+        Ejecuta el grafo y persiste el resultado (líder del single-flight).
+
+        Con ANALYSIS_SINGLE_FLIGHT_DB_LOCK habilitado, serializa además la
+        ejecución entre procesos mediante un advisory lock; al obtenerlo se
+        vuelve a consultar el cache por si otro worker terminó mientras tanto.
+
+        Args:
+            video_id (str): ID canónico del video.
+            force_refresh (bool): Ignora los análisis previos a la espera del lock.
+            on_progress (ProgressCallback): Notificado al completar cada nodo del grafo.
+            latency_tier (str): Nivel de latencia para el ruteo de modelos.
+
+        Returns:
+            VideoRecord: Instancia del modelo guardada en DB.
+        """
+        reuse_cached = not force_refresh
+        if not settings.ANALYSIS_SINGLE_FLIGHT_DB_LOCK:
+            return await AnalyzeVideoUseCase._run_graph(video_id, on_progress, reuse_cached, latency_tier)
+
+        waiting_since = timezone.now()
+        async with advisory_lock(f"analyze:{video_id}"):
+            since = waiting_since if force_refresh else None
+            cached = await AnalyzeVideoUseCase._get_fresh_record(video_id, since=since)
+            if cached is not None:
+                return cached
+            return await AnalyzeVideoUseCase._run_graph(video_id, on_progress, reuse_cached, latency_tier)
+
+    @staticmethod
+    async def _run_graph(
+        video_id: str,
+        on_progress: Optional[ProgressCallback] = None,
+        reuse_cached: bool = True,
+        latency_tier: Optional[str] = None
+    ) -> VideoRecord:
+        """
+        Dispara el grafo de LangGraph y guarda su estado final.
+
+        El grafo se recorre en modo streaming para poder notificar el avance
+        de cada nodo sin esperar a que termine la ejecución completa.
+
+        Args:
+            video_id (str): ID canónico del video.
+            on_progress (ProgressCallback): Notificado al completar cada nodo del grafo.
+            reuse_cached (bool): Permite reutilizar el análisis de un casi-duplicado y las
+                respuestas cacheadas del LLM (False con force_refresh).
+            latency_tier (str): Nivel de latencia para el ruteo de modelos.
+
         Returns:
             VideoRecord: Instancia del modelo guardada en DB.
         """
-        # 1. Disparar el grafo de LangGraph de forma asíncrona
+        video_url = canonical_video_url(video_id)
         initial_state = {"video_url": video_url, "errors": []}
-        final_state = await app.ainvoke(initial_state)
-        
+        configurable = {}
+        if latency_tier:
+            configurable["latency_tier"] = latency_tier
+        if reuse_cached and settings.ANALYSIS_NEAR_DUPLICATE_THRESHOLD > 0:
+            configurable["find_near_duplicate"] = (
+                lambda signature: AnalyzeVideoUseCase._find_near_duplicate(video_id, signature)
+            )
+        final_state = initial_state
+        with nullcontext() if reuse_cached else bypass_response_cache():
+            async for mode, chunk in get_graph().astream(
+                initial_state,
+                config={"configurable": configurable},
+                stream_mode=["updates", "values"]
+            ):
+                if mode == "values":
+                    final_state = chunk
+                elif on_progress is not None:
+                    for node, update in chunk.items():
+                        await on_progress(node, update or {})
+
         if final_state.get("errors"):
             raise ValueError(f"Error en el workflow: {final_state['errors'][0]}")
 
-        # 2. Persistencia usando sync_to_async 
-        @sync_to_async
-        def create_record():
-            return VideoRecord.objects.create(
-                url=video_url,
-                title=final_state["metadata"]["title"],
-                transcript=final_state["transcript"],
-                duration_seconds=final_state["metadata"]["duration_seconds"],
-                language_code=final_state["metadata"]["language_code"],
-                sentiment=final_state["analysis"]["sentiment"],
-                sentiment_score=final_state["analysis"]["sentiment_score"],
-                tone=final_state["analysis"]["tone"],
-                key_points=final_state["analysis"]["key_points"]
+        # Upsert por video_id: reemplaza un análisis vencido (o uno escrito en
+        # paralelo por otro worker) en lugar de violar la unicidad
+        return await upsert_video_record(
+            video_id,
+            url=video_url,
+            title=final_state["metadata"]["title"],
+            transcript=final_state["transcript"],
+            duration_seconds=final_state["metadata"]["duration_seconds"],
+            language_code=final_state["metadata"]["language_code"],
+            sentiment=final_state["analysis"]["sentiment"],
+            sentiment_score=final_state["analysis"]["sentiment_score"],
+            tone=final_state["analysis"]["tone"],
+            key_points=final_state["analysis"]["key_points"],
+            fingerprint=final_state.get("fingerprint"),
+            duplicate_of=final_state.get("duplicate_of", ""),
+            llm_provider=final_state.get("llm_provider", ""),
+            llm_model=final_state.get("llm_model", ""),
+        )
+
+    @staticmethod
+    async def _find_near_duplicate(video_id: str, signature) -> Optional[Dict[str, Any]]:
+        """
+        Busca un análisis vigente de otro video con una transcripción casi idéntica.
+
+        Args:
+            video_id (str): ID canónico del video en análisis (se excluye de la búsqueda).
+            signature (numpy.ndarray): Firma MinHash de su transcripción.
+
+        Returns:
+            Dict con 'video_id', 'similarity' y 'analysis' reutilizable, o None.
+        """
+        match = await find_near_duplicate(
+            signature,
+            settings.ANALYSIS_NEAR_DUPLICATE_THRESHOLD,
+            AnalyzeVideoUseCase._fresh_records().exclude(video_id=video_id)
+        )
+        if match is None:
+            return None
+        record, similarity = match
+        return {
+            "video_id": record.video_id,
+            "similarity": similarity,
+            "analysis": {
+                "sentiment": record.sentiment,
+                "sentiment_score": record.sentiment_score,
+                "tone": record.tone,
+                "key_points": record.key_points,
+            },
+        }
+
+    @staticmethod
+    async def _get_fresh_record(video_id: str, since: Optional[datetime] = None) -> Optional[VideoRecord]:
+        """
+        Busca un análisis almacenado cuya antigüedad no supere el TTL configurado.
+
+        Args:
+            video_id (str): ID canónico del video a consultar.
+            since (datetime): Si se indica, solo acepta análisis posteriores a ese instante.
+
+        Returns:
+            VideoRecord vigente o None si no existe o está vencido.
+        """
+        queryset = AnalyzeVideoUseCase._fresh_records().filter(video_id=video_id)
+        if since is not None:
+            queryset = queryset.filter(created_at__gte=since)
+        return await queryset.afirst()
+
+    @staticmethod
+    def _fresh_records():
+        """QuerySet de análisis cuya antigüedad no supera el TTL configurado."""
+        ttl = settings.ANALYSIS_CACHE_TTL_SECONDS
+        queryset = VideoRecord.objects.all()
+        if ttl > 0:
+            queryset = queryset.filter(created_at__gte=timezone.now() - timedelta(seconds=ttl))
+        return queryset
+
+
+class StreamVideoAnalysisUseCase:
+    """
+    Caso de Uso: Analizar un video emitiendo eventos de progreso.
+
+    Expone el avance de cada nodo del grafo como una secuencia de eventos
+    (``start``, ``extract``, ``analyze_chunk`` en transcripciones largas,
+    ``analyze``, ``done`` o ``error``) para que el cliente reciba
+    información mucho antes de que termine el análisis.
+    """
+
+    EVENT_START = "start"
+    EVENT_DONE = "done"
+    EVENT_ERROR = "error"
+    EVENT_HEARTBEAT = "heartbeat"
+
+    @staticmethod
+    async def execute(
+        video_url: str,
+        force_refresh: bool = False,
+        heartbeat_seconds: Optional[float] = None,
+        latency_tier: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Ejecuta el análisis y produce pares (evento, datos) a medida que avanza.
+
+        El evento ``done`` transporta el VideoRecord persistido; el resto,
+        diccionarios serializables. Si el cliente deja de consumir el
+        iterador, el análisis compartido sigue su curso (single-flight).
+
+        Args:
+            video_url (str): URL validada del video.
+            force_refresh (bool): Ignora el análisis almacenado y re-ejecuta el grafo.
+            heartbeat_seconds (float): Intervalo sin eventos tras el cual se emite
+                un ``heartbeat`` para mantener viva la conexión.
+            latency_tier (str): Nivel de latencia para el ruteo de modelos.
+
+        Yields:
+            Tuple[str, Any]: Nombre del evento y sus datos.
+        """
+        video_id = extract_video_id(video_url)
+        yield StreamVideoAnalysisUseCase.EVENT_START, {"video_id": video_id}
+
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+
+        async def on_progress(node: str, update: Dict[str, Any]) -> None:
+            await queue.put((node, update))
+
+        task = asyncio.ensure_future(
+            AnalyzeVideoUseCase.execute(
+                video_url, force_refresh=force_refresh, on_progress=on_progress, latency_tier=latency_tier
             )
-        
-        record = await create_record()
-        return record
\ No newline at end of file
+        )
+        task.add_done_callback(lambda _: queue.put_nowait(finished))
+
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield StreamVideoAnalysisUseCase.EVENT_HEARTBEAT, {}
+                    continue
+                if item is finished:
+                    break
+                event = StreamVideoAnalysisUseCase._progress_event(*item)
+                if event is not None:
+                    yield event
+
+            try:
+                record = task.result()
+            except Exception as e:
+                yield StreamVideoAnalysisUseCase.EVENT_ERROR, {"error": str(e)}
+            else:
+                yield StreamVideoAnalysisUseCase.EVENT_DONE, record
+        finally:
+            if not task.done():
+                task.cancel()
+
+    @staticmethod
+    def _progress_event(node: str, update: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Traduce la actualización de un nodo a un evento público.
+
+        Los errores no se emiten aquí: llegan como evento ``error`` al final.
+        """
+        if update.get("errors"):
+            return None
+        if node == "extract":
+            return node, {
+                "transcript_length": len(update.get("transcript") or ""),
+                "metadata": update.get("metadata", {}),
+            }
+        if node in ("analyze", "reduce"):
+            return "analyze", {"analysis": update.get("analysis", {})}
+        if node == "analyze_chunk":
+            partial = (update.get("partial_analyses") or [{}])[0]
+            return "analyze_chunk", {"chunk_index": partial.get("chunk_index")}
+        return "progress", {"node": node}
+
+
+@dataclass
+class BatchItemResult:
+    """
+    Resultado individual de un análisis por lotes.
+
+    Attributes:
+        video_url: URL tal como fue recibida.
+        video_id: ID canónico (None si la URL es inválida).
+        status: 'analyzed', 'cached' o 'failed'.
+        record: Análisis resultante (None si falló).
+        error: Mensaje de error (None si tuvo éxito).
+    """
+    video_url: str
+    video_id: Optional[str]
+    status: str
+    record: Optional[VideoRecord] = None
+    error: Optional[str] = None
+
+
+class AnalyzeVideoBatchUseCase:
+    """
+    Caso de Uso: Analizar una lista de videos con concurrencia acotada.
+
+    Deduplica por ID canónico, resuelve en una sola consulta los videos que ya
+    tienen un análisis vigente y ejecuta el resto con un límite de análisis
+    simultáneos para respetar los rate limits de los proveedores.
+    """
+
+    STATUS_ANALYZED = "analyzed"
+    STATUS_CACHED = "cached"
+    STATUS_FAILED = "failed"
+
+    @staticmethod
+    async def execute(video_urls: List[str], force_refresh: bool = False) -> List[BatchItemResult]:
+        """
+        Analiza todos los videos y devuelve un resultado por cada URL recibida.
+
+        Args:
+            video_urls (List[str]): URLs a procesar (pueden repetirse o ser variantes).
+            force_refresh (bool): Ignora los análisis almacenados.
+
+        Returns:
+            List[BatchItemResult]: Resultados en el mismo orden que las URLs.
+        """
+        # 1. Canonicalizar y deduplicar por video_id
+        ids_by_url: Dict[str, Optional[str]] = {}
+        url_errors: Dict[str, str] = {}
+        for url in video_urls:
+            try:
+                ids_by_url[url] = extract_video_id(url)
+            except InvalidVideoURLError as e:
+                ids_by_url[url] = None
+                url_errors[url] = str(e)
+        video_ids = list(dict.fromkeys(vid for vid in ids_by_url.values() if vid))
+
+        # 2. Resolver los ya analizados en una sola consulta
+        outcomes: Dict[str, BatchItemResult] = {}
+        if not force_refresh:
+            async for record in AnalyzeVideoUseCase._fresh_records().filter(video_id__in=video_ids):
+                outcomes[record.video_id] = BatchItemResult(
+                    video_url=record.url,
+                    video_id=record.video_id,
+                    status=AnalyzeVideoBatchUseCase.STATUS_CACHED,
+                    record=record
+                )
+
+        # 3. Analizar el resto con concurrencia acotada
+        semaphore = asyncio.Semaphore(settings.ANALYSIS_BATCH_CONCURRENCY)
+
+        async def analyze(video_id: str) -> BatchItemResult:
+            async with semaphore:
+                try:
+                    record = await AnalyzeVideoUseCase.execute(
+                        canonical_video_url(video_id), force_refresh=force_refresh
+                    )
+                except Exception as e:
+                    return BatchItemResult(
+                        video_url=canonical_video_url(video_id),
+                        video_id=video_id,
+                        status=AnalyzeVideoBatchUseCase.STATUS_FAILED,
+                        error=str(e)
+                    )
+                return BatchItemResult(
+                    video_url=record.url,
+                    video_id=video_id,
+                    status=AnalyzeVideoBatchUseCase.STATUS_ANALYZED,
+                    record=record
+                )
+
+        pending = [vid for vid in video_ids if vid not in outcomes]
+        for result in await asyncio.gather(*(analyze(vid) for vid in pending)):
+            outcomes[result.video_id] = result
+
+        # 4. Un resultado por URL de entrada, en el orden recibido
+        results = []
+        for url in video_urls:
+            video_id = ids_by_url[url]
+            if video_id is None:
+                results.append(BatchItemResult(
+                    video_url=url,
+                    video_id=None,
+                    status=AnalyzeVideoBatchUseCase.STATUS_FAILED,
+                    error=url_errors[url]
+                ))
+            else:
+                outcome = outcomes[video_id]
+                results.append(BatchItemResult(
+                    video_url=url,
+                    video_id=video_id,
+                    status=outcome.status,
+                    record=outcome.record,
+                    error=outcome.error
+                ))
+        return results
+
+
+def _run_job(job_id: str) -> Awaitable[None]:
+    """Handler del pool: procesa un trabajo encolado."""
+    return RunAnalysisJobUseCase.execute(job_id)
+
+
+# Pool acotado de workers para el modo asíncrono (202 Accepted)
+_job_pool = JobWorkerPool(
+    handler=_run_job,
+    workers=settings.ANALYSIS_JOB_WORKERS,
+    max_queue_size=settings.ANALYSIS_JOB_QUEUE_SIZE
+)
+
+
+class SubmitAnalysisJobUseCase:
+    """
+    Caso de Uso: Encolar un análisis para ejecución en segundo plano.
+    Devuelve inmediatamente el trabajo creado para que el cliente consulte su estado.
+    """
+
+    @staticmethod
+    async def execute(
+        video_url: str,
+        force_refresh: bool = False,
+        latency_tier: Optional[str] = None
+    ) -> AnalysisJob:
+        """
+        Registra el trabajo y lo encola en el pool de workers.
+
+        Args:
+            video_url (str): URL validada del video.
+            force_refresh (bool): Ignora el análisis almacenado y re-ejecuta el grafo.
+            latency_tier (str): Nivel de latencia para el ruteo de modelos
+                (None = LLM_DEFAULT_LATENCY_TIER).
+
+        Returns:
+            AnalysisJob: Trabajo en estado 'queued'.
+
+        Raises:
+            InvalidVideoURLError: Si la URL no contiene un ID de video de YouTube.
+            JobQueueFullError: Si la cola de trabajos está llena.
+        """
+        video_id = extract_video_id(video_url)
+        if not _job_pool.has_capacity():
+            raise JobQueueFullError("La cola de trabajos está llena. Reintente más tarde.")
+
+        job = await AnalysisJob.objects.acreate(
+            video_id=video_id,
+            video_url=canonical_video_url(video_id),
+            force_refresh=force_refresh,
+            latency_tier=latency_tier or ""
+        )
+        try:
+            _job_pool.submit(str(job.pk))
+        except JobQueueFullError:
+            # La cola se llenó mientras se creaba el trabajo: sin borrarlo, la
+            # recuperación de trabajos pendientes lo ejecutaría igual
+            await job.adelete()
+            raise
+        return job
+
+
+class RunAnalysisJobUseCase:
+    """
+    Caso de Uso: Procesar un trabajo encolado.
+    Reutiliza AnalyzeVideoUseCase (cache y single-flight) y refleja el avance
+    del grafo en el estado del trabajo.
+    """
+
+    @staticmethod
+    async def execute(job_id: str) -> None:
+        """
+        Ejecuta el análisis del trabajo y persiste su estado final.
+
+        Args:
+            job_id (str): ID del trabajo a procesar.
+        """
+        job = await AnalysisJob.objects.aget(pk=job_id)
+        await RunAnalysisJobUseCase._set_state(job, AnalysisJob.State.EXTRACTING)
+
+        async def on_progress(node: str, update: Dict[str, Any]) -> None:
+            if node == "extract" and not update.get("errors"):
+                await RunAnalysisJobUseCase._set_state(job, AnalysisJob.State.ANALYZING)
+
+        try:
+            record = await AnalyzeVideoUseCase.execute(
+                job.video_url,
+                force_refresh=job.force_refresh,
+                on_progress=on_progress,
+                latency_tier=job.latency_tier or None
+            )
+        except Exception as e:
+            job.error = str(e)
+            await RunAnalysisJobUseCase._set_state(job, AnalysisJob.State.FAILED, "error")
+        else:
+            job.record = record
+            await RunAnalysisJobUseCase._set_state(job, AnalysisJob.State.DONE, "record")
+
+    @staticmethod
+    async def _set_state(job: AnalysisJob, state: str, *extra_fields: str) -> None:
+        """Actualiza el estado del trabajo (y los campos adicionales indicados)."""
+        job.state = state
+        await job.asave(update_fields=["state", "updated_at", *extra_fields])
+
+
+class RecoverAnalysisJobsUseCase:
+    """
+    Caso de Uso: Retomar los trabajos interrumpidos por un reinicio.
+
+    La cola del pool vive en memoria: los trabajos que estaban en cola o en
+    curso cuando el proceso terminó quedarían en ese estado para siempre. Al
+    arrancar el servidor se reencolan (re-analizar es idempotente: cache y
+    upsert por video_id) mientras la cola tenga lugar; el resto se marca como
+    fallido para que el cliente reintente.
+
+    Cada trabajo se reclama con un UPDATE condicionado a su estado y
+    ``updated_at`` leídos, de modo que dos procesos que arrancan a la vez no
+    lo retoman dos veces.
+    """
+
+    STALE_STATES = (
+        AnalysisJob.State.QUEUED,
+        AnalysisJob.State.EXTRACTING,
+        AnalysisJob.State.ANALYZING,
+    )
+
+    @staticmethod
+    async def execute(started_before: Optional[datetime] = None) -> Tuple[int, int]:
+        """
+        Reencola o da por fallidos los trabajos sin terminar.
+
+        Args:
+            started_before (datetime): Solo trabajos sin actividad desde antes de
+                este instante (default: ahora, es decir, el arranque del proceso).
+
+        Returns:
+            Tuple[int, int]: Trabajos reencolados y trabajos marcados como fallidos.
+        """
+        started_before = started_before or timezone.now()
+        stale = [
+            job async for job in AnalysisJob.objects.filter(
+                state__in=RecoverAnalysisJobsUseCase.STALE_STATES,
+                updated_at__lt=started_before
+            ).order_by("created_at").values_list("pk", "state", "updated_at")
+        ]
+
+        requeued = failed = 0
+        for pk, state, updated_at in stale:
+            claim = AnalysisJob.objects.filter(pk=pk, state=state, updated_at=updated_at)
+            if _job_pool.has_capacity():
+                if await claim.aupdate(state=AnalysisJob.State.QUEUED, updated_at=timezone.now()):
+                    _job_pool.submit(str(pk))
+                    requeued += 1
+            elif await claim.aupdate(
+                state=AnalysisJob.State.FAILED,
+                error="Interrumpido por un reinicio del servidor con la cola llena. Reintente.",
+                updated_at=timezone.now()
+            ):
+                failed += 1
+
+        if stale:
+            logger.info("Trabajos interrumpidos: %d reencolados, %d fallidos", requeued, failed)
+        return requeued, failed
+
+
+class GetAnalysisJobUseCase:
+    """
+    Caso de Uso: Consultar el estado de un trabajo asíncrono.
+    """
+
+    @staticmethod
+    async def execute(job_id: str) -> Optional[AnalysisJob]:
+        """
+        Obtiene el trabajo junto con su resultado (si ya finalizó).
+
+        Args:
+            job_id (str): ID del trabajo.
+
+        Returns:
+            AnalysisJob o None si no existe.
+        """
+        return await AnalysisJob.objects.select_related("record").filter(pk=job_id).afirst()
+
+
+class GetVideoTranscriptUseCase:
+    """
+    Caso de Uso: Obtener la transcripción completa de un video analizado.
+    """
+
+    @staticmethod
+    async def execute(video_id: str) -> Optional[VideoTranscript]:
+        """
+        Obtiene la transcripción junto con el análisis al que pertenece.
+
+        Args:
+            video_id (str): ID canónico del video.
+
+        Returns:
+            VideoTranscript o None si el video no fue analizado.
+        """
+        return await VideoTranscript.objects.select_related("record").filter(record_id=video_id).afirst()
+
+
+@dataclass
+class VideoRecordPage:
+    """
+    Página de análisis almacenados.
+
+    Attributes:
+        results: Filas con las columnas pedidas (más ``id`` y ``created_at``).
+        next_cursor: Cursor de la página siguiente (None si es la última).
+    """
+    results: List[Dict[str, Any]]
+    next_cursor: Optional[str]
+
+
+class ListVideoRecordsUseCase:
+    """
+    Caso de Uso: Explorar los análisis almacenados.
+
+    Filtra por sentimiento, tono, idioma y rango de fechas, ordena del más
+    reciente al más antiguo y pagina por keyset sobre (created_at, id), de
+    modo que cada página es un rango sobre un índice sin importar cuán
+    profunda sea. Solo se leen las columnas pedidas (``.values()``).
+    """
+
+    @staticmethod
+    async def execute(
+        fields: Sequence[str],
+        sentiment: Optional[str] = None,
+        tone: Optional[str] = None,
+        language_code: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> VideoRecordPage:
+        """
+        Obtiene una página de análisis.
+
+        Args:
+            fields (Sequence[str]): Columnas de VideoRecord a leer.
+            sentiment (str): Sentimiento exacto.
+            tone (str): Tono exacto.
+            language_code (str): Idioma del subtítulo analizado.
+            created_after (datetime): Solo análisis creados desde este instante (inclusive).
+            created_before (datetime): Solo análisis creados antes de este instante.
+            cursor (str): Cursor devuelto por la página anterior.
+            limit (int): Tamaño de la página.
+
+        Returns:
+            VideoRecordPage con las filas y el cursor siguiente.
+
+        Raises:
+            InvalidCursorError: Si el cursor no es válido.
+        """
+        queryset = VideoRecord.objects.order_by("-created_at", "-id")
+        filters = {
+            "sentiment": sentiment,
+            "tone": tone,
+            "language_code": language_code,
+            "created_at__gte": created_after,
+            "created_at__lt": created_before,
+        }
+        queryset = queryset.filter(**{key: value for key, value in filters.items() if value is not None})
+        if cursor:
+            queryset = after_cursor(queryset, cursor)
+
+        columns = list(dict.fromkeys([*fields, "id", "created_at"]))
+        rows = [row async for row in queryset.values(*columns)[:limit + 1]]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        return VideoRecordPage(results=rows, next_cursor=next_cursor)
+
+
+@dataclass
+class VideoSearchPage:
+    """
+    Página de resultados de la búsqueda de texto completo.
+
+    Attributes:
+        results: Filas con las columnas pedidas más ``rank`` y ``snippet``.
+        next_offset: Offset de la página siguiente (None si es la última).
+    """
+    results: List[Dict[str, Any]]
+    next_offset: Optional[int]
+
+
+class SearchVideoRecordsUseCase:
+    """
+    Caso de Uso: Buscar análisis que mencionan un tema.
+
+    La búsqueda (índice de texto completo sobre título, puntos clave y
+    transcripción) devuelve los videos ordenados por relevancia; luego se
+    leen solo las columnas pedidas de esos análisis, nunca la transcripción.
+    """
+
+    @staticmethod
+    async def execute(
+        query: str,
+        fields: Sequence[str],
+        language_code: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> VideoSearchPage:
+        """
+        Obtiene una página de resultados.
+
+        Args:
+            query (str): Texto a buscar.
+            fields (Sequence[str]): Columnas de VideoRecord a leer.
+            language_code (str): Restringe la búsqueda a análisis en ese idioma.
+            limit (int): Tamaño de la página.
+            offset (int): Resultados a omitir.
+
+        Returns:
+            VideoSearchPage con los resultados en orden de relevancia.
+        """
+        hits = await search_videos(query, language_code, limit + 1, offset)
+        next_offset = offset + limit if len(hits) > limit else None
+        hits = hits[:limit]
+
+        columns = list(dict.fromkeys([*fields, "video_id"]))
+        rows = {
+            row["video_id"]: row
+            async for row in VideoRecord.objects.filter(video_id__in=[hit.video_id for hit in hits]).values(*columns)
+        }
+        results = [
+            {**rows[hit.video_id], "rank": hit.rank, "snippet": hit.snippet}
+            for hit in hits if hit.video_id in rows
+        ]
+        return VideoSearchPage(results=results, next_offset=next_offset)
+
+
+# Dimensiones de agrupación de las analíticas: columna o expresión sobre SentimentRollup
+ANALYTICS_GROUPINGS = {
+    "day": "day",
+    "week": TruncWeek("day"),
+    "month": TruncMonth("day"),
+    "sentiment": "sentiment",
+    "tone": "tone",
+    "language": F("language_code"),
+}
+
+
+@dataclass
+class SentimentAnalytics:
+    """
+    Distribución de sentimiento agregada.
+
+    Attributes:
+        results: Una fila por grupo con sus dimensiones, ``count`` y
+                 ``average_sentiment_score``.
+        count: Análisis considerados en total.
+        average_sentiment_score: Puntaje promedio sobre todos ellos (None si no hay).
+    """
+    results: List[Dict[str, Any]]
+    count: int
+    average_sentiment_score: Optional[float]
+
+
+class SentimentAnalyticsUseCase:
+    """
+    Caso de Uso: Analíticas de sentimiento por período, tono e idioma.
+
+    Se calculan sobre SentimentRollup (un bucket por día, sentimiento, tono e
+    idioma, mantenido de forma incremental), nunca sobre VideoRecord: el costo
+    depende de la cantidad de buckets del rango, no de la de análisis.
+    """
+
+    @staticmethod
+    async def execute(
+        group_by: Sequence[str] = ("day",),
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        sentiment: Optional[str] = None,
+        tone: Optional[str] = None,
+        language_code: Optional[str] = None
+    ) -> SentimentAnalytics:
+        """
+        Agrega los buckets del rango por las dimensiones pedidas.
+
+        Args:
+            group_by (Sequence[str]): Claves de ANALYTICS_GROUPINGS (al menos una).
+            since (date): Primer día (inclusive).
+            until (date): Último día (inclusive).
+            sentiment (str): Sentimiento exacto.
+            tone (str): Tono exacto.
+            language_code (str): Idioma del subtítulo analizado.
+
+        Returns:
+            SentimentAnalytics ordenado por las dimensiones pedidas.
+        """
+        filters = {
+            "day__gte": since,
+            "day__lte": until,
+            "sentiment": sentiment,
+            "tone": tone,
+            "language_code": language_code,
+        }
+        queryset = SentimentRollup.objects.filter(**{key: value for key, value in filters.items() if value is not None})
+
+        columns = [name for name in group_by if isinstance(ANALYTICS_GROUPINGS[name], str)]
+        expressions = {
+            name: ANALYTICS_GROUPINGS[name] for name in group_by
+            if not isinstance(ANALYTICS_GROUPINGS[name], str)
+        }
+        rows = (
+            queryset.values(*columns, **expressions)
+            .annotate(analyses=Sum("count"), score_total=Sum("score_sum"))
+            .filter(analyses__gt=0)
+            .order_by(*group_by)
+        )
+
+        results = []
+        count, score_total = 0, 0.0
+        async for row in rows:
+            analyses, score = row.pop("analyses"), row.pop("score_total")
+            count += analyses
+            score_total += score
+            results.append({
+                **{name: row[name] for name in group_by},
+                "count": analyses,
+                "average_sentiment_score": score / analyses,
+            })
+        return SentimentAnalytics(
+            results=results,
+            count=count,
+            average_sentiment_score=score_total / count if count else None
+        )
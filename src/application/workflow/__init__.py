@@ -10,8 +10,9 @@ El grafo principal implementa:
     - Manejo de errores mediante aristas condicionales
 
 Exports:
-    app: Grafo compilado listo para invocar.
+    get_graph: Grafo compilado listo para invocar (se construye en el primer uso).
+    warm_up: Crea los adaptadores y compila el grafo de antemano.
 """
-from .graph import app
+from .graph import get_graph, warm_up
 
-__all__ = ["app"]
+__all__ = ["get_graph", "warm_up"]
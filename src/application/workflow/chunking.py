@@ -0,0 +1,84 @@
+"""
+División de transcripciones largas en fragmentos acotados por tokens.
+
+Usado por la rama map-reduce del grafo: cada fragmento se analiza en paralelo
+y los resultados parciales se combinan en un único VideoAnalysis. Los
+fragmentos se solapan para no perder contexto en los cortes.
+"""
+import math
+from typing import List
+
+# Aproximación conservadora de caracteres por token para texto en español/inglés
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+
+def estimate_tokens(text: str, chars_per_token: float = DEFAULT_CHARS_PER_TOKEN) -> int:
+    """
+    Estima la cantidad de tokens de un texto sin invocar un tokenizer.
+
+    Args:
+        text: Texto a medir.
+        chars_per_token: Relación promedio de caracteres por token.
+
+    Returns:
+        Cantidad estimada de tokens (redondeo hacia arriba).
+    """
+    return math.ceil(len(text) / chars_per_token)
+
+
+def split_into_chunks(
+    text: str,
+    max_tokens: int,
+    overlap_tokens: int = 0,
+    chars_per_token: float = DEFAULT_CHARS_PER_TOKEN
+) -> List[str]:
+    """
+    Divide el texto en fragmentos de a lo sumo ``max_tokens`` tokens estimados.
+
+    Los cortes se hacen entre palabras. Cada fragmento (salvo el primero)
+    repite aproximadamente ``overlap_tokens`` del final del anterior.
+
+    Args:
+        text: Transcripción completa.
+        max_tokens: Presupuesto de tokens por fragmento.
+        overlap_tokens: Tokens compartidos entre fragmentos consecutivos.
+        chars_per_token: Relación promedio de caracteres por token.
+
+    Returns:
+        Lista de fragmentos (un único elemento si el texto ya entra completo).
+
+    Raises:
+        ValueError: Si el solapamiento no es menor que el tamaño del fragmento.
+    """
+    if overlap_tokens >= max_tokens:
+        raise ValueError("overlap_tokens debe ser menor que max_tokens")
+
+    words = text.split()
+    if not words:
+        return []
+
+    max_chars = int(max_tokens * chars_per_token)
+    overlap_chars = int(overlap_tokens * chars_per_token)
+
+    chunks = []
+    start = 0
+    while start < len(words):
+        # Avanzar mientras el fragmento (con espacios) entre en el presupuesto
+        end = start
+        size = 0
+        while end < len(words) and (end == start or size + 1 + len(words[end]) <= max_chars):
+            size += len(words[end]) + (1 if end > start else 0)
+            end += 1
+        chunks.append(" ".join(words[start:end]))
+        if end >= len(words):
+            break
+
+        # Retroceder desde el corte para construir el solapamiento
+        next_start = end
+        overlap = 0
+        while next_start - 1 > start and overlap + len(words[next_start - 1]) + 1 <= overlap_chars:
+            next_start -= 1
+            overlap += len(words[next_start]) + 1
+        start = next_start
+
+    return chunks
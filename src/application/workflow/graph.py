@@ -5,62 +5,388 @@ Implementa aristas condicionales y reintentos para resiliencia.
 El proveedor de LLM (Gemini, Groq, etc.) se configura via variables de entorno:
     - LLM_PROVIDER: "gemini" o "groq"
     - GEMINI_MODEL / GROQ_MODEL: modelo específico a usar
+
+Las transcripciones largas siguen una rama map-reduce: se dividen en fragmentos
+que se analizan en paralelo (``analyze_chunk``) y luego se combinan (``reduce``):
+    - ANALYSIS_CHUNK_TOKENS: tamaño máximo de fragmento (y umbral de la rama)
+    - ANALYSIS_CHUNK_OVERLAP_TOKENS: solapamiento entre fragmentos consecutivos
+    - ANALYSIS_MAP_CONCURRENCY: fragmentos analizados en simultáneo
+
+Con LLM_CONTEXT_POLICY=chunk (default), una transcripción que no entra en la
+ventana de contexto del modelo también se deriva a la rama map-reduce, con
+fragmentos acotados por el presupuesto del modelo.
+
+La extracción calcula además la firma MinHash de la transcripción. Si quien
+invoca el grafo provee ``find_near_duplicate`` en ``config["configurable"]``
+y éste encuentra un análisis de una transcripción casi idéntica, el grafo
+termina reutilizándolo sin llamar al LLM.
+
+Con LLM_ROUTING_ENABLED, la extracción elige además el modelo del análisis
+según el tamaño de la transcripción y el ``latency_tier`` de
+``config["configurable"]`` (ver ``infrastructure.adapters.llm.router``); el
+proveedor y el modelo elegidos quedan en el estado. Sin ruteo la extracción no
+toca el LLM: el modelo configurado lo informa el nodo que lo usa.
+
+Los adaptadores y el grafo compilado se crean en el primer uso (``get_graph``)
+o al llamar a ``warm_up``: importar este módulo no importa los SDKs de los
+proveedores, LangGraph ni exige API keys (p. ej. en ``manage.py migrate``).
+``reset`` los descarta para que el próximo uso relea la configuración.
 """
+import json
+import logging
+import os
 import operator
-from typing import Dict, Any, TypedDict, List, Annotated
-from langgraph.graph import StateGraph, END
+import threading
+from typing import Dict, Any, TypedDict, List, Annotated, Optional, Tuple, Union
+from langchain_core.runnables import RunnableConfig
+from domain.fingerprint import minhash_signature, signature_to_bytes
 from domain.models import VideoAnalysis
+from application.workflow.chunking import DEFAULT_CHARS_PER_TOKEN, estimate_tokens, split_into_chunks
 from infrastructure.adapters.youtube_adapter import YouTubeAdapter
-from infrastructure.adapters.exceptions import InfrastructureError
-from infrastructure.adapters.llm import get_llm_adapter
+from infrastructure.adapters.transcript_cache import get_transcript_cache
+from infrastructure.adapters.exceptions import CircuitOpenError, InfrastructureError
+from infrastructure.adapters.llm import (
+    LLMInterface, ModelRoute, ModelRouter, StructuredLLM, get_llm_adapter, get_structured_llm, routing_enabled
+)
+from infrastructure.adapters.llm.rate_limiter import ESTIMATED_COMPLETION_TOKENS
+from infrastructure.adapters.llm.tokens import POLICY_CHUNK
+
+logger = logging.getLogger(__name__)
 
 class GraphState(TypedDict):
     video_url: str
     transcript: str
     metadata: Dict[str, Any]
     analysis: Dict[str, Any]
+    # Firma MinHash serializada de la transcripción (None si no tiene palabras)
+    fingerprint: Optional[bytes]
+    # video_id cuyo análisis se reutilizó por ser un casi-duplicado
+    duplicate_of: str
+    # Modelo elegido por el router para el análisis
+    llm_provider: str
+    llm_model: str
+    # Resultados parciales de la rama map-reduce (uno por fragmento)
+    partial_analyses: Annotated[List[Dict[str, Any]], operator.add]
+    # Tokens de entrada enviados al LLM, sumados entre todas las llamadas
+    prompt_tokens: Annotated[int, operator.add]
     # Annotated con operator.add permite acumular errores de múltiples nodos
     errors: Annotated[List[str], operator.add]
 
-# --- Inicialización de Componentes ---
-yt_adapter = YouTubeAdapter()
+class ChunkState(TypedDict):
+    """Estado enviado (vía Send) a cada instancia de analyze_chunk."""
+    chunk: str
+    chunk_index: int
+    chunk_count: int
+    llm_provider: str
+    llm_model: str
+
+# --- Parámetros de la rama map-reduce ---
+CHUNK_TOKENS = int(os.getenv("ANALYSIS_CHUNK_TOKENS", "8000"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("ANALYSIS_CHUNK_OVERLAP_TOKENS", "200"))
+MAP_CONCURRENCY = int(os.getenv("ANALYSIS_MAP_CONCURRENCY", "4"))
+# Margen reservado para las instrucciones que acompañan a cada fragmento
+PROMPT_OVERHEAD_TOKENS = 256
+
+ANALYSIS_PROMPT = "Analiza esta transcripción y extrae sentimiento, tono y 3 puntos clave:\n\n"
+
+# --- Inicialización de Componentes (a demanda) ---
+# Se crean en el primer uso; asignar estos atributos (p. ej. con patch) los reemplaza.
+# Cache de transcripciones según TRANSCRIPT_CACHE_BACKEND (filesystem, database o none)
+yt_adapter: Optional[YouTubeAdapter] = None
+# Adaptador LLM según configuración (.env). Soporta: gemini, groq, hedged
+llm_adapter: Optional[LLMInterface] = None
+# Salida estructurada según el schema VideoAnalysis, con cache de respuestas
+# ante prompts idénticos (LLM_RESPONSE_CACHE_*)
+structured_llm: Optional[StructuredLLM] = None
+# Modelo por solicitud según tamaño y nivel de latencia (LLM_ROUTING_*)
+model_router: Optional[ModelRouter] = None
+
+_init_lock = threading.Lock()
 
-# Obtener el adaptador LLM según configuración (.env)
-# Soporta: gemini, groq (extensible a otros proveedores)
-llm_adapter = get_llm_adapter()
+def get_yt_adapter() -> YouTubeAdapter:
+    """Adaptador de YouTube del grafo (se crea en el primer uso)."""
+    global yt_adapter
+    with _init_lock:
+        if yt_adapter is None:
+            yt_adapter = YouTubeAdapter(cache=get_transcript_cache())
+        return yt_adapter
 
-# Configurar la salida estructurada según el schema VideoAnalysis
-structured_llm = llm_adapter.with_structured_output(VideoAnalysis)
+def _init_default_llm() -> LLMInterface:
+    """Crea el adaptador configurado y su StructuredLLM (se llama con ``_init_lock`` tomado)."""
+    global llm_adapter, structured_llm
+    if llm_adapter is None:
+        llm_adapter = get_llm_adapter()
+        if structured_llm is None:
+            structured_llm = get_structured_llm(VideoAnalysis, llm_adapter)
+    return llm_adapter
 
-async def extraction_node(state: GraphState):
-    """Nodo 1: Extracción con captura de errores clasificados."""
+def get_default_llm() -> Tuple[Optional[LLMInterface], StructuredLLM]:
+    """
+    Adaptador y StructuredLLM del modelo configurado (importa el SDK del proveedor en el primer uso).
+
+    Si el StructuredLLM ya está fijado no se crea el adaptador: puede volver
+    None, y entonces los tokens se cuentan con la estimación genérica.
+    """
+    with _init_lock:
+        if structured_llm is not None:
+            return llm_adapter, structured_llm
+        if llm_adapter is None:
+            return _init_default_llm(), structured_llm
+        # Adaptador reemplazado desde afuera: su StructuredLLM no se conserva
+        return llm_adapter, get_structured_llm(VideoAnalysis, llm_adapter)
+
+def get_model_router() -> ModelRouter:
+    """Router de modelos del grafo (se crea en el primer uso)."""
+    global model_router
+    with _init_lock:
+        if model_router is None:
+            # El router comparte el adaptador por defecto del grafo
+            adapter = _init_default_llm()
+            model_router = ModelRouter.from_env(adapter, adapter.provider)
+        return model_router
+
+def routed_llm(state: Dict[str, Any]) -> Tuple[Optional[LLMInterface], StructuredLLM]:
+    """Adaptador y StructuredLLM del modelo elegido para el estado (el configurado si no hay ruta)."""
+    provider, model = state.get("llm_provider"), state.get("llm_model")
+    if not routing_enabled() or not model:
+        return get_default_llm()
+    router = get_model_router()
+    if router.is_default(provider, model):
+        return get_default_llm()
+    route = ModelRoute(provider, model)
+    return router.adapter(route), router.structured_llm(route, VideoAnalysis)
+
+def count_prompt_tokens(prompt: str, adapter: Optional[LLMInterface] = None) -> int:
+    """Tokens del prompt según el contador del modelo (o la estimación genérica)."""
+    adapter = adapter or get_default_llm()[0]
+    budget = adapter.context_budget if adapter is not None else None
+    return budget.measure(prompt) if budget is not None else estimate_tokens(prompt)
+
+async def extraction_node(state: GraphState, config: Optional[RunnableConfig] = None):
+    """
+    Nodo 1: Extracción con captura de errores clasificados.
+
+    Calcula la firma MinHash de la transcripción y, si hay un buscador de
+    casi-duplicados configurado, adjunta el análisis reutilizable. Si no y el
+    ruteo está habilitado, elige el modelo que hará el análisis.
+    """
     try:
-        data = await yt_adapter.fetch_full_data(state["video_url"])
-        return {**data, "errors": []}
+        data = await get_yt_adapter().fetch_full_data(state["video_url"])
     except InfrastructureError as e:
         return {"errors": [str(e)]}
 
+    signature = minhash_signature(data["transcript"])
+    update = {
+        **data,
+        "fingerprint": signature_to_bytes(signature) if signature is not None else None,
+        "errors": []
+    }
+    configurable = (config or {}).get("configurable") or {}
+    find_near_duplicate = configurable.get("find_near_duplicate")
+    if find_near_duplicate is not None and signature is not None:
+        try:
+            duplicate = await find_near_duplicate(signature)
+        except Exception as e:
+            # La búsqueda es una optimización: ante un fallo se analiza normalmente
+            logger.warning(f"Error buscando casi-duplicados: {e}")
+            duplicate = None
+        if duplicate is not None:
+            update["duplicate_of"] = duplicate["video_id"]
+            update["analysis"] = duplicate["analysis"]
+            return update
+
+    if routing_enabled():
+        route = get_model_router().select(
+            estimate_tokens(f"{ANALYSIS_PROMPT}{data['transcript']}"),
+            configurable.get("latency_tier")
+        )
+        update["llm_provider"], update["llm_model"] = route.provider, route.model
+    elif llm_adapter is not None:
+        # Sin ruteo se informa el modelo configurado, sin crear su adaptador
+        update["llm_provider"], update["llm_model"] = llm_adapter.provider, llm_adapter.model
+    return update
+
+def _model_fields(state: Dict[str, Any], adapter: Optional[LLMInterface]) -> Dict[str, str]:
+    """Proveedor y modelo usados, si la extracción no los fijó (ruteo deshabilitado)."""
+    if state.get("llm_model") or adapter is None:
+        return {}
+    return {"llm_provider": adapter.provider, "llm_model": adapter.model}
+
+def _analysis_error(context: str, error: Exception) -> str:
+    """Mensaje para el canal errors: un circuito abierto se informa tal cual, ya clasificado."""
+    if isinstance(error, CircuitOpenError):
+        return str(error)
+    return f"{context}: {str(error)}"
+
 async def analysis_node(state: GraphState):
     """Nodo 2: Análisis de IA con validación de esquema."""
     if state.get("errors"): return state
     try:
-        prompt = f"Analiza esta transcripción y extrae sentimiento, tono y 3 puntos clave:\n\n{state['transcript']}"
-        result = await structured_llm.ainvoke(prompt)
-        return {"analysis": result.dict()}
+        adapter, llm = routed_llm(state)
+        prompt = f"{ANALYSIS_PROMPT}{state['transcript']}"
+        prompt_tokens = count_prompt_tokens(prompt, adapter)
+        result = await llm.ainvoke(prompt)
+        return {"analysis": result.dict(), "prompt_tokens": prompt_tokens, **_model_fields(state, adapter)}
     except Exception as e:
-        return {"errors": [f"Error en análisis de IA: {str(e)}"]}
+        return {"errors": [_analysis_error("Error en análisis de IA", e)]}
+
+async def chunk_analysis_node(state: ChunkState):
+    """Nodo 2b (map): Análisis de un fragmento de una transcripción larga."""
+    try:
+        adapter, llm = routed_llm(state)
+        prompt = (
+            f"Analiza el fragmento {state['chunk_index'] + 1} de {state['chunk_count']} "
+            f"de una transcripción y extrae sentimiento, tono y 3 puntos clave:\n\n{state['chunk']}"
+        )
+        prompt_tokens = count_prompt_tokens(prompt, adapter)
+        result = await llm.ainvoke(prompt)
+        partial = {**result.dict(), "chunk_index": state["chunk_index"], "weight": len(state["chunk"])}
+        return {"partial_analyses": [partial], "prompt_tokens": prompt_tokens}
+    except Exception as e:
+        return {"errors": [_analysis_error(f"Error en análisis de IA (fragmento {state['chunk_index'] + 1})", e)]}
+
+async def reduce_node(state: GraphState):
+    """Nodo 3 (reduce): Combina los análisis parciales en un único VideoAnalysis."""
+    if state.get("errors"): return {}
+    partials = sorted(state.get("partial_analyses", []), key=lambda p: p["chunk_index"])
+    summaries = [
+        {
+            "fragmento": p["chunk_index"] + 1,
+            "peso": p["weight"],
+            "sentiment": p["sentiment"],
+            "sentiment_score": p["sentiment_score"],
+            "tone": p["tone"],
+            "key_points": p["key_points"],
+        }
+        for p in partials
+    ]
+    try:
+        adapter, llm = routed_llm(state)
+        prompt = (
+            "Estos son los análisis parciales de fragmentos consecutivos de una misma transcripción "
+            "(el peso indica la longitud del fragmento). Combínalos en un único análisis del video "
+            "completo con sentimiento predominante, puntaje, tono y los 3 puntos clave más relevantes:\n\n"
+            f"{json.dumps(summaries, ensure_ascii=False, indent=2)}"
+        )
+        prompt_tokens = count_prompt_tokens(prompt, adapter)
+        result = await llm.ainvoke(prompt)
+        return {"analysis": result.dict(), "prompt_tokens": prompt_tokens, **_model_fields(state, adapter)}
+    except Exception as e:
+        return {"errors": [_analysis_error("Error en análisis de IA (reduce)", e)]}
 
 def should_continue(state: GraphState) -> str:
     """Router para manejo de errores en el flujo."""
     return "end" if state.get("errors") else "continue"
 
+def _tpm_chunk_tokens(adapter: Optional[LLMInterface]) -> Optional[int]:
+    """
+    Tokens de un fragmento cuya solicitud entra en el TPM del modelo (None sin límite).
+
+    Con un fragmento mayor, cada llamada consume más de un minuto de cupo (o
+    el proveedor la rechaza con 429) y el map se serializa.
+    """
+    limiter = adapter.rate_limiter if adapter is not None else None
+    tpm = limiter.limits.tokens_per_minute if limiter is not None else None
+    if not tpm:
+        return None
+    return max(tpm - PROMPT_OVERHEAD_TOKENS - ESTIMATED_COMPLETION_TOKENS, 1)
+
+def route_analysis(state: GraphState) -> Union[str, list]:
+    """
+    Router posterior a la extracción.
+
+    Termina ante errores o si se reutilizó el análisis de un casi-duplicado, usa el análisis de una sola llamada si la
+    transcripción entra en un fragmento (y en el contexto del modelo) y, si
+    no, reparte los fragmentos entre instancias paralelas de ``analyze_chunk``
+    (devuelve una lista de ``Send``). El tamaño de fragmento es
+    ``CHUNK_TOKENS``, limitado al TPM del modelo si es menor.
+
+    Si no hay fragmentos que repartir (transcripción sin palabras) o el modelo
+    no admite ni las instrucciones de un fragmento, también va al análisis
+    directo: como con la política reject, el LLM rechaza localmente el prompt
+    que no entra (LLMContextLengthError) y el error queda en el estado.
+    """
+    # LangGraph ya está importado: el router solo corre dentro del grafo compilado
+    from langgraph.graph import END
+    from langgraph.types import Send
+
+    if should_continue(state) == "end" or state.get("duplicate_of"):
+        return END
+    transcript = state.get("transcript", "")
+    adapter = routed_llm(state)[0]
+    budget = adapter.context_budget if adapter is not None else None
+    chunk_by_budget = budget is not None and budget.policy == POLICY_CHUNK
+    fits_model = not chunk_by_budget or budget.fits(f"{ANALYSIS_PROMPT}{transcript}")
+    chunk_tokens = min(CHUNK_TOKENS, _tpm_chunk_tokens(adapter) or CHUNK_TOKENS)
+    if estimate_tokens(transcript) <= chunk_tokens and fits_model:
+        return "analyze"
+
+    max_tokens, chars_per_token = chunk_tokens, DEFAULT_CHARS_PER_TOKEN
+    if chunk_by_budget and budget.max_prompt_tokens - PROMPT_OVERHEAD_TOKENS < chunk_tokens:
+        # El modelo admite menos que un fragmento estándar: se mide con su propio contador
+        max_tokens = budget.max_prompt_tokens - PROMPT_OVERHEAD_TOKENS
+        chars_per_token = budget.counter.chars_per_token
+        if max_tokens <= 0:
+            return "analyze"
+    overlap_tokens = min(CHUNK_OVERLAP_TOKENS, max_tokens // 4)
+    chunks = split_into_chunks(transcript, max_tokens, overlap_tokens, chars_per_token)
+    if not chunks:
+        # Un Send vacío dejaría el grafo sin análisis
+        return "analyze"
+    return [
+        Send("analyze_chunk", {
+            "chunk": chunk,
+            "chunk_index": i,
+            "chunk_count": len(chunks),
+            "llm_provider": state.get("llm_provider", ""),
+            "llm_model": state.get("llm_model", ""),
+        })
+        for i, chunk in enumerate(chunks)
+    ]
+
 # --- Configuración del Grafo ---
-workflow = StateGraph(GraphState)
-workflow.add_node("extract", extraction_node)
-workflow.add_node("analyze", analysis_node)
+def build_graph():
+    """Construye y compila el grafo de análisis."""
+    from langgraph.graph import StateGraph, END
+
+    workflow = StateGraph(GraphState)
+    workflow.add_node("extract", extraction_node)
+    workflow.add_node("analyze", analysis_node)
+    workflow.add_node("analyze_chunk", chunk_analysis_node)
+    workflow.add_node("reduce", reduce_node)
+
+    workflow.set_entry_point("extract")
+    workflow.add_conditional_edges("extract", route_analysis, ["analyze", "analyze_chunk", END])
+    workflow.add_edge("analyze", END)
+    workflow.add_edge("analyze_chunk", "reduce")
+    workflow.add_edge("reduce", END)
+
+    # max_concurrency acota cuántos fragmentos se analizan en simultáneo por ejecución
+    return workflow.compile().with_config(max_concurrency=MAP_CONCURRENCY)
+
+_graph = None
+
+def get_graph():
+    """Grafo compilado (se construye en el primer uso)."""
+    global _graph
+    with _init_lock:
+        if _graph is None:
+            _graph = build_graph()
+        return _graph
+
+def warm_up() -> None:
+    """
+    Crea de antemano los adaptadores y compila el grafo.
 
-workflow.set_entry_point("extract")
-workflow.add_conditional_edges("extract", should_continue, {"continue": "analyze", "end": END})
-workflow.add_edge("analyze", END)
+    Pensado para el arranque del servidor (ANALYSIS_WARM_UP): la primera
+    solicitud no paga las importaciones de los SDKs ni la compilación.
+    """
+    get_yt_adapter()
+    get_model_router()
+    get_graph()
 
-app = workflow.compile()
\ No newline at end of file
+def reset() -> None:
+    """Descarta los adaptadores, el router y el grafo creados (p. ej. entre tests)."""
+    global yt_adapter, llm_adapter, structured_llm, model_router, _graph
+    with _init_lock:
+        yt_adapter = llm_adapter = structured_llm = model_router = _graph = None
@@ -1,10 +1,27 @@
 """
 ASGI config for agente-ia-youtube project.
 Exposes the ASGI callable as a module-level variable named ``application``.
+
+Es el punto de entrada del servidor (uvicorn): el pool de trabajos asíncronos
+y el streaming SSE necesitan un event loop que viva tanto como el proceso.
 """
 import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Los adaptadores y el grafo se crean a demanda; en el servidor se adelantan al arranque
+from django.conf import settings  # noqa: E402
+
+if settings.ANALYSIS_WARM_UP:
+    from application.workflow import warm_up  # noqa: E402
+
+    warm_up()
+
+from application.use_cases.use_cases import RecoverAnalysisJobsUseCase  # noqa: E402
+from config.lifespan import LifespanApplication  # noqa: E402
+
+# Al arrancar se retoman los trabajos que un reinicio dejó en cola o en curso
+application = LifespanApplication(django_application, on_startup=[RecoverAnalysisJobsUseCase.execute])
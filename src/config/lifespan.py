@@ -0,0 +1,44 @@
+"""
+Protocolo lifespan de ASGI para la aplicación Django.
+
+Django no atiende los eventos ``lifespan.startup``/``lifespan.shutdown``;
+este wrapper los responde y ejecuta tareas de arranque sobre el event loop
+del servidor (el mismo en el que después corren las vistas y el pool de
+trabajos), antes de aceptar solicitudes.
+"""
+import logging
+from typing import Awaitable, Callable, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class LifespanApplication:
+    """
+    Aplicación ASGI que delega todo salvo ``lifespan`` en la aplicación Django.
+
+    Attributes:
+        app: Aplicación ASGI envuelta.
+        on_startup: Corrutinas a ejecutar al arrancar, en orden.
+    """
+
+    def __init__(self, app, on_startup: Sequence[Callable[[], Awaitable[object]]] = ()):
+        self.app = app
+        self.on_startup = list(on_startup)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "lifespan":
+            return await self.app(scope, receive, send)
+
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                for hook in self.on_startup:
+                    try:
+                        await hook()
+                    except Exception:
+                        # Una tarea de arranque fallida no impide servir solicitudes
+                        logger.exception("Error en la tarea de arranque %s", getattr(hook, "__qualname__", hook))
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
@@ -121,3 +121,40 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.JSONParser',
     ],
 }
+
+# Cache de análisis: segundos durante los cuales un VideoRecord existente se
+# considera vigente y se devuelve sin re-ejecutar el grafo (0 = nunca vence).
+ANALYSIS_CACHE_TTL_SECONDS = int(os.getenv('ANALYSIS_CACHE_TTL_SECONDS', '604800'))
+
+# Single-flight entre procesos: serializa con advisory locks de PostgreSQL los
+# análisis concurrentes del mismo video en despliegues con varios workers.
+ANALYSIS_SINGLE_FLIGHT_DB_LOCK = os.getenv('ANALYSIS_SINGLE_FLIGHT_DB_LOCK', 'False').lower() in ('true', '1', 'yes')
+
+# Modo asíncrono (202 Accepted): workers concurrentes (slots de análisis) y
+# capacidad de la cola de trabajos pendientes antes de responder 503.
+ANALYSIS_JOB_WORKERS = int(os.getenv('ANALYSIS_JOB_WORKERS', '4'))
+ANALYSIS_JOB_QUEUE_SIZE = int(os.getenv('ANALYSIS_JOB_QUEUE_SIZE', '1000'))
+
+# Análisis por lotes: máximo de URLs por solicitud y análisis simultáneos por lote.
+ANALYSIS_BATCH_MAX_SIZE = int(os.getenv('ANALYSIS_BATCH_MAX_SIZE', '500'))
+ANALYSIS_BATCH_CONCURRENCY = int(os.getenv('ANALYSIS_BATCH_CONCURRENCY', '4'))
+
+# Listado de análisis (GET /api/v1/videos/): tamaño de página por defecto y máximo.
+ANALYSIS_LIST_PAGE_SIZE = int(os.getenv('ANALYSIS_LIST_PAGE_SIZE', '50'))
+ANALYSIS_LIST_MAX_PAGE_SIZE = int(os.getenv('ANALYSIS_LIST_MAX_PAGE_SIZE', '200'))
+
+# Búsqueda de texto completo: resultados omitidos como máximo (limita la
+# profundidad de la paginación por offset, que rankea todas las coincidencias).
+ANALYSIS_SEARCH_MAX_OFFSET = int(os.getenv('ANALYSIS_SEARCH_MAX_OFFSET', '1000'))
+
+# Streaming SSE: segundos sin eventos tras los cuales se envía un comentario
+# keep-alive para que proxies y balanceadores no corten la conexión.
+ANALYSIS_STREAM_HEARTBEAT_SECONDS = float(os.getenv('ANALYSIS_STREAM_HEARTBEAT_SECONDS', '15'))
+
+# Casi-duplicados: similitud de Jaccard estimada (MinHash) a partir de la cual se
+# reutiliza el análisis de otra transcripción en lugar de llamar al LLM (0 = deshabilitado).
+ANALYSIS_NEAR_DUPLICATE_THRESHOLD = float(os.getenv('ANALYSIS_NEAR_DUPLICATE_THRESHOLD', '0.9'))
+
+# Arranque del servidor (ASGI/WSGI): crea los adaptadores y compila el grafo antes de
+# la primera solicitud. Los comandos de manage.py nunca lo hacen.
+ANALYSIS_WARM_UP = os.getenv('ANALYSIS_WARM_UP', 'True').lower() in ('true', '1', 'yes')
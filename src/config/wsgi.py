@@ -8,3 +8,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Los adaptadores y el grafo se crean a demanda; en el servidor se adelantan al arranque
+from django.conf import settings  # noqa: E402
+
+if settings.ANALYSIS_WARM_UP:
+    from application.workflow import warm_up  # noqa: E402
+
+    warm_up()
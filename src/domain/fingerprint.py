@@ -0,0 +1,119 @@
+"""
+Módulo de Dominio: Huella MinHash de transcripciones para detectar casi-duplicados.
+
+Re-subidas, espejos y recortes de un mismo contenido llegan con IDs de video
+distintos pero comparten la mayor parte de su texto. La firma MinHash de los
+shingles de palabras de una transcripción estima la similitud de Jaccard entre
+dos transcripciones comparando sus firmas posición a posición; el banding LSH
+reduce la búsqueda de candidatos a igualdades exactas de buckets indexables.
+
+El cálculo está vectorizado con NumPy: una transcripción de varias horas
+(decenas de miles de palabras) se procesa en milisegundos.
+
+Example:
+    >>> signature = minhash_signature(transcript)
+    >>> estimate_similarity(signature, other_signature)
+    0.93
+"""
+import hashlib
+import string
+import zlib
+from typing import List, Optional
+
+import numpy as np
+
+# Parámetros de la firma. Cambiarlos invalida las firmas persistidas.
+NUM_PERMUTATIONS = 128
+SHINGLE_SIZE = 5
+LSH_BANDS = 32
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+
+# Hashing multiply-shift: h(x) = ((a * x + b) mod 2**64) >> 32, sin divisiones
+_SHIFT = np.uint64(32)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_SHINGLE_MULTIPLIER = np.uint64(1000003)
+# Shingles procesados por bloque: acota la matriz intermedia (permutaciones x bloque)
+_BLOCK_SIZE = 8192
+
+# Coeficientes fijos (semilla constante) para que las firmas sean comparables entre procesos
+_rng = np.random.RandomState(20240601)
+_A = (_rng.randint(0, 2 ** 63, size=NUM_PERMUTATIONS, dtype=np.uint64) * np.uint64(2) + np.uint64(1))[:, None]
+_B = _rng.randint(0, 2 ** 63, size=NUM_PERMUTATIONS, dtype=np.uint64)[:, None]
+
+# La puntuación se reemplaza por espacios: "hola," y "hola" son la misma palabra
+_PUNCTUATION = str.maketrans(string.punctuation + "¡¿«»“”‘’…", " " * (len(string.punctuation) + 9))
+
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    """Hashes de 32 bits, sin repetir, de los shingles de palabras del texto."""
+    words = text.lower().translate(_PUNCTUATION).split()
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+
+    # crc32 (estable entre procesos, a diferencia de hash()) implementado en C
+    word_hashes = np.fromiter(map(zlib.crc32, map(str.encode, words)), dtype=np.uint64, count=len(words))
+
+    size = min(SHINGLE_SIZE, len(word_hashes))
+    count = len(word_hashes) - size + 1
+    shingles = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        shingles = shingles * _SHINGLE_MULTIPLIER ^ word_hashes[offset:offset + count]
+    return np.unique(shingles & _MAX_HASH)
+
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """
+    Calcula la firma MinHash de un texto.
+
+    Args:
+        text: Transcripción (u otro texto) a firmar.
+
+    Returns:
+        Arreglo uint32 de ``NUM_PERMUTATIONS`` valores, o None si el texto no
+        tiene palabras.
+    """
+    shingles = _shingle_hashes(text)
+    if shingles.size == 0:
+        return None
+
+    signature = np.full(NUM_PERMUTATIONS, _MAX_HASH, dtype=np.uint64)
+    buffer = np.empty((NUM_PERMUTATIONS, min(shingles.size, _BLOCK_SIZE)), dtype=np.uint64)
+    for start in range(0, shingles.size, _BLOCK_SIZE):
+        block = shingles[None, start:start + _BLOCK_SIZE]
+        hashed = buffer[:, :block.shape[1]]
+        # Operaciones in-place sobre un único buffer: sin matrices temporales por paso
+        np.multiply(_A, block, out=hashed)
+        hashed += _B
+        hashed >>= _SHIFT
+        np.minimum(signature, hashed.min(axis=1), out=signature)
+    return signature.astype(np.uint32)
+
+
+def estimate_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Similitud de Jaccard estimada: fracción de posiciones iguales entre dos firmas."""
+    return float(np.count_nonzero(a == b)) / NUM_PERMUTATIONS
+
+
+def lsh_buckets(signature: np.ndarray) -> List[int]:
+    """
+    Buckets LSH de una firma: un entero de 64 bits con signo por banda.
+
+    Dos firmas que coinciden en todas las filas de alguna banda comparten ese
+    bucket; con 32 bandas de 4 filas, pares con similitud >= 0.6 resultan
+    candidatos con probabilidad > 0.98.
+    """
+    bands = signature.astype("<u4").reshape(LSH_BANDS, LSH_ROWS)
+    return [
+        int.from_bytes(hashlib.blake2b(band.tobytes(), digest_size=8).digest(), "big", signed=True)
+        for band in bands
+    ]
+
+
+def signature_to_bytes(signature: np.ndarray) -> bytes:
+    """Serializa una firma para su persistencia (little-endian, 4 bytes por valor)."""
+    return signature.astype("<u4").tobytes()
+
+
+def signature_from_bytes(raw: bytes) -> np.ndarray:
+    """Reconstruye una firma serializada con ``signature_to_bytes``."""
+    return np.frombuffer(bytes(raw), dtype="<u4").astype(np.uint32)
@@ -0,0 +1,107 @@
+"""
+Módulo de Dominio: Identificación canónica de videos de YouTube.
+
+Un mismo video puede llegar bajo muchas variantes de URL (youtu.be, /shorts/,
+/embed/, m.youtube.com, parámetros extra como ``t`` o ``list``). Este módulo
+las reduce al ID de 11 caracteres, que es la clave de búsqueda y deduplicación
+compartida por la API, los casos de uso y el adaptador de YouTube.
+"""
+import re
+from urllib.parse import urlparse, parse_qs
+
+VIDEO_ID_LENGTH = 11
+
+# Un ID de YouTube: exactamente 11 caracteres base64 url-safe
+VIDEO_ID_PATTERN = re.compile(rf"[A-Za-z0-9_-]{{{VIDEO_ID_LENGTH}}}")
+
+_SHORT_HOSTS = {"youtu.be"}
+_LONG_HOSTS = {"youtube.com", "youtube-nocookie.com"}
+# Prefijos de host equivalentes al dominio principal
+_HOST_PREFIXES = ("www.", "m.", "music.")
+# Rutas cuyo segundo segmento es el ID del video
+_ID_PATH_PREFIXES = {"shorts", "embed", "v", "e", "live"}
+
+
+class InvalidVideoURLError(ValueError):
+    """Se lanza cuando no se puede extraer un ID de video de la URL."""
+    pass
+
+
+def extract_video_id(url: str) -> str:
+    """
+    Extrae el ID de 11 caracteres de una URL de YouTube.
+
+    Soporta formatos:
+        - Estándar: https://www.youtube.com/watch?v=XXXXXXXXXXX&t=30
+        - Corto: https://youtu.be/XXXXXXXXXXX?t=30
+        - Shorts / Embed / Live: https://youtube.com/shorts/XXXXXXXXXXX
+        - Móvil y música: https://m.youtube.com/watch?v=XXXXXXXXXXX
+
+    Args:
+        url: URL del video de YouTube (con o sin esquema).
+
+    Returns:
+        ID del video (exactamente 11 caracteres).
+
+    Raises:
+        InvalidVideoURLError: Si la URL no pertenece a YouTube o su ID no tiene
+            exactamente 11 caracteres válidos.
+    """
+    candidate = (url or "").strip()
+    if "://" not in candidate:
+        candidate = f"https://{candidate}"
+
+    parsed = urlparse(candidate)
+    host = (parsed.hostname or "").lower()
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+
+    segments = [segment for segment in parsed.path.split("/") if segment]
+    raw_id = None
+
+    if host in _SHORT_HOSTS:
+        raw_id = segments[0] if segments else None
+    elif host in _LONG_HOSTS:
+        if segments[:1] == ["watch"]:
+            raw_id = parse_qs(parsed.query).get("v", [None])[0]
+        elif len(segments) >= 2 and segments[0] in _ID_PATH_PREFIXES:
+            raw_id = segments[1]
+    else:
+        raise InvalidVideoURLError(f"La URL '{url}' no pertenece a YouTube.")
+
+    if not raw_id:
+        raise InvalidVideoURLError(f"No se pudo extraer el ID de video de '{url}'.")
+    if not is_valid_video_id(raw_id):
+        raise InvalidVideoURLError(
+            f"'{raw_id}' no es un ID de video válido: debe tener {VIDEO_ID_LENGTH} "
+            "caracteres entre letras, dígitos, '-' y '_'."
+        )
+    return raw_id
+
+
+def is_valid_video_id(video_id: str) -> bool:
+    """
+    Indica si el texto tiene la forma de un ID de video de YouTube.
+
+    Args:
+        video_id: Texto a validar.
+
+    Returns:
+        True si son exactamente 11 caracteres base64 url-safe.
+    """
+    return bool(VIDEO_ID_PATTERN.fullmatch(video_id or ""))
+
+
+def canonical_video_url(video_id: str) -> str:
+    """
+    Construye la URL canónica de un video a partir de su ID.
+
+    Args:
+        video_id: ID del video de YouTube.
+
+    Returns:
+        URL estándar ``https://www.youtube.com/watch?v=<id>``.
+    """
+    return f"https://www.youtube.com/watch?v={video_id}"
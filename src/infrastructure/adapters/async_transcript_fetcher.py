@@ -0,0 +1,266 @@
+"""
+Obtención nativa asyncio de transcripciones y metadata de YouTube sobre aiohttp.
+
+Reproduce el flujo de youtube-transcript-api (página del video → API
+InnerTube ``player`` → XML de subtítulos) con una ``aiohttp.ClientSession``
+compartida, de modo que cientos de extracciones concurrentes cuestan
+corrutinas y conexiones keep-alive reutilizadas en lugar de un thread del
+sistema operativo por video.
+
+La misma respuesta del player trae ``videoDetails``, de modo que ``fetch``
+devuelve también título y duración sin una segunda ida y vuelta a YouTube.
+
+Las fallas se expresan con las mismas excepciones públicas de
+youtube-transcript-api (VideoUnavailable, TranscriptsDisabled,
+NoTranscriptFound, ...), por lo que el adaptador las clasifica igual que en
+el camino síncrono. El contexto InnerTube y el parser del XML de subtítulos
+se mantienen en este módulo en lugar de importar internos de la librería.
+
+Example:
+    >>> fetcher = AsyncTranscriptFetcher()
+    >>> data = await fetcher.fetch("dQw4w9WgXcQ", ("es", "en"))
+    >>> data["language_code"]
+    'es'
+"""
+import asyncio
+import re
+from html import unescape
+from typing import Any, Dict, Iterable, Optional
+from xml.etree import ElementTree
+
+import aiohttp
+from youtube_transcript_api import (
+    IpBlocked,
+    NoTranscriptFound,
+    PoTokenRequired,
+    TranscriptsDisabled,
+    VideoUnavailable,
+    VideoUnplayable,
+    YouTubeDataUnparsable,
+)
+
+_API_KEY_PATTERN = re.compile(r'"INNERTUBE_API_KEY":\s*"([a-zA-Z0-9_-]+)"')
+_HTML_TAG_PATTERN = re.compile(r"<[^>]*>")
+
+# Cliente InnerTube con el que el player devuelve pistas de subtítulos sin PoToken
+# (mismo valor que usa youtube-transcript-api 1.2.x)
+INNERTUBE_CONTEXT = {"client": {"clientName": "ANDROID", "clientVersion": "20.10.38"}}
+
+
+def parse_transcript_xml(xml: str) -> str:
+    """
+    Convierte el XML de subtítulos de YouTube en texto plano.
+
+    Cada elemento ``<text>`` es un fragmento; se decodifican las entidades
+    HTML, se quitan las etiquetas de formato y se descartan los vacíos.
+
+    Args:
+        xml: Cuerpo de la respuesta de ``/api/timedtext``.
+
+    Returns:
+        Fragmentos unidos por espacios.
+
+    Raises:
+        ElementTree.ParseError: Si el cuerpo no es XML válido.
+    """
+    return " ".join(
+        _HTML_TAG_PATTERN.sub("", unescape(element.text))
+        for element in ElementTree.fromstring(xml)
+        if element.text is not None
+    )
+
+
+class AsyncTranscriptFetcher:
+    """
+    Cliente asíncrono de subtítulos y metadata de YouTube con sesión HTTP compartida.
+
+    La sesión se crea de forma perezosa sobre el event loop en ejecución y se
+    recrea si el loop cambia (p. ej. entre tests), igual que el pool de jobs.
+
+    Attributes:
+        base_url: Origen de YouTube (reemplazable por un servidor local en tests).
+        max_connections: Conexiones simultáneas del pool de la sesión.
+        timeout_seconds: Timeout total de cada request.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "https://www.youtube.com",
+        max_connections: int = 100,
+        timeout_seconds: float = 30.0
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_connections = max_connections
+        self.timeout_seconds = timeout_seconds
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def fetch(self, video_id: str, languages: Iterable[str]) -> Dict[str, Any]:
+        """
+        Obtiene la transcripción en texto plano del primer idioma disponible.
+
+        Prioriza subtítulos manuales sobre los generados automáticamente,
+        recorriendo ``languages`` en orden de preferencia. Título y duración
+        salen de la misma respuesta del player, sin requests adicionales.
+
+        Args:
+            video_id: ID de 11 caracteres del video.
+            languages: Códigos de idioma aceptados, en orden de preferencia.
+
+        Returns:
+            Dict con 'transcript' (texto plano), 'language_code' del subtítulo
+            elegido y 'metadata' ({'title', 'duration_seconds'}, o None si el
+            player no incluye ``videoDetails``).
+
+        Raises:
+            VideoUnavailable: Video inexistente o privado.
+            TranscriptsDisabled: El video no tiene subtítulos.
+            NoTranscriptFound: No hay subtítulos en los idiomas solicitados.
+            IpBlocked: YouTube está limitando las requests (HTTP 429 o captcha).
+        """
+        languages = list(languages)
+        session = self._get_session()
+        player = await self._fetch_player(session, video_id)
+
+        track = self._select_track(self._caption_tracks(player, video_id), languages, video_id)
+        track_url = track["baseUrl"].replace("&fmt=srv3", "")
+        if "&exp=xpe" in track_url:
+            raise PoTokenRequired(video_id)
+
+        xml = await self._get_text(session, track_url, video_id)
+        try:
+            transcript = parse_transcript_xml(xml)
+        except ElementTree.ParseError:
+            raise YouTubeDataUnparsable(video_id)
+        return {
+            "transcript": transcript,
+            "language_code": track["languageCode"],
+            "metadata": self._video_details(player),
+        }
+
+    async def fetch_metadata(self, video_id: str) -> Dict[str, Any]:
+        """
+        Obtiene título y duración del video desde la API InnerTube.
+
+        Solo para cuando no se pide la transcripción: ``fetch`` ya devuelve la
+        metadata de la misma respuesta del player.
+
+        Args:
+            video_id: ID de 11 caracteres del video.
+
+        Returns:
+            Dict con 'title' y 'duration_seconds'.
+
+        Raises:
+            VideoUnavailable: Video inexistente o privado.
+            YouTubeDataUnparsable: La respuesta no incluye los datos del video.
+        """
+        player = await self._fetch_player(self._get_session(), video_id)
+        self._assert_playable(player, video_id)
+        metadata = self._video_details(player)
+        if metadata is None:
+            raise YouTubeDataUnparsable(video_id)
+        return metadata
+
+    async def close(self) -> None:
+        """Cierra la sesión compartida y sus conexiones."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Devuelve la sesión del loop actual, creándola si hace falta."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._loop = loop
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout_seconds),
+                # Evita el interstitial de consentimiento de cookies en la UE
+                cookies={"CONSENT": "YES+cb"},
+                headers={"Accept-Language": "en-US"},
+            )
+        return self._session
+
+    async def _fetch_player(self, session: aiohttp.ClientSession, video_id: str) -> Dict[str, Any]:
+        """Obtiene la respuesta del player InnerTube (página del video → API key → player)."""
+        html = await self._get_text(session, f"{self.base_url}/watch", video_id, params={"v": video_id})
+        api_key = self._extract_api_key(html, video_id)
+
+        async with session.post(
+            f"{self.base_url}/youtubei/v1/player",
+            params={"key": api_key},
+            json={"context": INNERTUBE_CONTEXT, "videoId": video_id},
+        ) as response:
+            self._raise_for_status(response, video_id)
+            return await response.json(content_type=None)
+
+    async def _get_text(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        video_id: str,
+        params: Optional[Dict[str, str]] = None
+    ) -> str:
+        async with session.get(url, params=params) as response:
+            self._raise_for_status(response, video_id)
+            return await response.text()
+
+    @staticmethod
+    def _raise_for_status(response: aiohttp.ClientResponse, video_id: str) -> None:
+        if response.status == 429:
+            raise IpBlocked(video_id)
+        response.raise_for_status()
+
+    @staticmethod
+    def _extract_api_key(html: str, video_id: str) -> str:
+        match = _API_KEY_PATTERN.search(unescape(html))
+        if match:
+            return match.group(1)
+        if 'class="g-recaptcha"' in html:
+            raise IpBlocked(video_id)
+        raise YouTubeDataUnparsable(video_id)
+
+    @staticmethod
+    def _assert_playable(player: Dict[str, Any], video_id: str) -> None:
+        playability = player.get("playabilityStatus") or {}
+        status = playability.get("status")
+        if status not in (None, "OK"):
+            if status == "ERROR":
+                raise VideoUnavailable(video_id)
+            raise VideoUnplayable(video_id, playability.get("reason"), [])
+
+    @staticmethod
+    def _video_details(player: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Extrae título y duración de ``videoDetails`` (None si faltan)."""
+        details = player.get("videoDetails")
+        if not details or "title" not in details:
+            return None
+        return {
+            "title": details["title"],
+            "duration_seconds": int(details.get("lengthSeconds") or 0),
+        }
+
+    @classmethod
+    def _caption_tracks(cls, player: Dict[str, Any], video_id: str) -> list:
+        """Valida la respuesta del player y devuelve sus pistas de subtítulos."""
+        cls._assert_playable(player, video_id)
+        captions = (player.get("captions") or {}).get("playerCaptionsTracklistRenderer")
+        if not captions or "captionTracks" not in captions:
+            raise TranscriptsDisabled(video_id)
+        return captions["captionTracks"]
+
+    @staticmethod
+    def _select_track(tracks: list, languages: list, video_id: str) -> Dict[str, Any]:
+        """Elige la pista según idioma, prefiriendo subtítulos manuales a los automáticos."""
+        for language in languages:
+            candidates = [track for track in tracks if track.get("languageCode") == language]
+            candidates.sort(key=lambda track: track.get("kind") == "asr")
+            if candidates:
+                return candidates[0]
+        available = ", ".join(track.get("languageCode", "?") for track in tracks)
+        raise NoTranscriptFound(video_id, languages, f"Idiomas disponibles: {available}")
+
+    def __repr__(self) -> str:
+        return f"AsyncTranscriptFetcher(base_url='{self.base_url}', max_connections={self.max_connections})"
@@ -0,0 +1,187 @@
+"""
+Circuit breaker para servicios externos (YouTube, proveedores LLM).
+
+Durante una caída, cada solicitud esperaría timeouts y reintentos completos
+antes de fallar, acaparando los workers ASGI. El breaker observa el resultado
+de las últimas llamadas y, cuando la tasa de fallas supera el umbral, abre el
+circuito: las llamadas siguientes fallan al instante con CircuitOpenError.
+Tras el cooldown pasa a semiabierto y admite una llamada de prueba; si tiene
+éxito el circuito se cierra, si falla vuelve a abrirse.
+
+Environment Variables:
+    CIRCUIT_BREAKER_ENABLED: Habilita los circuit breakers (default: true).
+    CIRCUIT_BREAKER_FAILURE_RATE: Tasa de fallas que abre el circuito (default: 0.5).
+    CIRCUIT_BREAKER_WINDOW: Últimas llamadas consideradas (default: 20).
+    CIRCUIT_BREAKER_MIN_CALLS: Llamadas mínimas en la ventana para evaluar la tasa (default: 5).
+    CIRCUIT_BREAKER_COOLDOWN_SECONDS: Tiempo abierto antes de la llamada de prueba (default: 30).
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, Optional, Tuple, Type
+
+from .exceptions import CircuitOpenError
+
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por tasa de fallas con estados cerrado, abierto y semiabierto.
+
+    Attributes:
+        name: Servicio protegido (aparece en CircuitOpenError y en los logs).
+        failure_rate_threshold: Fracción de fallas en la ventana que abre el circuito.
+        window_size: Cantidad de resultados recientes considerados.
+        min_calls: Resultados mínimos antes de evaluar la tasa.
+        cooldown_seconds: Tiempo abierto antes de admitir una llamada de prueba.
+        failure_exceptions: Excepciones que cuentan como falla del servicio.
+        ignored_exceptions: Excepciones que no dicen nada de su salud (p. ej. un
+            video inexistente): cuentan como respuesta exitosa.
+        enabled: Si es False el breaker nunca abre.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 5,
+        cooldown_seconds: float = 30.0,
+        failure_exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+        ignored_exceptions: Tuple[Type[BaseException], ...] = (),
+        enabled: bool = True
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.cooldown_seconds = cooldown_seconds
+        self.failure_exceptions = failure_exceptions
+        self.ignored_exceptions = ignored_exceptions
+        self.enabled = enabled
+        self._outcomes: deque = deque(maxlen=window_size)
+        self._state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, name: str, **kwargs: Any) -> "CircuitBreaker":
+        """Crea un breaker con la configuración de las variables CIRCUIT_BREAKER_*."""
+        return cls(
+            name,
+            failure_rate_threshold=float(os.getenv("CIRCUIT_BREAKER_FAILURE_RATE", "0.5")),
+            window_size=int(os.getenv("CIRCUIT_BREAKER_WINDOW", "20")),
+            min_calls=int(os.getenv("CIRCUIT_BREAKER_MIN_CALLS", "5")),
+            cooldown_seconds=float(os.getenv("CIRCUIT_BREAKER_COOLDOWN_SECONDS", "30")),
+            enabled=os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true",
+            **kwargs
+        )
+
+    @property
+    def state(self) -> str:
+        """Estado actual (un circuito abierto con el cooldown vencido se informa semiabierto)."""
+        with self._lock:
+            if self._state == STATE_OPEN and self._cooldown_remaining() <= 0:
+                return STATE_HALF_OPEN
+            return self._state
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """
+        Protege una llamada al servicio y registra su resultado.
+
+        Raises:
+            CircuitOpenError: Si el circuito está abierto (la llamada no se ejecuta).
+        """
+        self._before_call()
+        succeeded: Optional[bool] = None
+        try:
+            yield
+            succeeded = True
+        except self.ignored_exceptions:
+            succeeded = True
+            raise
+        except self.failure_exceptions:
+            succeeded = False
+            raise
+        finally:
+            # None: la llamada se canceló sin resultado, solo libera la prueba
+            self._after_call(succeeded)
+
+    def stats(self) -> Dict[str, Any]:
+        """Instantánea del estado y la tasa de fallas de la ventana."""
+        with self._lock:
+            calls = len(self._outcomes)
+            failures = calls - sum(self._outcomes)
+            return {
+                "name": self.name,
+                "state": self._state,
+                "calls": calls,
+                "failure_rate": failures / calls if calls else 0.0,
+                "retry_after_seconds": self._cooldown_remaining() if self._state == STATE_OPEN else 0.0,
+            }
+
+    def _before_call(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._state == STATE_CLOSED:
+                return
+            remaining = self._cooldown_remaining()
+            if self._state == STATE_OPEN and remaining <= 0:
+                self._state = STATE_HALF_OPEN
+            if self._state == STATE_HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            retry_after = max(remaining, 0.0) if self._state == STATE_OPEN else self.cooldown_seconds
+        raise CircuitOpenError(self.name, retry_after)
+
+    def _after_call(self, succeeded: Optional[bool]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._state == STATE_HALF_OPEN:
+                self._trial_in_flight = False
+                if succeeded is True:
+                    logger.info(f"Circuit breaker '{self.name}': llamada de prueba exitosa, se cierra")
+                    self._state = STATE_CLOSED
+                    self._outcomes.clear()
+                elif succeeded is False:
+                    self._open()
+                return
+            if succeeded is None or self._state != STATE_CLOSED:
+                return
+            self._outcomes.append(succeeded)
+            calls = len(self._outcomes)
+            failure_rate = (calls - sum(self._outcomes)) / calls
+            if calls >= self.min_calls and failure_rate >= self.failure_rate_threshold:
+                self._open()
+
+    def _open(self) -> None:
+        logger.warning(
+            f"Circuit breaker '{self.name}' abierto por {self.cooldown_seconds:.0f}s "
+            f"({len(self._outcomes) - sum(self._outcomes)}/{len(self._outcomes)} fallas recientes)"
+        )
+        self._state = STATE_OPEN
+        self._opened_at = time.monotonic()
+
+    def _cooldown_remaining(self) -> float:
+        return self._opened_at + self.cooldown_seconds - time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"CircuitBreaker(name='{self.name}', state='{self._state}')"
+
+
+def circuit_guard(breaker: Optional[CircuitBreaker]) -> ContextManager[None]:
+    """``breaker.guard()``, o un contexto nulo si no hay breaker configurado."""
+    return breaker.guard() if breaker is not None else nullcontext()
@@ -22,4 +22,25 @@ class NoTranscriptError(YouTubeError):
 
 class LLMError(InfrastructureError):
     """Excepción para fallos en la comunicación con el proveedor de IA (Gemini)."""
-    pass
\ No newline at end of file
+    pass
+
+class ExecutorSaturatedError(InfrastructureError):
+    """Se lanza cuando un executor dedicado alcanzó su cola máxima de tareas pendientes."""
+    pass
+
+class CircuitOpenError(InfrastructureError):
+    """
+    Se lanza sin contactar al servicio externo cuando su circuit breaker está abierto.
+
+    Attributes:
+        service: Nombre del circuito (p. ej. "youtube", "llm:gemini:gemini-2.0-flash").
+        retry_after_seconds: Tiempo restante hasta admitir una llamada de prueba.
+    """
+
+    def __init__(self, service: str, retry_after_seconds: float):
+        self.service = service
+        self.retry_after_seconds = retry_after_seconds
+        super().__init__(
+            f"Servicio '{service}' no disponible (circuit breaker abierto); "
+            f"reintentar en {retry_after_seconds:.0f}s."
+        )
@@ -0,0 +1,137 @@
+"""
+Executor de threads dedicado y acotado para llamadas bloqueantes de I/O.
+
+El executor por defecto del event loop (``run_in_executor(None, ...)``) es
+compartido con ``sync_to_async`` y el resto de Django, y su tamaño depende de
+la cantidad de CPUs: una ráfaga de llamadas lentas a YouTube lo acapara y deja
+esperando al trabajo de base de datos (y viceversa). Este executor tiene su
+propio pool, nombrado y dimensionado por separado, mide la profundidad de la
+cola y el tiempo de espera, y rechaza de inmediato cuando está saturado.
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from .exceptions import ExecutorSaturatedError
+
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedExecutor:
+    """
+    Pool de threads con cola de pendientes acotada y métricas.
+
+    Attributes:
+        name: Prefijo de los threads del pool (visible en logs y profilers).
+        max_workers: Threads que ejecutan tareas en paralelo.
+        max_pending: Tareas admitidas en espera de un thread antes de rechazar.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, name: str):
+        """
+        Inicializa el pool (los threads se crean a demanda).
+
+        Args:
+            max_workers: Cantidad de threads del pool.
+            max_pending: Capacidad de la cola de espera.
+            name: Prefijo de nombre de los threads.
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._submitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Ejecuta ``fn(*args)`` en el pool sin bloquear el event loop.
+
+        Args:
+            fn: Función bloqueante a ejecutar.
+            *args: Argumentos posicionales de la función.
+
+        Returns:
+            El valor devuelto por la función.
+
+        Raises:
+            ExecutorSaturatedError: Si ya hay ``max_pending`` tareas esperando un thread.
+        """
+        with self._lock:
+            if self._queued >= self.max_pending:
+                self._rejected += 1
+                raise ExecutorSaturatedError(
+                    f"El executor '{self.name}' está saturado "
+                    f"({self._queued} tareas en espera, {self._running} en ejecución)."
+                )
+            self._queued += 1
+            self._submitted += 1
+
+        submitted_at = time.monotonic()
+
+        def call():
+            wait_seconds = time.monotonic() - submitted_at
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._total_wait_seconds += wait_seconds
+                self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        future = self._pool.submit(call)
+        future.add_done_callback(self._release_if_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def _release_if_cancelled(self, future: Future) -> None:
+        """Libera el lugar en la cola de una tarea cancelada antes de empezar."""
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Instantánea de las métricas del executor.
+
+        Returns:
+            Dict con profundidad de cola, tareas en ejecución, contadores
+            acumulados y tiempos de espera (promedio y máximo, en segundos).
+        """
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "queued": self._queued,
+                "running": self._running,
+                "submitted": self._submitted,
+                "rejected": self._rejected,
+                "completed": self._completed,
+                "avg_wait_seconds": self._total_wait_seconds / started if started else 0.0,
+                "max_wait_seconds": self._max_wait_seconds,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Detiene el pool, opcionalmente esperando las tareas en curso."""
+        self._pool.shutdown(wait=wait)
+
+    def __repr__(self) -> str:
+        return (
+            f"BoundedExecutor(name='{self.name}', max_workers={self.max_workers}, "
+            f"max_pending={self.max_pending})"
+        )
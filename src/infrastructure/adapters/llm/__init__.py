@@ -8,16 +8,31 @@ Usage:
     >>> from infrastructure.adapters.llm import get_llm_adapter
     >>> adapter = get_llm_adapter()  # Lee LLM_PROVIDER de .env
 """
-from .factory import get_llm_adapter, list_available_providers
+from .factory import get_llm_adapter, get_structured_llm, list_available_providers
 from .interface import LLMInterface, StructuredLLM
-from .exceptions import LLMError, LLMInferenceError, LLMConfigurationError
+from .exceptions import LLMError, LLMInferenceError, LLMConfigurationError, LLMContextLengthError
+from .hedged_adapter import HedgedAdapter
+from .tokens import ContextBudget, ModelLimits, get_token_counter
+from .response_cache import CachedStructuredLLM, bypass_response_cache
+from .router import ModelRoute, ModelRouter, routing_enabled
 
 __all__ = [
     "get_llm_adapter",
+    "get_structured_llm",
     "list_available_providers",
     "LLMInterface",
     "StructuredLLM",
+    "HedgedAdapter",
     "LLMError",
     "LLMInferenceError",
     "LLMConfigurationError",
+    "LLMContextLengthError",
+    "ContextBudget",
+    "ModelLimits",
+    "get_token_counter",
+    "CachedStructuredLLM",
+    "bypass_response_cache",
+    "ModelRoute",
+    "ModelRouter",
+    "routing_enabled",
 ]
@@ -46,6 +46,35 @@ class LLMRateLimitError(LLMError):
         super().__init__(message)
 
 
+class LLMContextLengthError(LLMError):
+    """
+    El prompt excede la ventana de contexto disponible del modelo.
+    
+    Se lanza localmente, antes de cualquier llamada de red, cuando la
+    política de presupuesto de contexto es "reject".
+    
+    Attributes:
+        prompt_tokens: Tokens estimados del prompt.
+        max_prompt_tokens: Tokens de entrada disponibles para el modelo.
+        provider: Nombre del proveedor (gemini, groq, etc.)
+        model: Modelo cuyo límite se excedió.
+    """
+    
+    def __init__(
+        self,
+        message: str,
+        prompt_tokens: int = None,
+        max_prompt_tokens: int = None,
+        provider: str = None,
+        model: str = None
+    ):
+        self.prompt_tokens = prompt_tokens
+        self.max_prompt_tokens = max_prompt_tokens
+        self.provider = provider
+        self.model = model
+        super().__init__(message)
+
+
 class LLMConfigurationError(LLMError):
     """
     Error de configuración del adaptador LLM.
@@ -10,12 +10,18 @@ La selección del proveedor sigue esta prioridad:
 2. Variable de entorno `LLM_PROVIDER`
 3. Default: "gemini"
 
+Los módulos de cada proveedor (y sus SDKs, p. ej. ``langchain_google_genai``)
+se importan recién cuando el proveedor se selecciona: un proceso configurado
+con Groq nunca carga el SDK de Gemini, y los comandos que no usan el LLM
+(``manage.py migrate``) no pagan ninguna de esas importaciones.
+
 Environment Variables:
-    LLM_PROVIDER: Proveedor a usar ("gemini" o "groq").
+    LLM_PROVIDER: Proveedor a usar ("gemini", "groq" o "hedged").
     GOOGLE_API_KEY: Requerido si LLM_PROVIDER=gemini.
     GROQ_API_KEY: Requerido si LLM_PROVIDER=groq.
     GEMINI_MODEL: Modelo de Gemini (opcional).
     GROQ_MODEL: Modelo de Groq (opcional).
+    LLM_HEDGE_PROVIDERS: Proveedores combinados por "hedged" (default: "gemini,groq").
 
 Example:
     >>> # Uso básico (lee LLM_PROVIDER de .env)
@@ -30,25 +36,49 @@ Example:
 """
 import os
 import logging
-from typing import Optional
+from importlib import import_module
+from typing import Dict, Optional, Type, TypeVar
+
+from pydantic import BaseModel
 
-from .interface import LLMInterface
-from .gemini_adapter import GeminiAdapter
-from .groq_adapter import GroqAdapter
+from .interface import LLMInterface, StructuredLLM
 from .exceptions import LLMConfigurationError
+from .response_cache import with_response_cache
+from .micro_batcher import with_micro_batching
 
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T', bound=BaseModel)
 
-# Registro de proveedores disponibles
-_PROVIDERS = {
-    "gemini": GeminiAdapter,
-    "groq": GroqAdapter,
+
+# Registro de proveedores disponibles: módulo y clase, importados a demanda
+_PROVIDERS: Dict[str, str] = {
+    "gemini": "gemini_adapter:GeminiAdapter",
+    "groq": "groq_adapter:GroqAdapter",
+    # Compuesto: hedged requests y failover entre LLM_HEDGE_PROVIDERS
+    "hedged": "hedged_adapter:HedgedAdapter",
 }
 
 
-def get_llm_adapter(provider: Optional[str] = None) -> LLMInterface:
+def get_provider_class(provider: str) -> Type[LLMInterface]:
+    """
+    Importa (la primera vez) y devuelve la clase adaptadora de un proveedor.
+
+    Raises:
+        LLMConfigurationError: Si el proveedor no está registrado.
+    """
+    if provider not in _PROVIDERS:
+        available = ", ".join(_PROVIDERS.keys())
+        raise LLMConfigurationError(
+            f"Proveedor LLM '{provider}' no soportado. "
+            f"Opciones disponibles: {available}"
+        )
+    module_name, class_name = _PROVIDERS[provider].split(":")
+    return getattr(import_module(f".{module_name}", __package__), class_name)
+
+
+def get_llm_adapter(provider: Optional[str] = None, model: Optional[str] = None) -> LLMInterface:
     """
     Factory principal para obtener un adaptador LLM.
     
@@ -56,8 +86,9 @@ def get_llm_adapter(provider: Optional[str] = None) -> LLMInterface:
     al proveedor especificado o al configurado en las variables de entorno.
     
     Args:
-        provider: Nombre del proveedor ("gemini", "groq"). 
+        provider: Nombre del proveedor ("gemini", "groq", "hedged"). 
                  Si es None, usa la variable LLM_PROVIDER.
+        model: Modelo del proveedor. Si es None, usa GEMINI_MODEL / GROQ_MODEL.
     
     Returns:
         LLMInterface: Instancia del adaptador configurado y listo para usar.
@@ -74,24 +105,16 @@ def get_llm_adapter(provider: Optional[str] = None) -> LLMInterface:
     Note:
         Para agregar un nuevo proveedor:
         1. Crear clase que implemente LLMInterface
-        2. Agregar al diccionario _PROVIDERS
+        2. Agregar "modulo:Clase" al diccionario _PROVIDERS
         3. Agregar variables de entorno correspondientes
     """
     provider_name = (provider or os.getenv("LLM_PROVIDER", "gemini")).lower()
-    
-    if provider_name not in _PROVIDERS:
-        available = ", ".join(_PROVIDERS.keys())
-        raise LLMConfigurationError(
-            f"Proveedor LLM '{provider_name}' no soportado. "
-            f"Opciones disponibles: {available}"
-        )
-    
-    adapter_class = _PROVIDERS[provider_name]
+    adapter_class = get_provider_class(provider_name)
     
     logger.info(f"Inicializando LLM adapter: {provider_name}")
     
     try:
-        adapter = adapter_class()
+        adapter = adapter_class(model=model) if model else adapter_class()
         logger.info(f"LLM adapter creado: {adapter}")
         return adapter
     except LLMConfigurationError:
@@ -102,9 +125,34 @@ def get_llm_adapter(provider: Optional[str] = None) -> LLMInterface:
         )
 
 
+def get_structured_llm(schema: Type[T], adapter: Optional[LLMInterface] = None) -> StructuredLLM[T]:
+    """
+    Devuelve un StructuredLLM listo para usar, con cache de respuestas.
+
+    La cache va por fuera del micro-batcher: los aciertos no esperan a formar
+    un lote ni ocupan lugar en él.
+    
+    Args:
+        schema: Clase Pydantic que define la estructura de respuesta.
+        adapter: Adaptador a usar. Si es None, se crea con get_llm_adapter().
+    
+    Returns:
+        StructuredLLM envuelto en la cache de respuestas y el micro-batcher
+        (cada uno si está habilitado).
+    
+    Example:
+        >>> structured_llm = get_structured_llm(VideoAnalysis, llm_adapter)
+    """
+    adapter = adapter or get_llm_adapter()
+    structured_llm = with_micro_batching(adapter.with_structured_output(schema), adapter, schema)
+    return with_response_cache(structured_llm)
+
+
 def list_available_providers() -> dict:
     """
     Lista los proveedores LLM disponibles y sus modelos.
+
+    Importa el módulo de cada proveedor (y su SDK).
     
     Returns:
         dict: Diccionario con proveedores y sus modelos disponibles.
@@ -118,6 +166,6 @@ def list_available_providers() -> dict:
         }
     """
     return {
-        name: list(cls.AVAILABLE_MODELS.keys())
-        for name, cls in _PROVIDERS.items()
+        name: list(get_provider_class(name).AVAILABLE_MODELS.keys())
+        for name in _PROVIDERS
     }
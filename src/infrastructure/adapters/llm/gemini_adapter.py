@@ -15,13 +15,17 @@ Example:
     >>> result = await structured.ainvoke("Analiza este video...")
 """
 import os
-from typing import Type, TypeVar
+from typing import Optional, Type, TypeVar
 
 from pydantic import BaseModel
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 from .interface import LLMInterface, StructuredLLM
-from .exceptions import LLMInferenceError, LLMConfigurationError
+from .exceptions import LLMInferenceError, LLMConfigurationError, LLMRateLimitError
+from .tokens import ContextBudget, ModelLimits, TokenCounter
+from .rate_limiter import RateLimits, TokenBucketLimiter, ainvoke_with_rate_limit, get_rate_limiter
+from ..circuit_breaker import CircuitBreaker, circuit_guard
+from ..exceptions import CircuitOpenError
 
 
 T = TypeVar('T', bound=BaseModel)
@@ -35,15 +39,39 @@ class GeminiStructuredLLM(StructuredLLM[T]):
     que las respuestas cumplan con el schema Pydantic especificado.
     """
     
-    def __init__(self, llm_with_schema):
+    provider = "gemini"
+    
+    def __init__(
+        self,
+        llm_with_schema,
+        context_budget: Optional[ContextBudget] = None,
+        model: str = None,
+        temperature: float = 0.0,
+        schema: Type[T] = None,
+        rate_limiter: Optional[TokenBucketLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
         """
         Inicializa el wrapper estructurado.
         
         Args:
             llm_with_schema: Instancia de ChatGoogleGenerativeAI configurada
                            con with_structured_output().
+            context_budget: Presupuesto de contexto a aplicar antes de cada llamada.
+            model: Modelo configurado (parte de la clave de cache de respuestas).
+            temperature: Temperatura configurada.
+            schema: Clase Pydantic de la respuesta.
+            rate_limiter: Limitador RPM/TPM compartido del modelo (None = sin límite).
+            circuit_breaker: Breaker del proveedor (None = sin breaker).
         """
-        self._llm = llm_with_schema.with_retry()
+        # Los reintentos los maneja ainvoke_with_rate_limit, pasando por el limitador
+        self._llm = llm_with_schema
+        self.context_budget = context_budget
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.model = model
+        self.temperature = temperature
+        self.schema = schema
     
     async def ainvoke(self, prompt: str) -> T:
         """
@@ -56,11 +84,24 @@ class GeminiStructuredLLM(StructuredLLM[T]):
             Instancia del schema Pydantic con los datos extraídos.
         
         Raises:
+            LLMContextLengthError: Si el prompt excede el contexto del modelo.
+            LLMRateLimitError: Si Gemini sigue respondiendo 429 tras los reintentos.
+            CircuitOpenError: Si Gemini viene fallando y el circuit breaker está abierto.
             LLMInferenceError: Si Gemini falla al procesar la solicitud.
         """
+        # Se valida antes de la llamada para no gastar red ni reintentos
+        if self.context_budget is not None:
+            prompt = self.context_budget.enforce(prompt)
+        budget = self.context_budget
+        tokens = budget.measure(prompt) if budget is not None else TokenCounter().count(prompt)
         try:
-            result = await self._llm.ainvoke(prompt)
-            return result
+            # Con el circuito abierto falla al instante, sin esperar timeouts ni reintentos
+            with circuit_guard(self.circuit_breaker):
+                return await ainvoke_with_rate_limit(
+                    self._llm.ainvoke, prompt, self.rate_limiter, tokens, "gemini", self.model
+                )
+        except (LLMRateLimitError, CircuitOpenError):
+            raise
         except Exception as e:
             raise LLMInferenceError(
                 message=f"Error calling Gemini: {str(e)}",
@@ -79,11 +120,16 @@ class GeminiAdapter(LLMInterface[T]):
     Attributes:
         model: Nombre del modelo (ej: gemini-2.0-flash).
         temperature: Control de creatividad (0-1).
+        context_budget: Presupuesto de tokens de entrada (None si el modelo no está catalogado).
+        rate_limiter: Limitador RPM/TPM del modelo (None si no hay límites conocidos).
+        circuit_breaker: Breaker de las llamadas al modelo (compartido por sus schemas).
     
     Raises:
         LLMConfigurationError: Si GOOGLE_API_KEY no está configurada.
     """
     
+    provider = "gemini"
+    
     # Modelos disponibles con sus características
     AVAILABLE_MODELS = {
         "gemini-2.0-flash": "Rápido, ideal para tareas generales",
@@ -92,6 +138,22 @@ class GeminiAdapter(LLMInterface[T]):
         "gemini-1.5-pro": "Mayor calidad, más costoso",
     }
     
+    # Ventana de contexto y salida máxima (tokens) por modelo
+    MODEL_LIMITS = {
+        "gemini-2.0-flash": ModelLimits(context_window=1_048_576, max_output_tokens=8_192),
+        "gemini-2.0-flash-lite": ModelLimits(context_window=1_048_576, max_output_tokens=8_192),
+        "gemini-1.5-flash": ModelLimits(context_window=1_048_576, max_output_tokens=8_192),
+        "gemini-1.5-pro": ModelLimits(context_window=2_097_152, max_output_tokens=8_192),
+    }
+    
+    # Límites del free tier (RPM, TPM) por modelo; GEMINI_RATE_LIMIT_RPM/TPM los reemplazan
+    RATE_LIMITS = {
+        "gemini-2.0-flash": RateLimits(requests_per_minute=15, tokens_per_minute=1_000_000),
+        "gemini-2.0-flash-lite": RateLimits(requests_per_minute=30, tokens_per_minute=1_000_000),
+        "gemini-1.5-flash": RateLimits(requests_per_minute=15, tokens_per_minute=1_000_000),
+        "gemini-1.5-pro": RateLimits(requests_per_minute=2, tokens_per_minute=32_000),
+    }
+    
     def __init__(
         self, 
         model: str = None, 
@@ -123,6 +185,12 @@ class GeminiAdapter(LLMInterface[T]):
             temperature=self.temperature,
             google_api_key=api_key
         )
+        self.context_budget = ContextBudget.for_model("gemini", self.model, self.MODEL_LIMITS.get(self.model))
+        self.rate_limiter = get_rate_limiter("gemini", self.model, self.RATE_LIMITS.get(self.model))
+        # Un 429 no indica que el proveedor esté caído: lo resuelve el rate limiter
+        self.circuit_breaker = CircuitBreaker.from_env(
+            f"llm:gemini:{self.model}", ignored_exceptions=(LLMRateLimitError,)
+        )
     
     def with_structured_output(self, schema: Type[T]) -> GeminiStructuredLLM[T]:
         """
@@ -135,7 +203,15 @@ class GeminiAdapter(LLMInterface[T]):
             GeminiStructuredLLM configurado con el schema.
         """
         llm_with_schema = self._llm.with_structured_output(schema)
-        return GeminiStructuredLLM(llm_with_schema)
+        return GeminiStructuredLLM(
+            llm_with_schema,
+            context_budget=self.context_budget,
+            model=self.model,
+            temperature=self.temperature,
+            schema=schema,
+            rate_limiter=self.rate_limiter,
+            circuit_breaker=self.circuit_breaker
+        )
     
     def __repr__(self) -> str:
         return f"GeminiAdapter(model='{self.model}', temperature={self.temperature})"
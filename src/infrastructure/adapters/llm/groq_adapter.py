@@ -11,7 +11,7 @@ Environment Variables:
     GROQ_API_KEY: API key de Groq Console (requerido).
     GROQ_MODEL: Modelo a utilizar (default: llama-3.3-70b-versatile).
 
-Free Tier Limits (aproximados):
+Free Tier Limits (aproximados, aplicados del lado del cliente por RATE_LIMITS):
     - llama-3.3-70b-versatile: 6,000 tokens/min, ~14,400 req/día
     - llama-3.1-8b-instant: 20,000 tokens/min
     - mixtral-8x7b-32768: 5,000 tokens/min
@@ -22,13 +22,17 @@ Example:
     >>> result = await structured.ainvoke("Analiza este video...")
 """
 import os
-from typing import Type, TypeVar
+from typing import Optional, Type, TypeVar
 
 from pydantic import BaseModel
 from langchain_groq import ChatGroq
 
 from .interface import LLMInterface, StructuredLLM
-from .exceptions import LLMInferenceError, LLMConfigurationError
+from .exceptions import LLMInferenceError, LLMConfigurationError, LLMRateLimitError
+from .tokens import ContextBudget, ModelLimits, TokenCounter
+from .rate_limiter import RateLimits, TokenBucketLimiter, ainvoke_with_rate_limit, get_rate_limiter
+from ..circuit_breaker import CircuitBreaker, circuit_guard
+from ..exceptions import CircuitOpenError
 
 
 T = TypeVar('T', bound=BaseModel)
@@ -42,15 +46,39 @@ class GroqStructuredLLM(StructuredLLM[T]):
     que las respuestas cumplan con el schema Pydantic especificado.
     """
     
-    def __init__(self, llm_with_schema):
+    provider = "groq"
+    
+    def __init__(
+        self,
+        llm_with_schema,
+        context_budget: Optional[ContextBudget] = None,
+        model: str = None,
+        temperature: float = 0.0,
+        schema: Type[T] = None,
+        rate_limiter: Optional[TokenBucketLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
         """
         Inicializa el wrapper estructurado.
         
         Args:
             llm_with_schema: Instancia de ChatGroq configurada
                            con with_structured_output().
+            context_budget: Presupuesto de contexto a aplicar antes de cada llamada.
+            model: Modelo configurado (parte de la clave de cache de respuestas).
+            temperature: Temperatura configurada.
+            schema: Clase Pydantic de la respuesta.
+            rate_limiter: Limitador RPM/TPM compartido del modelo (None = sin límite).
+            circuit_breaker: Breaker del proveedor (None = sin breaker).
         """
-        self._llm = llm_with_schema.with_retry()
+        # Los reintentos los maneja ainvoke_with_rate_limit, pasando por el limitador
+        self._llm = llm_with_schema
+        self.context_budget = context_budget
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.model = model
+        self.temperature = temperature
+        self.schema = schema
     
     async def ainvoke(self, prompt: str) -> T:
         """
@@ -63,11 +91,24 @@ class GroqStructuredLLM(StructuredLLM[T]):
             Instancia del schema Pydantic con los datos extraídos.
         
         Raises:
+            LLMContextLengthError: Si el prompt excede el contexto del modelo.
+            LLMRateLimitError: Si Groq sigue respondiendo 429 tras los reintentos.
+            CircuitOpenError: Si Groq viene fallando y el circuit breaker está abierto.
             LLMInferenceError: Si Groq falla al procesar la solicitud.
         """
+        # Se valida antes de la llamada para no gastar red ni reintentos
+        if self.context_budget is not None:
+            prompt = self.context_budget.enforce(prompt)
+        budget = self.context_budget
+        tokens = budget.measure(prompt) if budget is not None else TokenCounter().count(prompt)
         try:
-            result = await self._llm.ainvoke(prompt)
-            return result
+            # Con el circuito abierto falla al instante, sin esperar timeouts ni reintentos
+            with circuit_guard(self.circuit_breaker):
+                return await ainvoke_with_rate_limit(
+                    self._llm.ainvoke, prompt, self.rate_limiter, tokens, "groq", self.model
+                )
+        except (LLMRateLimitError, CircuitOpenError):
+            raise
         except Exception as e:
             raise LLMInferenceError(
                 message=f"Error calling Groq: {str(e)}",
@@ -86,11 +127,16 @@ class GroqAdapter(LLMInterface[T]):
     Attributes:
         model: Nombre del modelo (ej: llama-3.3-70b-versatile).
         temperature: Control de creatividad (0-1).
+        context_budget: Presupuesto de tokens de entrada (None si el modelo no está catalogado).
+        rate_limiter: Limitador RPM/TPM del modelo (None si no hay límites conocidos).
+        circuit_breaker: Breaker de las llamadas al modelo (compartido por sus schemas).
     
     Raises:
         LLMConfigurationError: Si GROQ_API_KEY no está configurada.
     """
     
+    provider = "groq"
+    
     # Modelos disponibles con sus características
     AVAILABLE_MODELS = {
         "llama-3.3-70b-versatile": "Modelo más capaz, excelente para análisis",
@@ -100,6 +146,24 @@ class GroqAdapter(LLMInterface[T]):
         "gemma2-9b-it": "Modelo de Google, compacto y eficiente",
     }
     
+    # Ventana de contexto y salida máxima (tokens) por modelo
+    MODEL_LIMITS = {
+        "llama-3.3-70b-versatile": ModelLimits(context_window=131_072, max_output_tokens=32_768),
+        "llama-3.1-8b-instant": ModelLimits(context_window=131_072, max_output_tokens=8_192),
+        "llama-3.1-70b-versatile": ModelLimits(context_window=131_072, max_output_tokens=8_192),
+        "mixtral-8x7b-32768": ModelLimits(context_window=32_768, max_output_tokens=4_096),
+        "gemma2-9b-it": ModelLimits(context_window=8_192, max_output_tokens=2_048),
+    }
+    
+    # Límites del free tier (RPM, TPM) por modelo; GROQ_RATE_LIMIT_RPM/TPM los reemplazan
+    RATE_LIMITS = {
+        "llama-3.3-70b-versatile": RateLimits(requests_per_minute=30, tokens_per_minute=6_000),
+        "llama-3.1-8b-instant": RateLimits(requests_per_minute=30, tokens_per_minute=20_000),
+        "llama-3.1-70b-versatile": RateLimits(requests_per_minute=30, tokens_per_minute=6_000),
+        "mixtral-8x7b-32768": RateLimits(requests_per_minute=30, tokens_per_minute=5_000),
+        "gemma2-9b-it": RateLimits(requests_per_minute=30, tokens_per_minute=15_000),
+    }
+    
     def __init__(
         self, 
         model: str = None, 
@@ -131,6 +195,12 @@ class GroqAdapter(LLMInterface[T]):
             temperature=self.temperature,
             groq_api_key=api_key
         )
+        self.context_budget = ContextBudget.for_model("groq", self.model, self.MODEL_LIMITS.get(self.model))
+        self.rate_limiter = get_rate_limiter("groq", self.model, self.RATE_LIMITS.get(self.model))
+        # Un 429 no indica que el proveedor esté caído: lo resuelve el rate limiter
+        self.circuit_breaker = CircuitBreaker.from_env(
+            f"llm:groq:{self.model}", ignored_exceptions=(LLMRateLimitError,)
+        )
     
     def with_structured_output(self, schema: Type[T]) -> GroqStructuredLLM[T]:
         """
@@ -143,7 +213,15 @@ class GroqAdapter(LLMInterface[T]):
             GroqStructuredLLM configurado con el schema.
         """
         llm_with_schema = self._llm.with_structured_output(schema)
-        return GroqStructuredLLM(llm_with_schema)
+        return GroqStructuredLLM(
+            llm_with_schema,
+            context_budget=self.context_budget,
+            model=self.model,
+            temperature=self.temperature,
+            schema=schema,
+            rate_limiter=self.rate_limiter,
+            circuit_breaker=self.circuit_breaker
+        )
     
     def __repr__(self) -> str:
         return f"GroqAdapter(model='{self.model}', temperature={self.temperature})"
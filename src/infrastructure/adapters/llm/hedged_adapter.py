@@ -0,0 +1,262 @@
+"""
+Adaptador compuesto con hedged requests y failover entre proveedores.
+
+Con un único proveedor, su latencia de cola (o una degradación) es la
+latencia de cola del análisis. HedgedAdapter agrupa varios adaptadores en
+orden de preferencia: cada invocación va al primario y, si no respondió
+dentro del percentil configurado de sus latencias recientes, se dispara la
+misma solicitud al siguiente proveedor. Gana la primera respuesta válida y
+las demás se cancelan. Cualquier falla de un proveedor (LLMInferenceError,
+LLMRateLimitError, CircuitOpenError, una respuesta que no valida contra el
+schema o un error inesperado) pasa al siguiente proveedor de inmediato, sin
+esperar el umbral ni cancelar los que siguen en curso.
+
+Environment Variables:
+    LLM_HEDGE_PROVIDERS: Proveedores en orden de preferencia (default: "gemini,groq").
+    LLM_HEDGE_PERCENTILE: Percentil de latencia del proveedor tras el cual se
+        dispara la solicitud de respaldo (default: 95).
+    LLM_HEDGE_INITIAL_DELAY_SECONDS: Umbral usado hasta reunir suficientes
+        muestras de latencia (default: 2.0).
+
+Example:
+    >>> adapter = get_llm_adapter(provider="hedged")
+    >>> structured = adapter.with_structured_output(VideoAnalysis)
+    >>> result = await structured.ainvoke("Analiza este video...")
+"""
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import deque
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Type, TypeVar
+
+from pydantic import BaseModel
+
+from .interface import LLMInterface, StructuredLLM
+from .exceptions import LLMConfigurationError
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T', bound=BaseModel)
+
+
+class LatencyTracker:
+    """
+    Ventana deslizante de latencias exitosas de un proveedor.
+
+    Attributes:
+        window: Cantidad de muestras retenidas.
+        min_samples: Muestras necesarias antes de confiar en el percentil.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: deque = deque(maxlen=window)
+        self._lock = Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Percentil de las latencias registradas.
+
+        Returns:
+            Latencia en segundos, o None si aún no hay ``min_samples`` muestras.
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = max(0, math.ceil(percentile / 100 * len(ordered)) - 1)
+        return ordered[index]
+
+
+class HedgedStructuredLLM(StructuredLLM[T]):
+    """
+    StructuredLLM que reparte cada invocación entre varios proveedores.
+
+    Los proveedores se prueban en orden; el siguiente se dispara cuando el
+    último lanzado supera su umbral de latencia o cuando falla.
+    """
+
+    provider = "hedged"
+
+    def __init__(
+        self,
+        llms: Sequence[StructuredLLM[T]],
+        trackers: Sequence[LatencyTracker],
+        percentile: float = 95.0,
+        initial_delay_seconds: float = 2.0,
+        schema: Type[T] = None
+    ):
+        """
+        Args:
+            llms: StructuredLLM de cada proveedor, en orden de preferencia.
+            trackers: Latencias de cada proveedor (compartidas entre schemas).
+            percentile: Percentil de latencia que dispara la solicitud de respaldo.
+            initial_delay_seconds: Umbral mientras no haya suficientes muestras.
+            schema: Clase Pydantic de la respuesta.
+        """
+        self.llms = list(llms)
+        self.trackers = list(trackers)
+        self.percentile = percentile
+        self.initial_delay_seconds = initial_delay_seconds
+        self.model = "+".join(f"{llm.provider}:{llm.model}" for llm in self.llms)
+        self.temperature = self.llms[0].temperature
+        self.schema = schema
+
+    def hedge_delay(self, index: int) -> float:
+        """Segundos a esperar al proveedor ``index`` antes de disparar el siguiente."""
+        delay = self.trackers[index].percentile(self.percentile)
+        return self.initial_delay_seconds if delay is None else delay
+
+    async def ainvoke(self, prompt: str) -> T:
+        """
+        Devuelve la primera respuesta válida entre los proveedores.
+
+        Args:
+            prompt: Texto de entrada para el modelo.
+
+        Returns:
+            Instancia del schema Pydantic.
+
+        Raises:
+            Exception: La última falla, si ningún proveedor respondió correctamente.
+        """
+        pending: Dict[asyncio.Task, int] = {}
+        errors: List[Exception] = []
+        launched = 0
+
+        def launch() -> None:
+            nonlocal launched
+            pending[asyncio.ensure_future(self._timed_invoke(launched, prompt))] = launched
+            launched += 1
+
+        launch()
+        try:
+            while pending:
+                can_hedge = launched < len(self.llms)
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_delay(launched - 1) if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    logger.info(
+                        f"Hedge: {self.llms[launched - 1].provider} superó su umbral de latencia, "
+                        f"se consulta también a {self.llms[launched].provider}"
+                    )
+                    launch()
+                    continue
+                for task in done:
+                    index = pending.pop(task)
+                    try:
+                        return task.result()
+                    except Exception as e:
+                        logger.warning(f"Failover: {self.llms[index].provider} falló: {e}")
+                        errors.append(e)
+                if not pending and launched < len(self.llms):
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise errors[-1]
+
+    async def _timed_invoke(self, index: int, prompt: str) -> T:
+        started = time.monotonic()
+        result = await self.llms[index].ainvoke(prompt)
+        self.trackers[index].record(time.monotonic() - started)
+        return result
+
+    def __repr__(self) -> str:
+        return f"HedgedStructuredLLM({self.model})"
+
+
+class HedgedAdapter(LLMInterface[T]):
+    """
+    Adaptador compuesto sobre varios proveedores configurados.
+
+    Attributes:
+        adapters: Adaptadores en orden de preferencia (el primero es el primario).
+        model: Modelos combinados, p. ej. "gemini-2.0-flash+llama-3.3-70b-versatile".
+        temperature: Temperatura del primario.
+        context_budget: El presupuesto más restrictivo entre los proveedores, para
+            que cualquier prompt admitido entre en todos.
+
+    Raises:
+        LLMConfigurationError: Si hay menos de dos proveedores.
+    """
+
+    provider = "hedged"
+
+    # Los modelos son los de cada proveedor agrupado
+    AVAILABLE_MODELS: Dict[str, str] = {}
+
+    def __init__(
+        self,
+        adapters: Optional[Sequence[LLMInterface]] = None,
+        percentile: Optional[float] = None,
+        initial_delay_seconds: Optional[float] = None
+    ):
+        """
+        Inicializa el adaptador compuesto.
+
+        Args:
+            adapters: Adaptadores a combinar. Si no se especifican, se crean
+                     los de LLM_HEDGE_PROVIDERS con la factory.
+            percentile: Percentil de latencia (default: LLM_HEDGE_PERCENTILE).
+            initial_delay_seconds: Umbral inicial (default: LLM_HEDGE_INITIAL_DELAY_SECONDS).
+        """
+        if adapters is None:
+            from .factory import get_llm_adapter
+
+            names = [
+                name.strip()
+                for name in os.getenv("LLM_HEDGE_PROVIDERS", "gemini,groq").split(",")
+                if name.strip()
+            ]
+            if "hedged" in names:
+                raise LLMConfigurationError("LLM_HEDGE_PROVIDERS no puede incluir 'hedged'.")
+            adapters = [get_llm_adapter(name) for name in names]
+        if len(adapters) < 2:
+            raise LLMConfigurationError("El proveedor 'hedged' requiere al menos dos proveedores.")
+
+        self.adapters = list(adapters)
+        self.percentile = percentile if percentile is not None else float(
+            os.getenv("LLM_HEDGE_PERCENTILE", "95")
+        )
+        self.initial_delay_seconds = initial_delay_seconds if initial_delay_seconds is not None else float(
+            os.getenv("LLM_HEDGE_INITIAL_DELAY_SECONDS", "2.0")
+        )
+        self.trackers = [LatencyTracker() for _ in self.adapters]
+        self.model = "+".join(adapter.model for adapter in self.adapters)
+        self.temperature = self.adapters[0].temperature
+        budgets = [adapter.context_budget for adapter in self.adapters if adapter.context_budget is not None]
+        self.context_budget = min(budgets, key=lambda budget: budget.max_prompt_tokens, default=None)
+
+    def with_structured_output(self, schema: Type[T]) -> HedgedStructuredLLM[T]:
+        """
+        Configura todos los proveedores para devolver el schema indicado.
+
+        Args:
+            schema: Clase Pydantic que define la estructura de respuesta.
+
+        Returns:
+            HedgedStructuredLLM sobre los StructuredLLM de cada proveedor.
+        """
+        return HedgedStructuredLLM(
+            [adapter.with_structured_output(schema) for adapter in self.adapters],
+            self.trackers,
+            percentile=self.percentile,
+            initial_delay_seconds=self.initial_delay_seconds,
+            schema=schema
+        )
+
+    def __repr__(self) -> str:
+        return f"HedgedAdapter(model='{self.model}', percentile={self.percentile})"
@@ -16,11 +16,16 @@ Example:
     >>> result = await structured_llm.ainvoke("Analiza este texto...")
 """
 from abc import ABC, abstractmethod
-from typing import Type, TypeVar, Generic
+from typing import Optional, Type, TypeVar, Generic, TYPE_CHECKING
 
 from pydantic import BaseModel
 
 
+if TYPE_CHECKING:
+    from .rate_limiter import TokenBucketLimiter
+    from .tokens import ContextBudget
+
+
 T = TypeVar('T', bound=BaseModel)
 
 
@@ -32,14 +37,23 @@ class LLMInterface(ABC, Generic[T]):
     para ser compatible con el sistema de análisis de videos.
     
     Attributes:
+        provider: Nombre del proveedor (gemini, groq, hedged).
         model: Nombre del modelo a utilizar.
         temperature: Parámetro de creatividad (0 = determinístico, 1 = creativo).
+        context_budget: Presupuesto de tokens de entrada del modelo, o None si
+            no se conocen sus límites (no se valida el tamaño del prompt).
+        rate_limiter: Limitador RPM/TPM del modelo, o None si no hay límites
+            conocidos o el rate limiting está deshabilitado.
     
     Note:
         Los adaptadores concretos (GeminiAdapter, GroqAdapter) deben implementar
         todos los métodos abstractos definidos aquí.
     """
     
+    provider: str
+    context_budget: Optional['ContextBudget'] = None
+    rate_limiter: Optional['TokenBucketLimiter'] = None
+    
     @abstractmethod
     def with_structured_output(self, schema: Type[T]) -> 'StructuredLLM[T]':
         """
@@ -66,8 +80,19 @@ class StructuredLLM(ABC, Generic[T]):
     
     Encapsula la lógica de parsing y validación de respuestas del LLM
     contra un schema Pydantic específico.
+    
+    Attributes:
+        provider: Nombre del proveedor (gemini, groq, etc.)
+        model: Modelo que responde.
+        temperature: Temperatura de muestreo del modelo.
+        schema: Clase Pydantic de la respuesta.
     """
     
+    provider: str
+    model: str
+    temperature: float
+    schema: Type[T]
+    
     @abstractmethod
     async def ainvoke(self, prompt: str) -> T:
         """
@@ -0,0 +1,215 @@
+"""
+Micro-batching de prompts cortos en una sola llamada estructurada.
+
+Con muchos clips cortos (shorts) en simultáneo, el costo de cada análisis lo
+domina el overhead por llamada: framing del prompt, round trip y cupo de
+RPM. El micro-batcher retiene los prompts cortos durante unos milisegundos,
+los envía juntos en una única solicitud cuyo schema es una lista de
+respuestas identificadas por ``item_id`` y entrega a cada llamador la suya.
+Los ítems que faltan o no validan en la respuesta combinada (o todos, si la
+llamada combinada falla) se reintentan con llamadas individuales.
+
+Los prompts largos no esperan: van directo al StructuredLLM individual.
+
+Environment Variables:
+    LLM_MICRO_BATCH_ENABLED: Habilita el micro-batching (default: false).
+    LLM_MICRO_BATCH_MAX_SIZE: Prompts por llamada combinada (default: 8).
+    LLM_MICRO_BATCH_MAX_WAIT_MS: Espera máxima para juntar un lote (default: 10).
+    LLM_MICRO_BATCH_MAX_ITEM_TOKENS: Tokens máximos de un prompt para entrar a un
+        lote (default: 2000).
+
+Example:
+    >>> batched = with_micro_batching(adapter.with_structured_output(VideoAnalysis), adapter, VideoAnalysis)
+    >>> results = await asyncio.gather(*(batched.ainvoke(p) for p in prompts))  # 1 llamada
+"""
+import asyncio
+import logging
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError, create_model
+
+from .interface import LLMInterface, StructuredLLM
+from .tokens import TokenCounter
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T', bound=BaseModel)
+
+BATCH_PROMPT = (
+    "Resuelve de forma independiente cada una de las siguientes solicitudes. "
+    "Devuelve exactamente un elemento en items por solicitud, con su item_id:\n\n"
+)
+
+
+@lru_cache(maxsize=None)
+def batch_schema(schema: Type[BaseModel]) -> Type[BaseModel]:
+    """
+    Schema de la respuesta combinada: ``{"items": [{item_id, ...campos de schema}]}``.
+
+    Se crea una única vez por schema (los proveedores cachean el JSON Schema).
+    """
+    item = create_model(f"{schema.__name__}BatchItem", __base__=schema, item_id=(str, ...))
+    return create_model(f"{schema.__name__}Batch", items=(List[item], ...))
+
+
+class MicroBatchingStructuredLLM(StructuredLLM[T]):
+    """
+    Decorador de StructuredLLM que agrupa prompts cortos concurrentes.
+
+    Attributes:
+        max_batch_size: Prompts por llamada combinada.
+        max_wait_seconds: Espera máxima del primer prompt de un lote.
+        max_item_tokens: Prompts más largos se envían de forma individual.
+    """
+
+    def __init__(
+        self,
+        single: StructuredLLM[T],
+        batch: StructuredLLM,
+        max_batch_size: int = 8,
+        max_wait_seconds: float = 0.01,
+        max_item_tokens: int = 2000
+    ):
+        """
+        Args:
+            single: StructuredLLM del schema individual (fallback y prompts largos).
+            batch: StructuredLLM del mismo proveedor para ``batch_schema(schema)``.
+            max_batch_size: Prompts por llamada combinada.
+            max_wait_seconds: Espera máxima para juntar un lote.
+            max_item_tokens: Tokens máximos de un prompt para entrar a un lote.
+        """
+        self.single = single
+        self.batch = batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.max_item_tokens = max_item_tokens
+        self.provider = single.provider
+        self.model = single.model
+        self.temperature = single.temperature
+        self.schema = single.schema
+        self.context_budget = getattr(single, "context_budget", None)
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Referencias a los despachos en curso (el loop solo guarda referencias débiles)
+        self._dispatches: Set[asyncio.Future] = set()
+
+    async def ainvoke(self, prompt: str) -> T:
+        """
+        Encola el prompt en el lote en formación y espera su respuesta.
+
+        Args:
+            prompt: Texto de entrada para el modelo.
+
+        Returns:
+            Instancia del schema Pydantic.
+        """
+        if self._measure(prompt) > self.max_item_tokens or self.max_batch_size < 2:
+            return await self.single.ainvoke(prompt)
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Lote en formación de otro loop (p. ej. entre tests): se descarta
+            self._loop, self._pending, self._flush_handle = loop, [], None
+        future = loop.create_future()
+        self._pending.append((prompt, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_seconds, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        """Despacha el lote en formación (por tamaño o al vencer la espera)."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        pending = [(prompt, future) for prompt, future in pending if not future.done()]
+        if pending:
+            dispatch = asyncio.ensure_future(self._dispatch(pending))
+            self._dispatches.add(dispatch)
+            dispatch.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, pending: List[Tuple[str, asyncio.Future]]) -> None:
+        if len(pending) == 1:
+            await self._invoke_single(*pending[0])
+            return
+
+        results: Dict[str, T] = {}
+        try:
+            response = await self.batch.ainvoke(self._batch_prompt([prompt for prompt, _ in pending]))
+            for item in response.items:
+                try:
+                    results[item.item_id] = self.schema.model_validate(item.model_dump(exclude={"item_id"}))
+                except ValidationError as e:
+                    logger.warning(f"Micro-batch: ítem {item.item_id} inválido: {e}")
+        except Exception as e:
+            logger.warning(f"Micro-batch de {len(pending)} prompts falló, se reintenta individualmente: {e}")
+
+        retries = []
+        for index, (prompt, future) in enumerate(pending):
+            result = results.get(str(index))
+            if result is None:
+                retries.append(self._invoke_single(prompt, future))
+            elif not future.done():
+                future.set_result(result)
+        if retries:
+            logger.info(f"Micro-batch: {len(retries)}/{len(pending)} prompts reintentados individualmente")
+            await asyncio.gather(*retries)
+
+    async def _invoke_single(self, prompt: str, future: asyncio.Future) -> None:
+        try:
+            result = await self.single.ainvoke(prompt)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(result)
+
+    @staticmethod
+    def _batch_prompt(prompts: List[str]) -> str:
+        sections = [f"### item_id: {index}\n{prompt}" for index, prompt in enumerate(prompts)]
+        return BATCH_PROMPT + "\n\n".join(sections)
+
+    def _measure(self, prompt: str) -> int:
+        budget = self.context_budget
+        return budget.measure(prompt) if budget is not None else TokenCounter().count(prompt)
+
+    def __repr__(self) -> str:
+        return (
+            f"MicroBatchingStructuredLLM({self.provider}:{self.model}, "
+            f"max_batch_size={self.max_batch_size})"
+        )
+
+
+def with_micro_batching(
+    structured_llm: StructuredLLM[T],
+    adapter: LLMInterface,
+    schema: Type[T]
+) -> StructuredLLM[T]:
+    """
+    Antepone el micro-batcher a un StructuredLLM según variables de entorno.
+
+    Args:
+        structured_llm: StructuredLLM individual devuelto por ``adapter.with_structured_output``.
+        adapter: Adaptador que lo creó (para el StructuredLLM del schema combinado).
+        schema: Clase Pydantic de la respuesta individual.
+
+    Returns:
+        MicroBatchingStructuredLLM, o el mismo objeto si está deshabilitado.
+    """
+    if os.getenv("LLM_MICRO_BATCH_ENABLED", "false").lower() != "true":
+        return structured_llm
+
+    return MicroBatchingStructuredLLM(
+        structured_llm,
+        adapter.with_structured_output(batch_schema(schema)),
+        max_batch_size=int(os.getenv("LLM_MICRO_BATCH_MAX_SIZE", "8")),
+        max_wait_seconds=int(os.getenv("LLM_MICRO_BATCH_MAX_WAIT_MS", "10")) / 1000,
+        max_item_tokens=int(os.getenv("LLM_MICRO_BATCH_MAX_ITEM_TOKENS", "2000"))
+    )
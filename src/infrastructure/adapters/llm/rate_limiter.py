@@ -0,0 +1,276 @@
+"""
+Rate limiting del lado del cliente por proveedor y modelo.
+
+Cada proveedor publica límites de solicitudes por minuto (RPM) y tokens por
+minuto (TPM). Sin control local, una ráfaga de análisis los excede, recibe
+429 y los reintentos vuelven a golpear la API en el peor momento. El
+limitador mantiene dos token buckets (RPM y TPM estimados) por
+proveedor+modelo, compartidos por todos los StructuredLLM del proceso: quien
+no tiene presupuesto espera en una cola FIFO en lugar de llamar a la API, y
+un 429 bloquea el bucket durante el ``retry_after_seconds`` informado.
+
+Environment Variables:
+    LLM_RATE_LIMIT_ENABLED: Habilita el limitador (default: true).
+    GEMINI_RATE_LIMIT_RPM / GEMINI_RATE_LIMIT_TPM: Reemplazan los límites
+        catalogados del modelo de Gemini (p. ej. para planes pagos).
+    GROQ_RATE_LIMIT_RPM / GROQ_RATE_LIMIT_TPM: Ídem para Groq.
+
+Example:
+    >>> limiter = get_rate_limiter("groq", "llama-3.3-70b-versatile", RateLimits(30, 6000))
+    >>> await limiter.acquire(tokens=1200)
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .exceptions import LLMRateLimitError
+
+
+logger = logging.getLogger(__name__)
+
+# Tokens de salida estimados por respuesta estructurada (cuentan para el TPM)
+ESTIMATED_COMPLETION_TOKENS = 256
+# Bloqueo aplicado ante un 429 sin Retry-After
+DEFAULT_RETRY_AFTER_SECONDS = 5.0
+MAX_ATTEMPTS = 3
+
+
+@dataclass(frozen=True)
+class RateLimits:
+    """
+    Límites de uso de un modelo (None = sin límite en esa dimensión).
+
+    Attributes:
+        requests_per_minute: Solicitudes por minuto.
+        tokens_per_minute: Tokens (entrada + salida) por minuto.
+    """
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets de solicitudes y tokens con cola FIFO de espera.
+
+    Los buckets arrancan llenos (admiten una ráfaga de hasta un minuto de
+    cupo) y se recargan de forma continua. Quien no tiene cupo retiene el
+    turno de la cola mientras espera, de modo que los llamadores se atienden
+    en orden de llegada y uno grande no es postergado indefinidamente.
+
+    Attributes:
+        name: Identificador (proveedor:modelo) usado en logs.
+        limits: Límites configurados.
+    """
+
+    def __init__(self, limits: RateLimits, name: str = ""):
+        self.name = name
+        self.limits = limits
+        self._requests = float(limits.requests_per_minute or 0)
+        self._tokens = float(limits.tokens_per_minute or 0)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiting = 0
+        self._total_wait_seconds = 0.0
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """
+        Espera (en orden de llegada) hasta que haya cupo y lo consume.
+
+        Args:
+            tokens: Tokens estimados de la solicitud. Si superan el TPM
+                   completo se limitan al TPM para no esperar para siempre.
+
+        Returns:
+            Segundos esperados.
+        """
+        rpm, tpm = self.limits.requests_per_minute, self.limits.tokens_per_minute
+        tokens = min(tokens, tpm) if tpm else 0
+        started = time.monotonic()
+        self._waiting += 1
+        try:
+            async with self._get_lock():
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    wait = self._blocked_until - now
+                    if rpm:
+                        wait = max(wait, (1 - self._requests) * 60 / rpm)
+                    if tpm:
+                        wait = max(wait, (tokens - self._tokens) * 60 / tpm)
+                    if wait <= 0:
+                        break
+                    await asyncio.sleep(wait)
+                if rpm:
+                    self._requests -= 1
+                if tpm:
+                    self._tokens -= tokens
+        finally:
+            self._waiting -= 1
+        waited = time.monotonic() - started
+        self._total_wait_seconds += waited
+        if waited > 1:
+            logger.info(f"Rate limit {self.name}: solicitud demorada {waited:.1f}s")
+        return waited
+
+    def penalize(self, retry_after_seconds: float) -> None:
+        """Bloquea el bucket (p. ej. tras un 429) durante los segundos indicados."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Instantánea del cupo disponible y la cola de espera."""
+        self._refill(time.monotonic())
+        return {
+            "name": self.name,
+            "requests_available": self._requests,
+            "tokens_available": self._tokens,
+            "waiting": self._waiting,
+            "blocked_for_seconds": max(0.0, self._blocked_until - time.monotonic()),
+            "total_wait_seconds": self._total_wait_seconds,
+        }
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        if self.limits.requests_per_minute:
+            rpm = self.limits.requests_per_minute
+            self._requests = min(rpm, self._requests + elapsed * rpm / 60)
+        if self.limits.tokens_per_minute:
+            tpm = self.limits.tokens_per_minute
+            self._tokens = min(tpm, self._tokens + elapsed * tpm / 60)
+
+    def _get_lock(self) -> asyncio.Lock:
+        """Lock FIFO del loop actual (se recrea si el loop cambia, p. ej. entre tests)."""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    def __repr__(self) -> str:
+        return (
+            f"TokenBucketLimiter(name='{self.name}', rpm={self.limits.requests_per_minute}, "
+            f"tpm={self.limits.tokens_per_minute})"
+        )
+
+
+# Un limitador por proveedor+modelo, compartido por todos los adaptadores del proceso
+_limiters: Dict[Tuple[str, str], TokenBucketLimiter] = {}
+
+
+def get_rate_limiter(provider: str, model: str, limits: Optional[RateLimits]) -> Optional[TokenBucketLimiter]:
+    """
+    Devuelve el limitador compartido de un proveedor+modelo.
+
+    Las variables ``{PROVIDER}_RATE_LIMIT_RPM`` y ``{PROVIDER}_RATE_LIMIT_TPM``
+    reemplazan los límites catalogados.
+
+    Args:
+        provider: Nombre del proveedor (gemini, groq).
+        model: Modelo configurado.
+        limits: Límites catalogados del modelo (None si no se conocen).
+
+    Returns:
+        TokenBucketLimiter, o None si está deshabilitado o no hay límites.
+    """
+    if os.getenv("LLM_RATE_LIMIT_ENABLED", "true").lower() != "true":
+        return None
+
+    prefix = provider.upper()
+    rpm = os.getenv(f"{prefix}_RATE_LIMIT_RPM")
+    tpm = os.getenv(f"{prefix}_RATE_LIMIT_TPM")
+    limits = limits or RateLimits()
+    limits = RateLimits(
+        requests_per_minute=int(rpm) if rpm else limits.requests_per_minute,
+        tokens_per_minute=int(tpm) if tpm else limits.tokens_per_minute,
+    )
+    if not limits.requests_per_minute and not limits.tokens_per_minute:
+        return None
+
+    key = (provider, model)
+    limiter = _limiters.get(key)
+    if limiter is None or limiter.limits != limits:
+        limiter = _limiters[key] = TokenBucketLimiter(limits, name=f"{provider}:{model}")
+    return limiter
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Indica si una excepción del SDK del proveedor corresponde a un HTTP 429."""
+    if isinstance(error, LLMRateLimitError):
+        return True
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    return status == 429 or "RateLimit" in type(error).__name__
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Extrae el Retry-After (segundos) de una excepción de rate limit, si lo trae."""
+    if isinstance(error, LLMRateLimitError):
+        return error.retry_after_seconds
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        value = headers.get("retry-after")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+async def ainvoke_with_rate_limit(
+    call: Callable[[str], Awaitable[Any]],
+    prompt: str,
+    limiter: Optional[TokenBucketLimiter],
+    tokens: int,
+    provider: str,
+    model: str
+) -> Any:
+    """
+    Invoca al proveedor respetando el limitador, con reintentos.
+
+    Cada intento pasa por el limitador. Un 429 bloquea el bucket durante su
+    Retry-After, por lo que el reintento (y cualquier otra solicitud al mismo
+    modelo) espera en la cola en vez de volver a golpear la API; el resto de
+    las fallas se reintenta con backoff exponencial con jitter.
+
+    Args:
+        call: Invocación asíncrona del modelo (recibe el prompt).
+        prompt: Prompt ya validado contra el presupuesto de contexto.
+        limiter: Limitador del modelo (None = sin límite).
+        tokens: Tokens estimados de entrada de la solicitud.
+        provider: Proveedor (para el error).
+        model: Modelo (para el error).
+
+    Returns:
+        El resultado de ``call``.
+
+    Raises:
+        LLMRateLimitError: Si el último intento recibió un 429.
+        Exception: La falla del último intento, tal como la lanzó el SDK.
+    """
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        if limiter is not None:
+            await limiter.acquire(tokens + ESTIMATED_COMPLETION_TOKENS)
+        try:
+            return await call(prompt)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                retry_after = retry_after_seconds(e)
+                delay = retry_after or DEFAULT_RETRY_AFTER_SECONDS
+                if limiter is not None:
+                    limiter.penalize(delay)
+                if attempt == MAX_ATTEMPTS:
+                    raise LLMRateLimitError(
+                        f"Rate limit de {provider} ({model}): {e}",
+                        retry_after_seconds=retry_after
+                    ) from e
+                logger.warning(f"429 de {provider}:{model}, reintento en {delay}s")
+                if limiter is None:
+                    await asyncio.sleep(delay)
+                continue
+            if attempt == MAX_ATTEMPTS:
+                raise
+            await asyncio.sleep(min(2 ** (attempt - 1), 10) + random.uniform(0, 1))
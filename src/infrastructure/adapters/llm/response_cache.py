@@ -0,0 +1,312 @@
+"""
+Cache de respuestas estructuradas del LLM.
+
+Decorador de StructuredLLM que evita llamar al proveedor ante prompts
+idénticos (re-envíos tras borrar un VideoRecord, reintentos después de una
+falla de persistencia, backfills). La clave combina proveedor, modelo,
+temperatura, nombre y versión del schema y un hash del prompt; la versión del
+schema es un hash de su JSON Schema, por lo que cambiar el modelo Pydantic
+invalida las entradas anteriores automáticamente.
+
+Se guarda el JSON ya validado y se rehidrata con ``model_validate_json``:
+un acierto cuesta microsegundos.
+
+Dentro de ``bypass_response_cache()`` (un re-análisis con force_refresh) no se
+consulta la cache: se invoca al proveedor y su respuesta reemplaza a la guardada.
+
+Niveles:
+    - Memoria: LRU por proceso acotado por ``LLM_RESPONSE_CACHE_MAX_ENTRIES``.
+    - Persistente: tabla LLMResponseCacheEntry, compartida entre réplicas.
+
+Environment Variables:
+    LLM_RESPONSE_CACHE_ENABLED: Habilita la cache (default: true).
+    LLM_RESPONSE_CACHE_PERSISTENT: Usa también la tabla en base de datos (default: true).
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: Entradas del LRU en memoria (default: 1024).
+    LLM_RESPONSE_CACHE_TTL_SECONDS: Vigencia de una respuesta (default: 604800, 0 = no expira).
+    LLM_RESPONSE_CACHE_EVICT_EVERY: Escrituras entre dos borrados de filas vencidas (default: 100).
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+from functools import lru_cache
+from threading import Lock
+from typing import Iterator, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from .interface import StructuredLLM
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T', bound=BaseModel)
+
+# Activo mientras se ejecuta un análisis que debe ignorar las respuestas cacheadas
+_bypass = ContextVar("llm_response_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_response_cache() -> Iterator[None]:
+    """
+    Ignora las respuestas cacheadas en las invocaciones hechas dentro del bloque.
+
+    Las respuestas nuevas se siguen guardando, reemplazando a las anteriores.
+    El valor viaja con el contexto, por lo que alcanza a las tareas que el
+    grafo crea dentro del bloque (p. ej. los fragmentos de la rama map-reduce).
+    """
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+@lru_cache(maxsize=None)
+def schema_version(schema: Type[BaseModel]) -> str:
+    """Hash corto del JSON Schema del modelo: cambia si cambian sus campos o validaciones."""
+    raw = json.dumps(schema.model_json_schema(), sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def response_cache_key(
+    provider: str,
+    model: str,
+    temperature: float,
+    schema: Type[BaseModel],
+    prompt: str
+) -> str:
+    """
+    Clave de cache de una invocación estructurada.
+
+    Returns:
+        Hash SHA-256 hexadecimal de los parámetros que determinan la respuesta.
+    """
+    parts = {
+        "provider": provider,
+        "model": model,
+        "temperature": temperature,
+        "schema": f"{schema.__module__}.{schema.__qualname__}",
+        "schema_version": schema_version(schema),
+        "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class InMemoryResponseCache:
+    """
+    LRU en memoria con TTL (JSON serializado por clave).
+
+    Attributes:
+        max_entries: Cantidad máxima de respuestas retenidas.
+        ttl_seconds: Vigencia de una entrada (0 = no expira).
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: int = 0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, raw = entry
+            if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return raw
+
+    def set(self, key: str, raw: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), raw)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DatabaseResponseCache:
+    """
+    Cache persistente en la tabla LLMResponseCacheEntry (ORM asíncrono).
+
+    Las filas vencidas se borran cada ``evict_every`` escrituras; entre
+    pasadas pueden quedar filas vencidas, que la lectura ya ignora.
+
+    Attributes:
+        ttl_seconds: Vigencia de una entrada (0 = no expira).
+        evict_every: Escrituras entre dos borrados de filas vencidas.
+    """
+
+    def __init__(self, ttl_seconds: int = 0, evict_every: int = 100):
+        self.ttl_seconds = ttl_seconds
+        self.evict_every = max(evict_every, 1)
+        self._writes = 0
+        self._writes_lock = Lock()
+
+    async def aget(self, key: str) -> Optional[str]:
+        from django.utils import timezone
+        from infrastructure.persistence.models import LLMResponseCacheEntry
+
+        entries = LLMResponseCacheEntry.objects.filter(key=key)
+        if self.ttl_seconds:
+            entries = entries.filter(created_at__gte=timezone.now() - timedelta(seconds=self.ttl_seconds))
+        entry = await entries.only("response").afirst()
+        return entry.response if entry is not None else None
+
+    async def aset(self, key: str, raw: str, provider: str, model: str, schema: str) -> None:
+        from django.utils import timezone
+        from infrastructure.persistence.models import LLMResponseCacheEntry
+
+        await LLMResponseCacheEntry.objects.aupdate_or_create(
+            key=key,
+            defaults={
+                "provider": provider,
+                "model": model,
+                "schema": schema,
+                "response": raw,
+                "created_at": timezone.now(),
+            }
+        )
+        if self.ttl_seconds and self._eviction_due():
+            await self.aevict()
+
+    async def aevict(self) -> int:
+        """
+        Borra las respuestas vencidas.
+
+        Returns:
+            Cantidad de filas eliminadas (0 si las entradas no expiran).
+        """
+        from django.utils import timezone
+        from infrastructure.persistence.models import LLMResponseCacheEntry
+
+        if not self.ttl_seconds:
+            return 0
+        cutoff = timezone.now() - timedelta(seconds=self.ttl_seconds)
+        deleted, _ = await LLMResponseCacheEntry.objects.filter(created_at__lt=cutoff).adelete()
+        return deleted
+
+    def _eviction_due(self) -> bool:
+        """Cuenta la escritura e indica si toca borrar las filas vencidas."""
+        with self._writes_lock:
+            self._writes += 1
+            return self._writes % self.evict_every == 0
+
+
+class CachedStructuredLLM(StructuredLLM[T]):
+    """
+    Decorador de StructuredLLM con cache en memoria y persistente.
+
+    Las fallas del nivel persistente se registran y se tratan como un miss:
+    nunca impiden obtener la respuesta del proveedor.
+    """
+
+    def __init__(
+        self,
+        inner: StructuredLLM[T],
+        memory: InMemoryResponseCache,
+        persistent: Optional[DatabaseResponseCache] = None
+    ):
+        """
+        Args:
+            inner: StructuredLLM del proveedor (con provider, model, temperature y schema).
+            memory: Nivel LRU en memoria.
+            persistent: Nivel persistente opcional.
+        """
+        self.inner = inner
+        self.memory = memory
+        self.persistent = persistent
+        self.provider = inner.provider
+        self.model = inner.model
+        self.temperature = inner.temperature
+        self.schema = inner.schema
+        self.context_budget = getattr(inner, "context_budget", None)
+
+    async def ainvoke(self, prompt: str) -> T:
+        """
+        Devuelve la respuesta cacheada o invoca al proveedor y la guarda.
+
+        Dentro de ``bypass_response_cache()`` siempre invoca al proveedor.
+
+        Args:
+            prompt: Texto de entrada para el modelo.
+
+        Returns:
+            Instancia del schema Pydantic.
+        """
+        key = response_cache_key(self.provider, self.model, self.temperature, self.schema, prompt)
+
+        if not _bypass.get():
+            raw = await self._lookup(key)
+            if raw is not None:
+                logger.debug(f"Respuesta LLM desde cache ({self.provider}:{self.model})")
+                return self.schema.model_validate_json(raw)
+
+        result = await self.inner.ainvoke(prompt)
+        raw = result.model_dump_json()
+        self.memory.set(key, raw)
+        if self.persistent is not None:
+            try:
+                await self.persistent.aset(
+                    key, raw, self.provider, self.model, self.schema.__qualname__
+                )
+            except Exception as e:
+                logger.warning(f"Error escribiendo la cache de respuestas LLM: {e}")
+        return result
+
+    async def _lookup(self, key: str) -> Optional[str]:
+        """Busca la respuesta en memoria y luego en el nivel persistente."""
+        raw = self.memory.get(key)
+        if raw is None and self.persistent is not None:
+            try:
+                raw = await self.persistent.aget(key)
+            except Exception as e:
+                logger.warning(f"Error leyendo la cache de respuestas LLM: {e}")
+            if raw is not None:
+                self.memory.set(key, raw)
+        return raw
+
+    def __repr__(self) -> str:
+        return f"CachedStructuredLLM({self.provider}:{self.model}, schema={self.schema.__qualname__})"
+
+
+def with_response_cache(structured_llm: StructuredLLM[T]) -> StructuredLLM[T]:
+    """
+    Envuelve un StructuredLLM con la cache de respuestas según variables de entorno.
+
+    Args:
+        structured_llm: StructuredLLM devuelto por ``adapter.with_structured_output``.
+
+    Returns:
+        CachedStructuredLLM, o el mismo objeto si la cache está deshabilitada.
+    """
+    if os.getenv("LLM_RESPONSE_CACHE_ENABLED", "true").lower() != "true":
+        return structured_llm
+
+    ttl_seconds = int(os.getenv("LLM_RESPONSE_CACHE_TTL_SECONDS", "604800"))
+    memory = InMemoryResponseCache(
+        max_entries=int(os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES", "1024")),
+        ttl_seconds=ttl_seconds
+    )
+    persistent = None
+    if os.getenv("LLM_RESPONSE_CACHE_PERSISTENT", "true").lower() == "true":
+        persistent = DatabaseResponseCache(
+            ttl_seconds=ttl_seconds,
+            evict_every=int(os.getenv("LLM_RESPONSE_CACHE_EVICT_EVERY", "100"))
+        )
+    return CachedStructuredLLM(structured_llm, memory, persistent)
@@ -0,0 +1,213 @@
+"""
+Ruteo de modelos por tamaño de transcripción y nivel de latencia.
+
+La mayoría de los videos son cortos y no necesitan el modelo más grande del
+proveedor. El router elige, por solicitud, el modelo de la tabla de ruteo
+según los tokens del prompt, el nivel de latencia pedido y la ventana de
+contexto de cada modelo: modelos chicos y rápidos para clips cortos, modelos
+de contexto largo para videos largos. Los adaptadores de cada modelo se
+crean a demanda y se reutilizan.
+
+La tabla se evalúa en orden y gana la primera ruta cuyo nivel coincide, cuyo
+``max_tokens`` cubre el prompt y cuyo modelo tiene ventana suficiente. Si
+ninguna entra, se usa la de mayor ventana (la transcripción se fragmenta).
+
+Environment Variables:
+    LLM_ROUTING_ENABLED: Habilita el ruteo (default: false = siempre el modelo configurado).
+    LLM_ROUTING_TABLE: Tabla JSON, p. ej.
+        '[{"tier": "fast", "provider": "groq", "model": "llama-3.1-8b-instant"},
+          {"max_tokens": 8000, "provider": "groq", "model": "llama-3.1-8b-instant"},
+          {"provider": "groq", "model": "llama-3.3-70b-versatile"}]'.
+        Sin tabla se usa la predeterminada de LLM_PROVIDER.
+    LLM_DEFAULT_LATENCY_TIER: Nivel de las solicitudes que no piden uno (default: standard).
+
+Example:
+    >>> router = ModelRouter.from_env(get_llm_adapter())
+    >>> route = router.select(tokens=1200, latency_tier="fast")
+    >>> structured = router.structured_llm(route, VideoAnalysis)
+"""
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from .interface import LLMInterface, StructuredLLM
+from .exceptions import LLMConfigurationError
+from .factory import _PROVIDERS, get_llm_adapter, get_provider_class, get_structured_llm
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T', bound=BaseModel)
+
+LATENCY_TIERS = ("fast", "standard", "quality")
+# Comodín de nivel: la ruta aplica a cualquier nivel de latencia
+ANY_TIER = "*"
+
+
+def routing_enabled() -> bool:
+    """Indica si LLM_ROUTING_ENABLED habilita el ruteo (sin crear adaptadores)."""
+    return os.getenv("LLM_ROUTING_ENABLED", "false").lower() == "true"
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """
+    Entrada de la tabla de ruteo.
+
+    Attributes:
+        provider: Proveedor del modelo (gemini, groq).
+        model: Modelo a usar.
+        max_tokens: Tokens de prompt máximos de la ruta (None = sin tope).
+        tier: Nivel de latencia al que aplica ("*" = todos).
+    """
+    provider: str
+    model: str
+    max_tokens: Optional[int] = None
+    tier: str = ANY_TIER
+
+
+# Tablas predeterminadas por proveedor: el modelo liviano para clips cortos
+# (o si se pide baja latencia) y el de mayor calidad para el resto
+DEFAULT_ROUTES: Dict[str, List[ModelRoute]] = {
+    "gemini": [
+        ModelRoute("gemini", "gemini-2.0-flash-lite", tier="fast"),
+        ModelRoute("gemini", "gemini-2.0-flash-lite", max_tokens=8_000, tier="standard"),
+        ModelRoute("gemini", "gemini-2.0-flash"),
+    ],
+    "groq": [
+        ModelRoute("groq", "llama-3.1-8b-instant", tier="fast"),
+        ModelRoute("groq", "llama-3.1-8b-instant", max_tokens=8_000, tier="standard"),
+        ModelRoute("groq", "llama-3.3-70b-versatile"),
+    ],
+}
+
+
+def context_window(provider: str, model: str) -> Optional[int]:
+    """Tokens de entrada que admite un modelo catalogado (None si no se conocen)."""
+    if provider not in _PROVIDERS:
+        return None
+    limits = getattr(get_provider_class(provider), "MODEL_LIMITS", {}).get(model)
+    return limits.context_window - limits.max_output_tokens if limits is not None else None
+
+
+def parse_routing_table(raw: str) -> List[ModelRoute]:
+    """
+    Interpreta la tabla JSON de LLM_ROUTING_TABLE.
+
+    Raises:
+        LLMConfigurationError: Si la tabla no es válida o nombra un proveedor o nivel desconocido.
+    """
+    try:
+        routes = [
+            ModelRoute(
+                provider=entry["provider"],
+                model=entry["model"],
+                max_tokens=entry.get("max_tokens"),
+                tier=entry.get("tier", ANY_TIER)
+            )
+            for entry in json.loads(raw)
+        ]
+    except (ValueError, TypeError, KeyError) as e:
+        raise LLMConfigurationError(f"LLM_ROUTING_TABLE inválida: {e}")
+    for route in routes:
+        if route.provider not in _PROVIDERS or route.provider == "hedged":
+            raise LLMConfigurationError(f"LLM_ROUTING_TABLE: proveedor '{route.provider}' no soportado.")
+        if route.tier != ANY_TIER and route.tier not in LATENCY_TIERS:
+            raise LLMConfigurationError(f"LLM_ROUTING_TABLE: nivel de latencia '{route.tier}' desconocido.")
+    return routes
+
+
+class ModelRouter:
+    """
+    Elige el modelo de cada solicitud y mantiene sus adaptadores.
+
+    Attributes:
+        routes: Tabla de ruteo, en orden de evaluación (vacía = sin ruteo).
+        default_route: Modelo configurado por LLM_PROVIDER / *_MODEL.
+        default_tier: Nivel usado cuando la solicitud no pide uno.
+    """
+
+    def __init__(
+        self,
+        routes: Sequence[ModelRoute],
+        default_adapter: LLMInterface,
+        default_provider: str,
+        default_tier: str = "standard"
+    ):
+        """
+        Args:
+            routes: Tabla de ruteo (vacía = siempre el adaptador por defecto).
+            default_adapter: Adaptador ya creado del modelo configurado.
+            default_provider: Proveedor del adaptador por defecto.
+            default_tier: Nivel de latencia por defecto.
+        """
+        self.routes = list(routes)
+        self.default_route = ModelRoute(default_provider, default_adapter.model)
+        self.default_tier = default_tier
+        self._adapters: Dict[Tuple[str, str], LLMInterface] = {
+            (default_provider, default_adapter.model): default_adapter
+        }
+        self._structured: Dict[Tuple[str, str, Type[BaseModel]], StructuredLLM] = {}
+
+    @classmethod
+    def from_env(cls, default_adapter: LLMInterface, default_provider: Optional[str] = None) -> "ModelRouter":
+        """Crea el router según LLM_ROUTING_ENABLED, LLM_ROUTING_TABLE y LLM_DEFAULT_LATENCY_TIER."""
+        default_provider = (default_provider or os.getenv("LLM_PROVIDER", "gemini")).lower()
+        default_tier = os.getenv("LLM_DEFAULT_LATENCY_TIER", "standard")
+        if default_tier not in LATENCY_TIERS:
+            raise LLMConfigurationError(f"LLM_DEFAULT_LATENCY_TIER '{default_tier}' desconocido.")
+        routes: List[ModelRoute] = []
+        if routing_enabled():
+            raw = os.getenv("LLM_ROUTING_TABLE")
+            routes = parse_routing_table(raw) if raw else DEFAULT_ROUTES.get(default_provider, [])
+        return cls(routes, default_adapter, default_provider, default_tier)
+
+    def select(self, tokens: int, latency_tier: Optional[str] = None) -> ModelRoute:
+        """
+        Elige el modelo para un prompt.
+
+        Args:
+            tokens: Tokens estimados del prompt.
+            latency_tier: "fast", "standard" o "quality" (None = nivel por defecto).
+
+        Returns:
+            La ruta elegida (``default_route`` si no hay tabla o ninguna ruta aplica al nivel).
+        """
+        tier = latency_tier or self.default_tier
+        candidates = [route for route in self.routes if route.tier in (ANY_TIER, tier)]
+        if not candidates:
+            return self.default_route
+
+        for route in candidates:
+            window = context_window(route.provider, route.model)
+            if (route.max_tokens is None or tokens <= route.max_tokens) and (window is None or tokens <= window):
+                return route
+
+        # Ninguna ruta admite el prompt completo: la de mayor ventana (se fragmentará)
+        return max(candidates, key=lambda route: context_window(route.provider, route.model) or 0)
+
+    def is_default(self, provider: Optional[str], model: Optional[str]) -> bool:
+        """Indica si el par proveedor/modelo es el configurado (o no se eligió ninguno)."""
+        return not model or (provider, model) == (self.default_route.provider, self.default_route.model)
+
+    def adapter(self, route: ModelRoute) -> LLMInterface:
+        """Adaptador del modelo de la ruta, creado en el primer uso."""
+        key = (route.provider, route.model)
+        if key not in self._adapters:
+            logger.info(f"Router LLM: inicializando {route.provider}:{route.model}")
+            self._adapters[key] = get_llm_adapter(route.provider, model=route.model)
+        return self._adapters[key]
+
+    def structured_llm(self, route: ModelRoute, schema: Type[T]) -> StructuredLLM[T]:
+        """StructuredLLM (con cache de respuestas) del modelo de la ruta, reutilizado entre solicitudes."""
+        key = (route.provider, route.model, schema)
+        if key not in self._structured:
+            self._structured[key] = get_structured_llm(schema, self.adapter(route))
+        return self._structured[key]
+
+    def __repr__(self) -> str:
+        return f"ModelRouter(routes={len(self.routes)}, default={self.default_route.provider}:{self.default_route.model})"
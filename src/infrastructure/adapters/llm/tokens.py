@@ -0,0 +1,211 @@
+"""
+Conteo de tokens y presupuesto de contexto por proveedor y modelo.
+
+Permite medir un prompt localmente y decidir antes de la llamada de red si
+entra en la ventana de contexto del modelo, evitando subir transcripciones
+enormes solo para recibir un error (y sus reintentos) del proveedor.
+
+Políticas (variable de entorno ``LLM_CONTEXT_POLICY``):
+    - reject: lanza LLMContextLengthError sin contactar al proveedor.
+    - truncate: recorta el prompt al presupuesto disponible.
+    - chunk: el grafo deriva la transcripción al análisis map-reduce; si aun
+      así llega un prompt excedido, se rechaza como en "reject".
+
+Example:
+    >>> budget = ContextBudget.for_model("groq", "llama-3.1-8b-instant", ModelLimits(131_072, 8_192))
+    >>> budget.fits(transcript)
+    True
+"""
+import logging
+import math
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from .exceptions import LLMConfigurationError, LLMContextLengthError
+
+
+logger = logging.getLogger(__name__)
+
+POLICY_REJECT = "reject"
+POLICY_TRUNCATE = "truncate"
+POLICY_CHUNK = "chunk"
+_POLICIES = (POLICY_REJECT, POLICY_TRUNCATE, POLICY_CHUNK)
+
+# Relación caracteres/token por proveedor usada por el estimador heurístico
+_CHARS_PER_TOKEN = {
+    "gemini": 4.0,
+    "groq": 3.5,
+}
+_DEFAULT_CHARS_PER_TOKEN = 3.5
+
+
+@dataclass(frozen=True)
+class ModelLimits:
+    """
+    Límites publicados de un modelo.
+
+    Attributes:
+        context_window: Tokens totales (entrada + salida) que admite el modelo.
+        max_output_tokens: Tokens máximos que el modelo puede generar.
+    """
+    context_window: int
+    max_output_tokens: int
+
+
+class TokenCounter:
+    """Estimador heurístico basado en la relación promedio caracteres/token."""
+
+    def __init__(self, chars_per_token: float = _DEFAULT_CHARS_PER_TOKEN):
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        """Cantidad estimada de tokens del texto (redondeo hacia arriba)."""
+        return math.ceil(len(text) / self.chars_per_token)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Recorta el texto para que no supere ``max_tokens`` tokens."""
+        return text[:int(max_tokens * self.chars_per_token)]
+
+
+class TiktokenCounter(TokenCounter):
+    """
+    Conteo exacto con tiktoken (dependencia opcional).
+
+    ``chars_per_token`` se conserva como aproximación para quien necesite
+    convertir un presupuesto de tokens a caracteres (p. ej. al fragmentar).
+    """
+
+    def __init__(self, encoding_name: str = "cl100k_base"):
+        import tiktoken
+        super().__init__(_DEFAULT_CHARS_PER_TOKEN)
+        self._encoding = tiktoken.get_encoding(encoding_name)
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        tokens = self._encoding.encode(text, disallowed_special=())
+        return self._encoding.decode(tokens[:max_tokens])
+
+
+def get_token_counter(provider: str) -> TokenCounter:
+    """
+    Devuelve el contador de tokens más preciso disponible para el proveedor.
+
+    Los modelos de Groq (Llama, Mixtral) usan tokenizers BPE cercanos a los
+    de tiktoken, por lo que se usa tiktoken si está instalado. Gemini no
+    publica su tokenizer para uso local y se estima por caracteres.
+
+    Args:
+        provider: Nombre del proveedor ("gemini", "groq").
+
+    Returns:
+        TokenCounter para el proveedor.
+    """
+    if provider == "groq":
+        try:
+            return TiktokenCounter()
+        except ImportError:
+            pass
+    return TokenCounter(_CHARS_PER_TOKEN.get(provider, _DEFAULT_CHARS_PER_TOKEN))
+
+
+class ContextBudget:
+    """
+    Presupuesto de tokens de entrada de un modelo y política ante excesos.
+
+    Attributes:
+        provider: Nombre del proveedor.
+        model: Nombre del modelo.
+        limits: Límites del modelo.
+        policy: "reject", "truncate" o "chunk".
+        max_prompt_tokens: Tokens de entrada disponibles (ventana menos salida reservada).
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        model: str,
+        limits: ModelLimits,
+        counter: TokenCounter,
+        policy: str = POLICY_CHUNK
+    ):
+        if policy not in _POLICIES:
+            raise LLMConfigurationError(
+                f"Política de contexto '{policy}' no soportada. "
+                f"Opciones disponibles: {', '.join(_POLICIES)}"
+            )
+        self.provider = provider
+        self.model = model
+        self.limits = limits
+        self.counter = counter
+        self.policy = policy
+        self.max_prompt_tokens = limits.context_window - limits.max_output_tokens
+
+    @classmethod
+    def for_model(cls, provider: str, model: str, limits: Optional[ModelLimits]) -> Optional["ContextBudget"]:
+        """
+        Construye el presupuesto leyendo la política de ``LLM_CONTEXT_POLICY``.
+
+        Args:
+            provider: Nombre del proveedor.
+            model: Nombre del modelo.
+            limits: Límites del modelo (None si el modelo no está catalogado).
+
+        Returns:
+            ContextBudget, o None si no se conocen los límites del modelo.
+        """
+        if limits is None:
+            logger.warning(f"Sin límites de contexto conocidos para {provider}:{model}")
+            return None
+        policy = os.getenv("LLM_CONTEXT_POLICY", POLICY_CHUNK).lower()
+        return cls(provider, model, limits, get_token_counter(provider), policy)
+
+    def measure(self, text: str) -> int:
+        """Tokens del texto según el contador del proveedor."""
+        return self.counter.count(text)
+
+    def fits(self, text: str) -> bool:
+        """Indica si el texto entra en el presupuesto de entrada."""
+        return self.measure(text) <= self.max_prompt_tokens
+
+    def enforce(self, prompt: str) -> str:
+        """
+        Aplica la política al prompt antes de enviarlo al proveedor.
+
+        Args:
+            prompt: Prompt completo a enviar.
+
+        Returns:
+            El prompt original o, con política "truncate", su versión recortada.
+
+        Raises:
+            LLMContextLengthError: Si el prompt no entra y la política no es "truncate".
+        """
+        prompt_tokens = self.measure(prompt)
+        logger.debug(f"Prompt de {prompt_tokens} tokens para {self.provider}:{self.model}")
+        if prompt_tokens <= self.max_prompt_tokens:
+            return prompt
+
+        if self.policy == POLICY_TRUNCATE:
+            logger.warning(
+                f"Prompt de {prompt_tokens} tokens truncado a {self.max_prompt_tokens} "
+                f"para {self.provider}:{self.model}"
+            )
+            return self.counter.truncate(prompt, self.max_prompt_tokens)
+
+        raise LLMContextLengthError(
+            f"El prompt ({prompt_tokens} tokens) excede el contexto disponible de "
+            f"{self.provider}:{self.model} ({self.max_prompt_tokens} tokens)",
+            prompt_tokens=prompt_tokens,
+            max_prompt_tokens=self.max_prompt_tokens,
+            provider=self.provider,
+            model=self.model
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"ContextBudget(provider='{self.provider}', model='{self.model}', "
+            f"max_prompt_tokens={self.max_prompt_tokens}, policy='{self.policy}')"
+        )
@@ -0,0 +1,372 @@
+"""
+Cache persistente de transcripciones de YouTube.
+
+Las transcripciones son el principal motivo de throttling por parte de YouTube
+y no cambian entre re-análisis (nuevo prompt, otro modelo, reintentos), por lo
+que se guardan direccionadas por contenido: la clave es un hash de
+espacio de nombres + ``video_id`` + idiomas solicitados. El espacio de nombres
+permite guardar otros datos del video (p. ej. la metadata) en el mismo backend
+sin mezclarlos con las transcripciones.
+
+Backends disponibles (variable ``TRANSCRIPT_CACHE_BACKEND``):
+    - filesystem: blobs comprimidos (zstd si está instalado, gzip si no) en
+      ``TRANSCRIPT_CACHE_DIR``, con LRU acotado por ``TRANSCRIPT_CACHE_MAX_BYTES``.
+    - database: tabla TranscriptCacheEntry, con LRU acotado por
+      ``TRANSCRIPT_CACHE_MAX_ENTRIES`` (desalojo cada
+      ``TRANSCRIPT_CACHE_EVICT_EVERY`` escrituras).
+    - none: sin cache.
+
+Ambos backends expiran entradas tras ``TRANSCRIPT_CACHE_TTL_SECONDS``
+(0 = no expiran). Los métodos son síncronos: el adaptador los ejecuta en el
+mismo executor que la llamada a YouTube.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depende del entorno
+    zstandard = None
+
+
+logger = logging.getLogger(__name__)
+
+Payload = Dict[str, Any]
+
+NAMESPACE_TRANSCRIPT = "transcript"
+NAMESPACE_METADATA = "metadata"
+
+
+def cache_key(video_id: str, languages: Iterable[str], namespace: str = NAMESPACE_TRANSCRIPT) -> str:
+    """
+    Clave direccionada por contenido para una entrada de la cache.
+
+    Args:
+        video_id: ID canónico del video.
+        languages: Idiomas solicitados, en orden de preferencia.
+        namespace: Tipo de dato cacheado ("transcript", "metadata").
+
+    Returns:
+        Hash SHA-256 hexadecimal del espacio de nombres, ``video_id`` y los idiomas.
+    """
+    raw = f"{namespace}:{video_id}:{','.join(languages)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _compress(data: bytes) -> bytes:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data)
+
+
+def _decompress(blob: bytes) -> bytes:
+    # Magic number de zstd: permite leer blobs escritos con cualquiera de los dos códecs
+    if blob[:4] == b"\x28\xb5\x2f\xfd":
+        if zstandard is None:
+            raise ValueError("Blob comprimido con zstd pero zstandard no está instalado")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return gzip.decompress(blob)
+
+
+def encode_payload(payload: Payload) -> bytes:
+    """Serializa y comprime un payload de cache."""
+    return _compress(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+
+def decode_payload(blob: bytes) -> Payload:
+    """Descomprime y deserializa un payload de cache."""
+    return json.loads(_decompress(blob).decode("utf-8"))
+
+
+class TranscriptCache(ABC):
+    """
+    Contrato de los backends de cache de transcripciones.
+
+    Attributes:
+        ttl_seconds: Antigüedad máxima de una entrada (0 = sin expiración).
+    """
+
+    def __init__(self, ttl_seconds: int = 0):
+        self.ttl_seconds = ttl_seconds
+
+    @abstractmethod
+    def get(
+        self,
+        video_id: str,
+        languages: Iterable[str],
+        namespace: str = NAMESPACE_TRANSCRIPT
+    ) -> Optional[Payload]:
+        """Devuelve el payload cacheado o None si no existe o expiró."""
+        pass
+
+    @abstractmethod
+    def set(
+        self,
+        video_id: str,
+        languages: Iterable[str],
+        payload: Payload,
+        namespace: str = NAMESPACE_TRANSCRIPT
+    ) -> None:
+        """Guarda el payload, desalojando entradas antiguas si se supera el límite."""
+        pass
+
+    def _expired(self, created_at: float) -> bool:
+        return bool(self.ttl_seconds) and time.time() - created_at > self.ttl_seconds
+
+
+class FileSystemTranscriptCache(TranscriptCache):
+    """
+    Cache en disco local: un blob comprimido por entrada.
+
+    El orden LRU se lleva en el mtime de cada archivo (se actualiza en cada
+    acierto) y la antigüedad para el TTL se guarda dentro del blob. El tamaño
+    total se mide en el directorio al desalojar: varios procesos (workers)
+    comparten la cache y un contador en memoria no vería sus escrituras.
+
+    Attributes:
+        directory: Directorio raíz de la cache.
+        max_bytes: Tamaño total máximo de los blobs (0 = sin límite).
+    """
+
+    SUFFIX = ".bin"
+
+    def __init__(self, directory: str, ttl_seconds: int = 0, max_bytes: int = 0):
+        super().__init__(ttl_seconds)
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        video_id: str,
+        languages: Iterable[str],
+        namespace: str = NAMESPACE_TRANSCRIPT
+    ) -> Optional[Payload]:
+        path = self._path(cache_key(video_id, languages, namespace))
+        try:
+            blob = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        entry = decode_payload(blob)
+        if self._expired(entry["created_at"]):
+            self._remove(path)
+            return None
+        # Marcar como usada recientemente para el LRU
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return entry["payload"]
+
+    def set(
+        self,
+        video_id: str,
+        languages: Iterable[str],
+        payload: Payload,
+        namespace: str = NAMESPACE_TRANSCRIPT
+    ) -> None:
+        path = self._path(cache_key(video_id, languages, namespace))
+        blob = encode_payload({"created_at": time.time(), "payload": payload})
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            # Escritura atómica: nunca se lee un blob a medio escribir
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(blob)
+            os.replace(tmp_path, path)
+            self._evict()
+
+    def _path(self, key: str) -> Path:
+        # Subdirectorios por prefijo para no acumular miles de archivos en uno solo
+        return self.directory / key[:2] / f"{key}{self.SUFFIX}"
+
+    def _entries(self):
+        return self.directory.glob(f"*/*{self.SUFFIX}")
+
+    def _remove(self, path: Path) -> None:
+        path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Elimina las entradas menos usadas hasta que el directorio vuelva bajo ``max_bytes``."""
+        if not self.max_bytes:
+            return
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Otro proceso la desalojó mientras se recorría el directorio
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            logger.debug(f"Transcripción desalojada de la cache: {path.name}")
+
+
+class DatabaseTranscriptCache(TranscriptCache):
+    """
+    Cache en la base de datos de la aplicación (compartida entre réplicas).
+
+    Los métodos corren en los threads del executor de YouTube, fuera del ciclo
+    request_started/request_finished de Django: cada operación abre y cierra
+    la conexión de su thread como lo haría una solicitud, para que una conexión
+    caída (reinicio de la base, timeout por inactividad) no quede reutilizándose
+    para siempre.
+
+    Attributes:
+        max_entries: Cantidad máxima de entradas (0 = sin límite).
+        evict_every: Escrituras entre dos pasadas de desalojo; entre pasadas la
+                     tabla puede superar ``max_entries`` en hasta esa cantidad.
+    """
+
+    def __init__(self, ttl_seconds: int = 0, max_entries: int = 0, evict_every: int = 100):
+        super().__init__(ttl_seconds)
+        self.max_entries = max_entries
+        self.evict_every = max(evict_every, 1)
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+
+    def get(
+        self,
+        video_id: str,
+        languages: Iterable[str],
+        namespace: str = NAMESPACE_TRANSCRIPT
+    ) -> Optional[Payload]:
+        from django.utils import timezone
+        from infrastructure.persistence.models import TranscriptCacheEntry
+
+        key = cache_key(video_id, languages, namespace)
+        with _request_connection():
+            entry = TranscriptCacheEntry.objects.filter(key=key).first()
+            if entry is None:
+                return None
+            if self._expired(entry.created_at.timestamp()):
+                entry.delete()
+                return None
+            TranscriptCacheEntry.objects.filter(key=key).update(last_accessed_at=timezone.now())
+        return decode_payload(bytes(entry.payload))
+
+    def set(
+        self,
+        video_id: str,
+        languages: Iterable[str],
+        payload: Payload,
+        namespace: str = NAMESPACE_TRANSCRIPT
+    ) -> None:
+        from django.utils import timezone
+        from infrastructure.persistence.models import TranscriptCacheEntry
+
+        now = timezone.now()
+        blob = encode_payload(payload)
+        with _request_connection():
+            TranscriptCacheEntry.objects.update_or_create(
+                key=cache_key(video_id, languages, namespace),
+                defaults={
+                    "video_id": video_id,
+                    "payload": blob,
+                    "size_bytes": len(blob),
+                    "created_at": now,
+                    "last_accessed_at": now,
+                }
+            )
+            if self._eviction_due():
+                self._evict()
+
+    def _eviction_due(self) -> bool:
+        """Cuenta la escritura e indica si toca una pasada de desalojo."""
+        with self._writes_lock:
+            self._writes += 1
+            return self._writes % self.evict_every == 0
+
+    def _evict(self) -> None:
+        """Elimina las entradas expiradas y las menos usadas por encima de ``max_entries``."""
+        from django.utils import timezone
+        from infrastructure.persistence.models import TranscriptCacheEntry
+
+        if self.ttl_seconds:
+            cutoff = timezone.now() - timedelta(seconds=self.ttl_seconds)
+            TranscriptCacheEntry.objects.filter(created_at__lt=cutoff).delete()
+        if not self.max_entries:
+            return
+        stale_keys = list(
+            TranscriptCacheEntry.objects
+            .order_by("-last_accessed_at")
+            .values_list("key", flat=True)[self.max_entries:]
+        )
+        if stale_keys:
+            TranscriptCacheEntry.objects.filter(key__in=stale_keys).delete()
+
+
+@contextmanager
+def _request_connection() -> Iterator[None]:
+    """
+    Descarta la conexión del thread si quedó inutilizable o vieja, antes y después.
+
+    Equivale a lo que Django hace al empezar y terminar cada solicitud
+    (``close_old_connections``, que respeta CONN_MAX_AGE y CONN_HEALTH_CHECKS).
+    Dentro de una transacción abierta (p. ej. en tests) no se toca la conexión.
+    """
+    from django.db import close_old_connections, connection
+
+    if connection.in_atomic_block:
+        yield
+        return
+    close_old_connections()
+    try:
+        yield
+    finally:
+        close_old_connections()
+
+
+def get_transcript_cache(backend: str = None) -> Optional[TranscriptCache]:
+    """
+    Construye el backend de cache configurado por variables de entorno.
+
+    Args:
+        backend: "filesystem", "database" o "none". Si no se especifica, usa
+                TRANSCRIPT_CACHE_BACKEND o "filesystem" por defecto.
+
+    Returns:
+        Instancia de TranscriptCache, o None si la cache está deshabilitada.
+
+    Raises:
+        ValueError: Si el backend no es reconocido.
+    """
+    backend = (backend or os.getenv("TRANSCRIPT_CACHE_BACKEND", "filesystem")).lower()
+    ttl_seconds = int(os.getenv("TRANSCRIPT_CACHE_TTL_SECONDS", "2592000"))
+
+    if backend == "none":
+        return None
+    if backend == "filesystem":
+        return FileSystemTranscriptCache(
+            directory=os.getenv("TRANSCRIPT_CACHE_DIR", ".cache/transcripts"),
+            ttl_seconds=ttl_seconds,
+            max_bytes=int(os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+        )
+    if backend == "database":
+        return DatabaseTranscriptCache(
+            ttl_seconds=ttl_seconds,
+            max_entries=int(os.getenv("TRANSCRIPT_CACHE_MAX_ENTRIES", "10000")),
+            evict_every=int(os.getenv("TRANSCRIPT_CACHE_EVICT_EVERY", "100"))
+        )
+    raise ValueError(
+        f"Backend de cache '{backend}' no soportado. "
+        "Opciones disponibles: filesystem, database, none"
+    )
@@ -3,10 +3,26 @@ Adaptador para la extracción de datos de YouTube.
 Ahora utiliza las excepciones centralizadas para una clasificación profesional de fallos.
 """
 import asyncio
-from typing import Dict, Any
+import logging
+import os
+from typing import Dict, Any, Optional
 from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api._errors import VideoUnavailable, TranscriptsDisabled, NoTranscriptFound
-from .exceptions import VideoNotFoundError, NoTranscriptError, YouTubeError
+from youtube_transcript_api._errors import (
+    VideoUnavailable, TranscriptsDisabled, NoTranscriptFound, VideoUnplayable, RequestBlocked
+)
+from domain.video_url import extract_video_id, InvalidVideoURLError
+from .exceptions import VideoNotFoundError, NoTranscriptError, YouTubeError, ExecutorSaturatedError
+from .circuit_breaker import CircuitBreaker
+from .async_transcript_fetcher import AsyncTranscriptFetcher
+from .executor import BoundedExecutor
+from .transcript_cache import TranscriptCache, NAMESPACE_TRANSCRIPT, NAMESPACE_METADATA
+
+logger = logging.getLogger(__name__)
+
+# Fallas propias del video (o bloqueos): reintentarlas por el camino síncrono no cambia el resultado
+_DEFINITIVE_ERRORS = (VideoUnavailable, TranscriptsDisabled, NoTranscriptFound, VideoUnplayable, RequestBlocked)
+# Respuestas válidas de YouTube sobre un video puntual o saturación local: no abren el circuito
+_CIRCUIT_NEUTRAL_ERRORS = (VideoNotFoundError, NoTranscriptError, ExecutorSaturatedError)
 
 class YouTubeAdapter:
     """
@@ -14,27 +30,78 @@ class YouTubeAdapter:
 
     Encapsula la obtención de transcripciones y metadata de videos,
     ejecutando las llamadas síncronas de youtube-transcript-api dentro
-    de un executor para no bloquear el event loop asíncrono.
+    de un executor dedicado para no bloquear el event loop asíncrono ni
+    competir con el pool por defecto que usan Django y ``sync_to_async``.
 
     Attributes:
         api: Instancia de YouTubeTranscriptApi para obtener transcripciones.
+        cache: Cache persistente de transcripciones (None = siempre consulta YouTube).
+        executor: Pool de threads propio para las llamadas a YouTube.
+        async_fetcher: Cliente aiohttp nativo (None = solo youtube-transcript-api en threads).
+        metadata_client: Cliente aiohttp para título y duración cuando no vienen con la transcripción.
+        circuit_breaker: Corta las llamadas a YouTube mientras viene fallando.
 
     Raises:
         VideoNotFoundError: Si el video no existe o es privado.
         NoTranscriptError: Si el video no tiene subtítulos disponibles.
+        ExecutorSaturatedError: Si el executor de YouTube no admite más tareas.
+        CircuitOpenError: Si el circuit breaker de YouTube está abierto.
         YouTubeError: Para cualquier otro error inesperado del adaptador.
     """
 
-    def __init__(self):
-        """Inicializa el adaptador con una instancia de YouTubeTranscriptApi."""
+    # Idiomas solicitados, en orden de preferencia (forman parte de la clave de cache)
+    LANGUAGES = ('es', 'en')
+
+    def __init__(
+        self,
+        cache: Optional[TranscriptCache] = None,
+        executor: Optional[BoundedExecutor] = None,
+        async_fetcher: Optional[AsyncTranscriptFetcher] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
+        """
+        Inicializa el adaptador con una instancia de YouTubeTranscriptApi.
+
+        Args:
+            cache: Cache de transcripciones consultada antes de llamar a YouTube.
+            executor: Executor para las llamadas bloqueantes. Si no se especifica,
+                     se crea uno según YOUTUBE_FETCH_WORKERS y YOUTUBE_FETCH_MAX_PENDING.
+            async_fetcher: Fetcher asíncrono. Si no se especifica, se crea uno
+                          cuando YOUTUBE_FETCH_MODE=aiohttp.
+            circuit_breaker: Breaker de las llamadas a YouTube. Si no se especifica,
+                            se crea con las variables CIRCUIT_BREAKER_*.
+        """
         self.api = YouTubeTranscriptApi()
+        self.cache = cache
+        self.executor = executor or BoundedExecutor(
+            max_workers=int(os.getenv("YOUTUBE_FETCH_WORKERS", "8")),
+            max_pending=int(os.getenv("YOUTUBE_FETCH_MAX_PENDING", "64")),
+            name="youtube-fetch"
+        )
+        if async_fetcher is None and os.getenv("YOUTUBE_FETCH_MODE", "threaded").lower() == "aiohttp":
+            async_fetcher = AsyncTranscriptFetcher(
+                max_connections=int(os.getenv("YOUTUBE_FETCH_MAX_CONNECTIONS", "100"))
+            )
+        self.async_fetcher = async_fetcher
+        # La metadata suelta se obtiene de forma nativa asyncio (la sesión se crea a demanda)
+        self.metadata_client = async_fetcher or AsyncTranscriptFetcher()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker.from_env(
+            "youtube", ignored_exceptions=_CIRCUIT_NEUTRAL_ERRORS
+        )
 
     async def fetch_full_data(self, video_url: str) -> Dict[str, Any]:
         """
         Obtiene la transcripción y metadata de un video de YouTube.
 
-        Ejecuta la extracción en un thread executor para mantener
-        la compatibilidad con el event loop asíncrono de Django/ASGI.
+        Con ``async_fetcher`` la transcripción es nativa asyncio (aiohttp) y
+        la metadata sale de la misma respuesta del player, sin otra ida y
+        vuelta a YouTube. Si no, o si el fetcher asíncrono falla
+        inesperadamente, se ejecuta youtube-transcript-api en el executor
+        dedicado del adaptador y la metadata se obtiene en paralelo, de modo
+        que la latencia es la del más lento de los dos y no su suma.
+
+        El ``language_code`` es el del subtítulo efectivamente elegido. Si la
+        metadata no se puede obtener se usan valores genéricos sin fallar.
 
         Args:
             video_url: URL completa del video de YouTube.
@@ -46,26 +113,37 @@ class YouTubeAdapter:
         Raises:
             VideoNotFoundError: Video inexistente o privado.
             NoTranscriptError: Sin subtítulos ni transcripción automática.
+            ExecutorSaturatedError: Demasiadas extracciones en espera.
             YouTubeError: Error inesperado en la comunicación con YouTube.
+            CircuitOpenError: YouTube viene fallando y el circuit breaker está abierto.
         """
         video_id = self._extract_id(video_url)
-        loop = asyncio.get_event_loop()
-        
+        with self.circuit_breaker.guard():
+            return await self._fetch_full_data(video_id)
+
+    async def _fetch_full_data(self, video_id: str) -> Dict[str, Any]:
+        """Obtiene transcripción y metadata en paralelo y clasifica las fallas."""
         try:
-            # Ejecución en executor para no bloquear el loop asíncrono
-            transcript_text = await loop.run_in_executor(None, self._get_transcript, video_id)
+            if self.async_fetcher is None:
+                transcript_data, metadata = await asyncio.gather(
+                    self._fetch_transcript(video_id),
+                    self._fetch_metadata(video_id)
+                )
+            else:
+                # El player que trae los subtítulos ya trae título y duración;
+                # solo se busca aparte si la transcripción vino de la cache o del fallback
+                transcript_data = await self._fetch_transcript(video_id)
+                metadata = transcript_data.get("metadata") or await self._fetch_metadata(video_id)
             return {
-                "transcript": transcript_text,
-                "metadata": {
-                    "title": f"Video {video_id}",
-                    "duration_seconds": 0,
-                    "language_code": "es"
-                }
+                "transcript": transcript_data["transcript"],
+                "metadata": {**metadata, "language_code": transcript_data["language_code"]}
             }
         except VideoUnavailable:
             raise VideoNotFoundError(f"El video {video_id} no está disponible.")
         except (TranscriptsDisabled, NoTranscriptFound):
             raise NoTranscriptError(f"El video {video_id} no posee transcripciones.")
+        except ExecutorSaturatedError:
+            raise
         except Exception as e:
             raise YouTubeError(f"Error inesperado en el adaptador: {str(e)}")
 
@@ -73,20 +151,137 @@ class YouTubeAdapter:
         """
         Extrae el ID de 11 caracteres de una URL de YouTube.
 
-        Soporta formatos:
-            - Estándar: https://www.youtube.com/watch?v=XXXXXXXXXXX
-            - Corto: https://youtu.be/XXXXXXXXXXX
+        Delega en el canonicalizador de dominio, que soporta youtu.be,
+        /shorts/, /embed/, m.youtube.com y parámetros adicionales.
 
         Args:
             url: URL del video de YouTube.
 
         Returns:
-            ID del video (máximo 11 caracteres).
+            ID del video (exactamente 11 caracteres).
+
+        Raises:
+            YouTubeError: Si la URL no contiene un ID de video reconocible.
         """
-        if "v=" in url: return url.split("v=")[1][:11]
-        return url.split("/")[-1][:11]
+        try:
+            return extract_video_id(url)
+        except InvalidVideoURLError as e:
+            raise YouTubeError(str(e))
+
+    async def _fetch_transcript(self, video_id: str) -> Dict[str, str]:
+        """
+        Obtiene la transcripción por el camino asíncrono o el síncrono.
+
+        Args:
+            video_id: ID de 11 caracteres del video.
+
+        Returns:
+            Dict con 'transcript' (texto plano) y 'language_code'; desde el
+            fetcher asíncrono incluye además la 'metadata' del player.
+        """
+        if self.async_fetcher is None:
+            # Cache y YouTube en un único salto al executor dedicado
+            return await self.executor.run(self._get_cached_transcript, video_id)
+
+        if self.cache is not None:
+            cached = await self.executor.run(self._read_cache, video_id, NAMESPACE_TRANSCRIPT)
+            if self._is_complete(cached):
+                return cached
+
+        try:
+            data = await self.async_fetcher.fetch(video_id, self.LANGUAGES)
+        except _DEFINITIVE_ERRORS:
+            raise
+        except Exception as e:
+            logger.warning(f"Fallo del fetcher asíncrono ({video_id}), se usa youtube-transcript-api: {e}")
+            return await self.executor.run(self._fetch_and_store, video_id)
+
+        if self.cache is not None:
+            transcript = {"transcript": data["transcript"], "language_code": data["language_code"]}
+            await self.executor.run(self._write_cache, video_id, transcript, NAMESPACE_TRANSCRIPT)
+            if data.get("metadata"):
+                await self.executor.run(self._write_cache, video_id, data["metadata"], NAMESPACE_METADATA)
+        return data
+
+    async def _fetch_metadata(self, video_id: str) -> Dict[str, Any]:
+        """
+        Obtiene título y duración del video, con cache propia.
+
+        La metadata es secundaria para el análisis: ante cualquier falla se
+        registra una advertencia y se devuelven valores genéricos.
+
+        Args:
+            video_id: ID de 11 caracteres del video.
+
+        Returns:
+            Dict con 'title' y 'duration_seconds'.
+        """
+        try:
+            if self.cache is not None:
+                cached = await self.executor.run(self._read_cache, video_id, NAMESPACE_METADATA)
+                if cached is not None:
+                    return cached
+
+            metadata = await self.metadata_client.fetch_metadata(video_id)
+
+            if self.cache is not None:
+                await self.executor.run(self._write_cache, video_id, metadata, NAMESPACE_METADATA)
+            return metadata
+        except Exception as e:
+            logger.warning(f"No se pudo obtener la metadata de {video_id}: {e}")
+            return {"title": f"Video {video_id}", "duration_seconds": 0}
+
+    def _get_cached_transcript(self, video_id: str) -> Dict[str, str]:
+        """
+        Obtiene la transcripción desde la cache o, si no está, desde YouTube.
+
+        Args:
+            video_id: ID de 11 caracteres del video.
+
+        Returns:
+            Dict con 'transcript' (texto plano) y 'language_code'.
+        """
+        cached = self._read_cache(video_id, NAMESPACE_TRANSCRIPT)
+        if self._is_complete(cached):
+            return cached
+        return self._fetch_and_store(video_id)
+
+    def _fetch_and_store(self, video_id: str) -> Dict[str, str]:
+        """Obtiene la transcripción de YouTube (síncrono) y la guarda en la cache."""
+        data = self._get_transcript(video_id)
+        self._write_cache(video_id, data, NAMESPACE_TRANSCRIPT)
+        return data
+
+    @staticmethod
+    def _is_complete(cached: Optional[Dict[str, Any]]) -> bool:
+        # Las entradas anteriores al registro del idioma real se tratan como miss
+        return cached is not None and "language_code" in cached
+
+    def _read_cache(self, video_id: str, namespace: str) -> Optional[Dict[str, Any]]:
+        """
+        Lee una entrada de la cache.
+
+        Los fallos de la cache se registran y se tratan como un miss: nunca
+        impiden obtener los datos.
+        """
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.get(video_id, self.LANGUAGES, namespace)
+        except Exception as e:
+            logger.warning(f"Error leyendo la cache ({namespace}, {video_id}): {e}")
+            return None
+
+    def _write_cache(self, video_id: str, payload: Dict[str, Any], namespace: str) -> None:
+        """Guarda una entrada en la cache, registrando (sin propagar) los fallos."""
+        if self.cache is None:
+            return
+        try:
+            self.cache.set(video_id, self.LANGUAGES, payload, namespace)
+        except Exception as e:
+            logger.warning(f"Error escribiendo la cache ({namespace}, {video_id}): {e}")
 
-    def _get_transcript(self, video_id: str) -> str:
+    def _get_transcript(self, video_id: str) -> Dict[str, str]:
         """
         Obtiene la transcripción en texto plano de un video.
 
@@ -97,9 +292,13 @@ class YouTubeAdapter:
             video_id: ID de 11 caracteres del video.
 
         Returns:
-            Transcripción concatenada como texto plano.
+            Dict con 'transcript' (texto plano) y 'language_code' del
+            subtítulo efectivamente elegido.
         """
         # Nueva API usa fetch() en instancia en lugar de get_transcript() estático
-        transcript = self.api.fetch(video_id, languages=['es', 'en'])
+        transcript = self.api.fetch(video_id, languages=list(self.LANGUAGES))
         # Convertir a texto plano
-        return " ".join([entry.text for entry in transcript])
\ No newline at end of file
+        return {
+            "transcript": " ".join([entry.text for entry in transcript]),
+            "language_code": transcript.language_code
+        }
\ No newline at end of file
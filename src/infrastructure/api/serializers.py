@@ -2,29 +2,272 @@
 Módulo de Serialización: Define los contratos de entrada y salida para la API REST.
 Utiliza Django REST Framework para validar la integridad de las peticiones HTTP.
 """
+from django.conf import settings
 from rest_framework import serializers
-from infrastructure.persistence.models import VideoRecord
+from domain.video_url import extract_video_id, InvalidVideoURLError
+from application.use_cases.pagination import decode_cursor, InvalidCursorError
+from application.use_cases.use_cases import ANALYTICS_GROUPINGS
+from infrastructure.persistence.models import VideoRecord, VideoTranscript, AnalysisJob
 
 class VideoInputSerializer(serializers.Serializer):
     """
     DTO (Data Transfer Object) para la entrada de datos.
-    Valida que la URL proporcionada sea sintácticamente correcta antes de procesarla.
+    Valida que la URL proporcionada sea sintácticamente correcta y que
+    corresponda a un video de YouTube antes de procesarla.
     """
     video_url = serializers.URLField(
         required=True, 
         help_text="URL del video de YouTube a procesar"
     )
+    force_refresh = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Ignora el análisis almacenado y vuelve a procesar el video"
+    )
+    async_mode = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Encola el análisis y responde 202 con el ID del trabajo"
+    )
+    latency_tier = serializers.ChoiceField(
+        choices=["fast", "standard", "quality"],
+        required=False,
+        allow_null=True,
+        default=None,
+        help_text="Nivel de latencia para elegir el modelo (por defecto LLM_DEFAULT_LATENCY_TIER)"
+    )
+
+    def validate_video_url(self, value):
+        """Rechaza URLs que no permiten identificar un video de YouTube."""
+        try:
+            extract_video_id(value)
+        except InvalidVideoURLError as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
+class VideoBatchInputSerializer(serializers.Serializer):
+    """
+    DTO de entrada para el análisis por lotes.
+    Las URLs se validan individualmente en el caso de uso para reportar
+    errores por ítem en lugar de rechazar el lote completo.
+    """
+    video_urls = serializers.ListField(
+        child=serializers.CharField(max_length=500),
+        allow_empty=False,
+        max_length=settings.ANALYSIS_BATCH_MAX_SIZE,
+        help_text="Lista de URLs de videos de YouTube a procesar"
+    )
+    force_refresh = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Ignora los análisis almacenados y vuelve a procesar los videos"
+    )
 
 class VideoRecordSerializer(serializers.ModelSerializer):
     """
     Mapea el modelo de persistencia a una respuesta JSON estructurada.
     Incluye todos los campos requeridos por el desafío [cite: 15-29].
+
+    La transcripción solo se incluye con ``include_transcript`` en el contexto
+    (``?include=transcript``) y debe estar precargada con ``load_transcripts``.
     """
+    transcript = serializers.SerializerMethodField()
+
     class Meta:
         model = VideoRecord
         fields = [
-            'id', 'url', 'title', 'transcript', 'duration_seconds', 
+            'id', 'video_id', 'url', 'title', 'transcript', 'duration_seconds', 
             'language_code', 'sentiment', 'sentiment_score', 
-            'tone', 'key_points', 'created_at'
+            'tone', 'key_points', 'duplicate_of', 'llm_provider', 'llm_model', 'created_at'
         ]
-        read_only_fields = ['id', 'created_at']
\ No newline at end of file
+        read_only_fields = ['id', 'video_id', 'duplicate_of', 'llm_provider', 'llm_model', 'created_at']
+
+    def get_fields(self):
+        """Omite la transcripción salvo que se haya pedido explícitamente."""
+        fields = super().get_fields()
+        if not self.context.get('include_transcript'):
+            fields.pop('transcript')
+        return fields
+
+    def get_transcript(self, obj):
+        """Texto precargado de VideoTranscript (None si no hay transcripción almacenada)."""
+        if not VideoRecord.transcript_data.is_cached(obj):
+            return None
+        return obj.transcript_data.text
+
+
+class VideoTranscriptSerializer(serializers.ModelSerializer):
+    """
+    Transcripción completa de un video analizado (endpoint dedicado).
+    """
+    video_id = serializers.CharField(source='record_id', read_only=True)
+    language_code = serializers.CharField(source='record.language_code', read_only=True)
+    transcript = serializers.CharField(source='text', read_only=True)
+
+    class Meta:
+        model = VideoTranscript
+        fields = ['video_id', 'language_code', 'transcript']
+        read_only_fields = fields
+
+
+
+class VideoRecordListSerializer(VideoRecordSerializer):
+    """
+    Fila del listado de análisis, proyectada a los campos pedidos con ``fields=``.
+    Serializa los diccionarios de ``.values()`` (nunca incluye la transcripción).
+    """
+    # Campos que admite la proyección: todos los del análisis salvo la transcripción
+    LISTABLE_FIELDS = [name for name in VideoRecordSerializer.Meta.fields if name != 'transcript']
+    # Campos que se devuelven siempre, además de los proyectados
+    EXTRA_FIELDS = []
+
+    def get_fields(self):
+        """Restringe la salida a los campos pedidos (todos los listables por defecto)."""
+        fields = super().get_fields()
+        requested = [*(self.context.get('fields') or self.LISTABLE_FIELDS), *self.EXTRA_FIELDS]
+        return {name: field for name, field in fields.items() if name in requested}
+
+
+class VideoSearchResultSerializer(VideoRecordListSerializer):
+    """
+    Resultado de la búsqueda: campos proyectados, relevancia y un fragmento
+    de la transcripción con los términos encontrados (nunca el texto completo).
+    """
+    EXTRA_FIELDS = ['rank', 'snippet']
+
+    rank = serializers.FloatField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+
+    class Meta(VideoRecordListSerializer.Meta):
+        fields = VideoRecordListSerializer.Meta.fields + ['rank', 'snippet']
+
+
+class ProjectionQuerySerializer(serializers.Serializer):
+    """
+    Parámetros comunes de los listados: tamaño de página y proyección ``fields=``.
+    """
+    limit = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=settings.ANALYSIS_LIST_MAX_PAGE_SIZE,
+        default=settings.ANALYSIS_LIST_PAGE_SIZE
+    )
+    fields = serializers.CharField(
+        required=False,
+        help_text="Campos a devolver separados por coma (p. ej. video_id,title,sentiment)"
+    )
+
+    def validate_fields(self, value):
+        """Convierte la lista separada por comas y rechaza campos desconocidos."""
+        fields = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in fields if name not in VideoRecordListSerializer.LISTABLE_FIELDS]
+        if unknown:
+            raise serializers.ValidationError(
+                f"Campos desconocidos: {', '.join(unknown)}. "
+                f"Opciones: {', '.join(VideoRecordListSerializer.LISTABLE_FIELDS)}"
+            )
+        return fields
+
+
+class VideoListQuerySerializer(ProjectionQuerySerializer):
+    """
+    Parámetros de consulta del listado de análisis (filtros, cursor y proyección).
+    """
+    sentiment = serializers.CharField(required=False, max_length=20)
+    tone = serializers.CharField(required=False, max_length=100)
+    language = serializers.CharField(required=False, max_length=10)
+    created_after = serializers.DateTimeField(required=False, help_text="Inclusive")
+    created_before = serializers.DateTimeField(required=False, help_text="Exclusivo")
+    cursor = serializers.CharField(required=False)
+
+    def validate_cursor(self, value):
+        """Rechaza cursores que no fueron emitidos por el listado."""
+        try:
+            decode_cursor(value)
+        except InvalidCursorError as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
+
+class VideoSearchQuerySerializer(ProjectionQuerySerializer):
+    """
+    Parámetros de la búsqueda de texto completo.
+    """
+    q = serializers.CharField(max_length=200, help_text="Texto a buscar")
+    language = serializers.CharField(
+        required=False,
+        max_length=10,
+        help_text="Solo análisis en este idioma (y búsqueda con sus reglas de stemming)"
+    )
+    offset = serializers.IntegerField(
+        required=False,
+        min_value=0,
+        max_value=settings.ANALYSIS_SEARCH_MAX_OFFSET,
+        default=0
+    )
+
+
+class SentimentAnalyticsQuerySerializer(serializers.Serializer):
+    """
+    Parámetros de las analíticas de sentimiento: dimensiones, rango de días y filtros.
+    """
+    PERIODS = ('day', 'week', 'month')
+
+    group_by = serializers.CharField(
+        required=False,
+        default='day',
+        help_text=f"Dimensiones separadas por coma: {', '.join(ANALYTICS_GROUPINGS)}"
+    )
+    since = serializers.DateField(required=False, help_text="Primer día (inclusive)")
+    until = serializers.DateField(required=False, help_text="Último día (inclusive)")
+    sentiment = serializers.CharField(required=False, max_length=20)
+    tone = serializers.CharField(required=False, max_length=100)
+    language = serializers.CharField(required=False, max_length=10)
+
+    def validate_group_by(self, value):
+        """Convierte la lista separada por comas; admite un solo período."""
+        group_by = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+        unknown = [name for name in group_by if name not in ANALYTICS_GROUPINGS]
+        if unknown:
+            raise serializers.ValidationError(
+                f"Dimensiones desconocidas: {', '.join(unknown)}. "
+                f"Opciones: {', '.join(ANALYTICS_GROUPINGS)}"
+            )
+        if not group_by:
+            raise serializers.ValidationError("Indique al menos una dimensión.")
+        if len([name for name in group_by if name in self.PERIODS]) > 1:
+            raise serializers.ValidationError(f"Solo se admite un período ({', '.join(self.PERIODS)}).")
+        return group_by
+
+    def validate(self, data):
+        if data.get('since') and data.get('until') and data['since'] > data['until']:
+            raise serializers.ValidationError({"until": "Debe ser posterior o igual a 'since'."})
+        return data
+
+
+class AnalysisJobSerializer(serializers.ModelSerializer):
+    """
+    Estado de un trabajo de análisis asíncrono.
+    Incluye el análisis completo en 'result' una vez que el trabajo finalizó.
+    """
+    job_id = serializers.UUIDField(source='id', read_only=True)
+    result = VideoRecordSerializer(source='record', read_only=True)
+
+    class Meta:
+        model = AnalysisJob
+        fields = [
+            'job_id', 'video_id', 'video_url', 'latency_tier', 'state', 'error',
+            'result', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+
+class BatchItemResultSerializer(serializers.Serializer):
+    """
+    Resultado individual del análisis por lotes: estado, análisis o error.
+    """
+    video_url = serializers.CharField()
+    video_id = serializers.CharField(allow_null=True)
+    status = serializers.CharField()
+    result = VideoRecordSerializer(source='record', allow_null=True)
+    error = serializers.CharField(allow_null=True)
@@ -3,8 +3,24 @@ Configuración de rutas para el módulo de API.
 Define los puntos de entrada para la funcionalidad de análisis de video.
 """
 from django.urls import path
-from .views import VideoAnalysisView
+from .views import (
+    VideoListView,
+    VideoSearchView,
+    SentimentAnalyticsView,
+    VideoAnalysisView,
+    VideoAnalysisStreamView,
+    VideoBatchAnalysisView,
+    AnalysisJobView,
+    VideoTranscriptView,
+)
 
 urlpatterns = [
+    path('', VideoListView.as_view(), name='video-list'),
+    path('search/', VideoSearchView.as_view(), name='video-search'),
+    path('analytics/sentiment/', SentimentAnalyticsView.as_view(), name='video-analytics-sentiment'),
     path('analyze/', VideoAnalysisView.as_view(), name='video-analyze'),
+    path('analyze/stream/', VideoAnalysisStreamView.as_view(), name='video-analyze-stream'),
+    path('analyze/batch/', VideoBatchAnalysisView.as_view(), name='video-analyze-batch'),
+    path('jobs/<uuid:job_id>/', AnalysisJobView.as_view(), name='video-job-detail'),
+    path('<str:video_id>/transcript/', VideoTranscriptView.as_view(), name='video-transcript'),
 ]
\ No newline at end of file
@@ -2,11 +2,157 @@
 Módulo de Vistas: Adaptadores de entrada para el protocolo HTTP.
 Implementa controladores asíncronos para maximizar el throughput de la API.
 """
+import json
+
 from adrf.views import APIView  # pip install django-adrf para soporte async nativo en DRF
 from rest_framework.response import Response
 from rest_framework import status
-from .serializers import VideoInputSerializer, VideoRecordSerializer
-from application.use_cases.use_cases import AnalyzeVideoUseCase
+from rest_framework.utils.encoders import JSONEncoder
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from .serializers import (
+    VideoInputSerializer,
+    VideoBatchInputSerializer,
+    VideoRecordSerializer,
+    AnalysisJobSerializer,
+    BatchItemResultSerializer,
+    VideoTranscriptSerializer,
+    VideoListQuerySerializer,
+    VideoRecordListSerializer,
+    VideoSearchQuerySerializer,
+    VideoSearchResultSerializer,
+    SentimentAnalyticsQuerySerializer,
+)
+from application.jobs import JobQueueFullError
+from application.use_cases.use_cases import (
+    AnalyzeVideoUseCase,
+    AnalyzeVideoBatchUseCase,
+    StreamVideoAnalysisUseCase,
+    SubmitAnalysisJobUseCase,
+    GetAnalysisJobUseCase,
+    GetVideoTranscriptUseCase,
+    ListVideoRecordsUseCase,
+    SearchVideoRecordsUseCase,
+    SentimentAnalyticsUseCase,
+)
+from infrastructure.persistence.video_records import load_transcripts
+
+
+def _include_transcript(request) -> bool:
+    """Indica si la solicitud pidió la transcripción (``?include=transcript``)."""
+    return 'transcript' in request.query_params.get('include', '').split(',')
+
+
+class VideoListView(APIView):
+    """
+    Listado de los análisis almacenados, del más reciente al más antiguo.
+    Pagina por cursor (keyset) en lugar de OFFSET: el costo de una página no
+    depende de su profundidad. ``fields=`` limita las columnas leídas.
+    """
+
+    async def get(self, request):
+        """
+        Retorna una página de análisis filtrada y el enlace a la siguiente.
+        """
+        serializer = VideoListQuerySerializer(data=request.query_params)
+
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        params = serializer.validated_data
+        fields = params.get('fields') or VideoRecordListSerializer.LISTABLE_FIELDS
+        page = await ListVideoRecordsUseCase.execute(
+            fields,
+            sentiment=params.get('sentiment'),
+            tone=params.get('tone'),
+            language_code=params.get('language'),
+            created_after=params.get('created_after'),
+            created_before=params.get('created_before'),
+            cursor=params.get('cursor'),
+            limit=params['limit']
+        )
+
+        next_url = None
+        if page.next_cursor is not None:
+            query = request.query_params.copy()
+            query['cursor'] = page.next_cursor
+            next_url = f"{request.path}?{query.urlencode()}"
+        results = VideoRecordListSerializer(page.results, many=True, context={'fields': fields}).data
+        return Response(
+            {"results": results, "next_cursor": page.next_cursor, "next": next_url},
+            status=status.HTTP_200_OK
+        )
+
+
+class VideoSearchView(APIView):
+    """
+    Búsqueda de texto completo sobre título, puntos clave y transcripción.
+    Devuelve los análisis por relevancia con un fragmento de la transcripción.
+    """
+
+    async def get(self, request):
+        """
+        Retorna una página de resultados para ``q`` y el enlace a la siguiente.
+        """
+        serializer = VideoSearchQuerySerializer(data=request.query_params)
+
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        params = serializer.validated_data
+        fields = params.get('fields') or VideoRecordListSerializer.LISTABLE_FIELDS
+        page = await SearchVideoRecordsUseCase.execute(
+            params['q'],
+            fields,
+            language_code=params.get('language'),
+            limit=params['limit'],
+            offset=params['offset']
+        )
+
+        next_url = None
+        if page.next_offset is not None and page.next_offset <= settings.ANALYSIS_SEARCH_MAX_OFFSET:
+            query = request.query_params.copy()
+            query['offset'] = page.next_offset
+            next_url = f"{request.path}?{query.urlencode()}"
+        results = VideoSearchResultSerializer(page.results, many=True, context={'fields': fields}).data
+        return Response({"results": results, "next": next_url}, status=status.HTTP_200_OK)
+
+
+class SentimentAnalyticsView(APIView):
+    """
+    Distribución de sentimiento y puntaje promedio por período, tono e idioma.
+    Se sirve desde los agregados precalculados (SentimentRollup), no de VideoRecord.
+    """
+
+    async def get(self, request):
+        """
+        Retorna una fila por grupo y los totales del rango filtrado.
+        """
+        serializer = SentimentAnalyticsQuerySerializer(data=request.query_params)
+
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        params = serializer.validated_data
+        analytics = await SentimentAnalyticsUseCase.execute(
+            params['group_by'],
+            since=params.get('since'),
+            until=params.get('until'),
+            sentiment=params.get('sentiment'),
+            tone=params.get('tone'),
+            language_code=params.get('language')
+        )
+        return Response(
+            {
+                "results": analytics.results,
+                "count": analytics.count,
+                "average_sentiment_score": analytics.average_sentiment_score,
+            },
+            status=status.HTTP_200_OK
+        )
+
 
 class VideoAnalysisView(APIView):
     """
@@ -17,6 +163,10 @@ class VideoAnalysisView(APIView):
     async def post(self, request):
         """
         Recibe una URL de video y retorna el análisis estructurado.
+        Responde 201 si el análisis se guardó durante la solicitud y 200 si
+        se devolvió uno vigente ya almacenado (acierto de cache).
+        Con ``async_mode`` encola el análisis y responde 202 con el trabajo creado.
+        Con ``?include=transcript`` la respuesta incluye la transcripción completa.
         """
         serializer = VideoInputSerializer(data=request.data)
         
@@ -25,17 +175,175 @@ class VideoAnalysisView(APIView):
         
         try:
             video_url = serializer.validated_data['video_url']
+            force_refresh = serializer.validated_data['force_refresh']
+
+            latency_tier = serializer.validated_data['latency_tier']
+
+            if serializer.validated_data['async_mode']:
+                return await self._enqueue(video_url, force_refresh, latency_tier)
             
             # Ejecución del Caso de Uso
-            result_record = await AnalyzeVideoUseCase.execute(video_url)
+            requested_at = timezone.now()
+            result_record = await AnalyzeVideoUseCase.execute(
+                video_url,
+                force_refresh=force_refresh,
+                latency_tier=latency_tier
+            )
             
             # Respuesta serializada
-            output_serializer = VideoRecordSerializer(result_record)
-            return Response(output_serializer.data, status=status.HTTP_201_CREATED)
+            include_transcript = _include_transcript(request)
+            if include_transcript:
+                await load_transcripts([result_record])
+            output_serializer = VideoRecordSerializer(
+                result_record, context={'include_transcript': include_transcript}
+            )
+            created = result_record.created_at >= requested_at
+            return Response(
+                output_serializer.data,
+                status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+            )
             
         except Exception as e:
             # error handling: Logging detallado y respuesta amigable
             return Response(
                 {"error": str(e)}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+    async def _enqueue(self, video_url, force_refresh, latency_tier=None):
+        """Encola el análisis y devuelve 202 con la URL de consulta del trabajo."""
+        try:
+            job = await SubmitAnalysisJobUseCase.execute(
+                video_url, force_refresh=force_refresh, latency_tier=latency_tier
+            )
+        except JobQueueFullError as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        data = AnalysisJobSerializer(job).data
+        status_url = reverse('video-job-detail', kwargs={'job_id': job.pk})
+        return Response(
+            {**data, "status_url": status_url},
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": status_url}
+        )
+
+
+class VideoAnalysisStreamView(APIView):
+    """
+    Variante streaming del análisis mediante Server-Sent Events.
+    Emite un evento por cada nodo completado del grafo (``extract``, ``analyze``)
+    y el análisis final en ``done``, compatible con ``EventSource`` del navegador.
+
+    Requiere el servidor ASGI (``uvicorn config.asgi:application``): bajo WSGI
+    Django consume el iterador asíncrono completo antes de responder y el
+    cliente recibe todos los eventos juntos al final.
+    """
+
+    async def get(self, request):
+        """
+        Recibe la URL por query string y responde con un stream text/event-stream.
+        """
+        serializer = VideoInputSerializer(data=request.query_params)
+
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        events = StreamVideoAnalysisUseCase.execute(
+            serializer.validated_data['video_url'],
+            force_refresh=serializer.validated_data['force_refresh'],
+            heartbeat_seconds=settings.ANALYSIS_STREAM_HEARTBEAT_SECONDS,
+            latency_tier=serializer.validated_data['latency_tier']
+        )
+        response = StreamingHttpResponse(
+            self._format_events(events, _include_transcript(request)),
+            content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        # Evita que nginx acumule el stream en su buffer
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    @staticmethod
+    async def _format_events(events, include_transcript=False):
+        """Serializa cada evento del caso de uso al formato SSE."""
+        async for event, data in events:
+            if event == StreamVideoAnalysisUseCase.EVENT_HEARTBEAT:
+                yield ": keep-alive\n\n"
+                continue
+            if event == StreamVideoAnalysisUseCase.EVENT_DONE:
+                if include_transcript:
+                    await load_transcripts([data])
+                data = VideoRecordSerializer(data, context={'include_transcript': include_transcript}).data
+            yield f"event: {event}\ndata: {json.dumps(data, cls=JSONEncoder)}\n\n"
+
+
+class VideoBatchAnalysisView(APIView):
+    """
+    Análisis de múltiples videos en una sola solicitud.
+    Deduplica por video, omite los ya analizados y procesa el resto con
+    concurrencia acotada (ANALYSIS_BATCH_CONCURRENCY).
+    """
+
+    async def post(self, request):
+        """
+        Recibe una lista de URLs y retorna un resultado (o error) por cada una.
+        """
+        serializer = VideoBatchInputSerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        results = await AnalyzeVideoBatchUseCase.execute(
+            serializer.validated_data['video_urls'],
+            force_refresh=serializer.validated_data['force_refresh']
+        )
+        summary = {
+            outcome: sum(1 for item in results if item.status == outcome)
+            for outcome in (
+                AnalyzeVideoBatchUseCase.STATUS_ANALYZED,
+                AnalyzeVideoBatchUseCase.STATUS_CACHED,
+                AnalyzeVideoBatchUseCase.STATUS_FAILED,
+            )
+        }
+        include_transcript = _include_transcript(request)
+        if include_transcript:
+            await load_transcripts(item.record for item in results)
+        data = BatchItemResultSerializer(
+            results, many=True, context={'include_transcript': include_transcript}
+        ).data
+        return Response({"summary": summary, "results": data}, status=status.HTTP_200_OK)
+
+
+class AnalysisJobView(APIView):
+    """
+    Consulta del estado de un análisis encolado en modo asíncrono.
+    """
+
+    async def get(self, request, job_id):
+        """
+        Retorna el estado del trabajo y, si finalizó, el análisis completo.
+        """
+        job = await GetAnalysisJobUseCase.execute(job_id)
+        if job is None:
+            return Response({"error": "Trabajo no encontrado"}, status=status.HTTP_404_NOT_FOUND)
+        include_transcript = _include_transcript(request)
+        if include_transcript:
+            await load_transcripts([job.record])
+        data = AnalysisJobSerializer(job, context={'include_transcript': include_transcript}).data
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class VideoTranscriptView(APIView):
+    """
+    Transcripción completa de un video ya analizado.
+    Las respuestas del análisis no la incluyen (salvo ``?include=transcript``).
+    """
+
+    async def get(self, request, video_id):
+        """
+        Retorna la transcripción almacenada del video.
+        """
+        transcript = await GetVideoTranscriptUseCase.execute(video_id)
+        if transcript is None:
+            return Response({"error": "Transcripción no encontrada"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(VideoTranscriptSerializer(transcript).data, status=status.HTTP_200_OK)
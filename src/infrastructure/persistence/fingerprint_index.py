@@ -0,0 +1,80 @@
+"""
+Índice de casi-duplicados sobre las firmas MinHash de las transcripciones.
+
+Cada VideoRecord con firma registra un bucket LSH por banda en
+TranscriptFingerprintBand. Buscar un casi-duplicado es una consulta exacta
+por (banda, bucket) seguida de la comparación de firmas de los pocos
+candidatos, sin recorrer la tabla de análisis.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+from django.db.models import QuerySet
+
+from domain.fingerprint import estimate_similarity, lsh_buckets, signature_from_bytes
+from .models import TranscriptFingerprintBand, VideoRecord
+
+
+def index_fingerprint(record: VideoRecord, signature: np.ndarray) -> None:
+    """
+    Reemplaza los buckets LSH del registro por los de su firma actual (síncrono).
+
+    La cantidad de bandas es fija (LSH_BANDS), así que un upsert por
+    (registro, banda) reemplaza todos los buckets en una sola sentencia.
+
+    Args:
+        record: VideoRecord ya guardado.
+        signature: Firma MinHash de su transcripción.
+    """
+    TranscriptFingerprintBand.objects.bulk_create(
+        [
+            TranscriptFingerprintBand(record=record, band=band, bucket=bucket)
+            for band, bucket in enumerate(lsh_buckets(signature))
+        ],
+        update_conflicts=True,
+        unique_fields=["record", "band"],
+        update_fields=["bucket"]
+    )
+
+
+def unindex_fingerprint(record: VideoRecord) -> None:
+    """Quita los buckets LSH del registro (síncrono), p. ej. si su nueva transcripción no tiene firma."""
+    TranscriptFingerprintBand.objects.filter(record=record).delete()
+
+
+async def find_near_duplicate(
+    signature: np.ndarray,
+    threshold: float,
+    queryset: Optional[QuerySet] = None
+) -> Optional[Tuple[VideoRecord, float]]:
+    """
+    Busca el análisis cuya transcripción es más similar a la firma dada.
+
+    Args:
+        signature: Firma MinHash de la transcripción nueva.
+        threshold: Similitud de Jaccard estimada mínima para aceptar un candidato.
+        queryset: Registros elegibles (p. ej. solo análisis vigentes y de otros videos).
+
+    Returns:
+        Tupla (VideoRecord, similitud) del mejor candidato, o None si ninguno
+        alcanza el umbral.
+    """
+    buckets = lsh_buckets(signature)
+    candidate_ids = set()
+    async for record_id, band, bucket in TranscriptFingerprintBand.objects.filter(
+        bucket__in=buckets
+    ).values_list("record_id", "band", "bucket"):
+        if buckets[band] == bucket:
+            candidate_ids.add(record_id)
+    if not candidate_ids:
+        return None
+
+    best: Optional[Tuple[VideoRecord, float]] = None
+    candidates = (queryset if queryset is not None else VideoRecord.objects.all()).filter(
+        pk__in=candidate_ids, fingerprint__isnull=False
+    )
+    async for record in candidates:
+        similarity = estimate_similarity(signature, signature_from_bytes(record.fingerprint))
+        if similarity >= threshold and (best is None or similarity > best[1]):
+            best = (record, similarity)
+    return best
@@ -0,0 +1,118 @@
+"""
+Locks distribuidos sobre la base de datos.
+
+Permite coordinar múltiples procesos/workers (gunicorn, uvicorn --workers)
+que comparten la misma base PostgreSQL mediante advisory locks:
+
+    - ``advisory_lock``: lock de sesión para secciones críticas largas (la
+      ejecución completa del grafo), sobre una conexión propia del lock.
+    - ``xact_lock``: lock de transacción para secciones dentro de ``transaction.atomic``.
+
+En otros motores (SQLite en tests) los locks son no-ops.
+"""
+import asyncio
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from asgiref.sync import sync_to_async
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+logger = logging.getLogger(__name__)
+
+
+def _lock_id(key: str) -> int:
+    """Deriva un entero de 64 bits con signo estable a partir de la clave."""
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+@sync_to_async
+def _open_lock_connection() -> BaseDatabaseWrapper:
+    """Abre una conexión dedicada, fuera del registro por thread de Django."""
+    lock_connection = connections.create_connection(DEFAULT_DB_ALIAS)
+    # sync_to_async puede despachar cada paso en un thread distinto
+    lock_connection.inc_thread_sharing()
+    lock_connection.ensure_connection()
+    return lock_connection
+
+
+@sync_to_async
+def _try_acquire(lock_connection: BaseDatabaseWrapper, lock_id: int) -> bool:
+    with lock_connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s)", [lock_id])
+        return cursor.fetchone()[0]
+
+
+@sync_to_async
+def _close_lock_connection(lock_connection: BaseDatabaseWrapper) -> None:
+    """Cierra la sesión: PostgreSQL libera con ella todos sus advisory locks."""
+    try:
+        lock_connection.close()
+    except Exception as e:
+        # Una conexión rota ya terminó su sesión y con ella el lock
+        logger.warning(f"Error cerrando la conexión del advisory lock: {e}")
+    finally:
+        lock_connection.dec_thread_sharing()
+
+
+@asynccontextmanager
+async def advisory_lock(
+    key: str,
+    poll_interval: float = 0.1,
+    max_poll_interval: float = 1.0
+) -> AsyncIterator[None]:
+    """
+    Adquiere un advisory lock de PostgreSQL para la clave indicada.
+
+    Usa ``pg_try_advisory_lock`` con sondeo y backoff en lugar de la variante
+    bloqueante, para no retener el thread de sync_to_async mientras se espera.
+
+    El lock vive en una conexión dedicada, abierta al entrar y cerrada al
+    salir. La conexión por thread de Django no sirve: sync_to_async puede
+    correr el lock y el unlock en threads (y conexiones) distintos, y
+    ``close_old_connections`` puede cerrarla a mitad de camino, perdiendo el
+    lock o dejándolo tomado. Un lock de transacción tampoco: la sección
+    crítica (el grafo completo) dura minutos y retendría una transacción
+    abierta todo ese tiempo. Cerrar la sesión libera el lock aunque la tarea
+    se cancele o la conexión se haya roto.
+
+    Args:
+        key: Clave lógica a serializar entre procesos.
+        poll_interval: Espera inicial entre intentos (segundos).
+        max_poll_interval: Espera máxima entre intentos (segundos).
+    """
+    if connection.vendor != "postgresql":
+        yield
+        return
+
+    lock_id = _lock_id(key)
+    lock_connection = await _open_lock_connection()
+    try:
+        delay = poll_interval
+        while not await _try_acquire(lock_connection, lock_id):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)
+        yield
+    finally:
+        await _close_lock_connection(lock_connection)
+
+
+def xact_lock(key: str) -> None:
+    """
+    Toma un advisory lock de transacción (``pg_advisory_xact_lock``) para la clave.
+
+    Bloquea hasta obtenerlo y PostgreSQL lo libera al terminar la transacción
+    en curso, sin un unlock explícito que pueda ejecutarse en otra conexión.
+    Debe llamarse (desde código síncrono) dentro de ``transaction.atomic``. En
+    otros motores es un no-op: SQLite ya serializa las transacciones de escritura.
+
+    Args:
+        key: Clave lógica a serializar entre procesos.
+    """
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", [_lock_id(key)])
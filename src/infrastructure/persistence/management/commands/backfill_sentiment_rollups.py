@@ -0,0 +1,50 @@
+"""
+Reconstruye los agregados de sentimiento a partir de los análisis almacenados.
+
+Sirve como backfill inicial (análisis previos a SentimentRollup) y como
+compactación periódica: corrige el desvío que dejan los cambios hechos por
+fuera de ``upsert_video_record`` (p. ej. borrados desde el admin). Mientras
+corre, las escrituras de análisis esperan a que termine (ver
+``rebuild_rollups``); ``--since`` acota el recorrido y esa espera.
+
+Usage:
+    python manage.py backfill_sentiment_rollups
+    python manage.py backfill_sentiment_rollups --since 2026-10-01 --chunk-size 5000
+"""
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from infrastructure.persistence.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Reconstruye SentimentRollup recorriendo VideoRecord en chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="Primer día (YYYY-MM-DD) a reconstruir; los anteriores no se modifican"
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Filas leídas por consulta (default: 2000)"
+        )
+
+    def handle(self, *args, since=None, chunk_size=2000, **options):
+        first_day = self._parse_day(since) if since else None
+
+        analyzed, written = rebuild_rollups(since=first_day, chunk_size=chunk_size)
+        self.stdout.write(self.style.SUCCESS(
+            f"{analyzed} análisis agregados en {written} buckets"
+            + (f" desde {first_day.isoformat()}" if first_day else "")
+        ))
+
+    @staticmethod
+    def _parse_day(value: str) -> date:
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise CommandError(f"--since inválido: {value!r} (formato YYYY-MM-DD)")
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.11 on 2026-10-17 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videorecord',
+            name='video_id',
+            field=models.CharField(help_text='ID canónico de 11 caracteres del video de YouTube', max_length=11, null=True),
+        ),
+        migrations.AlterField(
+            model_name='videorecord',
+            name='url',
+            field=models.URLField(help_text='URL canónica de origen del video', max_length=500),
+        ),
+    ]
@@ -0,0 +1,98 @@
+# Generated by Django 5.2.11 on 2026-10-17 10:14
+
+import logging
+
+from django.db import migrations
+
+from domain.video_url import (
+    extract_video_id, canonical_video_url, is_valid_video_id, InvalidVideoURLError, VIDEO_ID_LENGTH
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+# Prefijo de la clave de los registros sin ID reconocible: "!" no es un carácter
+# de ID de YouTube, por lo que nunca coincide con un video real
+UNPARSABLE_PREFIX = "!"
+
+
+def _legacy_video_id(url):
+    """
+    Regla de extracción previa al canonicalizador, usada como fallback.
+
+    Returns:
+        El ID si la regla produce uno válido de 11 caracteres; si no, None.
+    """
+    if "v=" in url:
+        candidate = url.split("v=")[1][:VIDEO_ID_LENGTH]
+    else:
+        candidate = url.split("/")[-1][:VIDEO_ID_LENGTH]
+    return candidate if is_valid_video_id(candidate) else None
+
+
+def _unparsable_key(record_id):
+    """Clave única (y marcada) para un registro cuya URL no contiene un ID."""
+    return f"{UNPARSABLE_PREFIX}{record_id}"
+
+
+def backfill_video_id(apps, schema_editor):
+    """
+    Completa video_id y normaliza url en los registros existentes.
+
+    Recorre la tabla del más reciente al más antiguo; si varias URLs apuntan
+    al mismo video se conserva el análisis más reciente y se eliminan los
+    duplicados, para poder declarar video_id como único.
+
+    Los registros cuya URL no contiene un ID válido no se deduplican (no
+    hay forma de saber si son el mismo video): conservan su URL y reciben
+    la clave ``!<id>``, única y fuera del alfabeto de IDs de YouTube, para
+    revisarlos a mano.
+    """
+    VideoRecord = apps.get_model('persistence', 'VideoRecord')
+    seen = set()
+    duplicates = []
+    pending = []
+    unparsable = 0
+
+    queryset = VideoRecord.objects.order_by('-created_at', '-id').only('id', 'url')
+    for record in queryset.iterator(chunk_size=BATCH_SIZE):
+        try:
+            video_id = extract_video_id(record.url)
+            record.url = canonical_video_url(video_id)
+        except InvalidVideoURLError:
+            video_id = _legacy_video_id(record.url)
+
+        if video_id is None:
+            unparsable += 1
+            video_id = _unparsable_key(record.id)
+        elif video_id in seen:
+            duplicates.append(record.id)
+            continue
+        seen.add(video_id)
+        record.video_id = video_id
+        pending.append(record)
+
+        if len(pending) >= BATCH_SIZE:
+            VideoRecord.objects.bulk_update(pending, ['video_id', 'url'])
+            pending = []
+
+    if pending:
+        VideoRecord.objects.bulk_update(pending, ['video_id', 'url'])
+    for start in range(0, len(duplicates), BATCH_SIZE):
+        VideoRecord.objects.filter(id__in=duplicates[start:start + BATCH_SIZE]).delete()
+    if unparsable:
+        logger.warning(
+            f"{unparsable} registro(s) sin ID de video reconocible quedaron con video_id "
+            f"'{UNPARSABLE_PREFIX}<id>' para revisión manual."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0002_videorecord_video_id'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_video_id, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-17 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0003_backfill_video_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='videorecord',
+            name='video_id',
+            field=models.CharField(help_text='ID canónico de 11 caracteres del video de YouTube', max_length=11, unique=True),
+        ),
+    ]
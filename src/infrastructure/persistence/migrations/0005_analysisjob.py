@@ -0,0 +1,33 @@
+# Generated by Django 5.2.11 on 2026-10-17 11:02
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0004_alter_videorecord_video_id_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalysisJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('video_id', models.CharField(db_index=True, max_length=11)),
+                ('video_url', models.URLField(max_length=500)),
+                ('force_refresh', models.BooleanField(default=False)),
+                ('state', models.CharField(choices=[('queued', 'En cola'), ('extracting', 'Extrayendo'), ('analyzing', 'Analizando'), ('done', 'Finalizado'), ('failed', 'Fallido')], default='queued', max_length=20)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('record', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='persistence.videorecord')),
+            ],
+            options={
+                'verbose_name': 'Trabajo de Análisis',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
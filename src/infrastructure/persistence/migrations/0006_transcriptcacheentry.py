@@ -0,0 +1,27 @@
+# Generated by Django 5.2.11 on 2026-10-17 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0005_analysisjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranscriptCacheEntry',
+            fields=[
+                ('key', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('video_id', models.CharField(db_index=True, max_length=11)),
+                ('payload', models.BinaryField()),
+                ('size_bytes', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('last_accessed_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Transcripción Cacheada',
+            },
+        ),
+    ]
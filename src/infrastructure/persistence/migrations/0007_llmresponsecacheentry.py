@@ -0,0 +1,27 @@
+# Generated by Django 5.2.11 on 2026-10-17 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0006_transcriptcacheentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LLMResponseCacheEntry',
+            fields=[
+                ('key', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('provider', models.CharField(max_length=20)),
+                ('model', models.CharField(max_length=100)),
+                ('schema', models.CharField(max_length=100)),
+                ('response', models.TextField()),
+                ('created_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Respuesta LLM Cacheada',
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.11 on 2026-10-17 11:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0007_llmresponsecacheentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videorecord',
+            name='duplicate_of',
+            field=models.CharField(blank=True, default='', help_text='video_id cuyo análisis se reutilizó por similitud de transcripción', max_length=11),
+        ),
+        migrations.AddField(
+            model_name='videorecord',
+            name='fingerprint',
+            field=models.BinaryField(blank=True, help_text='Firma MinHash de la transcripción (ver domain.fingerprint)', null=True),
+        ),
+        migrations.CreateModel(
+            name='TranscriptFingerprintBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('record', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fingerprint_bands', to='persistence.videorecord')),
+            ],
+            options={
+                'verbose_name': 'Banda LSH de Transcripción',
+                'indexes': [models.Index(fields=['band', 'bucket'], name='persistence_band_5dd63d_idx')],
+                'constraints': [models.UniqueConstraint(fields=('record', 'band'), name='unique_fingerprint_band_per_record')],
+            },
+        ),
+    ]
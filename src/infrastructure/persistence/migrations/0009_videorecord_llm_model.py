@@ -0,0 +1,23 @@
+# Generated by Django 5.2.11 on 2026-10-17 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0008_transcript_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videorecord',
+            name='llm_model',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='videorecord',
+            name='llm_provider',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+    ]
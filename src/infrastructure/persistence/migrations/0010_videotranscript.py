@@ -0,0 +1,24 @@
+# Generated by Django 5.2.11 on 2026-10-17 12:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0009_videorecord_llm_model'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VideoTranscript',
+            fields=[
+                ('record', models.OneToOneField(db_column='video_id', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='transcript_data', serialize=False, to='persistence.videorecord', to_field='video_id')),
+                ('text', models.TextField(help_text='Transcripción completa extraída')),
+            ],
+            options={
+                'verbose_name': 'Transcripción de Video',
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.11 on 2026-10-17 12:34
+
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+def move_transcripts(apps, schema_editor):
+    """
+    Copia VideoRecord.transcript a VideoTranscript en lotes por clave primaria.
+
+    Cada lote lee solo (id, video_id, transcript) de BATCH_SIZE filas, de modo
+    que la memoria no depende del tamaño de la tabla.
+    """
+    VideoRecord = apps.get_model('persistence', 'VideoRecord')
+    VideoTranscript = apps.get_model('persistence', 'VideoTranscript')
+    last_id = 0
+    while True:
+        batch = list(
+            VideoRecord.objects.filter(id__gt=last_id)
+            .order_by('id')
+            .values_list('id', 'video_id', 'transcript')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        VideoTranscript.objects.bulk_create(
+            [VideoTranscript(record_id=video_id, text=text) for _, video_id, text in batch],
+            ignore_conflicts=True
+        )
+        last_id = batch[-1][0]
+
+
+def restore_transcripts(apps, schema_editor):
+    """Reversa: vuelve a copiar el texto a VideoRecord.transcript, en lotes."""
+    VideoRecord = apps.get_model('persistence', 'VideoRecord')
+    VideoTranscript = apps.get_model('persistence', 'VideoTranscript')
+    last_video_id = ''
+    while True:
+        batch = list(
+            VideoTranscript.objects.filter(record_id__gt=last_video_id)
+            .order_by('record_id')
+            .values_list('record_id', 'text')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        texts = dict(batch)
+        records = list(VideoRecord.objects.filter(video_id__in=texts).only('id', 'video_id'))
+        for record in records:
+            record.transcript = texts[record.video_id]
+        VideoRecord.objects.bulk_update(records, ['transcript'])
+        last_video_id = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0010_videotranscript'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_transcripts, restore_transcripts),
+    ]
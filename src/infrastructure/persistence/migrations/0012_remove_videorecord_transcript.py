@@ -0,0 +1,23 @@
+# Generated by Django 5.2.11 on 2026-10-17 12:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0011_move_transcripts'),
+    ]
+
+    operations = [
+        # Default vacío: permite recrear la columna al revertir la migración
+        migrations.AlterField(
+            model_name='videorecord',
+            name='transcript',
+            field=models.TextField(default='', help_text='Transcripción completa extraída'),
+        ),
+        migrations.RemoveField(
+            model_name='videorecord',
+            name='transcript',
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.11 on 2026-10-17 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0012_remove_videorecord_transcript'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='videorecord',
+            index=models.Index(fields=['-created_at', '-id'], name='videorecord_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='videorecord',
+            index=models.Index(fields=['sentiment', '-created_at', '-id'], name='videorecord_sentiment_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='videorecord',
+            index=models.Index(fields=['tone', '-created_at', '-id'], name='videorecord_tone_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='videorecord',
+            index=models.Index(fields=['language_code', '-created_at', '-id'], name='videorecord_language_idx'),
+        ),
+    ]
@@ -0,0 +1,98 @@
+# Generated by Django 5.2.11 on 2026-10-17 13:52
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+# Copia de persistence.search.TEXT_SEARCH_CONFIGS al momento de la migración
+TEXT_SEARCH_CONFIGS = {
+    "es": "spanish",
+    "en": "english",
+    "pt": "portuguese",
+    "fr": "french",
+    "it": "italian",
+    "de": "german",
+}
+
+POSTGRES_CONFIG_SQL = "CASE split_part(lower(r.language_code), '-', 1) {} ELSE 'simple' END::regconfig".format(
+    " ".join(f"WHEN '{code}' THEN '{config}'" for code, config in TEXT_SEARCH_CONFIGS.items())
+)
+
+POSTGRES_BACKFILL_SQL = f"""
+    UPDATE persistence_videotranscript t
+    SET search_vector =
+        setweight(to_tsvector({POSTGRES_CONFIG_SQL}, r.title), 'A')
+        || setweight(to_tsvector({POSTGRES_CONFIG_SQL}, coalesce(
+            (SELECT string_agg(value, ' ') FROM jsonb_array_elements_text(r.key_points)), ''
+        )), 'B')
+        || setweight(to_tsvector({POSTGRES_CONFIG_SQL}, t.text), 'C')
+    FROM persistence_videorecord r
+    WHERE r.video_id = t.video_id AND r.id > %s AND r.id <= %s
+"""
+
+SQLITE_BACKFILL_SQL = """
+    INSERT INTO persistence_videosearch (video_id, title, key_points, transcript)
+    SELECT r.video_id, r.title, (SELECT group_concat(value, ' ') FROM json_each(r.key_points)), t.text
+    FROM persistence_videorecord r
+    JOIN persistence_videotranscript t ON t.video_id = r.video_id
+    WHERE r.id > %s AND r.id <= %s
+"""
+
+
+def create_search_structures(apps, schema_editor):
+    """Índice GIN en PostgreSQL; tabla FTS5 (y su limpieza al borrar) en SQLite."""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE INDEX videotranscript_search_idx ON persistence_videotranscript USING gin (search_vector)"
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE persistence_videosearch USING fts5("
+            "video_id UNINDEXED, title, key_points, transcript, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            "CREATE TRIGGER persistence_videosearch_delete AFTER DELETE ON persistence_videotranscript "
+            "BEGIN DELETE FROM persistence_videosearch WHERE video_id = old.video_id; END"
+        )
+
+
+def drop_search_structures(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS videotranscript_search_idx")
+    elif vendor == 'sqlite':
+        schema_editor.execute("DROP TRIGGER IF EXISTS persistence_videosearch_delete")
+        schema_editor.execute("DROP TABLE IF EXISTS persistence_videosearch")
+
+
+def backfill_search(apps, schema_editor):
+    """Indexa los análisis existentes en rangos de BATCH_SIZE ids."""
+    vendor = schema_editor.connection.vendor
+    if vendor not in ('postgresql', 'sqlite'):
+        return
+    sql = POSTGRES_BACKFILL_SQL if vendor == 'postgresql' else SQLITE_BACKFILL_SQL
+    VideoRecord = apps.get_model('persistence', 'VideoRecord')
+    last_id = VideoRecord.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    with schema_editor.connection.cursor() as cursor:
+        for start in range(0, last_id, BATCH_SIZE):
+            cursor.execute(sql, [start, start + BATCH_SIZE])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0013_videorecord_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videotranscript',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_structures, drop_search_structures),
+        migrations.RunPython(backfill_search, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.11 on 2026-10-17 14:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0014_transcript_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SentimentRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('sentiment', models.CharField(max_length=20)),
+                ('tone', models.CharField(max_length=100)),
+                ('language_code', models.CharField(max_length=10)),
+                ('count', models.IntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0.0)),
+            ],
+            options={
+                'verbose_name': 'Agregado de Sentimiento',
+                'constraints': [models.UniqueConstraint(fields=('day', 'sentiment', 'tone', 'language_code'), name='unique_sentiment_rollup_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-17 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('persistence', '0015_sentimentrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysisjob',
+            name='latency_tier',
+            field=models.CharField(blank=True, default='', max_length=10),
+        ),
+    ]
@@ -2,6 +2,9 @@
 Módulo de Infraestructura: Implementación de la persistencia mediante Django ORM.
 Define cómo se mapean los resultados del análisis a la base de datos PostgreSQL.
 """
+import uuid
+
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 
@@ -11,15 +14,19 @@ class VideoRecord(models.Model):
     Incluye optimizaciones de índices y validaciones de rango.
     """
     # Identificación y Metadata [cite: 18-20, 30]
-    # url con índice y unicidad para evitar duplicados y acelerar búsquedas
+    # video_id canónico: clave de búsqueda y deduplicación (todas las variantes
+    # de URL de un mismo video comparten el mismo ID)
+    video_id = models.CharField(
+        max_length=11,
+        unique=True,
+        help_text="ID canónico de 11 caracteres del video de YouTube"
+    )
     url = models.URLField(
         max_length=500, 
-        unique=True, 
-        db_index=True, 
-        help_text="URL única de origen del video"
+        help_text="URL canónica de origen del video"
     )
     title = models.CharField(max_length=255)
-    transcript = models.TextField(help_text="Transcripción completa extraída")
+    # La transcripción vive en VideoTranscript: las lecturas del análisis no la arrastran
     duration_seconds = models.PositiveIntegerField()
     language_code = models.CharField(max_length=10)
 
@@ -32,12 +39,206 @@ class VideoRecord(models.Model):
     tone = models.CharField(max_length=100)
     key_points = models.JSONField(help_text="Lista de los 3 puntos clave en formato JSON")
 
+    # Detección de casi-duplicados (re-subidas, espejos, recortes)
+    fingerprint = models.BinaryField(
+        null=True,
+        blank=True,
+        help_text="Firma MinHash de la transcripción (ver domain.fingerprint)"
+    )
+    duplicate_of = models.CharField(
+        max_length=11,
+        blank=True,
+        default="",
+        help_text="video_id cuyo análisis se reutilizó por similitud de transcripción"
+    )
+
+    # Modelo que produjo el análisis (elegido por el router de modelos)
+    llm_provider = models.CharField(max_length=20, blank=True, default="")
+    llm_model = models.CharField(max_length=100, blank=True, default="")
+
     # Auditoría con índice para reportes cronológicos
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
         verbose_name = "Registro de Video"
         ordering = ['-created_at']
+        # Listado paginado por keyset (created_at, id): uno sin filtros y uno
+        # por cada filtro de igualdad, para que filtro + orden + cursor sean
+        # un único rango sobre el índice
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='videorecord_recent_idx'),
+            models.Index(fields=['sentiment', '-created_at', '-id'], name='videorecord_sentiment_idx'),
+            models.Index(fields=['tone', '-created_at', '-id'], name='videorecord_tone_idx'),
+            models.Index(fields=['language_code', '-created_at', '-id'], name='videorecord_language_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} - {self.sentiment}"
+
+
+class VideoTranscript(models.Model):
+    """
+    Transcripción completa de un VideoRecord, fuera de la fila del análisis.
+
+    Puede ocupar megabytes: separarla deja a VideoRecord con filas chicas
+    para listados y lookups, y el texto se lee solo cuando se pide
+    explícitamente. En PostgreSQL el texto largo se comprime y almacena
+    fuera de línea (TOAST).
+    """
+    record = models.OneToOneField(
+        VideoRecord,
+        to_field="video_id",
+        db_column="video_id",
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="transcript_data"
+    )
+    text = models.TextField(help_text="Transcripción completa extraída")
+    # Búsqueda de texto completo en PostgreSQL (ver persistence.search). El índice
+    # GIN lo crea la migración 0014 solo en PostgreSQL; en SQLite queda vacía
+    # y se usa una tabla FTS5.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        verbose_name = "Transcripción de Video"
+
+    def __str__(self):
+        return f"{self.record_id} ({len(self.text)} caracteres)"
+
+class TranscriptFingerprintBand(models.Model):
+    """
+    Índice LSH de las firmas MinHash: un bucket por banda de cada VideoRecord.
+    Dos transcripciones similares comparten el bucket de al menos una banda,
+    por lo que los candidatos se obtienen con una búsqueda exacta indexada.
+    """
+    record = models.ForeignKey(
+        VideoRecord,
+        on_delete=models.CASCADE,
+        related_name="fingerprint_bands"
+    )
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        verbose_name = "Banda LSH de Transcripción"
+        indexes = [models.Index(fields=["band", "bucket"])]
+        constraints = [
+            models.UniqueConstraint(fields=["record", "band"], name="unique_fingerprint_band_per_record")
+        ]
+
+    def __str__(self):
+        return f"{self.record_id} [{self.band}] {self.bucket}"
+
+
+class AnalysisJob(models.Model):
+    """
+    Solicitud de análisis asíncrona (modo 202 Accepted).
+    Registra el estado del procesamiento para que el cliente pueda consultarlo
+    desde cualquier worker mientras el grafo se ejecuta en segundo plano.
+    """
+
+    class State(models.TextChoices):
+        QUEUED = "queued", "En cola"
+        EXTRACTING = "extracting", "Extrayendo"
+        ANALYZING = "analyzing", "Analizando"
+        DONE = "done", "Finalizado"
+        FAILED = "failed", "Fallido"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    video_id = models.CharField(max_length=11, db_index=True)
+    video_url = models.URLField(max_length=500)
+    force_refresh = models.BooleanField(default=False)
+    # Nivel de latencia pedido para el ruteo de modelos ("" = LLM_DEFAULT_LATENCY_TIER)
+    latency_tier = models.CharField(max_length=10, blank=True, default="")
+    state = models.CharField(max_length=20, choices=State.choices, default=State.QUEUED)
+    error = models.TextField(blank=True, default="")
+    # Resultado del análisis una vez finalizado
+    record = models.ForeignKey(
+        VideoRecord,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="jobs"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Trabajo de Análisis"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.video_id} - {self.state}"
+
+
+class TranscriptCacheEntry(models.Model):
+    """
+    Entrada de la cache persistente de transcripciones (backend "database").
+    La clave es el hash de video_id + idiomas solicitados; el payload se guarda
+    comprimido y last_accessed_at ordena el desalojo LRU.
+    """
+    key = models.CharField(max_length=64, primary_key=True)
+    video_id = models.CharField(max_length=11, db_index=True)
+    payload = models.BinaryField()
+    size_bytes = models.PositiveIntegerField()
+    created_at = models.DateTimeField(db_index=True)
+    last_accessed_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = "Transcripción Cacheada"
+
+    def __str__(self):
+        return f"{self.video_id} ({self.size_bytes} bytes)"
+
+
+class LLMResponseCacheEntry(models.Model):
+    """
+    Respuesta estructurada cacheada del LLM (nivel persistente de la cache).
+    La clave es el hash de proveedor, modelo, temperatura, schema y prompt;
+    response guarda el JSON ya validado contra el schema.
+    """
+    key = models.CharField(max_length=64, primary_key=True)
+    provider = models.CharField(max_length=20)
+    model = models.CharField(max_length=100)
+    schema = models.CharField(max_length=100)
+    response = models.TextField()
+    created_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = "Respuesta LLM Cacheada"
+
+    def __str__(self):
+        return f"{self.provider}:{self.model} ({self.schema})"
+
+
+class SentimentRollup(models.Model):
+    """
+    Agregado de sentimiento por día, sentimiento, tono e idioma.
+
+    Cada fila resume los análisis almacenados de un bucket (cantidad y suma de
+    sentiment_score), de modo que las métricas se sirven desde unos cientos de
+    filas sin recorrer VideoRecord. Se actualiza de forma incremental en cada
+    escritura (ver persistence.rollups) y se reconstruye con el comando
+    ``backfill_sentiment_rollups``.
+    """
+    # Día de created_at en la zona horaria del proyecto (TIME_ZONE)
+    day = models.DateField()
+    sentiment = models.CharField(max_length=20)
+    tone = models.CharField(max_length=100)
+    language_code = models.CharField(max_length=10)
+    # IntegerField: los decrementos pasan por un INSERT ... ON CONFLICT con count negativo
+    count = models.IntegerField(default=0)
+    score_sum = models.FloatField(default=0.0)
+
+    class Meta:
+        verbose_name = "Agregado de Sentimiento"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "sentiment", "tone", "language_code"],
+                name="unique_sentiment_rollup_bucket"
+            )
+        ]
 
     def __str__(self):
-        return f"{self.title} - {self.sentiment}"
\ No newline at end of file
+        return f"{self.day} {self.sentiment}/{self.tone}/{self.language_code}: {self.count}"
@@ -0,0 +1,151 @@
+"""
+Agregados incrementales de sentimiento (SentimentRollup).
+
+Cada escritura de un análisis suma su aporte (1 análisis y su
+sentiment_score) al bucket (día, sentimiento, tono, idioma) y, si reemplazó
+un análisis previo del mismo video, resta el aporte anterior. Así la tabla
+refleja en todo momento el GROUP BY de los análisis almacenados sin volver a
+recorrer VideoRecord. Los incrementos son un ``INSERT ... ON CONFLICT DO
+UPDATE SET count = count + excluded.count`` (PostgreSQL y SQLite) que se
+ejecuta en la misma transacción que el upsert del análisis y la lectura
+(``SELECT ... FOR UPDATE``) del análisis reemplazado.
+
+Lo que no pasa por ``upsert_video_record`` (borrados desde el admin, SQL
+manual) no se refleja hasta ejecutar ``manage.py backfill_sentiment_rollups``
+(``rebuild_rollups``).
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import SentimentRollup, VideoRecord
+
+# (día, sentimiento, tono, idioma)
+BucketKey = Tuple[date, str, str, str]
+
+# Columnas de VideoRecord que definen el aporte de un análisis
+CONTRIBUTION_FIELDS = ("created_at", "sentiment", "tone", "language_code", "sentiment_score")
+
+_INCREMENT_SQL = f"""
+    INSERT INTO {SentimentRollup._meta.db_table} (day, sentiment, tone, language_code, count, score_sum)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON CONFLICT (day, sentiment, tone, language_code) DO UPDATE SET
+        count = {SentimentRollup._meta.db_table}.count + excluded.count,
+        score_sum = {SentimentRollup._meta.db_table}.score_sum + excluded.score_sum
+"""
+
+
+@dataclass(frozen=True)
+class RollupContribution:
+    """
+    Aporte de un análisis a los agregados.
+
+    Attributes:
+        created_at: Momento del análisis (define el día del bucket).
+        sentiment: Sentimiento.
+        tone: Tono.
+        language_code: Idioma.
+        sentiment_score: Puntaje del análisis.
+    """
+    created_at: datetime
+    sentiment: str
+    tone: str
+    language_code: str
+    sentiment_score: float
+
+    @property
+    def bucket(self) -> BucketKey:
+        return (timezone.localdate(self.created_at), self.sentiment, self.tone, self.language_code)
+
+
+def apply_contribution(
+    new: RollupContribution,
+    previous: Optional[RollupContribution] = None
+) -> None:
+    """
+    Suma el aporte de un análisis y resta el del análisis que reemplazó (síncrono).
+
+    Debe ejecutarse en la transacción que leyó ``previous`` con bloqueo y
+    guardó ``new``: si no, dos escritores del mismo video restarían dos veces
+    el mismo aporte.
+
+    Args:
+        new: Aporte del análisis recién guardado.
+        previous: Aporte del análisis previo del mismo video (None si es nuevo).
+    """
+    deltas = [(new.bucket, 1, new.sentiment_score)]
+    if previous is not None:
+        deltas.append((previous.bucket, -1, -previous.sentiment_score))
+    with connection.cursor() as cursor:
+        cursor.executemany(_INCREMENT_SQL, [(*bucket, count, score) for bucket, count, score in deltas])
+
+
+def aggregate_contributions(contributions: Iterable[RollupContribution]) -> Dict[BucketKey, List[float]]:
+    """
+    Agrega aportes en memoria: {bucket: [cantidad, suma de puntajes]}.
+
+    La memoria depende de la cantidad de buckets, no de la de análisis.
+    """
+    buckets: Dict[BucketKey, List[float]] = {}
+    for contribution in contributions:
+        totals = buckets.setdefault(contribution.bucket, [0, 0.0])
+        totals[0] += 1
+        totals[1] += contribution.sentiment_score
+    return buckets
+
+
+def rebuild_rollups(since: Optional[date] = None, chunk_size: int = 2000) -> Tuple[int, int]:
+    """
+    Reconstruye los agregados (desde ``since`` o todos) a partir de VideoRecord (síncrono).
+
+    Todo ocurre en una transacción que primero bloquea la escritura de
+    SentimentRollup (``LOCK TABLE ... IN EXCLUSIVE MODE`` en PostgreSQL; en
+    SQLite el ``DELETE`` inicial toma el lock de escritura de la base) y recién
+    después recorre los análisis. Un escritor concurrente espera a que la
+    reconstrucción termine para aplicar su incremento, que es relativo al
+    análisis que el recorrido ya contó: no se pierde ningún incremento. Las
+    lecturas de los agregados no se bloquean.
+
+    Args:
+        since: Primer día reconstruido (None = toda la tabla).
+        chunk_size: Filas de VideoRecord leídas por consulta.
+
+    Returns:
+        Tuple[int, int]: Análisis recorridos y buckets escritos.
+    """
+    analyses = VideoRecord.objects.order_by().values_list(*CONTRIBUTION_FIELDS)
+    stale = SentimentRollup.objects.all()
+    if since is not None:
+        analyses = analyses.filter(created_at__gte=timezone.make_aware(datetime.combine(since, time.min)))
+        stale = stale.filter(day__gte=since)
+
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(f"LOCK TABLE {SentimentRollup._meta.db_table} IN EXCLUSIVE MODE")
+        stale.delete()
+
+        # Solo las columnas del aporte, en chunks: la memoria depende de los buckets
+        scanned = 0
+
+        def contributions():
+            nonlocal scanned
+            for row in analyses.iterator(chunk_size=chunk_size):
+                scanned += 1
+                yield RollupContribution(*row)
+
+        buckets = aggregate_contributions(contributions())
+        SentimentRollup.objects.bulk_create(
+            [
+                SentimentRollup(
+                    day=day, sentiment=sentiment, tone=tone, language_code=language_code,
+                    count=int(count), score_sum=score_sum
+                )
+                for (day, sentiment, tone, language_code), (count, score_sum) in buckets.items()
+            ],
+            batch_size=1000
+        )
+    return scanned, len(buckets)
@@ -0,0 +1,177 @@
+"""
+Búsqueda de texto completo sobre transcripciones, títulos y puntos clave.
+
+En PostgreSQL cada VideoTranscript guarda un ``tsvector`` (columna
+``search_vector`` con índice GIN) construido con la configuración de texto
+del idioma del análisis (``language_code``): título con peso A, puntos
+clave con peso B y transcripción con peso C. Se recalcula en cada escritura
+del análisis y la búsqueda es un ``@@`` indexado ordenado por ``ts_rank``.
+
+En SQLite (settings de testing) se usa una tabla virtual FTS5 con ranking
+BM25 y los mismos pesos relativos. En otros motores la búsqueda no está
+disponible y la indexación es un no-op.
+"""
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+from asgiref.sync import sync_to_async
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, TextField, Value
+
+from .models import VideoRecord, VideoTranscript
+
+# Configuración de text search de PostgreSQL por código ISO 639-1
+TEXT_SEARCH_CONFIGS = {
+    "es": "spanish",
+    "en": "english",
+    "pt": "portuguese",
+    "fr": "french",
+    "it": "italian",
+    "de": "german",
+}
+DEFAULT_TEXT_SEARCH_CONFIG = "simple"
+
+# Tabla virtual FTS5 del fallback de SQLite (creada por la migración 0014)
+SQLITE_FTS_TABLE = "persistence_videosearch"
+# Pesos BM25 de (title, key_points, transcript), equivalentes a A/B/C
+SQLITE_BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+SNIPPET_WORDS = 24
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class SearchHit:
+    """
+    Resultado de la búsqueda.
+
+    Attributes:
+        video_id: ID canónico del video.
+        rank: Relevancia (mayor = más relevante; solo comparable dentro de una búsqueda).
+        snippet: Fragmento de la transcripción con los términos encontrados.
+    """
+    video_id: str
+    rank: float
+    snippet: str
+
+
+def text_search_config(language_code: Optional[str]) -> str:
+    """Configuración de text search para un idioma (``es-419`` usa la de ``es``)."""
+    language = (language_code or "").split("-")[0].lower()
+    return TEXT_SEARCH_CONFIGS.get(language, DEFAULT_TEXT_SEARCH_CONFIG)
+
+
+def index_video(record: VideoRecord) -> None:
+    """
+    Recalcula la entrada de búsqueda de un análisis a partir de su fila actual (síncrono).
+
+    Debe llamarse después de guardar el VideoRecord y su VideoTranscript, en
+    la misma transacción.
+
+    Args:
+        record: VideoRecord guardado (título, puntos clave e idioma vigentes).
+    """
+    key_points = " ".join(str(point) for point in record.key_points or [])
+    if connection.vendor == "postgresql":
+        config = text_search_config(record.language_code)
+        VideoTranscript.objects.filter(record_id=record.video_id).update(
+            search_vector=(
+                SearchVector(Value(record.title, output_field=TextField()), weight="A", config=config)
+                + SearchVector(Value(key_points, output_field=TextField()), weight="B", config=config)
+                + SearchVector("text", weight="C", config=config)
+            )
+        )
+    elif connection.vendor == "sqlite":
+        _sqlite_index(record.video_id, record.title, key_points)
+
+
+async def search_videos(
+    query: str,
+    language_code: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0
+) -> List[SearchHit]:
+    """
+    Busca análisis cuyo título, puntos clave o transcripción mencionan la consulta.
+
+    Args:
+        query: Texto a buscar (en PostgreSQL admite la sintaxis de
+               ``websearch_to_tsquery``: comillas, ``OR`` y ``-``).
+        language_code: Restringe a análisis en ese idioma y busca con su
+                       configuración; sin idioma se combinan todas.
+        limit: Resultados a devolver.
+        offset: Resultados a omitir (paginación).
+
+    Returns:
+        Resultados ordenados por relevancia descendente.
+    """
+    if connection.vendor == "postgresql":
+        return await _postgres_search(query, language_code, limit, offset)
+    if connection.vendor == "sqlite":
+        return await _sqlite_search(query, language_code, limit, offset)
+    return []
+
+
+async def _postgres_search(query: str, language_code: Optional[str], limit: int, offset: int) -> List[SearchHit]:
+    if language_code:
+        configs: Iterable[str] = [text_search_config(language_code)]
+    else:
+        configs = dict.fromkeys([*TEXT_SEARCH_CONFIGS.values(), DEFAULT_TEXT_SEARCH_CONFIG])
+    search_query = None
+    for config in configs:
+        part = SearchQuery(query, search_type="websearch", config=config)
+        search_query = part if search_query is None else search_query | part
+
+    transcripts = VideoTranscript.objects.filter(search_vector=search_query)
+    if language_code:
+        transcripts = transcripts.filter(record__language_code=language_code)
+    rows = transcripts.annotate(
+        rank=SearchRank(F("search_vector"), search_query),
+        snippet=SearchHeadline(
+            "text",
+            search_query,
+            start_sel="[",
+            stop_sel="]",
+            max_words=SNIPPET_WORDS,
+            min_words=SNIPPET_WORDS // 2
+        )
+    ).order_by("-rank", "record_id").values_list("record_id", "rank", "snippet")[offset:offset + limit]
+    return [SearchHit(video_id, rank, snippet) async for video_id, rank, snippet in rows]
+
+
+def _sqlite_index(video_id: str, title: str, key_points: str) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SQLITE_FTS_TABLE} WHERE video_id = %s", [video_id])
+        cursor.execute(
+            f"INSERT INTO {SQLITE_FTS_TABLE} (video_id, title, key_points, transcript) "
+            f"SELECT %s, %s, %s, text FROM persistence_videotranscript WHERE video_id = %s",
+            [video_id, title, key_points, video_id]
+        )
+
+
+@sync_to_async
+def _sqlite_search(query: str, language_code: Optional[str], limit: int, offset: int) -> List[SearchHit]:
+    # Cada palabra como frase literal: la entrada nunca se interpreta como sintaxis FTS5
+    terms = " ".join(f'"{word}"' for word in _WORD.findall(query))
+    if not terms:
+        return []
+    sql = (
+        f"SELECT s.video_id, -bm25({SQLITE_FTS_TABLE}, 0, {', '.join(map(str, SQLITE_BM25_WEIGHTS))}) AS rank, "
+        f"snippet({SQLITE_FTS_TABLE}, 3, '[', ']', '…', {SNIPPET_WORDS}) "
+        f"FROM {SQLITE_FTS_TABLE} s "
+    )
+    params: list = [terms]
+    if language_code:
+        sql += "JOIN persistence_videorecord r ON r.video_id = s.video_id "
+    sql += f"WHERE {SQLITE_FTS_TABLE} MATCH %s "
+    if language_code:
+        sql += "AND r.language_code = %s "
+        params.append(language_code)
+    sql += "ORDER BY rank DESC, s.video_id LIMIT %s OFFSET %s"
+    params += [limit, offset]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [SearchHit(video_id, rank, snippet) for video_id, rank, snippet in cursor.fetchall()]
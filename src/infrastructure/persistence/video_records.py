@@ -0,0 +1,119 @@
+"""
+Repositorio de escritura de VideoRecord.
+
+El análisis se guarda con un ``INSERT ... ON CONFLICT (video_id) DO UPDATE``
+en lugar de ``update_or_create`` (``SELECT`` + ``UPDATE`` o ``INSERT``): una
+re-solicitud concurrente del mismo video actualiza la fila existente en vez
+de fallar con ``IntegrityError``.
+
+Persistir un análisis no es una sola sentencia: además de la fila se
+escriben su transcripción (VideoTranscript, que solo se lee a pedido con
+``load_transcripts``), su entrada de búsqueda, sus buckets LSH y los
+agregados de sentimiento (SentimentRollup). Todo ocurre en una única
+transacción: si algo falla no queda ninguna escritura parcial. El análisis
+reemplazado se lee con ``SELECT ... FOR UPDATE`` bajo un advisory lock de
+transacción por video, de modo que los escritores concurrentes del mismo
+video se serializan y cada uno resta de los agregados exactamente el aporte
+que reemplazó.
+"""
+from typing import Any, Dict, Iterable, Optional
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.utils import timezone
+
+from domain.fingerprint import signature_from_bytes
+from .fingerprint_index import index_fingerprint, unindex_fingerprint
+from .locks import xact_lock
+from .search import index_video
+from .models import VideoRecord, VideoTranscript
+from .rollups import CONTRIBUTION_FIELDS, RollupContribution, apply_contribution
+
+# Campos que un nuevo análisis reemplaza en la fila existente (todos salvo la clave)
+UPSERT_FIELDS = [
+    field.name for field in VideoRecord._meta.concrete_fields
+    if not field.primary_key and field.name != "video_id"
+]
+
+
+async def upsert_video_record(video_id: str, transcript: Optional[str] = None, **fields: Any) -> VideoRecord:
+    """
+    Inserta o reemplaza, en una transacción, el análisis de un video, su
+    transcripción, su entrada de búsqueda, su índice LSH y los agregados de
+    sentimiento.
+
+    ``created_at`` se renueva en cada escritura: marca la vigencia del análisis
+    para el TTL de la cache.
+
+    Args:
+        video_id: ID canónico del video (clave del upsert).
+        transcript: Transcripción completa (None = conserva la almacenada).
+        **fields: Valores de los campos de VideoRecord.
+
+    Returns:
+        VideoRecord guardado, con su ``pk`` (el de la fila existente si hubo
+        conflicto) y la transcripción ya cargada si se indicó.
+    """
+    return await _persist(video_id, transcript, fields)
+
+
+@sync_to_async
+def _persist(video_id: str, transcript: Optional[str], fields: Dict[str, Any]) -> VideoRecord:
+    with transaction.atomic():
+        # Serializa a los escritores del video también cuando la fila todavía no existe
+        xact_lock(f"video_record:{video_id}")
+        previous = (
+            VideoRecord.objects.select_for_update()
+            .filter(video_id=video_id)
+            .values_list(*CONTRIBUTION_FIELDS)
+            .first()
+        )
+        record = VideoRecord(video_id=video_id, **{**fields, "created_at": timezone.now()})
+        VideoRecord.objects.bulk_create(
+            [record],
+            update_conflicts=True,
+            unique_fields=["video_id"],
+            update_fields=UPSERT_FIELDS
+        )
+        if record.pk is None:
+            # Backends sin RETURNING en el upsert (p. ej. MySQL)
+            record.pk = VideoRecord.objects.filter(video_id=video_id).values_list("pk", flat=True).get()
+
+        if transcript is not None:
+            VideoTranscript.objects.bulk_create(
+                [VideoTranscript(record=record, text=transcript)],
+                update_conflicts=True,
+                unique_fields=["record"],
+                update_fields=["text"]
+            )
+        index_video(record)
+        if record.fingerprint is not None:
+            index_fingerprint(record, signature_from_bytes(record.fingerprint))
+        else:
+            # Sin firma nueva, los buckets de la anterior lo seguirían ofreciendo como duplicado
+            unindex_fingerprint(record)
+        apply_contribution(
+            RollupContribution(*(getattr(record, field) for field in CONTRIBUTION_FIELDS)),
+            RollupContribution(*previous) if previous is not None else None
+        )
+    return record
+
+
+async def load_transcripts(records: Iterable[VideoRecord]) -> None:
+    """
+    Carga en una sola consulta la transcripción de los registros indicados.
+
+    Queda accesible como ``record.transcript_data`` sin nuevas consultas; los
+    registros sin transcripción almacenada no la tienen cacheada.
+
+    Args:
+        records: Registros a completar (se omiten los que ya la tienen cargada).
+    """
+    pending = {
+        record.video_id: record for record in records
+        if record is not None and not VideoRecord.transcript_data.is_cached(record)
+    }
+    if not pending:
+        return
+    async for transcript in VideoTranscript.objects.filter(record_id__in=pending):
+        pending[transcript.record_id].transcript_data = transcript
@@ -6,7 +6,15 @@ Contiene tests unitarios y de integración organizados por capa:
     - test_domain_models: Validación de esquemas Pydantic (VideoAnalysis, VideoMetadata).
     - test_graph_nodes: Tests aislados de cada nodo del grafo LangGraph.
     - test_youtube_adapter: Tests del adaptador de YouTube con mocking.
+    - test_llm_tokens: Conteo de tokens y presupuesto de contexto por modelo.
+    - test_llm_cache: Cache de respuestas estructuradas del LLM.
+    - test_llm_hedged: Hedged requests y failover entre proveedores LLM.
+    - test_llm_rate_limit: Token buckets RPM/TPM por proveedor y modelo.
+    - test_llm_micro_batch: Micro-batching de prompts cortos en una sola llamada.
+    - test_llm_router: Ruteo de modelos por tamaño de transcripción y nivel de latencia.
+    - test_circuit_breaker: Circuit breakers de YouTube y de los proveedores LLM.
     - test_api: Tests de integración del endpoint REST.
+    - test_use_cases: Tests del caso de uso (cache de análisis y persistencia).
     - conftest: Fixtures compartidos (async_client, mock data).
 
 Ejecutar:
@@ -4,6 +4,7 @@ Define fixtures compartidos para tests asíncronos con Django.
 """
 import os
 import pytest
+from unittest.mock import MagicMock
 from django.test import AsyncClient
 
 # Configurar Django settings module
@@ -74,3 +75,28 @@ def mock_graph_final_state(mock_transcript, mock_metadata, mock_analysis_result)
         "analysis": mock_analysis_result,
         "errors": []
     }
+
+
+@pytest.fixture
+def fake_graph_stream():
+    """
+    Fábrica de reemplazos para ``app.astream`` del grafo compilado.
+
+    Devuelve un MagicMock cuyo side_effect emite las actualizaciones de cada
+    nodo y el estado final, igual que ``stream_mode=["updates", "values"]``.
+    Si se pasa un ``asyncio.Event`` la emisión espera a que se active.
+    """
+    def factory(final_state, gate=None):
+        async def astream(initial_state, stream_mode=None, **kwargs):
+            if gate is not None:
+                await gate.wait()
+            yield ("updates", {"extract": {
+                "transcript": final_state.get("transcript", ""),
+                "metadata": final_state.get("metadata", {}),
+                "errors": final_state.get("errors", []),
+            }})
+            if not final_state.get("errors"):
+                yield ("updates", {"analyze": {"analysis": final_state.get("analysis", {})}})
+            yield ("values", final_state)
+        return MagicMock(side_effect=astream)
+    return factory
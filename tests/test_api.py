@@ -2,10 +2,27 @@
 Suite de Tests de Integración para la API de Análisis de Video.
 Se utiliza Mocking para aislar la lógica de negocio de los servicios externos (Gemini/YouTube).
 """
+import json
+import uuid
 import pytest
+from datetime import date, timedelta
 from unittest.mock import patch, AsyncMock, MagicMock
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
+from application.jobs import JobQueueFullError
+from application.use_cases.use_cases import _job_pool, BatchItemResult
+from config.lifespan import LifespanApplication
+from infrastructure.persistence.models import VideoRecord, AnalysisJob, SentimentRollup
+from infrastructure.persistence.video_records import upsert_video_record
+
+
+def _stored_during_request(record):
+    """side_effect de AnalyzeVideoUseCase.execute: el análisis se guarda durante la solicitud."""
+    def execute(*args, **kwargs):
+        record.created_at = timezone.now()
+        return record
+    return execute
 
 
 @pytest.mark.django_db
@@ -36,9 +53,7 @@ class TestVideoAnalysisAPI:
         mock_record.sentiment_score = 0.95
         mock_record.tone = "educativo"
         mock_record.key_points = ["Punto A", "Punto B", "Punto C"]
-        mock_record.created_at = "2026-02-05T12:00:00Z"
-        
-        mock_execute.return_value = mock_record
+        mock_execute.side_effect = _stored_during_request(mock_record)
 
         payload = {"video_url": "https://www.youtube.com/watch?v=12345678901"}
         response = await async_client.post(self.url, data=payload, content_type='application/json')
@@ -62,6 +77,16 @@ class TestVideoAnalysisAPI:
         data = response.json()
         assert 'video_url' in data
 
+    async def test_non_youtube_url_is_rejected(self, async_client):
+        """
+        Caso de error: URL válida que no corresponde a un video de YouTube.
+        """
+        payload = {"video_url": "https://vimeo.com/123456"}
+        response = await async_client.post(self.url, data=payload, content_type='application/json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'video_url' in response.json()
+
     async def test_missing_video_url_field(self, async_client):
         """
         Caso de error: Falta el campo video_url.
@@ -82,6 +107,14 @@ class TestVideoAnalysisAPI:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
+    async def test_unknown_latency_tier_is_rejected(self, async_client):
+        """Un nivel de latencia fuera de fast/standard/quality se rechaza con 400."""
+        payload = {"video_url": "https://www.youtube.com/watch?v=12345678901", "latency_tier": "turbo"}
+        response = await async_client.post(self.url, data=payload, content_type='application/json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'latency_tier' in response.json()
+
     @patch('application.use_cases.use_cases.AnalyzeVideoUseCase.execute')
     async def test_workflow_error_returns_500(self, mock_execute, async_client):
         """
@@ -90,7 +123,7 @@ class TestVideoAnalysisAPI:
         """
         mock_execute.side_effect = ValueError("Error en el workflow: Video no encontrado")
 
-        payload = {"video_url": "https://www.youtube.com/watch?v=invalidvid"}
+        payload = {"video_url": "https://www.youtube.com/watch?v=invalidvid1"}
         response = await async_client.post(self.url, data=payload, content_type='application/json')
 
         assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -122,7 +155,7 @@ class TestVideoAnalysisAPI:
             "Error en el workflow: Error en análisis de IA: API rate limit"
         )
 
-        payload = {"video_url": "https://www.youtube.com/watch?v=validvideo"}
+        payload = {"video_url": "https://www.youtube.com/watch?v=validvideo1"}
         response = await async_client.post(self.url, data=payload, content_type='application/json')
 
         assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -143,9 +176,7 @@ class TestVideoAnalysisAPI:
         mock_record.sentiment_score = 0.5
         mock_record.tone = "formal"
         mock_record.key_points = ["P1", "P2", "P3"]
-        mock_record.created_at = "2026-02-05T12:00:00Z"
-        
-        mock_execute.return_value = mock_record
+        mock_execute.side_effect = _stored_during_request(mock_record)
 
         payload = {"video_url": "https://www.youtube.com/watch?v=testvideo11"}
         response = await async_client.post(self.url, data=payload, content_type='application/json')
@@ -164,9 +195,9 @@ class TestVideoAnalysisAPI:
         assert 'tone' in data
         assert 'key_points' in data
         
-        # Verificar persistencia
+        # Verificar persistencia (la transcripción solo se incluye a pedido)
         assert 'url' in data
-        assert 'transcript' in data
+        assert 'transcript' not in data
 
     @patch('application.use_cases.use_cases.AnalyzeVideoUseCase.execute')
     async def test_sentiment_score_is_float_in_range(self, mock_execute, async_client):
@@ -184,15 +215,615 @@ class TestVideoAnalysisAPI:
         mock_record.sentiment_score = 0.87
         mock_record.tone = "casual"
         mock_record.key_points = ["A", "B", "C"]
-        mock_record.created_at = "2026-02-05T12:00:00Z"
-        
-        mock_execute.return_value = mock_record
+        mock_execute.side_effect = _stored_during_request(mock_record)
 
-        payload = {"video_url": "https://www.youtube.com/watch?v=scoretest1"}
+        payload = {"video_url": "https://www.youtube.com/watch?v=scoretest12"}
         response = await async_client.post(self.url, data=payload, content_type='application/json')
 
         data = response.json()
         score = data['sentiment_score']
         
         assert isinstance(score, float)
-        assert 0.0 <= score <= 1.0
\ No newline at end of file
+        assert 0.0 <= score <= 1.0
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+class TestAnalysisJobAPI:
+    """
+    Pruebas del modo asíncrono: 202 Accepted + consulta de estado del trabajo.
+    """
+
+    def setup_method(self):
+        self.url = reverse('video-analyze')
+
+    async def _create_record(self, mock_graph_final_state):
+        return await upsert_video_record(
+            "dQw4w9WgXcQ",
+            url="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            title=mock_graph_final_state["metadata"]["title"],
+            transcript=mock_graph_final_state["transcript"],
+            duration_seconds=mock_graph_final_state["metadata"]["duration_seconds"],
+            language_code=mock_graph_final_state["metadata"]["language_code"],
+            **mock_graph_final_state["analysis"]
+        )
+
+    @patch('application.use_cases.use_cases.AnalyzeVideoUseCase.execute')
+    async def test_async_mode_returns_202_and_job_completes(
+        self, mock_execute, async_client, sample_video_url, mock_graph_final_state
+    ):
+        """El POST responde 202 de inmediato y el trabajo finaliza en segundo plano."""
+        mock_execute.return_value = await self._create_record(mock_graph_final_state)
+
+        payload = {"video_url": sample_video_url, "async_mode": True}
+        response = await async_client.post(self.url, data=payload, content_type='application/json')
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        data = response.json()
+        assert data['state'] == 'queued'
+        assert data['video_id'] == 'dQw4w9WgXcQ'
+        assert response['Location'] == data['status_url']
+
+        await _job_pool.join()
+        status_response = await async_client.get(data['status_url'])
+
+        assert status_response.status_code == status.HTTP_200_OK
+        job = status_response.json()
+        assert job['state'] == 'done'
+        assert job['result']['sentiment'] == 'positivo'
+        assert len(job['result']['key_points']) == 3
+
+    @patch('application.use_cases.use_cases.AnalyzeVideoUseCase.execute')
+    async def test_async_mode_keeps_latency_tier(
+        self, mock_execute, async_client, sample_video_url, mock_graph_final_state
+    ):
+        """El nivel de latencia se guarda en el trabajo y llega al análisis en segundo plano."""
+        mock_execute.return_value = await self._create_record(mock_graph_final_state)
+
+        payload = {"video_url": sample_video_url, "async_mode": True, "latency_tier": "fast"}
+        response = await async_client.post(self.url, data=payload, content_type='application/json')
+        await _job_pool.join()
+
+        assert response.json()['latency_tier'] == 'fast'
+        assert mock_execute.call_args.kwargs["latency_tier"] == "fast"
+
+    @patch('application.use_cases.use_cases.AnalyzeVideoUseCase.execute')
+    async def test_failed_job_reports_error(self, mock_execute, async_client, sample_video_url):
+        """Un fallo del workflow deja el trabajo en estado 'failed' con el error."""
+        mock_execute.side_effect = ValueError("Error en el workflow: Sin transcripción")
+
+        payload = {"video_url": sample_video_url, "async_mode": True}
+        response = await async_client.post(self.url, data=payload, content_type='application/json')
+        await _job_pool.join()
+        job = (await async_client.get(response.json()['status_url'])).json()
+
+        assert job['state'] == 'failed'
+        assert 'Sin transcripción' in job['error']
+        assert job['result'] is None
+
+    async def test_unknown_job_returns_404(self, async_client):
+        """Consultar un trabajo inexistente devuelve 404."""
+        url = reverse('video-job-detail', kwargs={'job_id': uuid.uuid4()})
+        response = await async_client.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @patch('application.use_cases.use_cases._job_pool.has_capacity', return_value=False)
+    async def test_full_queue_returns_503(self, mock_capacity, async_client, sample_video_url):
+        """Con la cola llena se rechaza la solicitud en lugar de encolarla."""
+        payload = {"video_url": sample_video_url, "async_mode": True}
+        response = await async_client.post(self.url, data=payload, content_type='application/json')
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert await AnalysisJob.objects.acount() == 0
+
+    @patch('application.use_cases.use_cases._job_pool.submit', side_effect=JobQueueFullError("llena"))
+    async def test_queue_filled_during_creation_leaves_no_job(self, mock_submit, async_client, sample_video_url):
+        """Si la cola se llena entre el chequeo y el encolado, no queda un trabajo huérfano."""
+        payload = {"video_url": sample_video_url, "async_mode": True}
+        response = await async_client.post(self.url, data=payload, content_type='application/json')
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        mock_submit.assert_called_once()
+        assert await AnalysisJob.objects.acount() == 0
+
+
+@pytest.mark.asyncio
+class TestLifespanApplication:
+    """
+    Pruebas del wrapper ASGI que atiende el protocolo lifespan.
+    """
+
+    async def _run_lifespan(self, app):
+        messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+        sent = []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        await app({"type": "lifespan"}, receive, send)
+        return sent
+
+    async def test_startup_hooks_run_before_startup_completes(self):
+        """Las tareas de arranque se ejecutan y el servidor recibe startup.complete."""
+        hook = AsyncMock()
+        inner = AsyncMock()
+
+        sent = await self._run_lifespan(LifespanApplication(inner, on_startup=[hook]))
+
+        hook.assert_awaited_once()
+        inner.assert_not_called()
+        assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+
+    async def test_failing_hook_does_not_block_startup(self):
+        """Un error en una tarea de arranque se registra y el servidor arranca igual."""
+        hook = AsyncMock(side_effect=RuntimeError("sin base de datos"))
+
+        sent = await self._run_lifespan(LifespanApplication(AsyncMock(), on_startup=[hook]))
+
+        assert sent[0] == "lifespan.startup.complete"
+
+    async def test_http_is_delegated_to_django(self):
+        """Todo lo que no es lifespan llega a la aplicación envuelta."""
+        inner = AsyncMock()
+        scope = {"type": "http"}
+
+        await LifespanApplication(inner, on_startup=[AsyncMock()])(scope, None, None)
+
+        inner.assert_awaited_once_with(scope, None, None)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+class TestVideoAnalysisCacheAPI:
+    """
+    Pruebas del endpoint de análisis con un resultado ya almacenado.
+    """
+
+    def setup_method(self):
+        self.url = reverse('video-analyze')
+
+    async def test_cached_analysis_returns_200(self, async_client, mock_graph_final_state):
+        """Un análisis vigente ya almacenado se devuelve con 200, no 201."""
+        await upsert_video_record(
+            "dQw4w9WgXcQ",
+            url="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            title=mock_graph_final_state["metadata"]["title"],
+            transcript=mock_graph_final_state["transcript"],
+            duration_seconds=mock_graph_final_state["metadata"]["duration_seconds"],
+            language_code=mock_graph_final_state["metadata"]["language_code"],
+            **mock_graph_final_state["analysis"]
+        )
+
+        payload = {"video_url": "https://youtu.be/dQw4w9WgXcQ"}
+        response = await async_client.post(self.url, data=payload, content_type='application/json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['video_id'] == "dQw4w9WgXcQ"
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+class TestVideoTranscriptAPI:
+    """
+    Pruebas de la transcripción almacenada fuera de VideoRecord.
+    """
+
+    async def _create_record(self, mock_graph_final_state):
+        await upsert_video_record(
+            "dQw4w9WgXcQ",
+            url="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            title=mock_graph_final_state["metadata"]["title"],
+            transcript=mock_graph_final_state["transcript"],
+            duration_seconds=mock_graph_final_state["metadata"]["duration_seconds"],
+            language_code=mock_graph_final_state["metadata"]["language_code"],
+            **mock_graph_final_state["analysis"]
+        )
+        # Lectura como la del cache: sin la transcripción cargada
+        return await VideoRecord.objects.aget(video_id="dQw4w9WgXcQ")
+
+    @patch('application.use_cases.use_cases.AnalyzeVideoUseCase.execute')
+    async def test_include_transcript_loads_it_on_demand(
+        self, mock_execute, async_client, sample_video_url, mock_graph_final_state
+    ):
+        """Con ?include=transcript la respuesta del análisis trae el texto completo."""
+        mock_execute.return_value = await self._create_record(mock_graph_final_state)
+        url = reverse('video-analyze')
+        payload = {"video_url": sample_video_url}
+
+        default = await async_client.post(url, data=payload, content_type='application/json')
+        included = await async_client.post(
+            f"{url}?include=transcript", data=payload, content_type='application/json'
+        )
+
+        assert 'transcript' not in default.json()
+        assert included.json()['transcript'] == mock_graph_final_state["transcript"]
+
+    async def test_transcript_endpoint(self, async_client, mock_graph_final_state):
+        """El endpoint dedicado devuelve la transcripción y su idioma."""
+        await self._create_record(mock_graph_final_state)
+
+        response = await async_client.get(reverse('video-transcript', kwargs={'video_id': 'dQw4w9WgXcQ'}))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "video_id": "dQw4w9WgXcQ",
+            "language_code": mock_graph_final_state["metadata"]["language_code"],
+            "transcript": mock_graph_final_state["transcript"],
+        }
+
+    async def test_unknown_video_transcript_returns_404(self, async_client):
+        """Un video sin análisis no tiene transcripción."""
+        response = await async_client.get(reverse('video-transcript', kwargs={'video_id': 'zzzzzzzzzzz'}))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+class TestVideoListAPI:
+    """
+    Pruebas del listado de análisis: filtros, paginación por cursor y proyección.
+    """
+
+    def setup_method(self):
+        self.url = reverse('video-list')
+
+    async def _create_records(self, count, created_at=None, **overrides):
+        base = timezone.now() if created_at is None else created_at
+        for i in range(count):
+            fields = {
+                "url": f"https://www.youtube.com/watch?v=video{i:06d}",
+                "title": f"Video {i}",
+                "transcript": "texto",
+                "duration_seconds": 60,
+                "language_code": "es",
+                "sentiment": "positivo",
+                "sentiment_score": 0.8,
+                "tone": "informativo",
+                "key_points": ["A", "B", "C"],
+                **overrides,
+            }
+            record = await upsert_video_record(f"video{i:06d}", **fields)
+            # Más antiguos cuanto mayor el índice (o todos iguales si se fijó created_at)
+            offset = timedelta(0) if created_at is not None else timedelta(minutes=i)
+            await VideoRecord.objects.filter(pk=record.pk).aupdate(created_at=base - offset)
+
+    async def _walk(self, async_client, url):
+        pages = []
+        while url is not None:
+            response = await async_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            data = response.json()
+            pages.append([item['video_id'] for item in data['results']])
+            url = data['next']
+        return pages
+
+    async def test_cursor_pagination_walks_all_records_in_order(self, async_client):
+        """El cursor recorre todos los análisis, del más reciente al más antiguo, sin repetir."""
+        await self._create_records(5)
+
+        pages = await self._walk(async_client, f"{self.url}?limit=2")
+
+        assert pages == [
+            ["video000000", "video000001"],
+            ["video000002", "video000003"],
+            ["video000004"],
+        ]
+
+    async def test_cursor_breaks_created_at_ties_by_id(self, async_client):
+        """Análisis con el mismo created_at no se pierden ni se repiten entre páginas."""
+        await self._create_records(5, created_at=timezone.now())
+
+        pages = await self._walk(async_client, f"{self.url}?limit=2")
+
+        video_ids = [video_id for page in pages for video_id in page]
+        assert len(video_ids) == len(set(video_ids)) == 5
+
+    async def test_filters(self, async_client):
+        """Se filtra por sentimiento, idioma y rango de fechas."""
+        await self._create_records(3)
+        await VideoRecord.objects.filter(video_id="video000001").aupdate(sentiment="negativo", language_code="en")
+
+        negative = await async_client.get(self.url, {"sentiment": "negativo", "language": "en"})
+        recent = await async_client.get(
+            self.url, {"created_after": (timezone.now() - timedelta(seconds=90)).isoformat()}
+        )
+
+        assert [item['video_id'] for item in negative.json()['results']] == ["video000001"]
+        assert [item['video_id'] for item in recent.json()['results']] == ["video000000", "video000001"]
+
+    async def test_fields_projection(self, async_client):
+        """fields= limita la respuesta a los campos pedidos y nunca incluye la transcripción."""
+        await self._create_records(1)
+
+        projected = (await async_client.get(self.url, {"fields": "video_id,sentiment"})).json()
+        default = (await async_client.get(self.url)).json()
+
+        assert projected['results'] == [{"video_id": "video000000", "sentiment": "positivo"}]
+        assert 'transcript' not in default['results'][0]
+        assert default['next'] is None
+
+    async def test_invalid_parameters_return_400(self, async_client):
+        """Campos desconocidos, cursores corruptos y límites fuera de rango se rechazan."""
+        for params in ({"fields": "transcript"}, {"cursor": "no-es-un-cursor"}, {"limit": 0}):
+            response = await async_client.get(self.url, params)
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+class TestVideoSearchAPI:
+    """
+    Pruebas de la búsqueda de texto completo (fallback FTS5 de SQLite).
+    """
+
+    def setup_method(self):
+        self.url = reverse('video-search')
+
+    async def _create(self, video_id, title, transcript, key_points=("A", "B", "C"), language_code="es"):
+        return await upsert_video_record(
+            video_id,
+            url=f"https://www.youtube.com/watch?v={video_id}",
+            title=title,
+            transcript=transcript,
+            duration_seconds=60,
+            language_code=language_code,
+            sentiment="neutral",
+            sentiment_score=0.5,
+            tone="informativo",
+            key_points=list(key_points),
+        )
+
+    async def _search(self, async_client, **params):
+        response = await async_client.get(self.url, params)
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()
+
+    async def test_results_are_ranked_and_exclude_transcript(self, async_client):
+        """Una coincidencia en el título pesa más que una en la transcripción."""
+        await self._create("aaaaaaaaaaa", "Receta de cocina", "Hoy hablamos de inflación y precios.")
+        await self._create("bbbbbbbbbbb", "La inflación explicada", "Un repaso de la política monetaria.")
+        await self._create("ccccccccccc", "Fútbol", "Resumen del partido.")
+
+        data = await self._search(async_client, q="inflación")
+
+        assert [item['video_id'] for item in data['results']] == ["bbbbbbbbbbb", "aaaaaaaaaaa"]
+        first, second = data['results']
+        assert first['rank'] > second['rank']
+        assert 'transcript' not in first
+        assert "[inflación]" in second['snippet']
+
+    async def test_matches_key_points_and_ignores_accents(self, async_client):
+        """Los puntos clave se indexan y la búsqueda no distingue tildes."""
+        await self._create("aaaaaaaaaaa", "Charla", "Texto sin el tema.", key_points=["Crecimiento de la economía"])
+
+        data = await self._search(async_client, q="economia", fields="video_id,title")
+
+        assert data['results'][0]['video_id'] == "aaaaaaaaaaa"
+        assert set(data['results'][0]) == {"video_id", "title", "rank", "snippet"}
+
+    async def test_language_filter(self, async_client):
+        """language restringe los resultados a análisis en ese idioma."""
+        await self._create("aaaaaaaaaaa", "Machine learning", "Intro", language_code="es")
+        await self._create("bbbbbbbbbbb", "Machine learning", "Intro", language_code="en")
+
+        data = await self._search(async_client, q="machine learning", language="en")
+
+        assert [item['video_id'] for item in data['results']] == ["bbbbbbbbbbb"]
+
+    async def test_index_follows_reanalysis_and_deletion(self, async_client):
+        """Re-analizar reemplaza la entrada del índice y borrar el análisis la elimina."""
+        await self._create("aaaaaaaaaaa", "Video", "Hablamos de astronomía.")
+        await self._create("aaaaaaaaaaa", "Video", "Hablamos de botánica.")
+
+        assert (await self._search(async_client, q="astronomía"))['results'] == []
+        assert len((await self._search(async_client, q="botánica"))['results']) == 1
+
+        await VideoRecord.objects.filter(video_id="aaaaaaaaaaa").adelete()
+        assert (await self._search(async_client, q="botánica"))['results'] == []
+
+    async def test_pagination(self, async_client):
+        """next avanza por offset hasta agotar los resultados."""
+        for i in range(3):
+            await self._create(f"video{i:06d}", f"Tema {i}", "Un video sobre volcanes.")
+
+        first = await self._search(async_client, q="volcanes", limit=2)
+        second = (await async_client.get(first['next'])).json()
+
+        video_ids = [item['video_id'] for item in first['results'] + second['results']]
+        assert sorted(video_ids) == ["video000000", "video000001", "video000002"]
+        assert second['next'] is None
+
+    async def test_missing_query_returns_400(self, async_client):
+        """q es obligatorio."""
+        response = await async_client.get(self.url)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+class TestSentimentAnalyticsAPI:
+    """
+    Pruebas de las analíticas de sentimiento servidas desde SentimentRollup.
+    """
+
+    def setup_method(self):
+        self.url = reverse('video-analytics-sentiment')
+
+    async def _create(self, video_id, sentiment, sentiment_score, language_code="es"):
+        return await upsert_video_record(
+            video_id,
+            url=f"https://www.youtube.com/watch?v={video_id}",
+            title="Video",
+            transcript="texto",
+            duration_seconds=60,
+            language_code=language_code,
+            sentiment=sentiment,
+            sentiment_score=sentiment_score,
+            tone="informativo",
+            key_points=["A", "B", "C"],
+        )
+
+    async def test_groups_by_sentiment_and_language(self, async_client):
+        """Cada grupo trae su cantidad y puntaje promedio; la respuesta, los totales."""
+        await self._create("aaaaaaaaaaa", "positivo", 0.8)
+        await self._create("bbbbbbbbbbb", "positivo", 0.6)
+        await self._create("ccccccccccc", "negativo", 0.2, language_code="en")
+        await self._create("ccccccccccc", "negativo", 0.1, language_code="en")
+
+        response = await async_client.get(self.url, {"group_by": "sentiment,language"})
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data['results'] == [
+            {"sentiment": "negativo", "language": "en", "count": 1, "average_sentiment_score": pytest.approx(0.1)},
+            {"sentiment": "positivo", "language": "es", "count": 2, "average_sentiment_score": pytest.approx(0.7)},
+        ]
+        assert data['count'] == 3
+        assert data['average_sentiment_score'] == pytest.approx(0.5)
+
+    async def test_groups_by_month_within_range(self, async_client):
+        """group_by=month suma los días de cada mes; since/until acotan los días."""
+        await SentimentRollup.objects.abulk_create([
+            SentimentRollup(day=date(2026, 8, 30), sentiment="positivo", tone="t", language_code="es", count=5, score_sum=4.0),
+            SentimentRollup(day=date(2026, 9, 1), sentiment="positivo", tone="t", language_code="es", count=2, score_sum=1.0),
+            SentimentRollup(day=date(2026, 9, 20), sentiment="negativo", tone="t", language_code="es", count=2, score_sum=0.0),
+            SentimentRollup(day=date(2026, 9, 21), sentiment="neutral", tone="t", language_code="es", count=0, score_sum=0.0),
+            SentimentRollup(day=date(2026, 10, 2), sentiment="positivo", tone="t", language_code="es", count=1, score_sum=1.0),
+        ])
+
+        response = await async_client.get(
+            self.url, {"group_by": "month", "since": "2026-08-31", "until": "2026-10-31"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['results'] == [
+            {"month": "2026-09-01", "count": 4, "average_sentiment_score": 0.25},
+            {"month": "2026-10-01", "count": 1, "average_sentiment_score": 1.0},
+        ]
+
+    async def test_invalid_group_by_returns_400(self, async_client):
+        """Se rechazan dimensiones desconocidas y más de un período."""
+        for group_by in ("video_id", "day,month", ","):
+            response = await async_client.get(self.url, {"group_by": group_by})
+
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+@pytest.mark.asyncio
+class TestVideoBatchAnalysisAPI:
+    """
+    Pruebas del endpoint de análisis por lotes.
+    """
+
+    def setup_method(self):
+        self.url = reverse('video-analyze-batch')
+
+    @patch('application.use_cases.use_cases.AnalyzeVideoBatchUseCase.execute')
+    async def test_batch_returns_per_item_results(self, mock_execute, async_client):
+        """Cada URL recibe su propio estado, resultado o error."""
+        mock_record = MagicMock()
+        mock_record.id = 1
+        mock_record.video_id = "aaaaaaaaaaa"
+        mock_record.url = "https://www.youtube.com/watch?v=aaaaaaaaaaa"
+        mock_record.title = "Video A"
+        mock_record.transcript = "Texto"
+        mock_record.duration_seconds = 60
+        mock_record.language_code = "es"
+        mock_record.sentiment = "positivo"
+        mock_record.sentiment_score = 0.9
+        mock_record.tone = "casual"
+        mock_record.key_points = ["A", "B", "C"]
+        mock_record.created_at = "2026-02-05T12:00:00Z"
+        mock_execute.return_value = [
+            BatchItemResult("https://youtu.be/aaaaaaaaaaa", "aaaaaaaaaaa", "cached", record=mock_record),
+            BatchItemResult("https://vimeo.com/1", None, "failed", error="URL inválida"),
+        ]
+
+        payload = {"video_urls": ["https://youtu.be/aaaaaaaaaaa", "https://vimeo.com/1"]}
+        response = await async_client.post(self.url, data=payload, content_type='application/json')
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data['summary'] == {"analyzed": 0, "cached": 1, "failed": 1}
+        assert data['results'][0]['result']['sentiment'] == 'positivo'
+        assert data['results'][1]['result'] is None
+        assert data['results'][1]['error'] == "URL inválida"
+
+    async def test_empty_batch_is_rejected(self, async_client):
+        """Un lote vacío devuelve 400."""
+        response = await async_client.post(self.url, data={"video_urls": []}, content_type='application/json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'video_urls' in response.json()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+class TestVideoAnalysisStreamAPI:
+    """
+    Pruebas del endpoint de progreso vía Server-Sent Events.
+    """
+
+    def setup_method(self):
+        self.url = reverse('video-analyze-stream')
+
+    async def _read_events(self, response):
+        body = "".join([
+            chunk.decode() if isinstance(chunk, bytes) else chunk
+            async for chunk in response.streaming_content
+        ])
+        events = []
+        for block in body.strip().split("\n\n"):
+            lines = dict(line.split(": ", 1) for line in block.split("\n"))
+            events.append((lines["event"], json.loads(lines["data"])))
+        return events
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_stream_emits_node_events_then_done(
+        self, mock_app, fake_graph_stream, async_client, sample_video_url, mock_graph_final_state
+    ):
+        """Se emiten start, extract, analyze y done en ese orden."""
+        mock_app.return_value.astream = fake_graph_stream(mock_graph_final_state)
+
+        response = await async_client.get(self.url, {"video_url": sample_video_url})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'text/event-stream'
+        events = await self._read_events(response)
+        assert [name for name, _ in events] == ["start", "extract", "analyze", "done"]
+        assert events[1][1]["transcript_length"] == len(mock_graph_final_state["transcript"])
+        assert events[1][1]["metadata"]["title"] == mock_graph_final_state["metadata"]["title"]
+        assert events[3][1]["sentiment"] == "positivo"
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_stream_reports_workflow_error(self, mock_app, fake_graph_stream, async_client, sample_video_url):
+        """Un fallo del workflow se comunica como evento 'error'."""
+        mock_app.return_value.astream = fake_graph_stream({"errors": ["Sin transcripción"]})
+
+        response = await async_client.get(self.url, {"video_url": sample_video_url})
+        events = await self._read_events(response)
+
+        assert [name for name, _ in events] == ["start", "error"]
+        assert "Sin transcripción" in events[1][1]["error"]
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_stream_passes_latency_tier(
+        self, mock_app, fake_graph_stream, async_client, sample_video_url, mock_graph_final_state
+    ):
+        """El latency_tier del query string llega al grafo como en el POST síncrono."""
+        mock_app.return_value.astream = fake_graph_stream(mock_graph_final_state)
+
+        response = await async_client.get(self.url, {"video_url": sample_video_url, "latency_tier": "quality"})
+        await self._read_events(response)
+
+        assert mock_app.return_value.astream.call_args.kwargs["config"]["configurable"]["latency_tier"] == "quality"
+
+    async def test_stream_rejects_invalid_url(self, async_client):
+        """Una URL inválida devuelve 400 sin abrir el stream."""
+        response = await async_client.get(self.url, {"video_url": "https://vimeo.com/1"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,216 @@
+"""
+Tests Unitarios para los circuit breakers de YouTube y los proveedores LLM.
+Usan cooldowns de centésimas de segundo para recorrer los tres estados sin demoras.
+"""
+import time
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from infrastructure.adapters.circuit_breaker import (
+    CircuitBreaker,
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+)
+from infrastructure.adapters.exceptions import CircuitOpenError, VideoNotFoundError, YouTubeError
+from infrastructure.adapters.youtube_adapter import YouTubeAdapter
+from infrastructure.adapters.llm.exceptions import LLMInferenceError, LLMRateLimitError
+from infrastructure.adapters.llm.gemini_adapter import GeminiAdapter
+from infrastructure.adapters.llm.groq_adapter import GroqAdapter, GroqStructuredLLM
+from application.workflow.graph import analysis_node, extraction_node
+
+
+def _fail(breaker, error=RuntimeError("caída")):
+    with pytest.raises(type(error)):
+        with breaker.guard():
+            raise error
+
+
+def _succeed(breaker):
+    with breaker.guard():
+        pass
+
+
+class TestCircuitBreaker:
+    """Tests de las transiciones cerrado -> abierto -> semiabierto."""
+
+    def test_opens_when_failure_rate_reaches_threshold(self):
+        """Con la ventana mínima cubierta y 50% de fallas, el circuito se abre."""
+        breaker = CircuitBreaker("svc", failure_rate_threshold=0.5, min_calls=4)
+        _succeed(breaker)
+        _succeed(breaker)
+        _fail(breaker)
+        assert breaker.state == STATE_CLOSED
+
+        _fail(breaker)
+
+        assert breaker.state == STATE_OPEN
+
+    def test_does_not_open_below_min_calls(self):
+        """Pocas llamadas fallidas no alcanzan para abrir el circuito."""
+        breaker = CircuitBreaker("svc", min_calls=5)
+        for _ in range(4):
+            _fail(breaker)
+
+        assert breaker.state == STATE_CLOSED
+
+    def test_open_circuit_fails_fast_without_calling(self):
+        """Abierto, la llamada no se ejecuta y se lanza CircuitOpenError con el tiempo restante."""
+        breaker = CircuitBreaker("svc", min_calls=1, cooldown_seconds=30)
+        _fail(breaker)
+        called = MagicMock()
+
+        with pytest.raises(CircuitOpenError) as exc_info:
+            with breaker.guard():
+                called()
+
+        called.assert_not_called()
+        assert exc_info.value.service == "svc"
+        assert 29 < exc_info.value.retry_after_seconds <= 30
+
+    def test_half_open_success_closes_circuit(self):
+        """Tras el cooldown, una llamada de prueba exitosa cierra el circuito."""
+        breaker = CircuitBreaker("svc", min_calls=1, cooldown_seconds=0.01)
+        _fail(breaker)
+        time.sleep(0.02)
+        assert breaker.state == STATE_HALF_OPEN
+
+        _succeed(breaker)
+
+        assert breaker.state == STATE_CLOSED
+        assert breaker.stats()["calls"] == 0
+
+    def test_half_open_failure_reopens_circuit(self):
+        """Si la llamada de prueba falla, el circuito vuelve a abrirse con un nuevo cooldown."""
+        breaker = CircuitBreaker("svc", min_calls=1, cooldown_seconds=0.01)
+        _fail(breaker)
+        time.sleep(0.02)
+
+        _fail(breaker)
+
+        assert breaker.stats()["state"] == STATE_OPEN
+        with pytest.raises(CircuitOpenError):
+            _succeed(breaker)
+
+    def test_half_open_admits_a_single_trial(self):
+        """Mientras la llamada de prueba está en curso, las demás fallan rápido."""
+        breaker = CircuitBreaker("svc", min_calls=1, cooldown_seconds=0.01)
+        _fail(breaker)
+        time.sleep(0.02)
+
+        with breaker.guard():
+            with pytest.raises(CircuitOpenError):
+                _succeed(breaker)
+
+        assert breaker.state == STATE_CLOSED
+
+    def test_ignored_exceptions_do_not_count_as_failures(self):
+        """Las excepciones ignoradas cuentan como respuesta del servicio."""
+        breaker = CircuitBreaker("svc", min_calls=2, ignored_exceptions=(VideoNotFoundError,))
+        for _ in range(5):
+            _fail(breaker, VideoNotFoundError("no existe"))
+
+        assert breaker.state == STATE_CLOSED
+
+    def test_disabled_breaker_never_opens(self):
+        """Con enabled=False las fallas no abren el circuito."""
+        breaker = CircuitBreaker("svc", min_calls=1, enabled=False)
+        for _ in range(5):
+            _fail(breaker)
+
+        _succeed(breaker)
+
+    def test_from_env_reads_configuration(self):
+        """La configuración se toma de las variables CIRCUIT_BREAKER_*."""
+        env = {
+            "CIRCUIT_BREAKER_FAILURE_RATE": "0.25",
+            "CIRCUIT_BREAKER_WINDOW": "8",
+            "CIRCUIT_BREAKER_MIN_CALLS": "3",
+            "CIRCUIT_BREAKER_COOLDOWN_SECONDS": "12",
+            "CIRCUIT_BREAKER_ENABLED": "false",
+        }
+        with patch.dict("os.environ", env):
+            breaker = CircuitBreaker.from_env("svc")
+
+        assert breaker.failure_rate_threshold == 0.25
+        assert breaker.window_size == 8
+        assert breaker.min_calls == 3
+        assert breaker.cooldown_seconds == 12
+        assert breaker.enabled is False
+
+
+@pytest.mark.asyncio
+class TestCircuitBreakerIntegration:
+    """Tests del breaker en los adaptadores y en los nodos del grafo."""
+
+    async def test_youtube_adapter_fails_fast_when_open(self):
+        """Tras fallas inesperadas de YouTube, el adaptador deja de consultarlo."""
+        adapter = YouTubeAdapter(circuit_breaker=CircuitBreaker("youtube", min_calls=2))
+        adapter._fetch_transcript = AsyncMock(side_effect=RuntimeError("503"))
+        adapter._fetch_metadata = AsyncMock(return_value={})
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+        for _ in range(2):
+            with pytest.raises(YouTubeError):
+                await adapter.fetch_full_data(url)
+        with pytest.raises(CircuitOpenError):
+            await adapter.fetch_full_data(url)
+
+        assert adapter._fetch_transcript.await_count == 2
+
+    async def test_youtube_missing_video_does_not_open_circuit(self):
+        """Videos inexistentes son respuestas válidas de YouTube: el circuito sigue cerrado."""
+        with patch.dict("os.environ", {"CIRCUIT_BREAKER_MIN_CALLS": "2"}):
+            adapter = YouTubeAdapter()
+        adapter._fetch_full_data = AsyncMock(side_effect=VideoNotFoundError("no existe"))
+
+        for _ in range(4):
+            with pytest.raises(VideoNotFoundError):
+                await adapter.fetch_full_data("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+
+        assert adapter.circuit_breaker.state == STATE_CLOSED
+
+    async def test_structured_llm_fails_fast_when_open(self):
+        """El wrapper del proveedor lanza CircuitOpenError sin invocar al modelo."""
+        llm = MagicMock()
+        llm.ainvoke = AsyncMock(side_effect=RuntimeError("500"))
+        breaker = CircuitBreaker("llm:groq:m", min_calls=1)
+        structured = GroqStructuredLLM(llm, model="m", circuit_breaker=breaker)
+
+        with patch("infrastructure.adapters.llm.rate_limiter.asyncio.sleep", AsyncMock()):
+            with pytest.raises(LLMInferenceError):
+                await structured.ainvoke("prompt")
+        calls = llm.ainvoke.await_count
+        with pytest.raises(CircuitOpenError):
+            await structured.ainvoke("prompt")
+
+        assert llm.ainvoke.await_count == calls
+
+    @pytest.mark.parametrize("adapter_class, key", [(GeminiAdapter, "GOOGLE_API_KEY"), (GroqAdapter, "GROQ_API_KEY")])
+    async def test_llm_rate_limits_do_not_open_circuit(self, adapter_class, key):
+        """Un 429 persistente lo resuelve el rate limiter: no cuenta como falla del proveedor."""
+        with patch.dict("os.environ", {key: "test", "CIRCUIT_BREAKER_MIN_CALLS": "2"}):
+            breaker = adapter_class().circuit_breaker
+
+        for _ in range(4):
+            _fail(breaker, LLMRateLimitError("429", retry_after_seconds=1))
+
+        assert breaker.state == STATE_CLOSED
+
+    @patch('application.workflow.graph.yt_adapter')
+    async def test_extraction_node_reports_open_circuit(self, mock_adapter):
+        """El nodo de extracción publica el circuito abierto en el canal errors."""
+        mock_adapter.fetch_full_data = AsyncMock(side_effect=CircuitOpenError("youtube", 12))
+
+        result = await extraction_node({"video_url": "https://youtu.be/dQw4w9WgXcQ"})
+
+        assert "circuit breaker abierto" in result["errors"][0]
+        assert "'youtube'" in result["errors"][0]
+
+    @patch('application.workflow.graph.structured_llm')
+    async def test_analysis_node_reports_open_circuit_unprefixed(self, mock_llm):
+        """Un circuito abierto del LLM llega clasificado, sin el prefijo genérico de error."""
+        mock_llm.ainvoke = AsyncMock(side_effect=CircuitOpenError("llm:gemini:gemini-2.0-flash", 20))
+
+        result = await analysis_node({"transcript": "hola", "errors": []})
+
+        assert result["errors"][0].startswith("Servicio 'llm:gemini:gemini-2.0-flash' no disponible")
@@ -1,10 +1,21 @@
 """
 Tests Unitarios para los Modelos de Dominio.
-Valida que los esquemas Pydantic cumplan con las restricciones del challenge.
+Valida que los esquemas Pydantic cumplan con las restricciones del challenge,
+la canonicalización de URLs de YouTube y la huella MinHash de transcripciones.
 """
 import pytest
 from pydantic import ValidationError
 from domain.models import VideoAnalysis, VideoMetadata
+from domain.video_url import extract_video_id, canonical_video_url, InvalidVideoURLError
+from domain.fingerprint import (
+    NUM_PERMUTATIONS,
+    LSH_BANDS,
+    estimate_similarity,
+    lsh_buckets,
+    minhash_signature,
+    signature_from_bytes,
+    signature_to_bytes,
+)
 
 
 class TestVideoAnalysis:
@@ -128,3 +139,92 @@ class TestVideoMetadata:
                 # Falta duration_seconds
                 language_code="es"
             )
+
+
+class TestVideoURLCanonicalization:
+    """Tests para la extracción del ID canónico de video."""
+
+    @pytest.mark.parametrize("url", [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://youtube.com/watch?v=dQw4w9WgXcQ&t=120",
+        "https://www.youtube.com/watch?list=PL123&v=dQw4w9WgXcQ&index=2",
+        "https://m.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://music.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ?t=30",
+        "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+        "https://www.youtube.com/embed/dQw4w9WgXcQ?autoplay=1",
+        "https://www.youtube-nocookie.com/embed/dQw4w9WgXcQ",
+        "https://www.youtube.com/live/dQw4w9WgXcQ?si=abc",
+        "youtube.com/watch?v=dQw4w9WgXcQ",
+    ])
+    def test_url_variants_share_the_same_id(self, url):
+        """Todas las variantes de URL de un video producen el mismo ID."""
+        assert extract_video_id(url) == "dQw4w9WgXcQ"
+
+    @pytest.mark.parametrize("url", [
+        "https://vimeo.com/123456",
+        "https://www.youtube.com/",
+        "https://www.youtube.com/watch?t=30",
+        "https://www.youtube.com/channel/UC123",
+        "https://youtu.be/",
+        "https://youtu.be/abc",
+        "https://www.youtube.com/watch?v=dQw4w9WgXc",
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQextra",
+        "https://www.youtube.com/shorts/dQw4w9WgXc!",
+    ])
+    def test_invalid_urls_raise_error(self, url):
+        """URLs ajenas a YouTube, sin ID o con un ID que no tiene 11 caracteres válidos lanzan InvalidVideoURLError."""
+        with pytest.raises(InvalidVideoURLError):
+            extract_video_id(url)
+
+    def test_canonical_url_roundtrip(self):
+        """La URL canónica vuelve a producir el mismo ID."""
+        url = canonical_video_url("dQw4w9WgXcQ")
+        assert url == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        assert extract_video_id(url) == "dQw4w9WgXcQ"
+
+
+class TestTranscriptFingerprint:
+    """Tests para la firma MinHash y el banding LSH."""
+
+    TRANSCRIPT = " ".join(f"palabra{i % 700} tema{i % 13}" for i in range(3000))
+
+    def test_identical_text_has_identical_signature(self):
+        """La firma es determinista y no depende de mayúsculas ni puntuación."""
+        a = minhash_signature(self.TRANSCRIPT)
+        b = minhash_signature(self.TRANSCRIPT.upper().replace(" tema", ", tema"))
+
+        assert len(a) == NUM_PERMUTATIONS
+        assert estimate_similarity(a, b) == 1.0
+
+    def test_clipped_copy_is_near_duplicate(self):
+        """Un recorte de la misma transcripción conserva una similitud alta."""
+        words = self.TRANSCRIPT.split()
+        clipped = " ".join(words[300:])
+
+        similarity = estimate_similarity(minhash_signature(self.TRANSCRIPT), minhash_signature(clipped))
+
+        assert similarity >= 0.8
+        assert set(lsh_buckets(minhash_signature(self.TRANSCRIPT))) & set(lsh_buckets(minhash_signature(clipped)))
+
+    def test_unrelated_text_has_low_similarity(self):
+        """Transcripciones distintas no se confunden."""
+        other = " ".join(f"otra{i % 500} cosa{i % 7}" for i in range(3000))
+
+        assert estimate_similarity(minhash_signature(self.TRANSCRIPT), minhash_signature(other)) < 0.1
+
+    def test_text_without_words_has_no_signature(self):
+        """Un texto vacío o solo con puntuación no tiene firma."""
+        assert minhash_signature("") is None
+        assert minhash_signature(" ... ¡! ") is None
+
+    def test_signature_bytes_roundtrip(self):
+        """La serialización para la base de datos preserva la firma."""
+        signature = minhash_signature("texto corto")
+
+        restored = signature_from_bytes(signature_to_bytes(signature))
+
+        assert len(signature_to_bytes(signature)) == NUM_PERMUTATIONS * 4
+        assert estimate_similarity(signature, restored) == 1.0
+        assert len(lsh_buckets(restored)) == LSH_BANDS
@@ -2,15 +2,32 @@
 Tests Unitarios para los Nodos del Grafo de LangGraph.
 Aísla cada nodo para verificar su comportamiento individual.
 """
+import os
+import subprocess
+import sys
+
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
+from langgraph.graph import END
 from application.workflow.graph import (
     extraction_node, 
     analysis_node, 
+    chunk_analysis_node,
     should_continue,
+    route_analysis,
+    get_graph,
+    get_default_llm,
+    get_model_router,
+    reset,
+    ANALYSIS_PROMPT,
+    PROMPT_OVERHEAD_TOKENS,
     GraphState
 )
+from application.workflow.chunking import estimate_tokens, split_into_chunks
 from infrastructure.adapters.exceptions import VideoNotFoundError, NoTranscriptError
+from infrastructure.adapters.llm.exceptions import LLMContextLengthError
+from infrastructure.adapters.llm.rate_limiter import ESTIMATED_COMPLETION_TOKENS, RateLimits, TokenBucketLimiter
+from infrastructure.adapters.llm.tokens import ContextBudget, ModelLimits, TokenCounter
 
 
 class TestExtractionNode:
@@ -42,6 +59,43 @@ class TestExtractionNode:
         assert result["transcript"] == "Transcripción de prueba"
         assert result["metadata"]["title"] == "Video Test"
         assert result["errors"] == []
+        assert result["fingerprint"] is not None
+        assert "duplicate_of" not in result
+
+    @pytest.mark.asyncio
+    @patch('application.workflow.graph.yt_adapter')
+    async def test_extraction_reuses_near_duplicate_analysis(self, mock_adapter, mock_analysis_result):
+        """Si el buscador configurado encuentra un casi-duplicado se adjunta su análisis."""
+        mock_adapter.fetch_full_data = AsyncMock(return_value={
+            "transcript": "Transcripción de prueba",
+            "metadata": {"title": "Espejo", "duration_seconds": 180, "language_code": "es"}
+        })
+        find_near_duplicate = AsyncMock(return_value={
+            "video_id": "orig0000001", "similarity": 0.97, "analysis": mock_analysis_result
+        })
+        config = {"configurable": {"find_near_duplicate": find_near_duplicate}}
+
+        result = await extraction_node({"video_url": "https://youtu.be/mirror00001", "errors": []}, config)
+
+        find_near_duplicate.assert_awaited_once()
+        assert result["duplicate_of"] == "orig0000001"
+        assert result["analysis"] == mock_analysis_result
+        assert route_analysis({**result, "partial_analyses": []}) == END
+
+    @pytest.mark.asyncio
+    @patch('application.workflow.graph.yt_adapter')
+    async def test_extraction_ignores_duplicate_lookup_failures(self, mock_adapter):
+        """Un fallo del buscador de casi-duplicados no interrumpe la extracción."""
+        mock_adapter.fetch_full_data = AsyncMock(return_value={
+            "transcript": "Transcripción de prueba",
+            "metadata": {"title": "Video", "duration_seconds": 180, "language_code": "es"}
+        })
+        config = {"configurable": {"find_near_duplicate": AsyncMock(side_effect=RuntimeError("db"))}}
+
+        result = await extraction_node({"video_url": "https://youtu.be/test1234567", "errors": []}, config)
+
+        assert result["errors"] == []
+        assert "duplicate_of" not in result
 
     @pytest.mark.asyncio
     @patch('application.workflow.graph.yt_adapter')
@@ -115,6 +169,7 @@ class TestAnalysisNode:
         assert result["analysis"]["sentiment"] == "positivo"
         assert result["analysis"]["sentiment_score"] == 0.9
         assert len(result["analysis"]["key_points"]) == 3
+        assert result["prompt_tokens"] > 0
 
     @pytest.mark.asyncio
     async def test_analysis_skips_on_error_state(self):
@@ -199,3 +254,237 @@ class TestShouldContinue:
         result = should_continue(state)
         
         assert result == "end"
+
+
+class TestTranscriptChunking:
+    """Tests para la división de transcripciones en fragmentos."""
+
+    def test_short_text_is_single_chunk(self):
+        """Un texto dentro del presupuesto produce un solo fragmento."""
+        assert split_into_chunks("hola mundo", max_tokens=100) == ["hola mundo"]
+
+    def test_chunks_respect_token_budget_and_cover_text(self):
+        """Ningún fragmento excede el presupuesto y no se pierden palabras."""
+        words = [f"palabra{i}" for i in range(500)]
+        chunks = split_into_chunks(" ".join(words), max_tokens=50, overlap_tokens=10)
+
+        assert len(chunks) > 1
+        assert all(estimate_tokens(chunk) <= 50 for chunk in chunks)
+        covered = {word for chunk in chunks for word in chunk.split()}
+        assert covered == set(words)
+
+    def test_consecutive_chunks_overlap(self):
+        """El comienzo de cada fragmento repite el final del anterior."""
+        words = [f"w{i}" for i in range(300)]
+        chunks = split_into_chunks(" ".join(words), max_tokens=40, overlap_tokens=10)
+
+        for previous, current in zip(chunks, chunks[1:]):
+            assert current.split()[0] in previous.split()
+
+    def test_overlap_must_be_smaller_than_chunk(self):
+        """Un solapamiento mayor o igual al fragmento es inválido."""
+        with pytest.raises(ValueError):
+            split_into_chunks("texto", max_tokens=10, overlap_tokens=10)
+
+
+class TestRouteAnalysis:
+    """Tests para el router entre análisis directo y map-reduce."""
+
+    def _state(self, transcript, errors=None):
+        return {
+            "video_url": "test",
+            "transcript": transcript,
+            "metadata": {},
+            "analysis": {},
+            "partial_analyses": [],
+            "errors": errors or []
+        }
+
+    def test_errors_end_the_flow(self):
+        """Con errores previos el flujo termina."""
+        assert route_analysis(self._state("", ["Error"])) == END
+
+    @patch('application.workflow.graph.CHUNK_TOKENS', 1000)
+    @patch('application.workflow.graph.llm_adapter', MagicMock(context_budget=None, rate_limiter=None))
+    def test_short_transcript_uses_single_call(self):
+        """Una transcripción corta va al nodo de análisis directo."""
+        assert route_analysis(self._state("texto corto")) == "analyze"
+
+    @patch('application.workflow.graph.CHUNK_OVERLAP_TOKENS', 5)
+    @patch('application.workflow.graph.CHUNK_TOKENS', 20)
+    @patch('application.workflow.graph.llm_adapter', MagicMock(context_budget=None, rate_limiter=None))
+    def test_long_transcript_fans_out_to_chunks(self):
+        """Una transcripción larga se reparte entre nodos analyze_chunk."""
+        transcript = " ".join(f"palabra{i}" for i in range(100))
+
+        sends = route_analysis(self._state(transcript))
+
+        assert len(sends) > 1
+        assert all(send.node == "analyze_chunk" for send in sends)
+        assert [send.arg["chunk_index"] for send in sends] == list(range(len(sends)))
+        assert all(send.arg["chunk_count"] == len(sends) for send in sends)
+
+    @patch('application.workflow.graph.CHUNK_TOKENS', 1000)
+    @patch('application.workflow.graph.llm_adapter')
+    def test_transcript_over_model_budget_fans_out(self, mock_adapter):
+        """Con política chunk, lo que no entra en el contexto del modelo se fragmenta."""
+        limits = ModelLimits(context_window=400, max_output_tokens=100)
+        mock_adapter.context_budget = ContextBudget("groq", "m", limits, TokenCounter(4.0), "chunk")
+        mock_adapter.rate_limiter = None
+        transcript = " ".join(f"palabra{i}" for i in range(200))
+
+        sends = route_analysis(self._state(transcript))
+
+        assert len(sends) > 1
+        assert all(mock_adapter.context_budget.fits(send.arg["chunk"]) for send in sends)
+
+    @patch('application.workflow.graph.CHUNK_TOKENS', 1000)
+    @patch('application.workflow.graph.llm_adapter')
+    def test_reject_policy_keeps_single_call(self, mock_adapter):
+        """Con política reject no se deriva al map-reduce: el LLM rechaza localmente."""
+        limits = ModelLimits(context_window=400, max_output_tokens=100)
+        mock_adapter.context_budget = ContextBudget("groq", "m", limits, TokenCounter(4.0), "reject")
+        mock_adapter.rate_limiter = None
+        transcript = " ".join(f"palabra{i}" for i in range(200))
+
+        assert route_analysis(self._state(transcript)) == "analyze"
+
+    @patch('application.workflow.graph.CHUNK_TOKENS', 20)
+    @patch('application.workflow.graph.llm_adapter', MagicMock(context_budget=None, rate_limiter=None))
+    def test_transcript_without_words_uses_single_call(self):
+        """Una transcripción larga pero sin palabras no produce fragmentos: análisis directo."""
+        transcript = "\n" * 400
+
+        assert split_into_chunks(transcript, 20, 5) == []
+        assert route_analysis(self._state(transcript)) == "analyze"
+
+    @patch('application.workflow.graph.CHUNK_OVERLAP_TOKENS', 50)
+    @patch('application.workflow.graph.CHUNK_TOKENS', 8000)
+    @patch('application.workflow.graph.llm_adapter')
+    def test_chunks_are_capped_at_the_model_tpm(self, mock_adapter):
+        """Con un TPM menor que CHUNK_TOKENS, cada fragmento (más instrucciones y respuesta) entra en él."""
+        mock_adapter.context_budget = None
+        mock_adapter.rate_limiter = TokenBucketLimiter(RateLimits(requests_per_minute=30, tokens_per_minute=1_000))
+        transcript = " ".join(f"palabra{i}" for i in range(1_000))
+        assert estimate_tokens(transcript) < 8000
+
+        sends = route_analysis(self._state(transcript))
+
+        assert len(sends) > 1
+        cap = 1_000 - PROMPT_OVERHEAD_TOKENS - ESTIMATED_COMPLETION_TOKENS
+        assert all(estimate_tokens(send.arg["chunk"]) <= cap for send in sends)
+
+    @patch('application.workflow.graph.CHUNK_TOKENS', 1000)
+    @patch('application.workflow.graph.llm_adapter')
+    def test_budget_below_prompt_overhead_is_rejected_by_the_llm(self, mock_adapter):
+        """Si el modelo no admite ni las instrucciones de un fragmento, no se fragmenta."""
+        limits = ModelLimits(context_window=300, max_output_tokens=100)
+        mock_adapter.context_budget = ContextBudget("groq", "m", limits, TokenCounter(4.0), "chunk")
+        mock_adapter.rate_limiter = None
+        transcript = " ".join(f"palabra{i}" for i in range(200))
+
+        assert route_analysis(self._state(transcript)) == "analyze"
+        with pytest.raises(LLMContextLengthError):
+            mock_adapter.context_budget.enforce(f"{ANALYSIS_PROMPT}{transcript}")
+
+
+class TestMapReduceNodes:
+    """Tests para los nodos de la rama map-reduce."""
+
+    @pytest.mark.asyncio
+    @patch('application.workflow.graph.structured_llm')
+    async def test_chunk_node_returns_partial_with_index(self, mock_llm):
+        """El nodo de fragmento devuelve un análisis parcial indexado."""
+        mock_result = MagicMock()
+        mock_result.dict.return_value = {
+            "sentiment": "positivo", "sentiment_score": 0.8,
+            "tone": "educativo", "key_points": ["A", "B", "C"]
+        }
+        mock_llm.ainvoke = AsyncMock(return_value=mock_result)
+
+        result = await chunk_analysis_node({"chunk": "fragmento", "chunk_index": 2, "chunk_count": 4})
+
+        assert result["partial_analyses"][0]["chunk_index"] == 2
+        assert result["partial_analyses"][0]["weight"] == len("fragmento")
+        assert "fragmento 3 de 4" in mock_llm.ainvoke.call_args[0][0]
+
+    @pytest.mark.asyncio
+    @patch('application.workflow.graph.structured_llm')
+    async def test_chunk_node_reports_errors(self, mock_llm):
+        """Un fallo del LLM en un fragmento se acumula como error."""
+        mock_llm.ainvoke = AsyncMock(side_effect=Exception("timeout"))
+
+        result = await chunk_analysis_node({"chunk": "x", "chunk_index": 0, "chunk_count": 2})
+
+        assert "fragmento 1" in result["errors"][0]
+
+    @pytest.mark.asyncio
+    @patch('application.workflow.graph.yt_adapter')
+    @patch('application.workflow.graph.structured_llm')
+    @patch('application.workflow.graph.CHUNK_OVERLAP_TOKENS', 5)
+    @patch('application.workflow.graph.CHUNK_TOKENS', 20)
+    async def test_long_transcript_runs_map_reduce(self, mock_llm, mock_adapter):
+        """El grafo completo analiza cada fragmento y combina el resultado en reduce."""
+        transcript = " ".join(f"palabra{i}" for i in range(60))
+        mock_adapter.fetch_full_data = AsyncMock(return_value={
+            "transcript": transcript,
+            "metadata": {"title": "Largo", "duration_seconds": 7200, "language_code": "es"}
+        })
+        mock_result = MagicMock()
+        mock_result.dict.return_value = {
+            "sentiment": "neutral", "sentiment_score": 0.5,
+            "tone": "formal", "key_points": ["A", "B", "C"]
+        }
+        mock_llm.ainvoke = AsyncMock(return_value=mock_result)
+
+        final_state = await get_graph().ainvoke({"video_url": "https://youtu.be/dQw4w9WgXcQ", "errors": []})
+
+        chunk_count = len(split_into_chunks(transcript, 20, 5))
+        assert len(final_state["partial_analyses"]) == chunk_count
+        assert mock_llm.ainvoke.await_count == chunk_count + 1
+        assert "análisis parciales" in mock_llm.ainvoke.call_args[0][0]
+        assert final_state["analysis"]["sentiment"] == "neutral"
+        assert final_state["errors"] == []
+
+
+class TestLazyInitialization:
+    """El import del grafo no crea adaptadores ni importa SDKs de proveedores."""
+
+    def test_import_does_not_load_provider_sdks(self):
+        """Importar el grafo sin API keys no importa LangGraph ni los SDKs de LLM."""
+        code = (
+            "import sys, django; django.setup(); import application.workflow.graph as g; "
+            "print(g.llm_adapter is None, g.yt_adapter is None, "
+            "[m for m in ('langchain_google_genai', 'langchain_groq', 'langgraph.graph') if m in sys.modules])"
+        )
+        env = {k: v for k, v in os.environ.items() if not k.endswith("_API_KEY")}
+        env.update(PYTHONPATH="src", DJANGO_SETTINGS_MODULE="config.settings")
+
+        output = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+        ).stdout
+
+        assert output.strip() == "True True []"
+
+    def test_graph_is_compiled_once(self):
+        """get_graph compila en el primer uso y luego reutiliza el grafo."""
+        assert get_graph() is get_graph()
+
+    @patch('application.workflow.graph.get_structured_llm')
+    @patch('application.workflow.graph.get_llm_adapter')
+    def test_router_shares_default_adapter_until_reset(self, mock_get_adapter, mock_get_structured):
+        """El router usa el adaptador por defecto del grafo; reset obliga a crearlo de nuevo."""
+        mock_get_adapter.side_effect = lambda: MagicMock(provider="groq", model="llama-3.3-70b-versatile")
+        reset()
+        try:
+            router = get_model_router()
+            adapter, _ = get_default_llm()
+
+            assert mock_get_adapter.call_count == 1
+            assert router.adapter(router.default_route) is adapter
+
+            reset()
+            assert get_default_llm()[0] is not adapter
+            assert mock_get_adapter.call_count == 2
+        finally:
+            reset()
@@ -0,0 +1,171 @@
+"""
+Tests Unitarios para la cache de respuestas estructuradas del LLM.
+Verifican que los prompts repetidos no vuelvan a llamar al proveedor.
+"""
+import pytest
+from datetime import timedelta
+from unittest.mock import patch, AsyncMock, MagicMock
+from django.utils import timezone
+from domain.models import VideoAnalysis
+from infrastructure.adapters.llm.response_cache import (
+    CachedStructuredLLM,
+    DatabaseResponseCache,
+    InMemoryResponseCache,
+    bypass_response_cache,
+    response_cache_key,
+    with_response_cache,
+)
+from infrastructure.persistence.models import LLMResponseCacheEntry
+
+
+def _inner(result, provider="groq", model="llama-3.3-70b-versatile", temperature=0.0):
+    """StructuredLLM de prueba que devuelve siempre ``result``."""
+    inner = MagicMock(provider=provider, model=model, temperature=temperature, schema=VideoAnalysis)
+    inner.ainvoke = AsyncMock(return_value=result)
+    return inner
+
+
+class TestResponseCacheKey:
+    """Tests para la clave de cache."""
+
+    def test_key_is_deterministic(self):
+        """El mismo conjunto de parámetros produce la misma clave."""
+        key = response_cache_key("groq", "m", 0.0, VideoAnalysis, "prompt")
+
+        assert key == response_cache_key("groq", "m", 0.0, VideoAnalysis, "prompt")
+        assert len(key) == 64
+
+    @pytest.mark.parametrize("changed", [
+        ("gemini", "m", 0.0, "prompt"),
+        ("groq", "otro", 0.0, "prompt"),
+        ("groq", "m", 0.7, "prompt"),
+        ("groq", "m", 0.0, "otro prompt"),
+    ])
+    def test_key_changes_with_any_parameter(self, changed):
+        """Cambiar proveedor, modelo, temperatura o prompt cambia la clave."""
+        provider, model, temperature, prompt = changed
+
+        assert response_cache_key(provider, model, temperature, VideoAnalysis, prompt) != \
+            response_cache_key("groq", "m", 0.0, VideoAnalysis, "prompt")
+
+
+class TestInMemoryResponseCache:
+    """Tests para el nivel LRU en memoria."""
+
+    def test_evicts_least_recently_used(self):
+        """Al superar max_entries se desaloja la entrada menos usada."""
+        cache = InMemoryResponseCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+
+        assert cache.get("a") == "1"
+        assert cache.get("b") is None
+        assert len(cache) == 2
+
+    def test_expired_entry_is_a_miss(self):
+        """Una entrada más vieja que el TTL no se devuelve."""
+        cache = InMemoryResponseCache(ttl_seconds=10)
+        with patch("infrastructure.adapters.llm.response_cache.time.monotonic", return_value=0.0):
+            cache.set("a", "1")
+        with patch("infrastructure.adapters.llm.response_cache.time.monotonic", return_value=11.0):
+            assert cache.get("a") is None
+
+
+@pytest.fixture
+def analysis(mock_analysis_result):
+    """VideoAnalysis válido construido desde el fixture compartido."""
+    return VideoAnalysis(**mock_analysis_result)
+
+
+class TestCachedStructuredLLM:
+    """Tests para el decorador de StructuredLLM."""
+
+    async def test_repeated_prompt_skips_provider(self, analysis):
+        """El segundo ainvoke con el mismo prompt se resuelve desde memoria."""
+        inner = _inner(analysis)
+        llm = CachedStructuredLLM(inner, InMemoryResponseCache())
+
+        first = await llm.ainvoke("Analiza esto")
+        second = await llm.ainvoke("Analiza esto")
+
+        inner.ainvoke.assert_awaited_once_with("Analiza esto")
+        assert isinstance(second, VideoAnalysis)
+        assert second == first
+
+    async def test_different_prompt_calls_provider(self, analysis):
+        """Un prompt distinto es un miss."""
+        inner = _inner(analysis)
+        llm = CachedStructuredLLM(inner, InMemoryResponseCache())
+
+        await llm.ainvoke("uno")
+        await llm.ainvoke("dos")
+
+        assert inner.ainvoke.await_count == 2
+
+    async def test_persistent_failure_does_not_break_invocation(self, analysis):
+        """Un error del nivel persistente se trata como miss."""
+        persistent = MagicMock()
+        persistent.aget = AsyncMock(side_effect=RuntimeError("db caída"))
+        persistent.aset = AsyncMock(side_effect=RuntimeError("db caída"))
+        inner = _inner(analysis)
+        llm = CachedStructuredLLM(inner, InMemoryResponseCache(), persistent)
+
+        result = await llm.ainvoke("Analiza esto")
+
+        assert result == analysis
+        inner.ainvoke.assert_awaited_once()
+
+    @pytest.mark.django_db(transaction=True)
+    async def test_persistent_hit_survives_process_restart(self, analysis):
+        """Una respuesta guardada en base de datos se reutiliza con memoria vacía."""
+        first_inner = _inner(analysis)
+        await CachedStructuredLLM(
+            first_inner, InMemoryResponseCache(), DatabaseResponseCache()
+        ).ainvoke("Analiza esto")
+
+        second_inner = _inner(analysis)
+        result = await CachedStructuredLLM(
+            second_inner, InMemoryResponseCache(), DatabaseResponseCache()
+        ).ainvoke("Analiza esto")
+
+        second_inner.ainvoke.assert_not_awaited()
+        assert result == analysis
+
+    async def test_bypass_calls_provider_and_replaces_entry(self, analysis):
+        """Dentro de bypass_response_cache se invoca al proveedor y la respuesta nueva queda cacheada."""
+        refreshed = analysis.model_copy(update={"sentiment": "neutral"})
+        inner = _inner(analysis)
+        llm = CachedStructuredLLM(inner, InMemoryResponseCache())
+        await llm.ainvoke("Analiza esto")
+
+        inner.ainvoke.return_value = refreshed
+        with bypass_response_cache():
+            result = await llm.ainvoke("Analiza esto")
+
+        assert result == refreshed
+        assert inner.ainvoke.await_count == 2
+        assert await llm.ainvoke("Analiza esto") == refreshed
+        assert inner.ainvoke.await_count == 2
+
+    @pytest.mark.django_db(transaction=True)
+    async def test_persistent_expired_rows_are_deleted_every_n_writes(self, analysis):
+        """Cada evict_every escrituras se borran las filas vencidas de la tabla."""
+        cache = DatabaseResponseCache(ttl_seconds=60, evict_every=2)
+        await cache.aset("viejo", "{}", "groq", "m", "VideoAnalysis")
+        await LLMResponseCacheEntry.objects.filter(key="viejo").aupdate(
+            created_at=timezone.now() - timedelta(seconds=120)
+        )
+
+        await cache.aset("nuevo", "{}", "groq", "m", "VideoAnalysis")
+
+        keys = {key async for key in LLMResponseCacheEntry.objects.values_list("key", flat=True)}
+        assert keys == {"nuevo"}
+
+    @patch.dict('os.environ', {"LLM_RESPONSE_CACHE_ENABLED": "false"})
+    def test_disabled_returns_inner_unchanged(self):
+        """Con LLM_RESPONSE_CACHE_ENABLED=false no se envuelve el StructuredLLM."""
+        inner = _inner(None)
+
+        assert with_response_cache(inner) is inner
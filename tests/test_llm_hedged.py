@@ -0,0 +1,195 @@
+"""
+Tests Unitarios para el adaptador compuesto con hedged requests y failover.
+Usan adaptadores falsos con latencia simulada: sin llamadas de red.
+"""
+import asyncio
+import pytest
+from domain.models import VideoAnalysis
+from infrastructure.adapters.llm.exceptions import (
+    LLMConfigurationError,
+    LLMInferenceError,
+    LLMRateLimitError,
+)
+from infrastructure.adapters.llm.hedged_adapter import HedgedAdapter, LatencyTracker
+from infrastructure.adapters.llm.interface import LLMInterface, StructuredLLM
+from infrastructure.adapters.llm.tokens import ContextBudget, ModelLimits, TokenCounter
+
+
+class FakeStructuredLLM(StructuredLLM):
+    """StructuredLLM que responde (o falla) tras una demora fija."""
+
+    def __init__(self, adapter, schema):
+        self.adapter = adapter
+        self.provider = adapter.name
+        self.model = adapter.model
+        self.temperature = 0.0
+        self.schema = schema
+
+    async def ainvoke(self, prompt):
+        self.adapter.calls += 1
+        try:
+            await asyncio.sleep(self.adapter.delay)
+        except asyncio.CancelledError:
+            self.adapter.cancelled = True
+            raise
+        if self.adapter.error is not None:
+            raise self.adapter.error
+        return self.schema(
+            sentiment="positivo",
+            sentiment_score=0.8,
+            tone=self.adapter.name,
+            key_points=["uno", "dos", "tres"]
+        )
+
+
+class FakeAdapter(LLMInterface):
+    """Adaptador falso con latencia y error configurables."""
+
+    def __init__(self, name, delay=0.0, error=None, context_budget=None):
+        self.name = name
+        self.model = f"{name}-model"
+        self.temperature = 0.0
+        self.delay = delay
+        self.error = error
+        self.context_budget = context_budget
+        self.calls = 0
+        self.cancelled = False
+
+    def with_structured_output(self, schema):
+        return FakeStructuredLLM(self, schema)
+
+
+def _hedged(primary, secondary, initial_delay_seconds=0.05):
+    adapter = HedgedAdapter([primary, secondary], percentile=95, initial_delay_seconds=initial_delay_seconds)
+    return adapter.with_structured_output(VideoAnalysis)
+
+
+@pytest.mark.asyncio
+class TestHedgedStructuredLLM:
+    """Tests de hedging, failover y cancelación."""
+
+    async def test_fast_primary_is_not_hedged(self):
+        """Si el primario responde dentro del umbral no se consulta al secundario."""
+        primary, secondary = FakeAdapter("gemini", delay=0.0), FakeAdapter("groq")
+
+        result = await _hedged(primary, secondary).ainvoke("prompt")
+
+        assert result.tone == "gemini"
+        assert secondary.calls == 0
+
+    async def test_slow_primary_is_hedged_and_cancelled(self):
+        """Un primario lento dispara al secundario; gana el más rápido y se cancela el otro."""
+        primary, secondary = FakeAdapter("gemini", delay=1.0), FakeAdapter("groq", delay=0.0)
+
+        result = await asyncio.wait_for(_hedged(primary, secondary).ainvoke("prompt"), timeout=0.5)
+
+        assert result.tone == "groq"
+        assert secondary.calls == 1
+        await asyncio.sleep(0)
+        assert primary.cancelled
+
+    async def test_hedged_primary_can_still_win(self):
+        """Tras disparar el respaldo, si el primario termina antes, su respuesta gana."""
+        primary, secondary = FakeAdapter("gemini", delay=0.1), FakeAdapter("groq", delay=1.0)
+
+        result = await asyncio.wait_for(_hedged(primary, secondary).ainvoke("prompt"), timeout=0.5)
+
+        assert result.tone == "gemini"
+        assert secondary.calls == 1
+        await asyncio.sleep(0)
+        assert secondary.cancelled
+
+    @pytest.mark.parametrize("error", [
+        LLMInferenceError("caído", provider="gemini"),
+        LLMRateLimitError("429", retry_after_seconds=30),
+    ])
+    async def test_failover_is_immediate(self, error):
+        """Ante un error de inferencia o rate limit se pasa al secundario sin esperar el umbral."""
+        primary, secondary = FakeAdapter("gemini", error=error), FakeAdapter("groq")
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await _hedged(primary, secondary, initial_delay_seconds=5.0).ainvoke("prompt")
+
+        assert result.tone == "groq"
+        assert loop.time() - started < 1.0
+
+    async def test_all_providers_failing_raises_last_error(self):
+        """Si todos fallan se propaga el último error."""
+        primary = FakeAdapter("gemini", error=LLMInferenceError("uno"))
+        secondary = FakeAdapter("groq", error=LLMInferenceError("dos"))
+
+        with pytest.raises(LLMInferenceError, match="dos"):
+            await _hedged(primary, secondary).ainvoke("prompt")
+
+    async def test_unexpected_errors_fail_over(self):
+        """Un error inesperado del primario también pasa al secundario."""
+        primary, secondary = FakeAdapter("gemini", error=KeyError("bug")), FakeAdapter("groq")
+
+        result = await _hedged(primary, secondary, initial_delay_seconds=5.0).ainvoke("prompt")
+
+        assert result.tone == "groq"
+
+    async def test_failing_hedge_does_not_cancel_primary(self):
+        """Si el respaldo falla con un error inesperado, se sigue esperando al primario."""
+        primary = FakeAdapter("gemini", delay=0.2)
+        secondary = FakeAdapter("groq", error=RuntimeError("bug"))
+
+        result = await asyncio.wait_for(_hedged(primary, secondary).ainvoke("prompt"), timeout=1.0)
+
+        assert result.tone == "gemini"
+        assert secondary.calls == 1
+        assert not primary.cancelled
+
+    async def test_unexpected_error_is_raised_when_no_provider_is_left(self):
+        """Sin proveedores pendientes se propaga el último error, aunque sea inesperado."""
+        primary = FakeAdapter("gemini", error=LLMInferenceError("uno"))
+        secondary = FakeAdapter("groq", error=RuntimeError("dos"))
+
+        with pytest.raises(RuntimeError, match="dos"):
+            await _hedged(primary, secondary).ainvoke("prompt")
+
+
+class TestHedgedAdapter:
+    """Tests de configuración del adaptador compuesto."""
+
+    def test_requires_two_providers(self):
+        """Un único proveedor no es una configuración válida."""
+        with pytest.raises(LLMConfigurationError):
+            HedgedAdapter([FakeAdapter("gemini")])
+
+    def test_uses_most_restrictive_context_budget(self):
+        """El presupuesto expuesto es el del proveedor con menos contexto."""
+        small = ContextBudget("groq", "m", ModelLimits(1000, 100), TokenCounter(), "chunk")
+        large = ContextBudget("gemini", "m", ModelLimits(100000, 100), TokenCounter(), "chunk")
+
+        adapter = HedgedAdapter([FakeAdapter("gemini", context_budget=large), FakeAdapter("groq", context_budget=small)])
+
+        assert adapter.context_budget is small
+
+    def test_structured_llm_identifies_all_models(self):
+        """El modelo del StructuredLLM (clave de cache) incluye a todos los proveedores."""
+        structured = _hedged(FakeAdapter("gemini"), FakeAdapter("groq"))
+
+        assert structured.provider == "hedged"
+        assert structured.model == "gemini:gemini-model+groq:groq-model"
+
+
+class TestLatencyTracker:
+    """Tests del percentil de latencias."""
+
+    def test_no_percentile_until_min_samples(self):
+        """Con pocas muestras se usa el umbral inicial."""
+        tracker = LatencyTracker(min_samples=3)
+        tracker.record(1.0)
+
+        assert tracker.percentile(95) is None
+
+    def test_percentile_over_window(self):
+        """El percentil se calcula sobre las muestras retenidas."""
+        tracker = LatencyTracker(window=100, min_samples=1)
+        for i in range(1, 101):
+            tracker.record(i / 100)
+
+        assert tracker.percentile(95) == 0.95
+        assert tracker.percentile(50) == 0.5
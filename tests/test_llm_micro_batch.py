@@ -0,0 +1,184 @@
+"""
+Tests Unitarios para el micro-batching de prompts cortos.
+El proveedor falso responde según el schema pedido y registra cada llamada.
+"""
+import asyncio
+import re
+import pytest
+from unittest.mock import patch
+from domain.models import VideoAnalysis
+from infrastructure.adapters.llm.exceptions import LLMInferenceError
+from infrastructure.adapters.llm.interface import LLMInterface, StructuredLLM
+from infrastructure.adapters.llm.micro_batcher import (
+    MicroBatchingStructuredLLM,
+    batch_schema,
+    with_micro_batching,
+)
+
+
+def _analysis(tone):
+    return {"sentiment": "positivo", "sentiment_score": 0.8, "tone": tone, "key_points": ["uno", "dos", "tres"]}
+
+
+class FakeStructuredLLM(StructuredLLM):
+    """Responde con el tono igual al prompt (individual) o a cada sección (combinado)."""
+
+    def __init__(self, adapter, schema):
+        self.adapter = adapter
+        self.provider = "fake"
+        self.model = "fake-model"
+        self.temperature = 0.0
+        self.schema = schema
+
+    async def ainvoke(self, prompt):
+        if self.schema is VideoAnalysis:
+            self.adapter.single_calls.append(prompt)
+            return VideoAnalysis(**_analysis(prompt))
+        self.adapter.batch_calls.append(prompt)
+        if self.adapter.batch_error is not None:
+            raise self.adapter.batch_error
+        items = [
+            {"item_id": item_id, **_analysis(text)}
+            for item_id, text in re.findall(r"### item_id: (\d+)\n(.*)", prompt)
+            if item_id not in self.adapter.drop_items
+        ]
+        return self.schema(items=items)
+
+
+class FakeAdapter(LLMInterface):
+    def __init__(self, batch_error=None, drop_items=()):
+        self.model = "fake-model"
+        self.temperature = 0.0
+        self.batch_error = batch_error
+        self.drop_items = set(drop_items)
+        self.single_calls = []
+        self.batch_calls = []
+
+    def with_structured_output(self, schema):
+        return FakeStructuredLLM(self, schema)
+
+
+def _batcher(adapter, **kwargs):
+    kwargs.setdefault("max_wait_seconds", 0.01)
+    return MicroBatchingStructuredLLM(
+        adapter.with_structured_output(VideoAnalysis),
+        adapter.with_structured_output(batch_schema(VideoAnalysis)),
+        **kwargs
+    )
+
+
+@pytest.mark.asyncio
+class TestMicroBatchingStructuredLLM:
+    """Tests de agrupamiento, reparto de resultados y fallback."""
+
+    async def test_concurrent_prompts_share_one_call(self):
+        """Prompts cortos simultáneos viajan en una sola llamada y cada uno recibe el suyo."""
+        adapter = FakeAdapter()
+        batcher = _batcher(adapter)
+
+        results = await asyncio.gather(*(batcher.ainvoke(f"clip {i}") for i in range(5)))
+
+        assert len(adapter.batch_calls) == 1
+        assert adapter.single_calls == []
+        assert [r.tone for r in results] == [f"clip {i}" for i in range(5)]
+
+    async def test_full_batch_is_sent_without_waiting(self):
+        """Al completar max_batch_size el lote sale sin esperar; el resto forma otro."""
+        adapter = FakeAdapter()
+        batcher = _batcher(adapter, max_batch_size=4, max_wait_seconds=5)
+
+        first = await asyncio.wait_for(
+            asyncio.gather(*(batcher.ainvoke(f"clip {i}") for i in range(4))), timeout=1
+        )
+
+        assert len(adapter.batch_calls) == 1
+        assert [r.tone for r in first] == [f"clip {i}" for i in range(4)]
+
+    async def test_lone_prompt_uses_single_call(self):
+        """Un prompt sin compañía al vencer la espera se envía de forma individual."""
+        adapter = FakeAdapter()
+
+        result = await _batcher(adapter).ainvoke("solo")
+
+        assert result.tone == "solo"
+        assert adapter.batch_calls == []
+        assert adapter.single_calls == ["solo"]
+
+    async def test_long_prompt_bypasses_batching(self):
+        """Un prompt que supera max_item_tokens no espera al lote."""
+        adapter = FakeAdapter()
+        batcher = _batcher(adapter, max_item_tokens=10, max_wait_seconds=5)
+
+        result = await asyncio.wait_for(batcher.ainvoke("palabra " * 100), timeout=1)
+
+        assert result.tone.startswith("palabra")
+        assert len(adapter.single_calls) == 1
+
+    async def test_missing_items_fall_back_to_single_calls(self):
+        """Los ítems ausentes en la respuesta combinada se reintentan individualmente."""
+        adapter = FakeAdapter(drop_items={"1"})
+        batcher = _batcher(adapter)
+
+        results = await asyncio.gather(*(batcher.ainvoke(f"clip {i}") for i in range(3)))
+
+        assert [r.tone for r in results] == ["clip 0", "clip 1", "clip 2"]
+        assert adapter.single_calls == ["clip 1"]
+
+    async def test_failed_batch_falls_back_to_single_calls(self):
+        """Si la llamada combinada falla, cada prompt se envía por separado."""
+        adapter = FakeAdapter(batch_error=LLMInferenceError("caída", provider="fake"))
+        batcher = _batcher(adapter)
+
+        results = await asyncio.gather(*(batcher.ainvoke(f"clip {i}") for i in range(3)))
+
+        assert [r.tone for r in results] == ["clip 0", "clip 1", "clip 2"]
+        assert sorted(adapter.single_calls) == ["clip 0", "clip 1", "clip 2"]
+
+    async def test_single_call_error_reaches_caller(self):
+        """Un error del reintento individual llega al llamador correspondiente."""
+        adapter = FakeAdapter(batch_error=RuntimeError("caída"))
+        batcher = _batcher(adapter)
+        batcher.single = FakeStructuredLLM(adapter, VideoAnalysis)
+
+        async def failing(prompt):
+            raise LLMInferenceError("individual", provider="fake")
+        batcher.single.ainvoke = failing
+
+        results = await asyncio.gather(batcher.ainvoke("a"), batcher.ainvoke("b"), return_exceptions=True)
+
+        assert all(isinstance(r, LLMInferenceError) for r in results)
+
+
+class TestMicroBatchConfiguration:
+    """Tests del schema combinado y la configuración."""
+
+    def test_batch_schema_wraps_items_with_id(self):
+        """El schema combinado es una lista de respuestas con item_id."""
+        schema = batch_schema(VideoAnalysis)
+        parsed = schema(items=[{"item_id": "0", **_analysis("t")}])
+
+        assert parsed.items[0].item_id == "0"
+        assert batch_schema(VideoAnalysis) is schema
+
+    def test_disabled_returns_same_llm(self):
+        """Deshabilitado (default), no se agrega el micro-batcher."""
+        adapter = FakeAdapter()
+        single = adapter.with_structured_output(VideoAnalysis)
+        with patch.dict("os.environ", {"LLM_MICRO_BATCH_ENABLED": "false"}):
+            assert with_micro_batching(single, adapter, VideoAnalysis) is single
+
+    def test_enabled_reads_configuration(self):
+        """Habilitado, se configura con las variables LLM_MICRO_BATCH_*."""
+        adapter = FakeAdapter()
+        env = {
+            "LLM_MICRO_BATCH_ENABLED": "true",
+            "LLM_MICRO_BATCH_MAX_SIZE": "4",
+            "LLM_MICRO_BATCH_MAX_WAIT_MS": "25",
+            "LLM_MICRO_BATCH_MAX_ITEM_TOKENS": "500",
+        }
+        with patch.dict("os.environ", env):
+            batcher = with_micro_batching(adapter.with_structured_output(VideoAnalysis), adapter, VideoAnalysis)
+
+        assert isinstance(batcher, MicroBatchingStructuredLLM)
+        assert (batcher.max_batch_size, batcher.max_wait_seconds, batcher.max_item_tokens) == (4, 0.025, 500)
+        assert batcher.batch.schema is batch_schema(VideoAnalysis)
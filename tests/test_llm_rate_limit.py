@@ -0,0 +1,155 @@
+"""
+Tests Unitarios para el rate limiting por proveedor y modelo.
+Usan límites altos y buckets vaciados a mano para que las esperas sean de décimas de segundo.
+"""
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock, AsyncMock
+from infrastructure.adapters.llm.exceptions import LLMRateLimitError
+from infrastructure.adapters.llm.groq_adapter import GroqAdapter, GroqStructuredLLM
+from infrastructure.adapters.llm.rate_limiter import (
+    RateLimits,
+    TokenBucketLimiter,
+    ainvoke_with_rate_limit,
+    get_rate_limiter,
+)
+
+
+class FakeRateLimitError(Exception):
+    """Imita el 429 de un SDK (status_code y header Retry-After)."""
+
+    status_code = 429
+
+    def __init__(self, retry_after="0.05"):
+        super().__init__("Too Many Requests")
+        self.response = SimpleNamespace(headers={"retry-after": retry_after})
+
+
+@pytest.mark.asyncio
+class TestTokenBucketLimiter:
+    """Tests de los buckets RPM/TPM y la cola de espera."""
+
+    async def test_request_within_budget_does_not_wait(self):
+        """Con cupo disponible la solicitud pasa de inmediato."""
+        limiter = TokenBucketLimiter(RateLimits(requests_per_minute=30, tokens_per_minute=6000))
+
+        assert await limiter.acquire(tokens=1000) < 0.05
+        assert limiter.stats()["tokens_available"] == pytest.approx(5000, abs=5)
+
+    async def test_exhausted_requests_wait_for_refill(self):
+        """Sin solicitudes disponibles se espera la recarga (600 RPM = 1 cada 0.1s)."""
+        limiter = TokenBucketLimiter(RateLimits(requests_per_minute=600))
+        limiter._requests = 0
+
+        assert await limiter.acquire() >= 0.09
+
+    async def test_exhausted_tokens_wait_for_refill(self):
+        """Sin tokens suficientes se espera la recarga (60.000 TPM = 100 tokens en 0.1s)."""
+        limiter = TokenBucketLimiter(RateLimits(tokens_per_minute=60_000))
+        limiter._tokens = 0
+
+        assert await limiter.acquire(tokens=100) >= 0.09
+
+    async def test_oversized_request_is_capped_to_bucket(self):
+        """Una solicitud mayor que el TPM completo no espera para siempre."""
+        limiter = TokenBucketLimiter(RateLimits(tokens_per_minute=1000))
+
+        assert await limiter.acquire(tokens=50_000) < 0.05
+
+    async def test_waiters_are_served_in_arrival_order(self):
+        """Un llamador grande en espera no es adelantado por uno chico posterior."""
+        limiter = TokenBucketLimiter(RateLimits(tokens_per_minute=60_000))
+        limiter._tokens = 0
+        order = []
+
+        async def caller(name, tokens):
+            await limiter.acquire(tokens)
+            order.append(name)
+
+        big = asyncio.create_task(caller("grande", 200))
+        await asyncio.sleep(0)
+        small = asyncio.create_task(caller("chico", 1))
+        await asyncio.gather(big, small)
+
+        assert order == ["grande", "chico"]
+
+    async def test_penalty_blocks_until_retry_after(self):
+        """penalize (p. ej. tras un 429) bloquea el bucket el tiempo indicado."""
+        limiter = TokenBucketLimiter(RateLimits(requests_per_minute=30))
+        limiter.penalize(0.1)
+
+        assert await limiter.acquire() >= 0.09
+
+
+@pytest.mark.asyncio
+class TestAinvokeWithRateLimit:
+    """Tests de reintentos con el limitador."""
+
+    async def test_429_honours_retry_after_and_retries(self):
+        """Tras un 429 el reintento espera el Retry-After en el limitador."""
+        limiter = TokenBucketLimiter(RateLimits(requests_per_minute=600))
+        call = AsyncMock(side_effect=[FakeRateLimitError("0.1"), "ok"])
+
+        started = time.monotonic()
+        result = await ainvoke_with_rate_limit(call, "prompt", limiter, 10, "groq", "m")
+
+        assert result == "ok"
+        assert call.await_count == 2
+        assert time.monotonic() - started >= 0.09
+
+    async def test_persistent_429_raises_rate_limit_error(self):
+        """Si todos los intentos reciben 429 se lanza LLMRateLimitError con el Retry-After."""
+        limiter = TokenBucketLimiter(RateLimits(requests_per_minute=600))
+        call = AsyncMock(side_effect=FakeRateLimitError("0.01"))
+
+        with pytest.raises(LLMRateLimitError) as exc_info:
+            await ainvoke_with_rate_limit(call, "prompt", limiter, 10, "groq", "m")
+
+        assert exc_info.value.retry_after_seconds == 0.01
+        assert call.await_count == 3
+
+    async def test_structured_llm_surfaces_rate_limit_error(self):
+        """El wrapper de Groq propaga LLMRateLimitError (no LLMInferenceError)."""
+        llm = MagicMock()
+        llm.ainvoke = AsyncMock(side_effect=FakeRateLimitError("0.01"))
+        limiter = TokenBucketLimiter(RateLimits(requests_per_minute=600))
+        structured = GroqStructuredLLM(llm, model="m", rate_limiter=limiter)
+
+        with pytest.raises(LLMRateLimitError):
+            await structured.ainvoke("prompt")
+
+
+class TestGetRateLimiter:
+    """Tests del registro de limitadores y su configuración."""
+
+    def test_limiter_is_shared_per_provider_and_model(self):
+        """Todos los adaptadores del mismo modelo comparten el limitador."""
+        limits = RateLimits(30, 6000)
+
+        assert get_rate_limiter("groq", "shared-model", limits) is get_rate_limiter("groq", "shared-model", limits)
+        assert get_rate_limiter("groq", "otro-model", limits) is not get_rate_limiter("groq", "shared-model", limits)
+
+    @patch.dict('os.environ', {"GROQ_RATE_LIMIT_TPM": "100000"})
+    def test_env_overrides_catalogued_limits(self):
+        """GROQ_RATE_LIMIT_TPM reemplaza el TPM del catálogo."""
+        limiter = get_rate_limiter("groq", "env-model", RateLimits(30, 6000))
+
+        assert limiter.limits == RateLimits(30, 100_000)
+
+    @patch.dict('os.environ', {"LLM_RATE_LIMIT_ENABLED": "false"})
+    def test_disabled_returns_none(self):
+        """Con LLM_RATE_LIMIT_ENABLED=false no hay limitador."""
+        assert get_rate_limiter("groq", "m", RateLimits(30, 6000)) is None
+
+    @patch.dict('os.environ', {"GROQ_API_KEY": "x"})
+    def test_adapter_uses_catalogued_limits(self):
+        """El adaptador toma los límites de RATE_LIMITS para su modelo."""
+        adapter = GroqAdapter(model="llama-3.3-70b-versatile")
+
+        assert adapter.rate_limiter.limits == GroqAdapter.RATE_LIMITS["llama-3.3-70b-versatile"]
+
+    def test_every_groq_model_has_rate_limits(self):
+        """Todos los modelos listados tienen límites conocidos."""
+        assert set(GroqAdapter.RATE_LIMITS) == set(GroqAdapter.AVAILABLE_MODELS)
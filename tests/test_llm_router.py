@@ -0,0 +1,175 @@
+"""
+Tests Unitarios para el ruteo de modelos por tamaño de transcripción.
+Los adaptadores se reemplazan por dobles: no se crean clientes de proveedores reales.
+"""
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock, AsyncMock
+from infrastructure.adapters.llm.exceptions import LLMConfigurationError
+from infrastructure.adapters.llm.router import (
+    DEFAULT_ROUTES,
+    ModelRoute,
+    ModelRouter,
+    context_window,
+    parse_routing_table,
+)
+from application.workflow.graph import extraction_node
+
+
+def _router(routes, default_model="llama-3.3-70b-versatile"):
+    return ModelRouter(routes, SimpleNamespace(model=default_model), "groq")
+
+
+class TestModelRouterSelect:
+    """Tests de la elección de modelo."""
+
+    def test_short_prompt_uses_small_model(self):
+        """Un clip corto va al modelo liviano de la tabla."""
+        route = _router(DEFAULT_ROUTES["groq"]).select(tokens=1_500)
+
+        assert route.model == "llama-3.1-8b-instant"
+
+    def test_long_prompt_uses_large_model(self):
+        """Superado el tope de la ruta liviana, se usa el modelo grande."""
+        route = _router(DEFAULT_ROUTES["groq"]).select(tokens=20_000)
+
+        assert route.model == "llama-3.3-70b-versatile"
+
+    def test_fast_tier_prefers_small_model_for_any_size(self):
+        """El nivel fast usa el modelo liviano aunque el prompt sea largo."""
+        route = _router(DEFAULT_ROUTES["groq"]).select(tokens=20_000, latency_tier="fast")
+
+        assert route.model == "llama-3.1-8b-instant"
+
+    def test_quality_tier_skips_standard_routes(self):
+        """Las rutas de otro nivel no aplican."""
+        route = _router(DEFAULT_ROUTES["groq"]).select(tokens=1_500, latency_tier="quality")
+
+        assert route.model == "llama-3.3-70b-versatile"
+
+    def test_route_skipped_when_context_window_too_small(self):
+        """Un modelo cuya ventana no admite el prompt se saltea aunque su tope lo permita."""
+        routes = [
+            ModelRoute("groq", "gemma2-9b-it"),
+            ModelRoute("groq", "mixtral-8x7b-32768"),
+        ]
+
+        assert _router(routes).select(tokens=10_000).model == "mixtral-8x7b-32768"
+
+    def test_oversized_prompt_uses_largest_window(self):
+        """Si ningún modelo admite el prompt, se elige el de mayor ventana."""
+        routes = [
+            ModelRoute("groq", "gemma2-9b-it"),
+            ModelRoute("groq", "llama-3.3-70b-versatile"),
+            ModelRoute("groq", "mixtral-8x7b-32768"),
+        ]
+
+        assert _router(routes).select(tokens=500_000).model == "llama-3.3-70b-versatile"
+
+    def test_without_routes_uses_default(self):
+        """Sin tabla de ruteo siempre se usa el modelo configurado."""
+        router = _router([])
+
+        assert router.select(tokens=1_000_000) == router.default_route
+        assert router.is_default("groq", "llama-3.3-70b-versatile")
+
+    def test_context_window_subtracts_output_reserve(self):
+        """La ventana útil descuenta la salida máxima reservada."""
+        assert context_window("groq", "gemma2-9b-it") == 8_192 - 2_048
+        assert context_window("groq", "desconocido") is None
+
+
+class TestRoutingConfiguration:
+    """Tests de la tabla configurable y la creación de adaptadores."""
+
+    def test_parse_routing_table(self):
+        """La tabla JSON se convierte en rutas con nivel "*" por defecto."""
+        routes = parse_routing_table(
+            '[{"provider": "groq", "model": "llama-3.1-8b-instant", "max_tokens": 4000},'
+            ' {"provider": "gemini", "model": "gemini-2.0-flash", "tier": "quality"}]'
+        )
+
+        assert routes == [
+            ModelRoute("groq", "llama-3.1-8b-instant", max_tokens=4000),
+            ModelRoute("gemini", "gemini-2.0-flash", tier="quality"),
+        ]
+
+    @pytest.mark.parametrize("raw", [
+        "no es json",
+        '[{"provider": "groq"}]',
+        '[{"provider": "openai", "model": "x"}]',
+        '[{"provider": "groq", "model": "x", "tier": "turbo"}]',
+    ])
+    def test_invalid_routing_table_is_rejected(self, raw):
+        """Tablas mal formadas, proveedores o niveles desconocidos fallan en la configuración."""
+        with pytest.raises(LLMConfigurationError):
+            parse_routing_table(raw)
+
+    def test_from_env_disabled_has_no_routes(self):
+        """Con el ruteo deshabilitado (default) no hay tabla."""
+        with patch.dict("os.environ", {"LLM_ROUTING_ENABLED": "false"}):
+            router = ModelRouter.from_env(SimpleNamespace(model="gemini-2.0-flash"), "gemini")
+
+        assert router.routes == []
+
+    def test_from_env_uses_provider_default_table(self):
+        """Habilitado y sin tabla, se usa la predeterminada del proveedor."""
+        with patch.dict("os.environ", {"LLM_ROUTING_ENABLED": "true"}, clear=False):
+            router = ModelRouter.from_env(SimpleNamespace(model="gemini-2.0-flash"), "gemini")
+
+        assert router.routes == DEFAULT_ROUTES["gemini"]
+
+    @patch("infrastructure.adapters.llm.router.get_llm_adapter")
+    def test_adapters_are_created_lazily_and_reused(self, mock_factory):
+        """El adaptador de un modelo se crea en su primer uso y luego se reutiliza."""
+        default = SimpleNamespace(model="llama-3.3-70b-versatile")
+        router = _router(DEFAULT_ROUTES["groq"])
+        router._adapters[("groq", "llama-3.3-70b-versatile")] = default
+        route = ModelRoute("groq", "llama-3.1-8b-instant")
+
+        first = router.adapter(route)
+        second = router.adapter(route)
+
+        mock_factory.assert_called_once_with("groq", model="llama-3.1-8b-instant")
+        assert first is second
+        assert router.adapter(ModelRoute("groq", "llama-3.3-70b-versatile")) is default
+
+
+@pytest.mark.asyncio
+class TestExtractionRouting:
+    """Tests de la elección de modelo dentro del grafo."""
+
+    @patch.dict("os.environ", {"LLM_ROUTING_ENABLED": "true"})
+    @patch('application.workflow.graph.model_router')
+    @patch('application.workflow.graph.yt_adapter')
+    async def test_extraction_records_routed_model(self, mock_adapter, mock_router):
+        """La extracción elige el modelo con el nivel de latencia de la configuración."""
+        mock_adapter.fetch_full_data = AsyncMock(return_value={
+            "transcript": "un clip corto",
+            "metadata": {"title": "t", "duration_seconds": 10, "language_code": "es"},
+        })
+        mock_router.select = MagicMock(return_value=ModelRoute("groq", "llama-3.1-8b-instant"))
+
+        result = await extraction_node(
+            {"video_url": "https://youtu.be/dQw4w9WgXcQ"},
+            config={"configurable": {"latency_tier": "fast"}}
+        )
+
+        assert mock_router.select.call_args.args[1] == "fast"
+        assert (result["llm_provider"], result["llm_model"]) == ("groq", "llama-3.1-8b-instant")
+
+    @patch.dict("os.environ", {"LLM_ROUTING_ENABLED": "false"})
+    @patch('application.workflow.graph.get_model_router')
+    @patch('application.workflow.graph.llm_adapter', SimpleNamespace(provider="groq", model="llama-3.3-70b-versatile"))
+    @patch('application.workflow.graph.yt_adapter')
+    async def test_extraction_without_routing_uses_configured_model(self, mock_adapter, mock_get_router):
+        """Sin ruteo la extracción no crea el router e informa el modelo configurado."""
+        mock_adapter.fetch_full_data = AsyncMock(return_value={
+            "transcript": "un clip corto",
+            "metadata": {"title": "t", "duration_seconds": 10, "language_code": "es"},
+        })
+
+        result = await extraction_node({"video_url": "https://youtu.be/dQw4w9WgXcQ"})
+
+        mock_get_router.assert_not_called()
+        assert (result["llm_provider"], result["llm_model"]) == ("groq", "llama-3.3-70b-versatile")
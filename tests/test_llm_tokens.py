@@ -0,0 +1,105 @@
+"""
+Tests Unitarios para el conteo de tokens y el presupuesto de contexto LLM.
+Verifican que los prompts excedidos se resuelvan localmente, sin llamadas de red.
+"""
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from infrastructure.adapters.llm.tokens import ContextBudget, ModelLimits, TokenCounter
+from infrastructure.adapters.llm.exceptions import LLMContextLengthError, LLMConfigurationError
+from infrastructure.adapters.llm.groq_adapter import GroqAdapter, GroqStructuredLLM
+from infrastructure.adapters.llm.gemini_adapter import GeminiAdapter
+
+
+def _budget(policy="reject", context_window=100, max_output_tokens=20):
+    """Presupuesto de 80 tokens de entrada con un contador de 1 carácter por token."""
+    limits = ModelLimits(context_window=context_window, max_output_tokens=max_output_tokens)
+    return ContextBudget("groq", "test-model", limits, TokenCounter(chars_per_token=1.0), policy)
+
+
+class TestContextBudget:
+    """Tests para la aplicación de políticas sobre el prompt."""
+
+    def test_prompt_budget_reserves_output_tokens(self):
+        """El presupuesto de entrada descuenta la salida máxima del modelo."""
+        assert _budget().max_prompt_tokens == 80
+
+    def test_prompt_within_budget_is_unchanged(self):
+        """Un prompt que entra se devuelve intacto."""
+        assert _budget().enforce("x" * 80) == "x" * 80
+
+    def test_reject_policy_raises_with_counts(self):
+        """Con política reject se lanza LLMContextLengthError con los conteos."""
+        with pytest.raises(LLMContextLengthError) as exc_info:
+            _budget("reject").enforce("x" * 81)
+
+        assert exc_info.value.prompt_tokens == 81
+        assert exc_info.value.max_prompt_tokens == 80
+        assert exc_info.value.model == "test-model"
+
+    def test_truncate_policy_cuts_prompt(self):
+        """Con política truncate el prompt se recorta al presupuesto."""
+        assert _budget("truncate").enforce("x" * 200) == "x" * 80
+
+    def test_chunk_policy_rejects_oversized_prompt(self):
+        """Con política chunk un prompt excedido que llega al LLM se rechaza."""
+        with pytest.raises(LLMContextLengthError):
+            _budget("chunk").enforce("x" * 81)
+
+    def test_unknown_policy_is_configuration_error(self):
+        """Una política desconocida es un error de configuración."""
+        with pytest.raises(LLMConfigurationError):
+            _budget("ignore")
+
+    @patch.dict('os.environ', {"LLM_CONTEXT_POLICY": "truncate"})
+    def test_for_model_reads_policy_from_env(self):
+        """La política se toma de LLM_CONTEXT_POLICY."""
+        budget = ContextBudget.for_model("gemini", "m", ModelLimits(1000, 100))
+
+        assert budget.policy == "truncate"
+        assert budget.max_prompt_tokens == 900
+
+    def test_for_model_without_limits_returns_none(self):
+        """Un modelo no catalogado no tiene presupuesto."""
+        assert ContextBudget.for_model("gemini", "desconocido", None) is None
+
+
+class TestAdapterContextBudget:
+    """Tests de la integración del presupuesto en los adaptadores."""
+
+    @patch.dict('os.environ', {"GROQ_API_KEY": "x"})
+    def test_groq_adapter_uses_model_limits(self):
+        """El adaptador construye el presupuesto a partir de MODEL_LIMITS."""
+        adapter = GroqAdapter(model="mixtral-8x7b-32768")
+        limits = GroqAdapter.MODEL_LIMITS["mixtral-8x7b-32768"]
+
+        assert adapter.context_budget.max_prompt_tokens == limits.context_window - limits.max_output_tokens
+
+    def test_every_gemini_model_has_limits(self):
+        """Todos los modelos listados tienen límites conocidos."""
+        assert set(GeminiAdapter.MODEL_LIMITS) == set(GeminiAdapter.AVAILABLE_MODELS)
+
+    def test_every_groq_model_has_limits(self):
+        """Todos los modelos listados tienen límites conocidos."""
+        assert set(GroqAdapter.MODEL_LIMITS) == set(GroqAdapter.AVAILABLE_MODELS)
+
+    @pytest.mark.asyncio
+    async def test_oversized_prompt_fails_before_network_call(self):
+        """Un prompt excedido falla localmente sin invocar al proveedor."""
+        llm = MagicMock()
+        llm.ainvoke = AsyncMock()
+        structured = GroqStructuredLLM(llm, context_budget=_budget("reject"))
+
+        with pytest.raises(LLMContextLengthError):
+            await structured.ainvoke("x" * 81)
+
+        llm.ainvoke.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_truncated_prompt_is_sent(self):
+        """Con truncate se envía el prompt recortado."""
+        llm = MagicMock()
+        llm.ainvoke = AsyncMock(return_value="ok")
+        structured = GroqStructuredLLM(llm, context_budget=_budget("truncate"))
+
+        assert await structured.ainvoke("x" * 200) == "ok"
+        llm.ainvoke.assert_awaited_once_with("x" * 80)
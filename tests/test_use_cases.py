@@ -0,0 +1,708 @@
+"""
+Tests del Caso de Uso AnalyzeVideoUseCase.
+Se mockea el grafo compilado para verificar la lógica de cache, single-flight,
+trabajos asíncronos, lotes, streaming y persistencia.
+"""
+import asyncio
+import importlib
+import pytest
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+from asgiref.sync import sync_to_async
+from django.apps import apps as django_apps
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from application.use_cases.use_cases import (
+    AnalyzeVideoUseCase,
+    AnalyzeVideoBatchUseCase,
+    RecoverAnalysisJobsUseCase,
+    RunAnalysisJobUseCase,
+    StreamVideoAnalysisUseCase,
+)
+from application.jobs import JobWorkerPool
+from application.use_cases.single_flight import SingleFlight
+from domain.fingerprint import minhash_signature, signature_to_bytes
+from infrastructure.adapters.llm.response_cache import _bypass as _response_cache_bypass
+from infrastructure.persistence import locks
+from infrastructure.persistence.models import VideoRecord, VideoTranscript, AnalysisJob, SentimentRollup, TranscriptFingerprintBand
+from infrastructure.persistence.rollups import rebuild_rollups
+from infrastructure.persistence.search import search_videos
+from infrastructure.persistence.video_records import upsert_video_record
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+class TestAnalyzeVideoUseCaseCache:
+    """Pruebas del cache read-through sobre VideoRecord."""
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_first_call_runs_graph_and_persists(self, mock_app, fake_graph_stream, sample_video_url, mock_graph_final_state):
+        """Sin registro previo se ejecuta el grafo y se guarda el resultado."""
+        mock_app.return_value.astream = fake_graph_stream(mock_graph_final_state)
+
+        record = await AnalyzeVideoUseCase.execute(sample_video_url)
+
+        mock_app.return_value.astream.assert_called_once()
+        assert record.pk is not None
+        assert record.sentiment == "positivo"
+        assert await VideoRecord.objects.acount() == 1
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_routed_model_is_recorded(self, mock_app, fake_graph_stream, sample_video_url, mock_graph_final_state):
+        """El modelo elegido por el router se guarda y el nivel de latencia llega al grafo."""
+        final_state = {**mock_graph_final_state, "llm_provider": "groq", "llm_model": "llama-3.1-8b-instant"}
+        mock_app.return_value.astream = fake_graph_stream(final_state)
+
+        record = await AnalyzeVideoUseCase.execute(sample_video_url, latency_tier="fast")
+
+        assert mock_app.return_value.astream.call_args.kwargs["config"]["configurable"]["latency_tier"] == "fast"
+        assert (record.llm_provider, record.llm_model) == ("groq", "llama-3.1-8b-instant")
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_repeat_call_is_served_from_cache(self, mock_app, fake_graph_stream, sample_video_url, mock_graph_final_state):
+        """La segunda solicitud de la misma URL no vuelve a ejecutar el grafo."""
+        mock_app.return_value.astream = fake_graph_stream(mock_graph_final_state)
+
+        first = await AnalyzeVideoUseCase.execute(sample_video_url)
+        second = await AnalyzeVideoUseCase.execute(sample_video_url)
+
+        assert mock_app.return_value.astream.call_count == 1
+        assert second.pk == first.pk
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_url_variants_hit_the_same_record(self, mock_app, fake_graph_stream, mock_graph_final_state):
+        """Distintas variantes de URL del mismo video comparten el análisis."""
+        mock_app.return_value.astream = fake_graph_stream(mock_graph_final_state)
+
+        first = await AnalyzeVideoUseCase.execute("https://youtu.be/dQw4w9WgXcQ?t=30")
+        second = await AnalyzeVideoUseCase.execute("https://m.youtube.com/watch?v=dQw4w9WgXcQ&list=PL1")
+
+        assert mock_app.return_value.astream.call_count == 1
+        assert second.pk == first.pk
+        assert first.video_id == "dQw4w9WgXcQ"
+        assert first.url == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_force_refresh_reruns_graph_and_updates(self, mock_app, fake_graph_stream, sample_video_url, mock_graph_final_state):
+        """force_refresh ignora el cache y actualiza el registro existente."""
+        mock_app.return_value.astream = fake_graph_stream(mock_graph_final_state)
+        first = await AnalyzeVideoUseCase.execute(sample_video_url)
+
+        refreshed_state = {**mock_graph_final_state, "analysis": {
+            **mock_graph_final_state["analysis"], "sentiment": "neutral"
+        }}
+        mock_app.return_value.astream = fake_graph_stream(refreshed_state)
+        second = await AnalyzeVideoUseCase.execute(sample_video_url, force_refresh=True)
+
+        mock_app.return_value.astream.assert_called_once()
+        assert second.pk == first.pk
+        assert second.sentiment == "neutral"
+        assert await VideoRecord.objects.acount() == 1
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_stale_record_is_reanalyzed(self, mock_app, fake_graph_stream, settings, sample_video_url, mock_graph_final_state):
+        """Un registro más antiguo que el TTL se vuelve a analizar."""
+        settings.ANALYSIS_CACHE_TTL_SECONDS = 60
+        mock_app.return_value.astream = fake_graph_stream(mock_graph_final_state)
+        record = await AnalyzeVideoUseCase.execute(sample_video_url)
+        await VideoRecord.objects.filter(pk=record.pk).aupdate(
+            created_at=timezone.now() - timedelta(seconds=120)
+        )
+
+        await AnalyzeVideoUseCase.execute(sample_video_url)
+
+        assert mock_app.return_value.astream.call_count == 2
+        assert await VideoRecord.objects.acount() == 1
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_workflow_errors_raise_value_error(self, mock_app, fake_graph_stream, sample_video_url):
+        """Los errores del grafo se propagan como ValueError sin persistir."""
+        mock_app.return_value.astream = fake_graph_stream({"errors": ["Video no encontrado"]})
+
+        with pytest.raises(ValueError):
+            await AnalyzeVideoUseCase.execute(sample_video_url)
+
+        assert await VideoRecord.objects.acount() == 0
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+class TestAnalyzeVideoUseCaseSingleFlight:
+    """Pruebas de coalescencia de solicitudes concurrentes."""
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_concurrent_requests_share_one_graph_run(self, mock_app, fake_graph_stream, sample_video_url, mock_graph_final_state):
+        """Varias solicitudes simultáneas del mismo video ejecutan el grafo una vez."""
+        release = asyncio.Event()
+
+        mock_app.return_value.astream = fake_graph_stream(mock_graph_final_state, gate=release)
+
+        calls = [asyncio.create_task(AnalyzeVideoUseCase.execute(sample_video_url)) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        release.set()
+        records = await asyncio.gather(*calls)
+
+        assert mock_app.return_value.astream.call_count == 1
+        assert len({record.pk for record in records}) == 1
+        assert await VideoRecord.objects.acount() == 1
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_errors_are_propagated_to_all_waiters(self, mock_app, fake_graph_stream, sample_video_url):
+        """Si la ejecución compartida falla, todos los solicitantes reciben el error."""
+        release = asyncio.Event()
+
+        mock_app.return_value.astream = fake_graph_stream({"errors": ["Sin transcripción"]}, gate=release)
+
+        calls = [asyncio.create_task(AnalyzeVideoUseCase.execute(sample_video_url)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        release.set()
+        results = await asyncio.gather(*calls, return_exceptions=True)
+
+        assert mock_app.return_value.astream.call_count == 1
+        assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+class TestUpsertVideoRecord:
+    """Pruebas del upsert por video_id (INSERT ... ON CONFLICT)."""
+
+    FIELDS = {
+        "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "title": "Video",
+        "transcript": "texto",
+        "duration_seconds": 60,
+        "language_code": "es",
+        "sentiment": "positivo",
+        "sentiment_score": 0.9,
+        "tone": "informativo",
+        "key_points": ["a", "b", "c"],
+    }
+
+    async def test_duplicate_write_updates_existing_row(self):
+        """Escribir dos veces el mismo video actualiza la fila en vez de fallar."""
+        first = await upsert_video_record("dQw4w9WgXcQ", **self.FIELDS)
+        second = await upsert_video_record("dQw4w9WgXcQ", **{**self.FIELDS, "sentiment": "negativo"})
+
+        assert second.pk == first.pk
+        stored = await VideoRecord.objects.aget(video_id="dQw4w9WgXcQ")
+        assert stored.sentiment == "negativo"
+        assert stored.created_at >= first.created_at
+
+    async def test_concurrent_writes_do_not_raise(self):
+        """Escrituras simultáneas del mismo video (sin single-flight) dejan una sola fila."""
+        records = await asyncio.gather(*(
+            upsert_video_record("dQw4w9WgXcQ", **{**self.FIELDS, "tone": f"tono {i}"}) for i in range(5)
+        ))
+
+        assert len({record.pk for record in records}) == 1
+        assert await VideoRecord.objects.acount() == 1
+
+    async def test_failed_write_leaves_nothing_behind(self):
+        """Si una escritura falla a mitad de camino no queda ninguna parte del análisis."""
+        fingerprint = signature_to_bytes(minhash_signature("uno dos tres cuatro cinco"))
+        with patch(
+            'infrastructure.persistence.video_records.apply_contribution',
+            side_effect=RuntimeError("fallo simulado")
+        ):
+            with pytest.raises(RuntimeError):
+                await upsert_video_record("dQw4w9WgXcQ", **self.FIELDS, fingerprint=fingerprint)
+
+        assert await VideoRecord.objects.acount() == 0
+        assert await VideoTranscript.objects.acount() == 0
+        assert await TranscriptFingerprintBand.objects.acount() == 0
+        assert await search_videos("texto") == []
+
+    async def test_fingerprint_bands_are_replaced(self):
+        """Un nuevo análisis reemplaza los buckets LSH del registro."""
+        fingerprint = signature_to_bytes(minhash_signature("uno dos tres cuatro cinco"))
+        record = await upsert_video_record("dQw4w9WgXcQ", **self.FIELDS, fingerprint=fingerprint)
+        before = {b async for b in TranscriptFingerprintBand.objects.filter(record=record).values_list("bucket", flat=True)}
+
+        other = signature_to_bytes(minhash_signature("seis siete ocho nueve diez"))
+        await upsert_video_record("dQw4w9WgXcQ", **self.FIELDS, fingerprint=other)
+
+        after = {b async for b in TranscriptFingerprintBand.objects.filter(record=record).values_list("bucket", flat=True)}
+        assert await TranscriptFingerprintBand.objects.filter(record=record).acount() == 32
+        assert after.isdisjoint(before)
+
+    async def test_fingerprint_bands_are_removed_without_fingerprint(self):
+        """Si el nuevo análisis no tiene firma, se quitan los buckets del anterior."""
+        fingerprint = signature_to_bytes(minhash_signature("uno dos tres cuatro cinco"))
+        record = await upsert_video_record("dQw4w9WgXcQ", **self.FIELDS, fingerprint=fingerprint)
+
+        await upsert_video_record("dQw4w9WgXcQ", **self.FIELDS, fingerprint=None)
+
+        assert await TranscriptFingerprintBand.objects.filter(record=record).acount() == 0
+
+
+@pytest.mark.asyncio
+class TestAdvisoryLock:
+    """Pruebas del advisory lock de sesión sobre una conexión dedicada."""
+
+    @staticmethod
+    def _lock_connection(*acquired):
+        lock_connection = MagicMock()
+        cursor = lock_connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.side_effect = [(result,) for result in acquired]
+        return lock_connection, cursor
+
+    async def test_lock_lives_on_its_own_connection(self):
+        """Lock, reintentos y liberación usan una conexión propia que se cierra al salir."""
+        lock_connection, cursor = self._lock_connection(False, True)
+        with patch.object(locks.connection, "vendor", "postgresql"), \
+                patch.object(locks.connections, "create_connection", return_value=lock_connection), \
+                patch.object(locks.connection, "cursor") as shared_cursor:
+            async with locks.advisory_lock("analyze:dQw4w9WgXcQ", poll_interval=0):
+                lock_connection.close.assert_not_called()
+
+        assert cursor.execute.call_count == 2
+        assert all("pg_try_advisory_lock" in call.args[0] for call in cursor.execute.call_args_list)
+        lock_connection.close.assert_called_once()
+        shared_cursor.assert_not_called()
+
+    async def test_failure_inside_the_section_still_releases(self):
+        """Una excepción en la sección crítica cierra igual la conexión (y con ella el lock)."""
+        lock_connection, _ = self._lock_connection(True)
+        with patch.object(locks.connection, "vendor", "postgresql"), \
+                patch.object(locks.connections, "create_connection", return_value=lock_connection):
+            with pytest.raises(RuntimeError):
+                async with locks.advisory_lock("analyze:dQw4w9WgXcQ"):
+                    raise RuntimeError("grafo caído")
+
+        lock_connection.close.assert_called_once()
+
+
+@pytest.mark.django_db
+class TestBackfillVideoIdMigration:
+    """Pruebas de la migración de datos que completa video_id en registros previos."""
+
+    def _record(self, url, age_days):
+        fields = {k: v for k, v in TestUpsertVideoRecord.FIELDS.items() if k != "transcript"}
+        record = VideoRecord.objects.create(**{**fields, "url": url}, video_id=f"tmp{age_days}")
+        VideoRecord.objects.filter(pk=record.pk).update(created_at=timezone.now() - timedelta(days=age_days))
+        return record
+
+    def test_unparsable_urls_are_flagged_not_collapsed(self):
+        """URLs sin ID válido conservan su fila con una clave propia; las variantes de un video se deduplican."""
+        migration = importlib.import_module("infrastructure.persistence.migrations.0003_backfill_video_id")
+        older = self._record("https://youtu.be/dQw4w9WgXcQ", age_days=2)
+        newer = self._record("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=5", age_days=1)
+        broken = [self._record("https://example.com/", age_days=3), self._record("https://youtu.be/abc", age_days=4)]
+
+        migration.backfill_video_id(django_apps, None)
+
+        rows = dict(VideoRecord.objects.values_list("pk", "video_id"))
+        assert older.pk not in rows
+        assert rows[newer.pk] == "dQw4w9WgXcQ"
+        assert {rows[record.pk] for record in broken} == {f"!{record.pk}" for record in broken}
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+class TestSentimentRollups:
+    """Pruebas de los agregados incrementales y del comando de backfill."""
+
+    FIELDS = TestUpsertVideoRecord.FIELDS
+
+    async def _create(self, video_id, **overrides):
+        return await upsert_video_record(
+            video_id, **{**self.FIELDS, "url": f"https://www.youtube.com/watch?v={video_id}", **overrides}
+        )
+
+    @staticmethod
+    async def _group_by_records():
+        """El GROUP BY sobre VideoRecord que los agregados deben reflejar."""
+        expected = {}
+        async for created_at, sentiment, tone, language_code, score in VideoRecord.objects.values_list(
+            "created_at", "sentiment", "tone", "language_code", "sentiment_score"
+        ):
+            totals = expected.setdefault((timezone.localdate(created_at), sentiment, tone, language_code), [0, 0.0])
+            totals[0] += 1
+            totals[1] += score
+        return {key: (count, pytest.approx(score)) for key, (count, score) in expected.items()}
+
+    @staticmethod
+    async def _rollups():
+        return {
+            (day, sentiment, tone, language_code): (count, score_sum)
+            async for day, sentiment, tone, language_code, count, score_sum in SentimentRollup.objects.filter(
+                count__gt=0
+            ).values_list("day", "sentiment", "tone", "language_code", "count", "score_sum")
+        }
+
+    async def test_incremental_rollups_follow_inserts_and_reanalysis(self):
+        """Cada upsert suma el análisis nuevo y resta el que reemplazó."""
+        await self._create("aaaaaaaaaaa")
+        await self._create("bbbbbbbbbbb", sentiment_score=0.7)
+        await self._create("ccccccccccc", sentiment="negativo", sentiment_score=0.2, language_code="en")
+        await self._create("aaaaaaaaaaa", sentiment="neutral", sentiment_score=0.5)
+
+        assert await self._rollups() == await self._group_by_records()
+        today = timezone.localdate()
+        positive = await SentimentRollup.objects.aget(day=today, sentiment="positivo")
+        assert (positive.count, positive.score_sum) == (1, pytest.approx(0.7))
+
+    async def test_concurrent_rewrites_of_a_video_keep_rollups_exact(self):
+        """Escritores simultáneos del mismo video restan cada uno el aporte que reemplazaron."""
+        await asyncio.gather(*(
+            self._create("aaaaaaaaaaa", sentiment=sentiment, sentiment_score=score)
+            for sentiment, score in [("positivo", 0.9), ("negativo", 0.1), ("neutral", 0.5)] * 3
+        ))
+
+        rollups = await self._rollups()
+        assert rollups == await self._group_by_records()
+        assert sum(count for count, _ in rollups.values()) == 1
+
+    async def test_backfill_rebuilds_rollups_from_records(self):
+        """El comando corrige el desvío de cambios hechos por fuera del upsert."""
+        await self._create("aaaaaaaaaaa")
+        await self._create("bbbbbbbbbbb", tone="humorístico")
+        await VideoRecord.objects.filter(video_id="bbbbbbbbbbb").adelete()
+        assert await self._rollups() != await self._group_by_records()
+
+        await sync_to_async(call_command)("backfill_sentiment_rollups", chunk_size=1)
+
+        assert await self._rollups() == await self._group_by_records()
+
+    async def test_backfill_blocks_rollup_writes_before_scanning(self):
+        """La reconstrucción toma el lock de escritura antes de recorrer los análisis."""
+        await self._create("aaaaaaaaaaa")
+
+        def rebuild():
+            with CaptureQueriesContext(connection) as queries:
+                rebuild_rollups()
+            return [query["sql"] for query in queries.captured_queries]
+
+        statements = await sync_to_async(rebuild)()
+
+        first_write = next(i for i, sql in enumerate(statements) if sql.startswith(("DELETE", "LOCK")))
+        scan = next(i for i, sql in enumerate(statements) if "persistence_videorecord" in sql)
+        assert first_write < scan
+        assert await self._rollups() == await self._group_by_records()
+
+    async def test_backfill_since_only_rebuilds_recent_days(self):
+        """Con --since solo se reemplazan los buckets desde ese día."""
+        await self._create("aaaaaaaaaaa")
+        await self._create("bbbbbbbbbbb")
+        old_day = timezone.now() - timedelta(days=10)
+        await VideoRecord.objects.filter(video_id="bbbbbbbbbbb").aupdate(created_at=old_day)
+
+        await sync_to_async(call_command)("backfill_sentiment_rollups", since=timezone.localdate().isoformat())
+        rollups = await self._rollups()
+        assert [key[0] for key in rollups] == [timezone.localdate()]
+        assert rollups[(timezone.localdate(), "positivo", "informativo", "es")][0] == 1
+
+        await sync_to_async(call_command)("backfill_sentiment_rollups")
+        assert await self._rollups() == await self._group_by_records()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+class TestAnalyzeVideoUseCaseNearDuplicates:
+    """Pruebas de reutilización de análisis entre transcripciones casi idénticas."""
+
+    TRANSCRIPT = " ".join(f"palabra{i % 400} tema{i % 11}" for i in range(2000))
+
+    async def _persist_original(self, mock_app, fake_graph_stream, mock_graph_final_state):
+        state = {
+            **mock_graph_final_state,
+            "transcript": self.TRANSCRIPT,
+            "fingerprint": signature_to_bytes(minhash_signature(self.TRANSCRIPT)),
+        }
+        mock_app.return_value.astream = fake_graph_stream(state)
+        return await AnalyzeVideoUseCase.execute("https://youtu.be/orig0000001")
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_fingerprint_is_persisted_and_indexed(self, mock_app, fake_graph_stream, mock_graph_final_state):
+        """El análisis guarda la firma y un bucket LSH por banda."""
+        record = await self._persist_original(mock_app, fake_graph_stream, mock_graph_final_state)
+
+        assert record.fingerprint is not None
+        assert await TranscriptFingerprintBand.objects.filter(record=record).acount() == 32
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_clipped_copy_finds_original_analysis(self, mock_app, fake_graph_stream, mock_graph_final_state):
+        """Un recorte de la transcripción reutiliza el análisis del original."""
+        original = await self._persist_original(mock_app, fake_graph_stream, mock_graph_final_state)
+        clipped = " ".join(self.TRANSCRIPT.split()[100:])
+
+        duplicate = await AnalyzeVideoUseCase._find_near_duplicate("mirror00001", minhash_signature(clipped))
+
+        assert duplicate["video_id"] == original.video_id
+        assert duplicate["similarity"] >= 0.9
+        assert duplicate["analysis"]["sentiment"] == original.sentiment
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_own_video_and_low_similarity_are_not_reused(self, mock_app, fake_graph_stream, mock_graph_final_state):
+        """Ni el propio video ni transcripciones distintas cuentan como duplicados."""
+        await self._persist_original(mock_app, fake_graph_stream, mock_graph_final_state)
+        unrelated = " ".join(f"otra{i % 300} cosa{i % 7}" for i in range(2000))
+
+        assert await AnalyzeVideoUseCase._find_near_duplicate(
+            "orig0000001", minhash_signature(self.TRANSCRIPT)
+        ) is None
+        assert await AnalyzeVideoUseCase._find_near_duplicate(
+            "mirror00001", minhash_signature(unrelated)
+        ) is None
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_reused_analysis_records_its_origin(self, mock_app, fake_graph_stream, mock_graph_final_state):
+        """El registro creado desde un casi-duplicado indica de qué video proviene."""
+        mock_app.return_value.astream = fake_graph_stream({**mock_graph_final_state, "duplicate_of": "orig0000001"})
+
+        record = await AnalyzeVideoUseCase.execute("https://youtu.be/mirror00001")
+
+        assert record.duplicate_of == "orig0000001"
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_force_refresh_disables_reuse(self, mock_app, fake_graph_stream, sample_video_url, mock_graph_final_state):
+        """force_refresh no provee el buscador de casi-duplicados al grafo."""
+        mock_app.return_value.astream = fake_graph_stream(mock_graph_final_state)
+
+        await AnalyzeVideoUseCase.execute(sample_video_url)
+        await AnalyzeVideoUseCase.execute(sample_video_url, force_refresh=True)
+
+        first_config, refresh_config = (call.kwargs["config"] for call in mock_app.return_value.astream.call_args_list)
+        assert "find_near_duplicate" in first_config["configurable"]
+        assert "find_near_duplicate" not in refresh_config["configurable"]
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_force_refresh_bypasses_llm_response_cache(self, mock_app, fake_graph_stream, sample_video_url, mock_graph_final_state):
+        """Solo el grafo de un force_refresh corre con la cache de respuestas LLM desactivada."""
+        bypassed = []
+        stream = fake_graph_stream(mock_graph_final_state).side_effect
+
+        def recording_stream(*args, **kwargs):
+            bypassed.append(_response_cache_bypass.get())
+            return stream(*args, **kwargs)
+
+        mock_app.return_value.astream = MagicMock(side_effect=recording_stream)
+
+        await AnalyzeVideoUseCase.execute(sample_video_url)
+        await AnalyzeVideoUseCase.execute(sample_video_url, force_refresh=True)
+
+        assert bypassed == [False, True]
+        assert _response_cache_bypass.get() is False
+
+
+@pytest.mark.asyncio
+class TestSingleFlight:
+    """Pruebas unitarias del registro SingleFlight."""
+
+    async def test_cancelled_caller_does_not_abort_shared_run(self):
+        """Cancelar a un solicitante no cancela la ejecución compartida."""
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "ok"
+
+        first = asyncio.create_task(flight.do("video", work))
+        second = asyncio.create_task(flight.do("video", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == "ok"
+        assert not flight.in_flight("video")
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+class TestRunAnalysisJobUseCase:
+    """Pruebas del procesamiento de trabajos asíncronos."""
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_job_progresses_to_done(self, mock_app, fake_graph_stream, sample_video_url, mock_graph_final_state):
+        """El trabajo pasa por extracting/analyzing y termina con el registro asociado."""
+        mock_app.return_value.astream = fake_graph_stream(mock_graph_final_state)
+        job = await AnalysisJob.objects.acreate(video_id="dQw4w9WgXcQ", video_url=sample_video_url)
+        states = []
+        original_set_state = RunAnalysisJobUseCase._set_state
+
+        async def spy_set_state(job, state, *extra_fields):
+            states.append(state)
+            await original_set_state(job, state, *extra_fields)
+
+        with patch.object(RunAnalysisJobUseCase, '_set_state', side_effect=spy_set_state):
+            await RunAnalysisJobUseCase.execute(str(job.pk))
+
+        job = await AnalysisJob.objects.select_related('record').aget(pk=job.pk)
+        assert states == ["extracting", "analyzing", "done"]
+        assert job.state == "done"
+        assert job.record.video_id == "dQw4w9WgXcQ"
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_progress_callback_receives_node_updates(self, mock_app, fake_graph_stream, sample_video_url, mock_graph_final_state):
+        """on_progress recibe la actualización de cada nodo en orden."""
+        mock_app.return_value.astream = fake_graph_stream(mock_graph_final_state)
+        events = []
+
+        async def on_progress(node, update):
+            events.append((node, update))
+
+        await AnalyzeVideoUseCase.execute(sample_video_url, on_progress=on_progress)
+
+        assert [node for node, _ in events] == ["extract", "analyze"]
+        assert events[1][1]["analysis"]["sentiment"] == "positivo"
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+class TestRecoverAnalysisJobsUseCase:
+    """Pruebas de la recuperación de trabajos interrumpidos al arrancar."""
+
+    async def _create_job(self, state, video_id="dQw4w9WgXcQ"):
+        return await AnalysisJob.objects.acreate(
+            video_id=video_id, video_url=f"https://www.youtube.com/watch?v={video_id}", state=state
+        )
+
+    @patch('application.use_cases.use_cases._job_pool')
+    async def test_unfinished_jobs_are_requeued(self, mock_pool):
+        """Los trabajos en cola o en curso vuelven a la cola; los terminados no se tocan."""
+        mock_pool.has_capacity.return_value = True
+        queued = await self._create_job(AnalysisJob.State.QUEUED)
+        running = await self._create_job(AnalysisJob.State.ANALYZING)
+        done = await self._create_job(AnalysisJob.State.DONE)
+
+        result = await RecoverAnalysisJobsUseCase.execute(timezone.now() + timedelta(seconds=1))
+
+        assert result == (2, 0)
+        assert [c.args[0] for c in mock_pool.submit.call_args_list] == [str(queued.pk), str(running.pk)]
+        assert (await AnalysisJob.objects.aget(pk=running.pk)).state == "queued"
+        assert (await AnalysisJob.objects.aget(pk=done.pk)).state == "done"
+
+    @patch('application.use_cases.use_cases._job_pool')
+    async def test_jobs_beyond_queue_capacity_fail(self, mock_pool):
+        """Con la cola llena el trabajo se marca fallido en vez de quedar colgado."""
+        mock_pool.has_capacity.side_effect = [True, False]
+        await self._create_job(AnalysisJob.State.QUEUED)
+        overflow = await self._create_job(AnalysisJob.State.EXTRACTING)
+
+        result = await RecoverAnalysisJobsUseCase.execute(timezone.now() + timedelta(seconds=1))
+
+        overflow = await AnalysisJob.objects.aget(pk=overflow.pk)
+        assert result == (1, 1)
+        assert overflow.state == "failed"
+        assert "reinicio" in overflow.error
+
+    @patch('application.use_cases.use_cases._job_pool')
+    async def test_jobs_active_after_startup_are_ignored(self, mock_pool):
+        """Solo se recuperan trabajos sin actividad desde antes del arranque."""
+        started_at = timezone.now()
+        await self._create_job(AnalysisJob.State.QUEUED)
+
+        assert await RecoverAnalysisJobsUseCase.execute(started_at) == (0, 0)
+        mock_pool.submit.assert_not_called()
+
+
+class TestJobWorkerPool:
+    """Pruebas del pool de workers."""
+
+    def test_pending_jobs_survive_a_closed_loop(self):
+        """Si el loop de los workers se cierra, los pendientes pasan al loop siguiente."""
+        handled = []
+
+        async def handler(job_id):
+            handled.append(job_id)
+
+        pool = JobWorkerPool(handler, workers=1, max_queue_size=10)
+
+        async def submit_on_short_lived_loop():
+            pool.submit("a")
+            pool.submit("b")
+
+        async def submit_and_wait():
+            pool.submit("c")
+            await pool.join()
+
+        # Como una vista async bajo WSGI: el loop se cierra antes de que corran los workers
+        asyncio.run(submit_on_short_lived_loop())
+        asyncio.run(submit_and_wait())
+
+        assert handled == ["a", "b", "c"]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+class TestAnalyzeVideoBatchUseCase:
+    """Pruebas del análisis por lotes."""
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_batch_dedups_and_skips_existing(self, mock_app, fake_graph_stream, mock_graph_final_state):
+        """Variantes del mismo video se analizan una vez y los existentes se omiten."""
+        mock_app.return_value.astream = fake_graph_stream(mock_graph_final_state)
+        await AnalyzeVideoUseCase.execute("https://www.youtube.com/watch?v=aaaaaaaaaaa")
+        mock_app.return_value.astream.reset_mock()
+
+        results = await AnalyzeVideoBatchUseCase.execute([
+            "https://youtu.be/aaaaaaaaaaa",
+            "https://www.youtube.com/watch?v=bbbbbbbbbbb",
+            "https://youtube.com/shorts/bbbbbbbbbbb",
+            "https://vimeo.com/123",
+        ])
+
+        assert mock_app.return_value.astream.call_count == 1
+        assert [item.status for item in results] == ["cached", "analyzed", "analyzed", "failed"]
+        assert results[1].record.pk == results[2].record.pk
+        assert results[3].video_id is None
+        assert results[3].error
+
+    @patch('application.use_cases.use_cases.AnalyzeVideoUseCase.execute')
+    async def test_batch_respects_concurrency_limit(self, mock_execute, settings):
+        """Nunca se ejecutan más análisis simultáneos que el límite configurado."""
+        settings.ANALYSIS_BATCH_CONCURRENCY = 2
+        running = 0
+        peak = 0
+
+        async def slow_execute(video_url, force_refresh=False):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            raise ValueError("Error en el workflow")
+
+        mock_execute.side_effect = slow_execute
+        urls = [f"https://youtu.be/video{i:06d}" for i in range(6)]
+
+        results = await AnalyzeVideoBatchUseCase.execute(urls)
+
+        assert peak == 2
+        assert mock_execute.call_count == 6
+        assert all(item.status == "failed" for item in results)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+class TestStreamVideoAnalysisUseCase:
+    """Pruebas del análisis con eventos de progreso."""
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_heartbeats_are_emitted_while_waiting(self, mock_app, fake_graph_stream, sample_video_url, mock_graph_final_state):
+        """Mientras el grafo no avanza se emiten heartbeats periódicos."""
+        release = asyncio.Event()
+        mock_app.return_value.astream = fake_graph_stream(mock_graph_final_state, gate=release)
+        asyncio.get_running_loop().call_later(0.05, release.set)
+
+        events = [
+            name async for name, _ in StreamVideoAnalysisUseCase.execute(sample_video_url, heartbeat_seconds=0.01)
+        ]
+
+        assert events[0] == "start"
+        assert "heartbeat" in events
+        assert events[-3:] == ["extract", "analyze", "done"]
+
+    @patch('application.use_cases.use_cases.get_graph')
+    async def test_cached_analysis_is_streamed_immediately(self, mock_app, fake_graph_stream, sample_video_url, mock_graph_final_state):
+        """Con un análisis vigente solo se emiten start y done."""
+        mock_app.return_value.astream = fake_graph_stream(mock_graph_final_state)
+        await AnalyzeVideoUseCase.execute(sample_video_url)
+
+        events = [name async for name, _ in StreamVideoAnalysisUseCase.execute(sample_video_url)]
+
+        assert events == ["start", "done"]
+        assert mock_app.return_value.astream.call_count == 1
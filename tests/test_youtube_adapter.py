@@ -2,13 +2,29 @@
 Tests Unitarios para el Adaptador de YouTube.
 Utiliza mocking para aislar las pruebas de la API externa.
 """
+import asyncio
+import os
+import threading
+import time
+
+import aiohttp
 import pytest
-from unittest.mock import patch, MagicMock
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from unittest.mock import patch, MagicMock, AsyncMock
 from infrastructure.adapters.youtube_adapter import YouTubeAdapter
+from infrastructure.adapters.executor import BoundedExecutor
+from infrastructure.adapters.async_transcript_fetcher import AsyncTranscriptFetcher, parse_transcript_xml
+from infrastructure.adapters.transcript_cache import (
+    FileSystemTranscriptCache,
+    DatabaseTranscriptCache,
+    get_transcript_cache
+)
 from infrastructure.adapters.exceptions import (
     VideoNotFoundError, 
     NoTranscriptError, 
-    YouTubeError
+    YouTubeError,
+    ExecutorSaturatedError
 )
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import VideoUnavailable, TranscriptsDisabled, NoTranscriptFound
@@ -38,11 +54,21 @@ class TestYouTubeAdapterVideoIdExtraction:
         video_id = self.adapter._extract_id(url)
         assert video_id == "dQw4w9WgXcQ"
 
-    def test_extract_id_limits_to_11_chars(self):
-        """Verifica que solo tome 11 caracteres del ID."""
-        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQextratext"
-        video_id = self.adapter._extract_id(url)
-        assert len(video_id) == 11
+    def test_extract_id_rejects_ids_that_are_not_11_chars(self):
+        """Un ID más largo o más corto que 11 caracteres no se recorta: es un error."""
+        for url in ("https://www.youtube.com/watch?v=dQw4w9WgXcQextratext", "https://youtu.be/dQw4w9"):
+            with pytest.raises(YouTubeError):
+                self.adapter._extract_id(url)
+
+
+@pytest.fixture
+def canned_metadata():
+    """Evita la llamada de red de metadata devolviendo datos fijos."""
+    with patch.object(
+        AsyncTranscriptFetcher, 'fetch_metadata',
+        new=AsyncMock(return_value={"title": "Video de prueba", "duration_seconds": 120})
+    ) as mock_fetch_metadata:
+        yield mock_fetch_metadata
 
 
 class TestYouTubeAdapterTranscriptFetching:
@@ -59,12 +85,15 @@ class TestYouTubeAdapterTranscriptFetching:
         mock_entry1.text = "Hola mundo"
         mock_entry2 = MagicMock()
         mock_entry2.text = "Este es un video"
-        mock_fetch.return_value = [mock_entry1, mock_entry2]
+        mock_fetch.return_value = MagicMock(language_code="en")
+        mock_fetch.return_value.__iter__.return_value = [mock_entry1, mock_entry2]
         
         result = self.adapter._get_transcript("test_video_id")
         
-        assert "Hola mundo" in result
-        assert "Este es un video" in result
+        assert "Hola mundo" in result["transcript"]
+        assert "Este es un video" in result["transcript"]
+        # El idioma informado es el del subtítulo efectivamente elegido
+        assert result["language_code"] == "en"
         mock_fetch.assert_called_once_with(
             "test_video_id", 
             languages=['es', 'en']
@@ -75,7 +104,8 @@ class TestYouTubeAdapterTranscriptFetching:
         """Verifica que se priorice español sobre inglés."""
         mock_entry = MagicMock()
         mock_entry.text = "Texto"
-        mock_fetch.return_value = [mock_entry]
+        mock_fetch.return_value = MagicMock(language_code="es")
+        mock_fetch.return_value.__iter__.return_value = [mock_entry]
         
         self.adapter._get_transcript("video_id")
         
@@ -85,6 +115,7 @@ class TestYouTubeAdapterTranscriptFetching:
 
 
 @pytest.mark.asyncio
+@pytest.mark.usefixtures("canned_metadata")
 class TestYouTubeAdapterAsync:
     """Tests asíncronos para fetch_full_data."""
 
@@ -94,18 +125,51 @@ class TestYouTubeAdapterAsync:
     @patch('infrastructure.adapters.youtube_adapter.YouTubeAdapter._get_transcript')
     async def test_fetch_full_data_success(self, mock_get_transcript):
         """Test de obtención completa de datos."""
-        mock_get_transcript.return_value = "Transcripción de prueba"
+        mock_get_transcript.return_value = {"transcript": "Transcripción de prueba", "language_code": "en"}
         
         result = await self.adapter.fetch_full_data(
-            "https://www.youtube.com/watch?v=test12345"
+            "https://www.youtube.com/watch?v=test1234567"
         )
         
         assert "transcript" in result
         assert "metadata" in result
         assert result["transcript"] == "Transcripción de prueba"
-        assert "title" in result["metadata"]
-        assert "duration_seconds" in result["metadata"]
-        assert "language_code" in result["metadata"]
+        assert result["metadata"] == {
+            "title": "Video de prueba",
+            "duration_seconds": 120,
+            "language_code": "en"
+        }
+
+    @patch('infrastructure.adapters.youtube_adapter.YouTubeAdapter._get_transcript')
+    async def test_fetch_metadata_runs_concurrently(self, mock_get_transcript, canned_metadata):
+        """La metadata se obtiene en paralelo con la transcripción, no después."""
+        def slow_transcript(video_id):
+            time.sleep(0.2)
+            return {"transcript": "Texto", "language_code": "es"}
+
+        async def metadata(video_id):
+            await asyncio.sleep(0.2)
+            return {"title": "Paralelo", "duration_seconds": 1}
+
+        mock_get_transcript.side_effect = slow_transcript
+        canned_metadata.side_effect = metadata
+
+        started = time.monotonic()
+        result = await self.adapter.fetch_full_data("https://youtu.be/dQw4w9WgXcQ")
+
+        # max(0.2, 0.2) y no la suma
+        assert time.monotonic() - started < 0.35
+        assert result["metadata"]["title"] == "Paralelo"
+
+    @patch('infrastructure.adapters.youtube_adapter.YouTubeAdapter._get_transcript')
+    async def test_metadata_failure_uses_placeholders(self, mock_get_transcript, canned_metadata):
+        """Una falla al obtener la metadata no impide la extracción."""
+        mock_get_transcript.return_value = {"transcript": "Texto", "language_code": "es"}
+        canned_metadata.side_effect = aiohttp.ClientConnectionError("reset")
+
+        result = await self.adapter.fetch_full_data("https://youtu.be/dQw4w9WgXcQ")
+
+        assert result["metadata"] == {"title": "Video dQw4w9WgXcQ", "duration_seconds": 0, "language_code": "es"}
 
     @patch('infrastructure.adapters.youtube_adapter.YouTubeAdapter._get_transcript')
     async def test_fetch_video_unavailable_raises_error(self, mock_get_transcript):
@@ -114,7 +178,7 @@ class TestYouTubeAdapterAsync:
         
         with pytest.raises(VideoNotFoundError) as exc_info:
             await self.adapter.fetch_full_data(
-                "https://www.youtube.com/watch?v=notexist"
+                "https://www.youtube.com/watch?v=notexist123"
             )
         
         assert "no está disponible" in str(exc_info.value)
@@ -142,7 +206,7 @@ class TestYouTubeAdapterAsync:
         
         with pytest.raises(NoTranscriptError):
             await self.adapter.fetch_full_data(
-                "https://www.youtube.com/watch?v=notranscript"
+                "https://www.youtube.com/watch?v=notranscrip"
             )
 
     @patch('infrastructure.adapters.youtube_adapter.YouTubeAdapter._get_transcript')
@@ -156,3 +220,376 @@ class TestYouTubeAdapterAsync:
             )
         
         assert "Error inesperado" in str(exc_info.value)
+
+
+class TestTranscriptCache:
+    """Tests para los backends de cache de transcripciones."""
+
+    def test_filesystem_roundtrip(self, tmp_path):
+        """Un payload guardado se recupera idéntico desde disco."""
+        cache = FileSystemTranscriptCache(str(tmp_path))
+
+        cache.set("dQw4w9WgXcQ", ("es", "en"), {"transcript": "hola mundo"})
+
+        assert cache.get("dQw4w9WgXcQ", ("es", "en")) == {"transcript": "hola mundo"}
+        assert cache.get("dQw4w9WgXcQ", ("en",)) is None
+
+    def test_filesystem_expired_entry_is_miss(self, tmp_path):
+        """Una entrada más antigua que el TTL no se devuelve."""
+        cache = FileSystemTranscriptCache(str(tmp_path), ttl_seconds=60)
+        cache.set("dQw4w9WgXcQ", ("es",), {"transcript": "viejo"})
+
+        with patch('infrastructure.adapters.transcript_cache.time.time', return_value=time.time() + 61):
+            assert cache.get("dQw4w9WgXcQ", ("es",)) is None
+
+    def test_filesystem_evicts_least_recently_used(self, tmp_path):
+        """Al superar max_bytes se desaloja la entrada menos usada."""
+        cache = FileSystemTranscriptCache(str(tmp_path))
+        cache.set("aaaaaaaaaaa", ("es",), {"transcript": "a" * 100})
+        entry_size = sum(p.stat().st_size for p in tmp_path.glob("*/*.bin"))
+        cache.max_bytes = entry_size * 5 // 2  # caben dos entradas, no tres
+        cache.set("bbbbbbbbbbb", ("es",), {"transcript": "b" * 100})
+        # Marcar "a" como usada más recientemente que "b"
+        old = time.time() - 100
+        for path in tmp_path.glob("*/*.bin"):
+            os.utime(path, (old, old))
+        cache.get("aaaaaaaaaaa", ("es",))
+
+        cache.set("ccccccccccc", ("es",), {"transcript": "c" * 100})
+
+        assert cache.get("aaaaaaaaaaa", ("es",)) is not None
+        assert cache.get("bbbbbbbbbbb", ("es",)) is None
+        assert cache.get("ccccccccccc", ("es",)) is not None
+
+    def test_filesystem_eviction_counts_other_processes_writes(self, tmp_path):
+        """El límite se aplica sobre el directorio compartido, no sobre lo escrito por esta instancia."""
+        worker_a, worker_b = FileSystemTranscriptCache(str(tmp_path)), FileSystemTranscriptCache(str(tmp_path))
+        worker_a.set("aaaaaaaaaaa", ("es",), {"transcript": "a" * 100})
+        entry_size = sum(p.stat().st_size for p in tmp_path.glob("*/*.bin"))
+        worker_b.set("bbbbbbbbbbb", ("es",), {"transcript": "b" * 100})
+        old = time.time() - 100
+        for path in tmp_path.glob("*/*.bin"):
+            os.utime(path, (old, old))
+        worker_a.get("aaaaaaaaaaa", ("es",))
+        worker_a.max_bytes = entry_size * 5 // 2
+
+        worker_a.set("ccccccccccc", ("es",), {"transcript": "c" * 100})
+
+        assert sum(p.stat().st_size for p in tmp_path.glob("*/*.bin")) <= worker_a.max_bytes
+        assert worker_b.get("bbbbbbbbbbb", ("es",)) is None
+
+    @pytest.mark.django_db
+    def test_database_roundtrip_and_eviction(self):
+        """El backend de base de datos conserva solo las max_entries más recientes."""
+        cache = DatabaseTranscriptCache(max_entries=1, evict_every=1)
+
+        cache.set("aaaaaaaaaaa", ("es",), {"transcript": "a"})
+        cache.set("bbbbbbbbbbb", ("es",), {"transcript": "b"})
+
+        assert cache.get("bbbbbbbbbbb", ("es",)) == {"transcript": "b"}
+        assert cache.get("aaaaaaaaaaa", ("es",)) is None
+
+    @pytest.mark.django_db
+    def test_database_eviction_runs_every_n_writes(self):
+        """El desalojo no corre en cada escritura sino cada evict_every."""
+        cache = DatabaseTranscriptCache(max_entries=1, evict_every=3)
+
+        with patch.object(cache, '_evict', wraps=cache._evict) as evict:
+            for video_id in ("aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc", "ddddddddddd"):
+                cache.set(video_id, ("es",), {"transcript": video_id})
+
+        assert evict.call_count == 1
+        assert cache.get("ddddddddddd", ("es",)) is not None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_database_operations_recycle_stale_connections(self):
+        """Cada operación descarta la conexión vieja o rota del thread, como una solicitud."""
+        cache = DatabaseTranscriptCache()
+
+        with patch('django.db.close_old_connections') as close_old_connections:
+            cache.set("aaaaaaaaaaa", ("es",), {"transcript": "a"})
+            assert cache.get("aaaaaaaaaaa", ("es",)) == {"transcript": "a"}
+
+        assert close_old_connections.call_count == 4
+
+    def test_factory_can_disable_cache(self):
+        """El backend "none" deshabilita la cache."""
+        assert get_transcript_cache("none") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("canned_metadata")
+class TestYouTubeAdapterCache:
+    """Tests de la integración de la cache en fetch_full_data."""
+
+    @patch('infrastructure.adapters.youtube_adapter.YouTubeAdapter._get_transcript')
+    async def test_cache_hit_skips_youtube(self, mock_get_transcript, tmp_path):
+        """Un segundo fetch del mismo video no vuelve a llamar a YouTube."""
+        mock_get_transcript.return_value = {"transcript": "Transcripción cacheada", "language_code": "en"}
+        adapter = YouTubeAdapter(cache=FileSystemTranscriptCache(str(tmp_path)))
+
+        first = await adapter.fetch_full_data("https://youtu.be/dQw4w9WgXcQ")
+        second = await adapter.fetch_full_data("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+
+        assert first == second
+        assert second["transcript"] == "Transcripción cacheada"
+        assert second["metadata"]["language_code"] == "en"
+        mock_get_transcript.assert_called_once()
+
+    @patch('infrastructure.adapters.youtube_adapter.YouTubeAdapter._get_transcript')
+    async def test_metadata_is_cached_independently(self, mock_get_transcript, canned_metadata, tmp_path):
+        """La metadata tiene su propia entrada de cache, separada de la transcripción."""
+        mock_get_transcript.return_value = {"transcript": "Texto", "language_code": "es"}
+        cache = FileSystemTranscriptCache(str(tmp_path))
+        adapter = YouTubeAdapter(cache=cache)
+
+        await adapter.fetch_full_data("https://youtu.be/dQw4w9WgXcQ")
+        await adapter.fetch_full_data("https://youtu.be/dQw4w9WgXcQ")
+
+        canned_metadata.assert_awaited_once()
+        assert cache.get("dQw4w9WgXcQ", YouTubeAdapter.LANGUAGES, "metadata")["title"] == "Video de prueba"
+
+    @patch('infrastructure.adapters.youtube_adapter.YouTubeAdapter._get_transcript')
+    async def test_broken_cache_falls_back_to_youtube(self, mock_get_transcript):
+        """Un fallo de la cache se trata como miss."""
+        mock_get_transcript.return_value = {"transcript": "Transcripción", "language_code": "es"}
+        cache = MagicMock()
+        cache.get.side_effect = OSError("disco lleno")
+        cache.set.side_effect = OSError("disco lleno")
+        adapter = YouTubeAdapter(cache=cache)
+
+        result = await adapter.fetch_full_data("https://youtu.be/dQw4w9WgXcQ")
+
+        assert result["transcript"] == "Transcripción"
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("canned_metadata")
+class TestBoundedExecutor:
+    """Tests para el executor dedicado de llamadas a YouTube."""
+
+    async def test_runs_in_named_dedicated_threads(self):
+        """Las tareas corren en threads propios del pool, no en el executor por defecto."""
+        executor = BoundedExecutor(max_workers=1, max_pending=1, name="youtube-test")
+
+        thread_name = await executor.run(lambda: threading.current_thread().name)
+
+        assert thread_name.startswith("youtube-test")
+        assert executor.stats()["completed"] == 1
+        executor.shutdown()
+
+    async def test_rejects_immediately_when_saturated(self):
+        """Con el pool ocupado y la cola llena, la siguiente tarea se rechaza sin esperar."""
+        executor = BoundedExecutor(max_workers=1, max_pending=1, name="youtube-test")
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocking():
+            started.set()
+            release.wait(5)
+
+        running = asyncio.ensure_future(executor.run(blocking))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        queued = asyncio.ensure_future(executor.run(lambda: "ok"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(lambda: "rechazada")
+
+        stats = executor.stats()
+        assert stats["queued"] == 1
+        assert stats["running"] == 1
+        assert stats["rejected"] == 1
+
+        release.set()
+        await running
+        assert await queued == "ok"
+        assert executor.stats()["max_wait_seconds"] > 0
+        executor.shutdown()
+
+    async def test_adapter_propagates_saturation(self):
+        """El adaptador no enmascara la saturación como un YouTubeError genérico."""
+        executor = MagicMock()
+        executor.run = AsyncMock(side_effect=ExecutorSaturatedError("saturado"))
+        adapter = YouTubeAdapter(executor=executor)
+
+        with pytest.raises(ExecutorSaturatedError):
+            await adapter.fetch_full_data("https://youtu.be/dQw4w9WgXcQ")
+
+
+CAPTIONS_XML = (
+    '<?xml version="1.0" encoding="utf-8" ?><transcript>'
+    '<text start="0.0" dur="1.5">Hola &amp;amp; bienvenidos</text>'
+    '<text start="1.5" dur="2.0">al canal</text>'
+    '</transcript>'
+)
+
+
+@pytest.fixture
+async def youtube_stand_in():
+    """
+    Servidor HTTP local que imita las tres respuestas de YouTube que usa el
+    fetcher asíncrono: página del video, API InnerTube y XML de subtítulos.
+    El comportamiento por video se configura en ``server.videos``.
+    """
+    state = {"videos": {}, "requests": 0}
+
+    async def watch(request):
+        state["requests"] += 1
+        return web.Response(text='<script>ytcfg.set({"INNERTUBE_API_KEY": "test-key"})</script>', content_type="text/html")
+
+    async def player(request):
+        state["requests"] += 1
+        body = await request.json()
+        assert request.query["key"] == "test-key"
+        return web.json_response(state["videos"].get(body["videoId"], {
+            "playabilityStatus": {"status": "ERROR", "reason": "This video is unavailable"}
+        }))
+
+    async def timedtext(request):
+        state["requests"] += 1
+        return web.Response(text=CAPTIONS_XML, content_type="text/xml")
+
+    app = web.Application()
+    app.router.add_get("/watch", watch)
+    app.router.add_post("/youtubei/v1/player", player)
+    app.router.add_get("/api/timedtext", timedtext)
+    server = TestServer(app)
+    await server.start_server()
+
+    def captions(*tracks):
+        return {
+            "playabilityStatus": {"status": "OK"},
+            "videoDetails": {"title": "Video local", "lengthSeconds": "212"},
+            "captions": {"playerCaptionsTracklistRenderer": {"captionTracks": [
+                {"baseUrl": str(server.make_url(f"/api/timedtext?lang={code}")), "languageCode": code, **extra}
+                for code, extra in tracks
+            ]}},
+        }
+
+    server.state = state
+    server.captions = captions
+    yield server
+    await server.close()
+
+
+@pytest.mark.asyncio
+class TestAsyncTranscriptFetcher:
+    """Tests del fetcher aiohttp contra un servidor local que imita a YouTube."""
+
+    async def test_fetches_and_parses_captions(self, youtube_stand_in):
+        """Recorre página → player → subtítulos y devuelve texto plano e idioma."""
+        youtube_stand_in.state["videos"]["dQw4w9WgXcQ"] = youtube_stand_in.captions(("es", {}))
+        fetcher = AsyncTranscriptFetcher(base_url=str(youtube_stand_in.make_url("")))
+
+        data = await fetcher.fetch("dQw4w9WgXcQ", ("es", "en"))
+        await fetcher.close()
+
+        assert data == {
+            "transcript": "Hola & bienvenidos al canal",
+            "language_code": "es",
+            "metadata": {"title": "Video local", "duration_seconds": 212},
+        }
+
+    async def test_parse_transcript_xml_strips_formatting(self):
+        """El parser propio decodifica entidades, quita etiquetas y omite fragmentos vacíos."""
+        xml = (
+            '<transcript><text start="0" dur="1">Uno &lt;b&gt;dos&lt;/b&gt;</text>'
+            '<text start="1" dur="1"></text><text start="2">tres</text></transcript>'
+        )
+
+        assert parse_transcript_xml(xml) == "Uno dos tres"
+
+    async def test_prefers_language_order_and_manual_tracks(self, youtube_stand_in):
+        """Se respeta el orden de idiomas y, dentro de uno, el subtítulo manual sobre el automático."""
+        youtube_stand_in.state["videos"]["dQw4w9WgXcQ"] = youtube_stand_in.captions(
+            ("en", {}), ("es", {"kind": "asr"}), ("es", {"name": "manual"})
+        )
+        fetcher = AsyncTranscriptFetcher(base_url=str(youtube_stand_in.make_url("")))
+        tracks = youtube_stand_in.state["videos"]["dQw4w9WgXcQ"]["captions"]["playerCaptionsTracklistRenderer"]["captionTracks"]
+
+        track = fetcher._select_track(tracks, ["es", "en"], "dQw4w9WgXcQ")
+
+        assert track["languageCode"] == "es"
+        assert "kind" not in track
+
+    async def test_unavailable_video(self, youtube_stand_in):
+        """Un video inexistente se informa con VideoUnavailable."""
+        fetcher = AsyncTranscriptFetcher(base_url=str(youtube_stand_in.make_url("")))
+
+        with pytest.raises(VideoUnavailable):
+            await fetcher.fetch("notexist123", ("es",))
+        await fetcher.close()
+
+    async def test_missing_language(self, youtube_stand_in):
+        """Sin subtítulos en los idiomas pedidos se lanza NoTranscriptFound."""
+        youtube_stand_in.state["videos"]["dQw4w9WgXcQ"] = youtube_stand_in.captions(("fr", {}))
+        fetcher = AsyncTranscriptFetcher(base_url=str(youtube_stand_in.make_url("")))
+
+        with pytest.raises(NoTranscriptFound):
+            await fetcher.fetch("dQw4w9WgXcQ", ("es", "en"))
+        await fetcher.close()
+
+    async def test_concurrent_fetches_share_one_session(self, youtube_stand_in):
+        """Las extracciones concurrentes reutilizan la misma sesión sin usar threads."""
+        youtube_stand_in.state["videos"]["dQw4w9WgXcQ"] = youtube_stand_in.captions(("es", {}))
+        fetcher = AsyncTranscriptFetcher(base_url=str(youtube_stand_in.make_url("")), max_connections=4)
+
+        results = await asyncio.gather(*(fetcher.fetch("dQw4w9WgXcQ", ("es",)) for _ in range(20)))
+        connection_limit = fetcher._session.connector.limit
+        await fetcher.close()
+
+        assert all(r["transcript"] == "Hola & bienvenidos al canal" for r in results)
+        assert youtube_stand_in.state["requests"] == 60
+        assert connection_limit == 4
+
+    async def test_adapter_uses_async_fetcher_without_executor(self, youtube_stand_in):
+        """Con async_fetcher el adaptador no ocupa threads del executor."""
+        youtube_stand_in.state["videos"]["dQw4w9WgXcQ"] = youtube_stand_in.captions(("es", {}))
+        fetcher = AsyncTranscriptFetcher(base_url=str(youtube_stand_in.make_url("")))
+        adapter = YouTubeAdapter(async_fetcher=fetcher)
+
+        result = await adapter.fetch_full_data("https://youtu.be/dQw4w9WgXcQ")
+        await fetcher.close()
+
+        assert result["transcript"] == "Hola & bienvenidos al canal"
+        assert result["metadata"] == {"title": "Video local", "duration_seconds": 212, "language_code": "es"}
+        assert adapter.executor.stats()["submitted"] == 0
+        # Página, player y subtítulos: la metadata no agrega requests
+        assert youtube_stand_in.state["requests"] == 3
+
+    async def test_adapter_caches_metadata_from_player(self, youtube_stand_in, tmp_path):
+        """La metadata del player se guarda en cache y la siguiente extracción no toca YouTube."""
+        youtube_stand_in.state["videos"]["dQw4w9WgXcQ"] = youtube_stand_in.captions(("es", {}))
+        fetcher = AsyncTranscriptFetcher(base_url=str(youtube_stand_in.make_url("")))
+        adapter = YouTubeAdapter(cache=FileSystemTranscriptCache(str(tmp_path)), async_fetcher=fetcher)
+
+        first = await adapter.fetch_full_data("https://youtu.be/dQw4w9WgXcQ")
+        second = await adapter.fetch_full_data("https://youtu.be/dQw4w9WgXcQ")
+        await fetcher.close()
+
+        assert second == first
+        assert youtube_stand_in.state["requests"] == 3
+
+    async def test_adapter_maps_async_errors(self, youtube_stand_in):
+        """Los errores del fetcher asíncrono se clasifican igual que en el camino síncrono."""
+        fetcher = AsyncTranscriptFetcher(base_url=str(youtube_stand_in.make_url("")))
+        adapter = YouTubeAdapter(async_fetcher=fetcher)
+
+        with pytest.raises(VideoNotFoundError):
+            await adapter.fetch_full_data("https://youtu.be/notexist123")
+        await fetcher.close()
+
+    @patch('infrastructure.adapters.youtube_adapter.YouTubeAdapter._get_transcript')
+    async def test_adapter_falls_back_to_threaded_fetch(self, mock_get_transcript):
+        """Un fallo inesperado del fetcher asíncrono cae al camino de youtube-transcript-api."""
+        mock_get_transcript.return_value = {"transcript": "Transcripción síncrona", "language_code": "es"}
+        fetcher = MagicMock()
+        fetcher.fetch = AsyncMock(side_effect=aiohttp.ClientConnectionError("reset"))
+        fetcher.fetch_metadata = AsyncMock(return_value={"title": "T", "duration_seconds": 1})
+        adapter = YouTubeAdapter(async_fetcher=fetcher)
+
+        result = await adapter.fetch_full_data("https://youtu.be/dQw4w9WgXcQ")
+
+        assert result["transcript"] == "Transcripción síncrona"
+        mock_get_transcript.assert_called_once_with("dQw4w9WgXcQ")